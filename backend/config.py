@@ -1,13 +1,88 @@
-from sqlalchemy import create_engine
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, scoped_session
 
 # Database configuration
-DATABASE_URL = 'sqlite:///funding_history.db'
+DATABASE_PATH = 'funding_history.db'
+DATABASE_URL = f'sqlite:///{DATABASE_PATH}'
+
+# Number of read-only connections shared by the dashboard callbacks
+DATABASE_READ_POOL_SIZE = int(os.environ.get('DATABASE_READ_POOL_SIZE', 5))
+
+# Bytes of series arrays kept in the in-process read cache
+SERIES_CACHE_MAX_BYTES = int(os.environ.get('SERIES_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+# Milliseconds a connection waits for a lock before failing
+DATABASE_BUSY_TIMEOUT_MS = 30_000
+
+# Compressed database snapshot restored when the database is missing
+SNAPSHOT_PATH = 'snapshots/funding_history.db.gz'
+
+
+def create_writer_engine(database_url: str = DATABASE_URL) -> Engine:
+    """Create the engine used by the ingestion, holding a single connection.
+
+    The connection switches the database to write-ahead logging, so readers keep reading the
+    last committed state while a write transaction is open.
+
+    Args:
+        database_url (str, optional): The URL of the database. Defaults to the application database.
+
+    Returns:
+        Engine: The writer engine.
+    """
+    writer = create_engine(database_url, pool_size=1, max_overflow=0)
+
+    @event.listens_for(writer, "connect")
+    def configure_writer(dbapi_connection, _) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute("PRAGMA synchronous = NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout = {DATABASE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+    return writer
+
+
+def create_reader_engine(database_path: str = DATABASE_PATH, pool_size: int = DATABASE_READ_POOL_SIZE) -> Engine:
+    """Create the read-only engine used by the dashboard.
+
+    Connections open the database with `mode=ro` and `query_only`, so they can never take the
+    write lock. Every session runs in an explicit read transaction and sees one consistent
+    snapshot of the database for all of its queries.
+
+    Args:
+        database_path (str, optional): The path of the database. Defaults to the application database.
+        pool_size (int, optional): The number of pooled connections. Defaults to `DATABASE_READ_POOL_SIZE`.
+
+    Returns:
+        Engine: The reader engine.
+    """
+    reader = create_engine(f'sqlite:///file:{database_path}?mode=ro&uri=true', pool_size=pool_size, max_overflow=0)
+
+    @event.listens_for(reader, "connect")
+    def configure_reader(dbapi_connection, _) -> None:
+        # Let SQLAlchemy emit BEGIN itself instead of the driver deferring it to the first write
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only = ON")
+        cursor.execute(f"PRAGMA busy_timeout = {DATABASE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+    @event.listens_for(reader, "begin")
+    def begin_snapshot(connection) -> None:
+        connection.exec_driver_sql("BEGIN")
+
+    return reader
 
 
-# Create engine
-engine = create_engine(DATABASE_URL)
+# Create engines
+engine = create_writer_engine()
+read_engine = create_reader_engine()
 
 
-# Create a session factory
-Session = scoped_session(sessionmaker(bind=engine))
\ No newline at end of file
+# Create session factories
+Session = scoped_session(sessionmaker(bind=engine))
+ReadSession = scoped_session(sessionmaker(bind=read_engine))
@@ -0,0 +1,168 @@
+""" This module contains async counterparts of the read and bulk write functions.
+
+SQLite has no native async driver in the dependencies, so the blocking functions are offloaded
+to thread pools and awaited. Reads run on a pool as large as the read-only connection pool and
+writes on a single thread, matching the single connection of the writer engine, so concurrent
+coroutines queue for the write lock in the executor instead of blocking the event loop.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from backend.config import DATABASE_READ_POOL_SIZE
+from backend.data_access.crud.crud_buckets import read_bucketed_series
+from backend.data_access.crud.crud_funding import read_funding_entries
+from backend.data_access.crud.crud_interest import read_interest_entries
+from backend.data_access.crud.crud_open_interest import read_open_interest_entries
+from backend.data_access.crud.crud_series import (
+    SeriesMatrix,
+    read_latest_timestamps,
+    read_series_arrays,
+    read_series_arrays_many,
+    read_series_matrix
+)
+from backend.data_access.storage.buckets import Aggregation, BucketResolution
+from backend.data_access.storage.time_series_store import SeriesTable, TimeSeriesStore, TimestampLike, get_store
+from backend.models.models_orm import Coin, Symbol
+
+
+READ_EXECUTOR = ThreadPoolExecutor(max_workers=DATABASE_READ_POOL_SIZE, thread_name_prefix='db-read')
+WRITE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-write')
+
+
+async def run_read(function: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking read on the read executor and await its result.
+
+    Args:
+        function (Callable): The blocking function.
+        *args: The positional arguments of the function.
+        **kwargs: The keyword arguments of the function.
+
+    Returns:
+        Any: The result of the function.
+    """
+    return await asyncio.get_running_loop().run_in_executor(READ_EXECUTOR, partial(function, *args, **kwargs))
+
+
+async def run_write(function: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking write on the single write thread and await its result.
+
+    Args:
+        function (Callable): The blocking function.
+        *args: The positional arguments of the function.
+        **kwargs: The keyword arguments of the function.
+
+    Returns:
+        Any: The result of the function.
+    """
+    return await asyncio.get_running_loop().run_in_executor(WRITE_EXECUTOR, partial(function, *args, **kwargs))
+
+
+async def read_series_arrays_async(
+    table: SeriesTable,
+    key: str,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    num_values: Optional[int] = None,
+    session_factory=None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Async counterpart of `read_series_arrays`."""
+    return await run_read(read_series_arrays, table, key, start, end, num_values, session_factory)
+
+
+async def read_series_arrays_many_async(
+    table: SeriesTable,
+    keys: Iterable[str],
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    session_factory=None
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Async counterpart of `read_series_arrays_many`."""
+    return await run_read(read_series_arrays_many, table, list(keys), start, end, session_factory)
+
+
+async def read_series_matrix_async(
+    table: SeriesTable,
+    keys: Iterable[str],
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    interval: Optional[np.timedelta64] = None,
+    session_factory=None
+) -> SeriesMatrix:
+    """Async counterpart of `read_series_matrix`."""
+    return await run_read(read_series_matrix, table, list(keys), start, end, interval, session_factory)
+
+
+async def read_latest_timestamps_async(table: SeriesTable, session_factory=None) -> Dict[str, datetime]:
+    """Async counterpart of `read_latest_timestamps`."""
+    return await run_read(read_latest_timestamps, table, session_factory)
+
+
+async def read_bucketed_series_async(
+    table: SeriesTable,
+    key: str,
+    resolution: BucketResolution,
+    aggregation: Aggregation,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    session_factory=None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Async counterpart of `read_bucketed_series`."""
+    return await run_read(read_bucketed_series, table, key, resolution, aggregation, start, end, session_factory)
+
+
+async def read_funding_entries_async(
+    symbol: Symbol,
+    num_values: Optional[int] = None,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Async counterpart of `read_funding_entries`."""
+    return await run_read(read_funding_entries, symbol, num_values, start, end)
+
+
+async def read_open_interest_entries_async(
+    symbol: Symbol,
+    num_values: Optional[int] = None,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Async counterpart of `read_open_interest_entries`."""
+    return await run_read(read_open_interest_entries, symbol, num_values, start, end)
+
+
+async def read_interest_entries_async(
+    coin: Coin,
+    num_values: Optional[int] = None,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Async counterpart of `read_interest_entries`."""
+    return await run_read(read_interest_entries, coin, num_values, start, end)
+
+
+async def create_entries_async(
+    table: SeriesTable,
+    key: str,
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    store: Optional[TimeSeriesStore] = None
+) -> int:
+    """Insert or overwrite a batch of entries of one series on the write thread.
+
+    Args:
+        table (SeriesTable): The table the series belongs to.
+        key (str): The symbol or coin of the series.
+        timestamps (np.ndarray): The timestamps of the entries.
+        values (np.ndarray): The values of the entries.
+        store (TimeSeriesStore, optional): The store to be written. Defaults to the active store.
+
+    Returns:
+        int: The number of entries written.
+    """
+    store = store if store is not None else get_store()
+    return await run_write(store.create_entries, table, key, timestamps, values)
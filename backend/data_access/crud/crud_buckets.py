@@ -0,0 +1,107 @@
+""" This module contains the bucketed reads of the funding rate, open interest and interest rate series.
+
+The entries are grouped in SQL by the integer division of their epoch seconds by the bucket
+width, months are grouped by their month index. Only one aggregated row per bucket leaves
+SQLite, so the cost of a read scales with the number of buckets instead of the history length.
+"""
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+from sqlalchemy import Integer, cast, func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.config import ReadSession
+from backend.data_access.crud.crud_series import fetch_raw
+from backend.data_access.storage.buckets import (
+    BUCKET_SECONDS,
+    EPOCH_MONDAY_SECONDS,
+    Aggregation,
+    BucketResolution,
+    bucket_index_to_start
+)
+from backend.data_access.storage.series_columns import SERIES_COLUMNS
+from backend.data_access.storage.time_series_store import SeriesTable, TimestampLike, to_naive_utc
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _bucket_index(timestamp_column, resolution: BucketResolution):
+    """Build the SQL expression of the integer bucket index of every entry, see `bucket_index`."""
+    if resolution == BucketResolution.MONTH:
+        return (
+            cast(func.strftime('%Y', timestamp_column), Integer) * 12
+            + cast(func.strftime('%m', timestamp_column), Integer) - 1
+        )
+    seconds = cast(func.strftime('%s', timestamp_column), Integer)
+    if resolution == BucketResolution.WEEK:
+        seconds = seconds - EPOCH_MONDAY_SECONDS
+    return seconds // BUCKET_SECONDS[resolution]
+
+
+def read_bucketed_series(
+    table: SeriesTable,
+    key: str,
+    resolution: BucketResolution,
+    aggregation: Aggregation,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    session_factory=None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Read one series within [start, end) reduced to one value per bucket.
+
+    The compound aggregation is computed as `exp(sum(ln(1 + value)))`, which needs an SQLite
+    build with the math functions.
+
+    Args:
+        table (SeriesTable): The table the series belongs to.
+        key (str): The symbol or coin of the series.
+        resolution (BucketResolution): The width of the buckets.
+        aggregation (Aggregation): The reduction of the entries within a bucket.
+        start (TimestampLike, optional): Inclusive lower bound of the entries. Defaults to None.
+        end (TimestampLike, optional): Exclusive upper bound of the entries. Defaults to None.
+        session_factory (optional): The session factory to be used. Defaults to the read-only ReadSession.
+
+    Returns:
+        tuple: The bucket starts as `datetime64[ms]` and the reduced values as `float64` in ascending order.
+    """
+    session_factory = session_factory if session_factory is not None else ReadSession
+    resolution = BucketResolution(resolution)
+    aggregation = Aggregation(aggregation)
+    columns = SERIES_COLUMNS[SeriesTable(table)]
+
+    bucket = _bucket_index(columns.timestamp, resolution).label('bucket')
+    if aggregation == Aggregation.LAST:
+        # With a single max() aggregate SQLite takes the bare value column from the row holding the maximum
+        query = select(bucket, columns.value, func.max(columns.timestamp))
+    else:
+        reductions = {
+            Aggregation.SUM: func.sum(columns.value),
+            Aggregation.COMPOUND: func.exp(func.sum(func.ln(1 + columns.value))),
+            Aggregation.MEAN: func.avg(columns.value),
+            Aggregation.MIN: func.min(columns.value),
+            Aggregation.MAX: func.max(columns.value)
+        }
+        query = select(bucket, reductions[aggregation])
+
+    query = query.where(columns.key == key)
+    if start is not None:
+        query = query.where(columns.timestamp >= to_naive_utc(start))
+    if end is not None:
+        query = query.where(columns.timestamp < to_naive_utc(end))
+    query = query.group_by(bucket).order_by(bucket)
+
+    try:
+        with session_factory() as session:
+            rows = fetch_raw(session, query)
+    except SQLAlchemyError as e:
+        logger.error("Database error occurred while reading bucketed %s records: %s", SeriesTable(table).value, e)
+        raise
+
+    if not rows:
+        return np.array([], dtype='datetime64[ms]'), np.array([], dtype=np.float64)
+    indices = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    values = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+    return bucket_index_to_start(indices, resolution), values
@@ -0,0 +1,274 @@
+""" This module contains the versioned in-process cache of series reads.
+
+Every series has a data version in the `series_versions` table, which is bumped in the same
+transaction as every write to the series. Writes changing existing entries, by overwriting their
+values or filling gaps between them, also record their version as the rewritten version. Writes
+only adding entries before the first or after the most recent one keep it, so cached reads newer
+than it are extended by the added entries instead of being read again. A cached read is stored
+together with the version read before it, so a hit is only served while the version is unchanged,
+also if another process wrote the series. The version is read before the data, hence a write racing
+with a read can only leave an entry behind that is already outdated, never a stale entry with a
+current version.
+"""
+from collections import OrderedDict
+import logging
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import inspect, select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session as OrmSession
+
+from backend.config import SERIES_CACHE_MAX_BYTES, ReadSession
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import SeriesVersion
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _nbytes(value: Any) -> int:
+    """Return the bytes held by the arrays of a cached value."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, tuple):
+        return sum(_nbytes(item) for item in value)
+    return 0
+
+
+def _freeze(value: Any) -> Any:
+    """Make the arrays of a cached value read-only, so callers cannot alter the cache."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        for item in value:
+            _freeze(item)
+    return value
+
+
+class VersionStamp(NamedTuple):
+    """The data version of a series and the version of its last write changing existing entries."""
+    version: int
+    rewritten: int
+
+
+class SeriesCache:
+    """Least recently used cache of series reads, bounded by the bytes of the cached arrays.
+
+    Attributes:
+        max_bytes (int): The maximum number of bytes held by the cached arrays.
+        hits (int): The number of reads served from the cache.
+        misses (int): The number of reads that went to the database.
+        evictions (int): The number of entries dropped to stay within `max_bytes`.
+        extensions (int): The number of outdated entries extended by added entries.
+    """
+
+    def __init__(self, max_bytes: int = SERIES_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.extensions = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[int, Any, int]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+
+    def get(self, key: Hashable, version: int) -> Optional[Any]:
+        """Return the cached value of a key if it was read at the given version.
+
+        Args:
+            key (Hashable): The key of the read.
+            version (int): The current data version of the series.
+
+        Returns:
+            Any: The cached value or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def peek(self, key: Hashable) -> Optional[Tuple[int, Any]]:
+        """Return the version and value cached for a key whatever its version, without counting a hit.
+
+        Args:
+            key (Hashable): The key of the read.
+
+        Returns:
+            tuple: The version and the value or None if the key is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else entry[:2]
+
+    def put(self, key: Hashable, version: int, value: Any) -> None:
+        """Cache a value read at the given version, evicting the least recently used entries.
+
+        Args:
+            key (Hashable): The key of the read.
+            version (int): The data version of the series the value was read at.
+            value (Any): The value, arrays or tuples of arrays.
+        """
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        _freeze(value)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (version, value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def count_extension(self) -> None:
+        """Count an outdated entry extended by added entries instead of read again."""
+        with self._lock:
+            self.extensions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = self.extensions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit, miss and eviction counters and the size of the cache."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'extensions': self.extensions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes
+            }
+
+
+SERIES_CACHE = SeriesCache()
+
+
+def migrate_series_versions(bind) -> None:
+    """Create the series version table and add the columns missing in databases of older releases.
+
+    Args:
+        bind: The engine of the database.
+    """
+    SeriesVersion.__table__.create(bind, checkfirst=True)
+    columns = {column['name'] for column in inspect(bind).get_columns(SeriesVersion.__tablename__)}
+    if 'rewritten_version' not in columns:
+        with bind.begin() as connection:
+            connection.execute(
+                text(f'ALTER TABLE {SeriesVersion.__tablename__} ADD COLUMN rewritten_version INTEGER NOT NULL DEFAULT 0')
+            )
+        logger.info("Column rewritten_version added to %s", SeriesVersion.__tablename__)
+
+
+def bump_series_version(session: OrmSession, table: SeriesTable, key: str, extends_only: bool = False) -> None:
+    """Increment the data version of a series. The caller commits the session with its write.
+
+    Writes that leave every existing entry unchanged keep the rewritten version, so cached reads
+    of the series can be extended by the new entries instead of being read again.
+
+    Args:
+        session (OrmSession): The session the series is written with.
+        table (SeriesTable): The table the series belongs to.
+        key (str): The symbol or coin of the series.
+        extends_only (bool, optional): Whether the write only added entries before the first or
+            after the most recent one. Defaults to False.
+    """
+    statement = sqlite_insert(SeriesVersion).values(
+        series_table=SeriesTable(table).value,
+        series_key=key,
+        version=1,
+        rewritten_version=0 if extends_only else 1
+    )
+    changes = {'version': SeriesVersion.version + 1}
+    if not extends_only:
+        changes['rewritten_version'] = SeriesVersion.version + 1
+    statement = statement.on_conflict_do_update(index_elements=['series_table', 'series_key'], set_=changes)
+    session.execute(statement)
+
+
+def read_series_version(table: SeriesTable, key: str, session_factory=None) -> VersionStamp:
+    """Read the data version of a series.
+
+    Args:
+        table (SeriesTable): The table the series belongs to.
+        key (str): The symbol or coin of the series.
+        session_factory (optional): The session factory to be used. Defaults to the read-only ReadSession.
+
+    Returns:
+        VersionStamp: The version and the rewritten version, both 0 if the series was never written.
+    """
+    session_factory = session_factory if session_factory is not None else ReadSession
+    query = (
+        select(SeriesVersion.version, SeriesVersion.rewritten_version)
+            .where(SeriesVersion.series_table == SeriesTable(table).value)
+            .where(SeriesVersion.series_key == key)
+    )
+    try:
+        with session_factory() as session:
+            row = session.execute(query).first()
+    except SQLAlchemyError as e:
+        logger.error("Database error occurred while reading the version of %s %s: %s", SeriesTable(table).value, key, e)
+        raise
+    return VersionStamp(0, 0) if row is None else VersionStamp(*row)
+
+
+def cached_read(
+    table: SeriesTable,
+    key: str,
+    read_key: Hashable,
+    read: Callable[[], Any],
+    session_factory=None,
+    cache: Optional[SeriesCache] = None,
+    extend: Optional[Callable[[Any], Any]] = None
+) -> Any:
+    """Serve a read of one series from the cache while the version of the series is unchanged.
+
+    If existing entries are unchanged since the cached read, `extend` derives the current value
+    from the cached one, reading only the new entries. It returns None if the cached value cannot
+    be extended, which reads the value again.
+
+    Args:
+        table (SeriesTable): The table the series belongs to.
+        key (str): The symbol or coin of the series.
+        read_key (Hashable): The parameters of the read, e.g. its range and resolution.
+        read (Callable): The function reading the value from the database on a miss.
+        session_factory (optional): The session factory the version is read with. Defaults to the read-only ReadSession.
+        cache (SeriesCache, optional): The cache to be used. Defaults to the global `SERIES_CACHE`.
+        extend (Callable, optional): The function extending an outdated cached value. Defaults to None.
+
+    Returns:
+        Any: The cached or freshly read value, its arrays are read-only.
+    """
+    cache = cache if cache is not None else SERIES_CACHE
+    stamp = read_series_version(table, key, session_factory)
+    cache_key = (SeriesTable(table), key, read_key)
+
+    value = cache.get(cache_key, stamp.version)
+    if value is not None:
+        return value
+
+    outdated = cache.peek(cache_key) if extend is not None else None
+    if outdated is not None and outdated[0] >= stamp.rewritten:
+        value = extend(outdated[1])
+        if value is not None:
+            cache.count_extension()
+    if value is None:
+        value = read()
+    cache.put(cache_key, stamp.version, value)
+    return value
@@ -0,0 +1,314 @@
+""" This module contains the CRUD functions for the persisted cumulative return curves.
+
+Every rate series and every spread of a symbol's funding net of a stable coin's interest has a
+curve holding the running sum of its rates and the running sum of `log1p(rate)` at every entry.
+Writes recompute the curve from their first timestamp on, starting from the stored point before
+it, so appending entries costs as much as the appended entries and deletes nothing. Backfills
+writing older pages first defer the recompute to a single one after their last page, see
+`SQLiteStore.defer_cumulative`. Reads rebase the stored curve to their start with the point
+before it, so a curve for any start date is one indexed range read.
+"""
+from datetime import datetime
+import logging
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session as OrmSession
+
+from backend.config import ReadSession, Session
+from backend.data_access.crud.crud_series import fetch_raw, read_latest_timestamps, rows_to_arrays, select_series
+from backend.data_access.storage.cumulative import (
+    SPREAD_TABLE,
+    Cumulative,
+    empty_cumulative,
+    spread_key,
+    split_spread_key
+)
+from backend.data_access.storage.resample import funding_interval, spread_rates
+from backend.data_access.storage.rollups import ROLLUP_TABLES
+from backend.data_access.storage.time_series_store import SeriesTable, TimestampLike, to_datetime64, to_naive_utc
+from backend.models.models_orm import SeriesCumulative
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _table_name(table: Union[SeriesTable, str]) -> str:
+    return table.value if isinstance(table, SeriesTable) else table
+
+
+def _read_raw(session: OrmSession, table: SeriesTable, key: str, start: Optional[np.datetime64]):
+    """Read the raw entries of a series from `start` on in ascending order."""
+    return rows_to_arrays(fetch_raw(session, select_series(table, key, start, None)))
+
+
+def _curve_query(series_table: str, key: str):
+    return (
+        select(SeriesCumulative.timestamp, SeriesCumulative.value_linear, SeriesCumulative.value_log)
+            .where(SeriesCumulative.series_table == series_table)
+            .where(SeriesCumulative.series_key == key)
+    )
+
+
+def _write_curve(
+    session: OrmSession,
+    series_table: str,
+    key: str,
+    first: Optional[np.datetime64],
+    timestamps: np.ndarray,
+    values: np.ndarray
+) -> int:
+    """Replace the curve points from `first` on by the accumulated rates, continuing the point before it."""
+    condition = [SeriesCumulative.series_table == series_table, SeriesCumulative.series_key == key]
+    base_linear, base_log = 0.0, 0.0
+    if first is not None:
+        first = to_naive_utc(first)
+        base = session.execute(
+            _curve_query(series_table, key)
+                .where(SeriesCumulative.timestamp < first)
+                .order_by(SeriesCumulative.timestamp.desc())
+                .limit(1)
+        ).first()
+        if base is not None:
+            base_linear, base_log = base[1], base[2]
+        condition.append(SeriesCumulative.timestamp >= first)
+
+    # Appended entries continue the stored tail, only entries within the curve replace points
+    tail = session.execute(select(func.max(SeriesCumulative.timestamp)).where(*condition[:2])).scalar()
+    if tail is not None and (first is None or tail >= first):
+        session.execute(delete(SeriesCumulative).where(*condition))
+
+    if len(timestamps) == 0:
+        return 0
+    values = np.asarray(values, dtype=np.float64)
+    rows = [
+        {
+            'series_table': series_table,
+            'series_key': key,
+            'timestamp': ts,
+            'value_linear': float(linear),
+            'value_log': float(log)
+        }
+        for ts, linear, log in zip(
+            to_datetime64(timestamps).astype(datetime),
+            base_linear + np.cumsum(values),
+            base_log + np.cumsum(np.log1p(values))
+        )
+    ]
+    session.execute(SeriesCumulative.__table__.insert(), rows)
+    return len(rows)
+
+
+def _spread_keys(session: OrmSession, table: SeriesTable, key: str) -> list:
+    """Read the keys of the persisted spread curves the given funding or interest series belongs to."""
+    if table == SeriesTable.FUNDING:
+        belongs = SeriesCumulative.series_key.startswith(spread_key(key, ''), autoescape=True)
+    else:
+        belongs = SeriesCumulative.series_key.endswith(spread_key('', key), autoescape=True)
+    return session.execute(
+        select(SeriesCumulative.series_key)
+            .where(SeriesCumulative.series_table == SPREAD_TABLE)
+            .where(belongs)
+            .distinct()
+    ).scalars().all()
+
+
+def update_spread_cumulative(
+    session: OrmSession,
+    symbol: str,
+    stablecoin: str,
+    first: Optional[np.datetime64] = None
+) -> int:
+    """Extend the spread curve of a symbol and a stable coin by the settlements not yet accumulated.
+
+    Every settlement accrues its funding net of the interest of its window, see `spread_rates`.
+    Settlements after the most recent interest entry are left for a later update, their window
+    may still be filled. The caller commits the session.
+
+    Args:
+        session (OrmSession): The session the curve is written with.
+        symbol (str): The symbol of the funding series.
+        stablecoin (str): The stable coin of the interest series.
+        first (np.datetime64, optional): The first timestamp of newly written entries of either
+            series, the curve is recomputed from there. Defaults to None to only extend the curve.
+
+    Returns:
+        int: The number of curve points written.
+    """
+    key = spread_key(symbol, stablecoin)
+    last = session.execute(
+        select(func.max(SeriesCumulative.timestamp))
+            .where(SeriesCumulative.series_table == SPREAD_TABLE)
+            .where(SeriesCumulative.series_key == key)
+    ).scalar()
+    start = None
+    if last is not None:
+        start = np.datetime64(last, 'ms') + np.timedelta64(1, 'ms')
+        if first is not None:
+            start = min(start, to_datetime64([first])[0])
+
+    interval = funding_interval(symbol)
+    settlements, funding = _read_raw(session, SeriesTable.FUNDING, symbol, start)
+    interest_start = settlements[0] - interval if len(settlements) else start
+    interest_timestamps, interest = _read_raw(session, SeriesTable.INTEREST, stablecoin, interest_start)
+
+    return _write_curve(session, SPREAD_TABLE, key, start, *spread_rates(settlements, funding, interest_timestamps, interest, interval))
+
+
+def update_cumulative(session: OrmSession, table: SeriesTable, key: str, timestamps: np.ndarray) -> int:
+    """Recompute the curve of a rate series and of its spreads from newly written entries on.
+
+    Only the spreads whose curve was persisted before are updated. The caller commits the session.
+
+    Args:
+        session (OrmSession): The session the new entries were written with.
+        table (SeriesTable): The table the series belongs to.
+        key (str): The symbol or coin of the series.
+        timestamps (np.ndarray): The timestamps of the newly written entries.
+
+    Returns:
+        int: The number of curve points written.
+    """
+    table = SeriesTable(table)
+    timestamps = to_datetime64(timestamps)
+    if table not in ROLLUP_TABLES or len(timestamps) == 0:
+        return 0
+
+    first = timestamps.min()
+    written = _write_curve(session, table.value, key, first, *_read_raw(session, table, key, first))
+    for spread in _spread_keys(session, table, key):
+        written += update_spread_cumulative(session, *split_spread_key(spread), first)
+    return written
+
+
+def rebuild_cumulative(table: Union[SeriesTable, str], key: str, session_factory=None) -> int:
+    """Rebuild the curve of a rate series or a spread from the raw entries.
+
+    Args:
+        table (SeriesTable | str): The table the series belongs to or `SPREAD_TABLE`.
+        key (str): The symbol or coin of the series, or the `spread_key` of a spread.
+        session_factory (optional): The session factory to be used. Defaults to the global Session.
+
+    Returns:
+        int: The number of curve points written.
+    """
+    series_table = _table_name(table)
+    session_factory = session_factory if session_factory is not None else Session
+
+    with session_factory() as session:
+        try:
+            if series_table == SPREAD_TABLE:
+                _write_curve(session, series_table, key, None, np.array([], dtype='datetime64[ms]'), [])
+                written = update_spread_cumulative(session, *split_spread_key(key))
+            else:
+                written = _write_curve(session, series_table, key, None, *_read_raw(session, SeriesTable(table), key, None))
+            session.commit()
+            logger.info("Rebuilt %d cumulative points for %s %s", written, series_table, key)
+            return written
+        except SQLAlchemyError as e:
+            logger.error("Database error occurred while rebuilding cumulative returns: %s", e)
+            session.rollback()
+            raise
+
+
+def backfill_cumulative(spreads: Iterable[Tuple[str, str]] = (), session_factory=None) -> int:
+    """Accumulate the curves of the rate series and spreads written before the curves were persisted.
+
+    Runs at startup, so reads never write. Series with any curve point are left untouched, their
+    curves are kept up to date by every write.
+
+    Args:
+        spreads (Iterable[Tuple[str, str]], optional): The symbol and stable coin of every spread
+            whose curve is persisted. Defaults to no spreads.
+        session_factory (optional): The session factory to be used. Defaults to the global Session.
+
+    Returns:
+        int: The number of curve points written.
+    """
+    session_factory = session_factory if session_factory is not None else Session
+    with session_factory() as session:
+        accumulated = set(session.execute(
+            select(SeriesCumulative.series_table, SeriesCumulative.series_key).distinct()
+        ).tuples())
+
+    written = 0
+    for table in ROLLUP_TABLES:
+        for key in read_latest_timestamps(table, session_factory):
+            if (table.value, key) not in accumulated:
+                written += rebuild_cumulative(table, key, session_factory)
+    for symbol, stablecoin in spreads:
+        if (SPREAD_TABLE, spread_key(symbol, stablecoin)) not in accumulated:
+            written += rebuild_cumulative(SPREAD_TABLE, spread_key(symbol, stablecoin), session_factory)
+    return written
+
+
+def read_cumulative_curve(
+    table: Union[SeriesTable, str],
+    key: str,
+    start: Optional[TimestampLike] = None,
+    session_factory=None
+) -> Cumulative:
+    """Read the persisted curve of a rate series or a spread from `start` on, rebased to `start`.
+
+    Args:
+        table (SeriesTable | str): The table the series belongs to or `SPREAD_TABLE`.
+        key (str): The symbol or coin of the series, or the `spread_key` of a spread.
+        start (TimestampLike, optional): The first entry accumulated. Defaults to None.
+        session_factory (optional): The session factory to be used. Defaults to the read-only ReadSession.
+
+    Returns:
+        Cumulative: The cumulative returns of the entries from `start` on.
+    """
+    series_table = _table_name(table)
+    session_factory = session_factory if session_factory is not None else ReadSession
+    query = _curve_query(series_table, key)
+    base = None
+    try:
+        with session_factory() as session:
+            if start is not None:
+                start = to_naive_utc(start)
+                query = query.where(SeriesCumulative.timestamp >= start)
+                base = session.execute(
+                    _curve_query(series_table, key)
+                        .where(SeriesCumulative.timestamp < start)
+                        .order_by(SeriesCumulative.timestamp.desc())
+                        .limit(1)
+                ).first()
+            rows = session.execute(query.order_by(SeriesCumulative.timestamp)).all()
+    except SQLAlchemyError as e:
+        logger.error("Database error occurred while reading cumulative returns of %s %s: %s", series_table, key, e)
+        raise
+
+    if not rows:
+        return empty_cumulative()
+    timestamps, linear, log = zip(*rows)
+    base_linear, base_log = (0.0, 0.0) if base is None else (base[1], base[2])
+    return Cumulative(
+        np.array(timestamps, dtype='datetime64[ms]'),
+        np.array(linear, dtype=np.float64) - base_linear,
+        np.exp(np.array(log, dtype=np.float64) - base_log)
+    )
+
+
+def count_cumulative_entries(table: Union[SeriesTable, str], key: str, session_factory=None) -> int:
+    """Count the curve points stored for a rate series or a spread.
+
+    Args:
+        table (SeriesTable | str): The table the series belongs to or `SPREAD_TABLE`.
+        key (str): The symbol or coin of the series, or the `spread_key` of a spread.
+        session_factory (optional): The session factory to be used. Defaults to the read-only ReadSession.
+
+    Returns:
+        int: The number of stored curve points.
+    """
+    session_factory = session_factory if session_factory is not None else ReadSession
+    with session_factory() as session:
+        return session.execute(
+            select(func.count())
+                .select_from(SeriesCumulative)
+                .where(SeriesCumulative.series_table == _table_name(table))
+                .where(SeriesCumulative.series_key == key)
+        ).scalar()
@@ -1,12 +1,12 @@
 """ This module contains CRUD functions for the funding rate data. """
-from typing import Optional, Tuple, Union
+import logging
+from datetime import datetime
+from typing import Optional, Tuple
 
 import numpy as np
-from sqlalchemy import desc
 from sqlalchemy.exc import SQLAlchemyError
-import logging
 
-from backend.config import Session
+from backend.data_access.storage.time_series_store import SeriesTable, TimestampLike, get_store
 from backend.models.models_orm import FundingRate, Symbol
 
 # Configure logging
@@ -15,44 +15,50 @@ logger = logging.getLogger(__name__)
 
 def create_funding_entries(funding_rate_record: FundingRate) -> None:
     """Create a new funding rate record in the database.
-    
+
+    The record is written through the active time series store, so the series version and the
+    derived rollups and cumulative curves are updated with it. Any error is logged and not
+    raised, so a malformed record never stops the ingest loop.
+
     Args:
         funding_rate_record (FundingRate): The funding rate record to be added.
     """
-    with Session() as session:
-        try:
-            session.merge(funding_rate_record)
-            session.commit()
-            logger.info("Funding rate record added successfully: %s", funding_rate_record)
-        except Exception as e:
-            logger.error("An error occurred while adding funding rate record: %s", e)
-            session.rollback()
+    try:
+        get_store().create_entries(
+            SeriesTable.FUNDING,
+            getattr(funding_rate_record.symbol, 'value', funding_rate_record.symbol),
+            [funding_rate_record.funding_rate_timestamp],
+            [funding_rate_record.funding_rate]
+        )
+        logger.info("Funding rate record added successfully: %s", funding_rate_record)
+    except Exception as e:
+        logger.error("An error occurred while adding funding rate record: %s", e)
 
 
-def read_funding_entries(symbol: Symbol, num_values: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+def read_funding_entries(
+    symbol: Symbol,
+    num_values: Optional[int] = None,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None
+) -> Tuple[np.ndarray, np.ndarray]:
     """Read funding rate records from the database.
 
+    The entries are read through the active time series store, column-direct on the read-only
+    connection and served from its cache, without hydrating ORM objects.
+
     Args:
         symbol (Symbol): The symbol for which the funding rate records should be read.
         num_values (int, optional): The number of funding rate records to be read. If None, all records are read. Defaults to None.
+        start (TimestampLike, optional): Inclusive lower bound of the timestamps. Defaults to None.
+        end (TimestampLike, optional): Exclusive upper bound of the timestamps. Defaults to None.
 
     Returns:
-        tuple: A tuple containing the timestamps and funding rate values.
+        tuple: A tuple containing the timestamps as `datetime64[ms]` and the funding rate values in ascending order.
     """
     try:
-        with Session() as session:
-            funding_rates = (
-                session.query(FundingRate)
-                    .filter_by(symbol=symbol.value)
-                    .order_by(desc(FundingRate.funding_rate_timestamp))
-                    .limit(num_values)
-                    .all()
-            )
-            logger.info("Funding rate records fetched successfully for symbol %s", symbol.value)
-        
-        timestamps = np.array([entry.funding_rate_timestamp for entry in funding_rates])[::-1]
-        funding_rate_values = np.array([entry.funding_rate for entry in funding_rates])[::-1]
-        return timestamps, funding_rate_values
+        timestamps, values = get_store().read_entries(SeriesTable.FUNDING, symbol.value, start, end, num_values)
+        logger.info("Funding rate records fetched successfully for symbol %s", symbol.value)
+        return timestamps, values
     except SQLAlchemyError as e:
         logger.error("Database error occurred while reading Funding Rate data: %s", e)
         raise
@@ -61,34 +67,26 @@ def read_funding_entries(symbol: Symbol, num_values: Optional[int] = None) -> Tu
         raise
 
 
-def read_most_recent_update_funding(symbol: Symbol) -> Union[str, None]:
+def read_most_recent_update_funding(symbol: Symbol) -> Optional[datetime]:
     """Read the date of the most recent funding rate update from the database.
 
     Args:
         symbol (Symbol): The symbol for which the most recent funding rate update should be read.
 
     Returns:
-        str: The timestamp of the most recent funding rate update.
+        datetime: The timestamp of the most recent funding rate update or None if there is no data.
     """
     try:
-        with Session() as session:
-            latest_entry = (
-                session.query(FundingRate)
-                    .filter_by(symbol=symbol.value)
-                    .order_by(desc(FundingRate.funding_rate_timestamp))
-                    .first()
-            )
-
-        if latest_entry is None:
-            logger.info("No funding rate data found for coin %s", symbol.value)
-            return None
-            
-        date_time = latest_entry.funding_rate_timestamp
-        logger.info("Most recent funding rate update for symbol %s: %s", symbol.value, date_time)
-        return date_time
+        date_time = get_store().read_most_recent_update(SeriesTable.FUNDING, symbol.value)
     except SQLAlchemyError as e:
         logger.error("Database error occurred while reading the most recent Funding Rate data timestamp: %s", e)
         raise
     except Exception as e:
         logger.error("Unexpected error while reading the most recent Funding Rate data timestamp: %s", e)
-        raise
\ No newline at end of file
+        raise
+
+    if date_time is None:
+        logger.info("No funding rate data found for symbol %s", symbol.value)
+        return None
+    logger.info("Most recent funding rate update for symbol %s: %s", symbol.value, date_time)
+    return date_time
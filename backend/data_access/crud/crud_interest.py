@@ -1,12 +1,12 @@
 """ This module contains the CRUD operations for the InterestRate model. """
 import logging
-from typing import Tuple, Union
+from datetime import datetime
+from typing import Optional, Tuple
 
 import numpy as np
-from sqlalchemy import desc
 from sqlalchemy.exc import SQLAlchemyError
 
-from backend.config import Session
+from backend.data_access.storage.time_series_store import SeriesTable, TimestampLike, get_store
 from backend.models.models_orm import Coin, InterestRate
 
 # Configure logging
@@ -16,37 +16,49 @@ logger = logging.getLogger(__name__)
 def create_interest_entries(interest_rate_record: InterestRate) -> None:
     """Create a new interest rate record in the database.
 
+    The record is written through the active time series store, so the series version and the
+    derived rollups and cumulative curves are updated with it. Any error is logged and not
+    raised, so a malformed record never stops the ingest loop.
+
     Args:
         interest_rate_record (InterestRate): The interest rate record to be added.
     """
-    with Session() as session:
-        try:
-            session.merge(interest_rate_record)
-            session.commit()
-            logger.info("Interest rate record added successfully: %s", interest_rate_record)
-        except Exception as e:
-            logger.error("An error occurred while adding interest rate record: %s", e)
-            session.rollback()
+    try:
+        get_store().create_entries(
+            SeriesTable.INTEREST,
+            getattr(interest_rate_record.coin, 'value', interest_rate_record.coin),
+            [interest_rate_record.interest_rate_timestamp],
+            [interest_rate_record.interest_rate]
+        )
+        logger.info("Interest rate record added successfully: %s", interest_rate_record)
+    except Exception as e:
+        logger.error("An error occurred while adding interest rate record: %s", e)
 
 
-def read_interest_entries(coin: Coin) -> Tuple[np.ndarray, np.ndarray]:
+def read_interest_entries(
+    coin: Coin,
+    num_values: Optional[int] = None,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None
+) -> Tuple[np.ndarray, np.ndarray]:
     """Read interest rate records from the database.
-    
+
+    The entries are read through the active time series store, column-direct on the read-only
+    connection and served from its cache, without hydrating ORM objects.
+
     Args:
         coin (Coin): The coin for which the interest rate records should be read.
-        
+        num_values (int, optional): The number of interest rate records to be read. If None, all records are read. Defaults to None.
+        start (TimestampLike, optional): Inclusive lower bound of the timestamps. Defaults to None.
+        end (TimestampLike, optional): Exclusive upper bound of the timestamps. Defaults to None.
+
     Returns:
-        tuple: A tuple containing the timestamps and interest rate values.
+        tuple: A tuple containing the timestamps as `datetime64[ms]` and the interest rate values in ascending order.
     """
     try:
-        with Session() as session:
-            interest_rates = session.query(InterestRate).filter_by(coin=coin.value).all()
-            logger.info("Interest rate records fetched successfully for coin %s", coin.value)
-
-        timestamps = np.array([rate.interest_rate_timestamp for rate in interest_rates])
-        interest_rates_values = np.array([float(rate.interest_rate) for rate in interest_rates])
-        
-        return timestamps, interest_rates_values
+        timestamps, values = get_store().read_entries(SeriesTable.INTEREST, coin.value, start, end, num_values)
+        logger.info("Interest rate records fetched successfully for coin %s", coin.value)
+        return timestamps, values
     except SQLAlchemyError as e:
         logger.error("Database error occurred while reading Interest Rate data: %s", e)
         raise
@@ -55,34 +67,26 @@ def read_interest_entries(coin: Coin) -> Tuple[np.ndarray, np.ndarray]:
         raise
 
 
-def read_most_recent_update_interest(coin: Coin) -> Union[str, None]:
+def read_most_recent_update_interest(coin: Coin) -> Optional[datetime]:
     """Read the date of the most recent interest rate update from the database.
 
     Args:
         coin (Coin): The coin for which the most recent interest rate update should be read.
 
     Returns:
-        str: The timestamp of the most recent interest rate update.
+        datetime: The timestamp of the most recent interest rate update or None if there is no data.
     """
     try:
-        with Session() as session:
-            latest_entry = (
-                session.query(InterestRate)
-                    .filter_by(coin=coin.value)
-                    .order_by(desc(InterestRate.interest_rate_timestamp))
-                    .first()
-            )
-
-        if latest_entry is None:
-            logger.info("No interest rate data found for coin %s", coin.value)
-            return None
-         
-        date_time = latest_entry.interest_rate_timestamp
-        logger.info("Most recent interest rate update for coin %s: %s", coin.value, date_time)
-        return date_time
+        date_time = get_store().read_most_recent_update(SeriesTable.INTEREST, coin.value)
     except SQLAlchemyError as e:
         logger.error("Database error occurred while reading the most recent Interest Rate data timestamp: %s", e)
         raise
     except Exception as e:
         logger.error("Unexpected error while reading the most recent Interest Rate data timestamp: %s", e)
-        raise
\ No newline at end of file
+        raise
+
+    if date_time is None:
+        logger.info("No interest rate data found for coin %s", coin.value)
+        return None
+    logger.info("Most recent interest rate update for coin %s: %s", coin.value, date_time)
+    return date_time
@@ -1,12 +1,12 @@
 """ This module contains CRUD functions for the OpenInterest table. """
-from typing import Optional, Tuple, Union
+import logging
+from datetime import datetime
+from typing import Optional, Tuple
 
 import numpy as np
-from sqlalchemy import desc
 from sqlalchemy.exc import SQLAlchemyError
-import logging
 
-from backend.config import Session
+from backend.data_access.storage.time_series_store import SeriesTable, TimestampLike, get_store
 from backend.models.models_orm import OpenInterest, Symbol
 
 # Configure logging
@@ -16,44 +16,49 @@ logger = logging.getLogger(__name__)
 def create_open_interest_entries(open_interest_record: OpenInterest) -> None:
     """Create a new open interest record in the database.
 
+    The record is written through the active time series store, so the series version and the
+    derived rollups and cumulative curves are updated with it. Any error is logged and not
+    raised, so a malformed record never stops the ingest loop.
+
     Args:
         open_interest_record (OpenInterest): The open interest record to be added.
     """
-    with Session() as session:
-        try:
-            session.merge(open_interest_record)
-            session.commit()
-            logger.info("Open interest record added successfully: %s", open_interest_record)
-        except Exception as e:
-            logger.error("An error occurred while adding open interest record: %s", e)
-            session.rollback()
+    try:
+        get_store().create_entries(
+            SeriesTable.OPEN_INTEREST,
+            getattr(open_interest_record.symbol, 'value', open_interest_record.symbol),
+            [open_interest_record.open_interest_timestamp],
+            [open_interest_record.open_interest]
+        )
+        logger.info("Open interest record added successfully: %s", open_interest_record)
+    except Exception as e:
+        logger.error("An error occurred while adding open interest record: %s", e)
 
 
-def read_open_interest_entries(symbol: Symbol, num_values: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+def read_open_interest_entries(
+    symbol: Symbol,
+    num_values: Optional[int] = None,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None
+) -> Tuple[np.ndarray, np.ndarray]:
     """Read open interest records from the database.
 
+    The entries are read through the active time series store, column-direct on the read-only
+    connection and served from its cache, without hydrating ORM objects.
+
     Args:
         symbol (Symbol): The symbol for which the open interest records should be read.
         num_values (int, optional): The number of open interest records to be read. If None, all records are read. Defaults to None.
+        start (TimestampLike, optional): Inclusive lower bound of the timestamps. Defaults to None.
+        end (TimestampLike, optional): Exclusive upper bound of the timestamps. Defaults to None.
 
     Returns:
-        tuple: A tuple containing the timestamps and open interest values.
+        tuple: A tuple containing the timestamps as `datetime64[ms]` and the open interest values in ascending order.
     """
     try:
-        with Session() as session:
-            open_interest = (
-                session.query(OpenInterest)
-                    .filter_by(symbol=symbol.value)
-                    .order_by(desc(OpenInterest.open_interest_timestamp))
-                    .limit(num_values)
-                    .all()
-            )
-            logger.info("Open interest records fetched successfully for symbol %s", symbol.value)
-
-        timestamps = np.array([rate.open_interest_timestamp for rate in open_interest])[::-1]
-        open_interest_values = np.array([float(rate.open_interest) for rate in open_interest])[::-1]
-        
-        return timestamps, open_interest_values
+        timestamps, values = get_store().read_entries(SeriesTable.OPEN_INTEREST, symbol.value, start, end, num_values)
+        logger.info("Open interest records fetched successfully for symbol %s", symbol.value)
+        return timestamps, values
     except SQLAlchemyError as e:
         logger.error("Database error occurred while reading Open Interest data: %s", e)
         raise
@@ -62,34 +67,26 @@ def read_open_interest_entries(symbol: Symbol, num_values: Optional[int] = None)
         raise
 
 
-def read_most_recent_update_open_interest(symbol: Symbol) -> Union[str, None]:
+def read_most_recent_update_open_interest(symbol: Symbol) -> Optional[datetime]:
     """Read the date of the most recent open interest update from the database.
 
     Args:
         symbol (Symbol): The symbol for which the most recent open interest update should be read.
 
     Returns:
-        str: The timestamp of the most recent open interest update.
+        datetime: The timestamp of the most recent open interest update or None if there is no data.
     """
     try:
-        with Session() as session:
-            latest_entry = (
-                session.query(OpenInterest)
-                    .filter_by(symbol=symbol.value)
-                    .order_by(desc(OpenInterest.open_interest_timestamp))
-                    .first()
-            )
-
-        if latest_entry is None:
-            logger.info("No open interest data found for coin %s", symbol.value)
-            return None
-            
-        date_time = latest_entry.open_interest_timestamp
-        logger.info("Most recent open interest update for symbol %s: %s", symbol.value, date_time)
-        return date_time
+        date_time = get_store().read_most_recent_update(SeriesTable.OPEN_INTEREST, symbol.value)
     except SQLAlchemyError as e:
         logger.error("Database error occurred while reading the most recent Open Interest data timestamp: %s", e)
         raise
     except Exception as e:
         logger.error("Unexpected error occurred while reading the most recent Open Interest data timestamp: %s", e)
-        raise
\ No newline at end of file
+        raise
+
+    if date_time is None:
+        logger.info("No open interest data found for symbol %s", symbol.value)
+        return None
+    logger.info("Most recent open interest update for symbol %s: %s", symbol.value, date_time)
+    return date_time
@@ -0,0 +1,296 @@
+""" This module contains CRUD functions for the compacted open interest tiers.
+
+Hourly open interest older than the hourly retention is compacted into 8 hour OHLC buckets and
+8 hour buckets older than their retention into daily OHLC buckets. Reads stitch the tiers
+together, representing every compacted bucket by its opening value at the bucket start.
+"""
+from datetime import datetime
+from enum import Enum
+import logging
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.config import Session
+from backend.data_access.crud.crud_cache import bump_series_version
+from backend.data_access.storage.time_series_store import SeriesTable, TimestampLike, to_naive_utc
+from backend.models.models_orm import OpenInterest, OpenInterestCompacted
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class OpenInterestTier(str, Enum):
+    """Enum for the granularities open interest is stored at."""
+    HOURLY = '1h'
+    EIGHT_HOURS = '8h'
+    DAILY = '1d'
+
+
+class OHLC(NamedTuple):
+    """Open, high, low and close values of a series of buckets."""
+    timestamps: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    count: np.ndarray
+
+
+def tier_bucket_start(timestamps: np.ndarray, tier: OpenInterestTier) -> np.ndarray:
+    """Return the start of the bucket of the given tier every timestamp falls into.
+
+    Args:
+        timestamps (np.ndarray): The timestamps as `datetime64[ms]`.
+        tier (OpenInterestTier): The tier of the buckets.
+
+    Returns:
+        np.ndarray: The bucket starts as `datetime64[ms]`.
+    """
+    tier = OpenInterestTier(tier)
+    if tier == OpenInterestTier.DAILY:
+        return timestamps.astype('datetime64[D]').astype('datetime64[ms]')
+    hours = timestamps.astype('datetime64[h]').astype(np.int64)
+    if tier == OpenInterestTier.EIGHT_HOURS:
+        hours = hours - hours % 8
+    return hours.astype('datetime64[h]').astype('datetime64[ms]')
+
+
+def aggregate_ohlc(ohlc: OHLC, tier: OpenInterestTier) -> OHLC:
+    """Aggregate sorted OHLC buckets into the coarser buckets of the given tier.
+
+    Args:
+        ohlc (OHLC): The buckets in ascending order.
+        tier (OpenInterestTier): The tier of the target buckets.
+
+    Returns:
+        OHLC: The aggregated buckets.
+    """
+    if len(ohlc.timestamps) == 0:
+        return ohlc
+
+    buckets = tier_bucket_start(ohlc.timestamps, tier)
+    first = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    last = np.r_[first[1:] - 1, len(buckets) - 1]
+
+    return OHLC(
+        timestamps=buckets[first],
+        open=ohlc.open[first],
+        high=np.maximum.reduceat(ohlc.high, first),
+        low=np.minimum.reduceat(ohlc.low, first),
+        close=ohlc.close[last],
+        count=np.add.reduceat(ohlc.count, first)
+    )
+
+
+def _read_source(session, symbol: str, tier: OpenInterestTier, cutoff: datetime) -> OHLC:
+    """Read the buckets of one tier older than `cutoff` as OHLC buckets."""
+    if tier == OpenInterestTier.HOURLY:
+        rows = session.execute(
+            select(OpenInterest.open_interest_timestamp, OpenInterest.open_interest)
+                .where(OpenInterest.symbol == symbol)
+                .where(OpenInterest.open_interest_timestamp < cutoff)
+                .order_by(OpenInterest.open_interest_timestamp)
+        ).all()
+        values = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+        return OHLC(
+            np.array([row[0] for row in rows], dtype='datetime64[ms]'),
+            values,
+            values,
+            values,
+            values,
+            np.ones(len(rows), dtype=np.int64)
+        )
+
+    rows = session.execute(
+        select(
+            OpenInterestCompacted.bucket_start,
+            OpenInterestCompacted.open,
+            OpenInterestCompacted.high,
+            OpenInterestCompacted.low,
+            OpenInterestCompacted.close,
+            OpenInterestCompacted.count
+        )
+            .where(OpenInterestCompacted.symbol == symbol)
+            .where(OpenInterestCompacted.tier == tier.value)
+            .where(OpenInterestCompacted.bucket_start < cutoff)
+            .order_by(OpenInterestCompacted.bucket_start)
+    ).all()
+    columns = list(zip(*rows)) if rows else [[]] * 6
+    return OHLC(
+        np.array(columns[0], dtype='datetime64[ms]'),
+        *(np.array(column, dtype=np.float64) for column in columns[1:5]),
+        np.array(columns[5], dtype=np.int64)
+    )
+
+
+def compact_open_interest_entries(
+    symbol: str,
+    source_tier: OpenInterestTier,
+    target_tier: OpenInterestTier,
+    cutoff: TimestampLike,
+    session_factory=None
+) -> int:
+    """Compact all buckets of the source tier older than `cutoff` into the target tier.
+
+    The cutoff is floored to a target bucket boundary, so only complete buckets are compacted.
+    A bucket that already exists in the target tier was compacted from all of its sources, so
+    source buckets falling into it are hours ingested again and are dropped without being
+    aggregated a second time.
+
+    Args:
+        symbol (str): The symbol whose open interest should be compacted.
+        source_tier (OpenInterestTier): The tier the buckets are taken from.
+        target_tier (OpenInterestTier): The coarser tier the buckets are compacted into.
+        cutoff (TimestampLike): Buckets starting before this time are compacted.
+        session_factory (optional): The session factory to be used. Defaults to the global Session.
+
+    Returns:
+        int: The number of source buckets that were compacted.
+    """
+    source_tier = OpenInterestTier(source_tier)
+    target_tier = OpenInterestTier(target_tier)
+    session_factory = session_factory if session_factory is not None else Session
+    cutoff = tier_bucket_start(np.array([to_naive_utc(cutoff)], dtype='datetime64[ms]'), target_tier)[0].astype(datetime)
+
+    with session_factory() as session:
+        try:
+            source = _read_source(session, symbol, source_tier, cutoff)
+            if len(source.timestamps) == 0:
+                return 0
+
+            existing = session.execute(
+                select(OpenInterestCompacted.bucket_start)
+                    .where(OpenInterestCompacted.symbol == symbol)
+                    .where(OpenInterestCompacted.tier == target_tier.value)
+                    .where(OpenInterestCompacted.bucket_start >= source.timestamps[0].astype(datetime))
+                    .where(OpenInterestCompacted.bucket_start < cutoff)
+            ).scalars().all()
+            covered = np.isin(tier_bucket_start(source.timestamps, target_tier), np.array(existing, dtype='datetime64[ms]'))
+
+            target = aggregate_ohlc(OHLC(*(column[~covered] for column in source)), target_tier)
+            rows = [
+                {
+                    'symbol': symbol,
+                    'tier': target_tier.value,
+                    'bucket_start': ts,
+                    'open': float(o),
+                    'high': float(h),
+                    'low': float(l),
+                    'close': float(c),
+                    'count': int(n)
+                }
+                for ts, o, h, l, c, n in zip(target.timestamps.astype(datetime), *target[1:])
+            ]
+            if rows:
+                session.execute(sqlite_insert(OpenInterestCompacted), rows)
+
+            if source_tier == OpenInterestTier.HOURLY:
+                session.execute(
+                    delete(OpenInterest)
+                        .where(OpenInterest.symbol == symbol)
+                        .where(OpenInterest.open_interest_timestamp < cutoff)
+                )
+            else:
+                session.execute(
+                    delete(OpenInterestCompacted)
+                        .where(OpenInterestCompacted.symbol == symbol)
+                        .where(OpenInterestCompacted.tier == source_tier.value)
+                        .where(OpenInterestCompacted.bucket_start < cutoff)
+                )
+            bump_series_version(session, SeriesTable.OPEN_INTEREST, symbol)
+            session.commit()
+            logger.info(
+                "Compacted %d %s open interest buckets of %s into %d %s buckets, dropped %d already compacted",
+                len(source.timestamps), source_tier.value, symbol, len(target.timestamps), target_tier.value,
+                int(covered.sum())
+            )
+            return len(source.timestamps)
+        except SQLAlchemyError as e:
+            logger.error("Database error occurred while compacting Open Interest data: %s", e)
+            session.rollback()
+            raise
+
+
+def read_compacted_open_interest_entries(
+    symbol: str,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    num_values: Optional[int] = None,
+    session_factory=None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Read the compacted open interest of all tiers as one series of opening values.
+
+    Args:
+        symbol (str): The symbol for which the open interest should be read.
+        start (TimestampLike, optional): Inclusive lower bound of the bucket starts. Defaults to None.
+        end (TimestampLike, optional): Exclusive upper bound of the bucket starts. Defaults to None.
+        num_values (int, optional): Only return the most recent `num_values` buckets. Defaults to None.
+        session_factory (optional): The session factory to be used. Defaults to the global Session.
+
+    Returns:
+        tuple: A tuple containing the bucket starts and opening values in ascending order.
+    """
+    session_factory = session_factory if session_factory is not None else Session
+
+    query = select(OpenInterestCompacted.bucket_start, OpenInterestCompacted.open).where(OpenInterestCompacted.symbol == symbol)
+    if start is not None:
+        query = query.where(OpenInterestCompacted.bucket_start >= to_naive_utc(start))
+    if end is not None:
+        query = query.where(OpenInterestCompacted.bucket_start < to_naive_utc(end))
+    if num_values is not None:
+        query = query.order_by(OpenInterestCompacted.bucket_start.desc()).limit(num_values)
+    else:
+        query = query.order_by(OpenInterestCompacted.bucket_start)
+
+    try:
+        with session_factory() as session:
+            rows = session.execute(query).all()
+    except SQLAlchemyError as e:
+        logger.error("Database error occurred while reading compacted Open Interest data: %s", e)
+        raise
+
+    if num_values is not None:
+        rows = rows[::-1]
+    timestamps = np.array([row[0] for row in rows], dtype='datetime64[ms]')
+    values = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+    return timestamps, values
+
+
+def read_most_recent_compacted_open_interest(symbol: str, session_factory=None) -> Optional[datetime]:
+    """Read the start of the most recent compacted open interest bucket.
+
+    Args:
+        symbol (str): The symbol for which the timestamp should be read.
+        session_factory (optional): The session factory to be used. Defaults to the global Session.
+
+    Returns:
+        datetime: The most recent bucket start or None if nothing was compacted yet.
+    """
+    session_factory = session_factory if session_factory is not None else Session
+    with session_factory() as session:
+        return session.execute(
+            select(func.max(OpenInterestCompacted.bucket_start)).where(OpenInterestCompacted.symbol == symbol)
+        ).scalar()
+
+
+def read_most_recent_compacted_open_interest_all(session_factory=None) -> Dict[str, datetime]:
+    """Read the start of the most recent compacted open interest bucket of every symbol with a single query.
+
+    Args:
+        session_factory (optional): The session factory to be used. Defaults to the global Session.
+
+    Returns:
+        dict: A dictionary mapping every compacted symbol to its most recent bucket start.
+    """
+    session_factory = session_factory if session_factory is not None else Session
+    query = (
+        select(OpenInterestCompacted.symbol, func.max(OpenInterestCompacted.bucket_start))
+            .group_by(OpenInterestCompacted.symbol)
+    )
+    with session_factory() as session:
+        return dict(session.execute(query).all())
@@ -0,0 +1,282 @@
+""" This module contains CRUD functions for the instrument and margin coin registry.
+
+The registry tables map every symbol and coin to the integer id the series tables are keyed by.
+Reads go through the in-process caches `INSTRUMENT_REGISTRY` and `COIN_REGISTRY`, which are
+seeded from the `Symbol` and `Coin` enums and refreshed from the database by `load_registry`.
+"""
+from datetime import datetime
+import logging
+from typing import List, Optional
+
+from sqlalchemy import MetaData, Table, case, func, inspect, insert, select, text, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+
+from backend.config import Session
+from backend.data_access.crud.crud_cache import migrate_series_versions
+from backend.models.models_orm import (
+    COIN_REGISTRY,
+    INSTRUMENT_REGISTRY,
+    FundingRate,
+    Instrument,
+    InterestRate,
+    KeyRegistry,
+    MarginCoin,
+    OpenInterest,
+    OpenInterestCompacted,
+    RegistryEntry,
+    SeriesCumulative,
+    SweepResult
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# The series tables keyed by a registry id and the name of their key column
+KEYED_TABLES = (
+    (FundingRate.__table__, 'symbol', INSTRUMENT_REGISTRY),
+    (OpenInterest.__table__, 'symbol', INSTRUMENT_REGISTRY),
+    (OpenInterestCompacted.__table__, 'symbol', INSTRUMENT_REGISTRY),
+    (InterestRate.__table__, 'coin', COIN_REGISTRY)
+)
+
+
+def _instrument_entry(row: Instrument) -> RegistryEntry:
+    return RegistryEntry(row.id, row.symbol, row.funding_interval_hours, row.listing_date, row.active)
+
+
+def _coin_entry(row: MarginCoin) -> RegistryEntry:
+    return RegistryEntry(row.id, row.coin, None, row.listing_date, row.active)
+
+
+def seed_registry(session_factory=None) -> None:
+    """Insert the enum members the registry caches are seeded with, keeping existing entries.
+
+    Args:
+        session_factory (optional): The session factory to be used. Defaults to the global Session.
+    """
+    session_factory = session_factory if session_factory is not None else Session
+
+    instruments = [
+        {'id': entry.id, 'symbol': entry.key, 'funding_interval_hours': entry.funding_interval_hours, 'active': True}
+        for entry in INSTRUMENT_REGISTRY.entries() if entry.id <= len(INSTRUMENT_REGISTRY.seed)
+    ]
+    coins = [
+        {'id': entry.id, 'coin': entry.key, 'active': True}
+        for entry in COIN_REGISTRY.entries() if entry.id <= len(COIN_REGISTRY.seed)
+    ]
+
+    with session_factory() as session:
+        try:
+            session.execute(sqlite_insert(Instrument).on_conflict_do_nothing(), instruments)
+            session.execute(sqlite_insert(MarginCoin).on_conflict_do_nothing(), coins)
+            session.commit()
+        except SQLAlchemyError as e:
+            logger.error("Database error occurred while seeding the registry: %s", e)
+            session.rollback()
+            raise
+
+
+def load_registry(session_factory=None) -> int:
+    """Refresh the in-process registry caches from the database.
+
+    Args:
+        session_factory (optional): The session factory to be used. Defaults to the global Session.
+
+    Returns:
+        int: The number of loaded instruments and coins.
+    """
+    session_factory = session_factory if session_factory is not None else Session
+    try:
+        with session_factory() as session:
+            instruments = [_instrument_entry(row) for row in session.scalars(select(Instrument))]
+            coins = [_coin_entry(row) for row in session.scalars(select(MarginCoin))]
+    except SQLAlchemyError as e:
+        logger.error("Database error occurred while loading the registry: %s", e)
+        raise
+
+    for entry in instruments:
+        INSTRUMENT_REGISTRY.update(entry)
+    for entry in coins:
+        COIN_REGISTRY.update(entry)
+    logger.info("Registry loaded with %d instruments and %d coins", len(instruments), len(coins))
+    return len(instruments) + len(coins)
+
+
+def create_instrument(
+    symbol: str,
+    funding_interval_hours: int = 8,
+    listing_date: Optional[datetime] = None,
+    active: bool = True,
+    session_factory=None
+) -> RegistryEntry:
+    """Register a new instrument or update the metadata of an existing one.
+
+    Args:
+        symbol (str): The exchange symbol of the instrument.
+        funding_interval_hours (int, optional): Hours between two funding payments. Defaults to 8.
+        listing_date (datetime, optional): The date the instrument was listed. Defaults to None.
+        active (bool, optional): Whether the instrument is still traded. Defaults to True.
+        session_factory (optional): The session factory to be used. Defaults to the global Session.
+
+    Returns:
+        RegistryEntry: The registered instrument.
+    """
+    values = {'funding_interval_hours': funding_interval_hours, 'listing_date': listing_date, 'active': active}
+    statement = sqlite_insert(Instrument).values(symbol=symbol, **values)
+    statement = statement.on_conflict_do_update(index_elements=['symbol'], set_=values)
+    query = select(Instrument).where(Instrument.symbol == symbol)
+    return _write_entry(statement, query, _instrument_entry, INSTRUMENT_REGISTRY, session_factory)
+
+
+def create_coin(
+    coin: str,
+    listing_date: Optional[datetime] = None,
+    active: bool = True,
+    session_factory=None
+) -> RegistryEntry:
+    """Register a new margin coin or update the metadata of an existing one.
+
+    Args:
+        coin (str): The name of the coin.
+        listing_date (datetime, optional): The date the coin was listed. Defaults to None.
+        active (bool, optional): Whether the coin is still lent out. Defaults to True.
+        session_factory (optional): The session factory to be used. Defaults to the global Session.
+
+    Returns:
+        RegistryEntry: The registered coin.
+    """
+    values = {'listing_date': listing_date, 'active': active}
+    statement = sqlite_insert(MarginCoin).values(coin=coin, **values)
+    statement = statement.on_conflict_do_update(index_elements=['coin'], set_=values)
+    query = select(MarginCoin).where(MarginCoin.coin == coin)
+    return _write_entry(statement, query, _coin_entry, COIN_REGISTRY, session_factory)
+
+
+def set_instrument_active(symbol: str, active: bool, session_factory=None) -> RegistryEntry:
+    """Mark an instrument as listed or delisted, delisted instruments are skipped by the sync.
+
+    Args:
+        symbol (str): The exchange symbol of the instrument.
+        active (bool): Whether the instrument is still traded.
+        session_factory (optional): The session factory to be used. Defaults to the global Session.
+
+    Returns:
+        RegistryEntry: The updated instrument.
+    """
+    statement = update(Instrument).where(Instrument.symbol == symbol).values(active=active)
+    query = select(Instrument).where(Instrument.symbol == symbol)
+    return _write_entry(statement, query, _instrument_entry, INSTRUMENT_REGISTRY, session_factory)
+
+
+def _write_entry(statement, query, to_entry, registry: KeyRegistry, session_factory) -> RegistryEntry:
+    """Execute a write on a registry table and update the cache with the written row."""
+    session_factory = session_factory if session_factory is not None else Session
+    with session_factory() as session:
+        try:
+            session.execute(statement)
+            session.commit()
+            row = session.scalars(query).one()
+            entry = to_entry(row)
+        except SQLAlchemyError as e:
+            logger.error("Database error occurred while writing the %s registry: %s", registry.name, e)
+            session.rollback()
+            raise
+
+    registry.update(entry)
+    logger.info("Registry entry written: %s", entry)
+    return entry
+
+
+def get_instruments(active_only: bool = False) -> List[RegistryEntry]:
+    """Read the registered instruments from the in-process cache.
+
+    Args:
+        active_only (bool, optional): Leave out delisted instruments. Defaults to False.
+
+    Returns:
+        list: The instruments ordered by id.
+    """
+    return INSTRUMENT_REGISTRY.entries(active_only)
+
+
+def get_coins(active_only: bool = False) -> List[RegistryEntry]:
+    """Read the registered margin coins from the in-process cache.
+
+    Args:
+        active_only (bool, optional): Leave out inactive coins. Defaults to False.
+
+    Returns:
+        list: The coins ordered by id.
+    """
+    return COIN_REGISTRY.entries(active_only)
+
+
+def migrate_registry(bind) -> int:
+    """Create and seed the registry and rekey series tables still keyed by enum names.
+
+    Tables created before the registry store the enum name of every symbol or coin. SQLite
+    cannot change the type of a column, so these tables are rebuilt with integer keys and their
+    rows copied over. Finally the registry caches are loaded from the database.
+
+    Args:
+        bind: The engine of the database.
+
+    Returns:
+        int: The number of rebuilt tables.
+    """
+    Instrument.__table__.create(bind, checkfirst=True)
+    MarginCoin.__table__.create(bind, checkfirst=True)
+    # Databases written before the read cache have no series versions yet
+    migrate_series_versions(bind)
+    # Databases written before the persisted cumulative curves have no curve table yet
+    SeriesCumulative.__table__.create(bind, checkfirst=True)
+    # Databases written before the backtest sweeps have no result table yet
+    SweepResult.__table__.create(bind, checkfirst=True)
+    session_factory = sessionmaker(bind=bind)
+    seed_registry(session_factory)
+    load_registry(session_factory)
+
+    inspector = inspect(bind)
+    existing = set(inspector.get_table_names())
+    rebuilt = 0
+    for table, key_name, registry in KEYED_TABLES:
+        if table.name not in existing:
+            continue
+        key_column = next(column for column in inspector.get_columns(table.name) if column['name'] == key_name)
+        if str(key_column['type']).upper() == 'INTEGER':
+            continue
+
+        # Legacy rows may hold the enum name or the exchange symbol of a key
+        mapping = {entry.key: entry.id for entry in registry.entries()}
+        mapping.update({member.name: registry.id_of(member.value) for member in registry.seed})
+        legacy_name = f'{table.name}_legacy'
+
+        try:
+            with bind.begin() as connection:
+                connection.execute(text(f'ALTER TABLE {table.name} RENAME TO {legacy_name}'))
+                table.create(connection)
+                legacy = Table(legacy_name, MetaData(), autoload_with=connection)
+                key_id = case(mapping, value=legacy.c[key_name])
+                others = [column.name for column in table.columns if column.name != key_name]
+                connection.execute(
+                    insert(table).from_select(
+                        [key_name, *others],
+                        select(key_id, *(legacy.c[name] for name in others)).where(key_id.is_not(None))
+                    )
+                )
+                copied = connection.execute(select(func.count()).select_from(table)).scalar()
+                total = connection.execute(select(func.count()).select_from(legacy)).scalar()
+                connection.execute(text(f'DROP TABLE {legacy_name}'))
+        except SQLAlchemyError as e:
+            logger.error("Database error occurred while migrating %s to registry keys: %s", table.name, e)
+            raise
+
+        if copied < total:
+            logger.warning("%d rows of %s with unknown keys were dropped", total - copied, table.name)
+        logger.info("Table %s migrated to registry keys, %d rows copied", table.name, copied)
+        rebuilt += 1
+    return rebuilt
@@ -0,0 +1,253 @@
+""" This module contains the CRUD functions for the daily, weekly and monthly rollups of the rate series. """
+from datetime import datetime
+import logging
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session as OrmSession
+
+from backend.config import ReadSession, Session
+from backend.data_access.crud.crud_series import fetch_raw, read_latest_timestamps, rows_to_arrays, select_series
+from backend.data_access.storage.rollups import (
+    ROLLUP_TABLES,
+    Resolution,
+    Rollups,
+    bucket_end,
+    bucket_start,
+    compute_rollups
+)
+from backend.data_access.storage.time_series_store import SeriesTable, TimestampLike, to_datetime64, to_naive_utc
+from backend.models.models_orm import SeriesRollup
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _read_raw(session: OrmSession, table: SeriesTable, key: str, start: Optional[datetime], end: Optional[datetime]):
+    """Read the raw entries of a series within [start, end) in ascending order."""
+    return rows_to_arrays(fetch_raw(session, select_series(table, key, start, end)))
+
+
+def _write_rollups(session: OrmSession, table: SeriesTable, key: str, resolution: Resolution, rollups: Rollups) -> None:
+    """Upsert rollup buckets of one series and resolution."""
+    if len(rollups.timestamps) == 0:
+        return
+
+    rows = [
+        {
+            'series_table': table.value,
+            'series_key': key,
+            'resolution': resolution.value,
+            'bucket_start': ts,
+            'value_sum': float(total),
+            'value_compound': float(compound),
+            'value_min': float(minimum),
+            'value_max': float(maximum),
+            'value_count': int(count),
+            'value_last': float(last)
+        }
+        for ts, total, compound, minimum, maximum, count, last in zip(
+            rollups.timestamps.astype(datetime), *rollups[1:]
+        )
+    ]
+    statement = sqlite_insert(SeriesRollup)
+    statement = statement.on_conflict_do_update(
+        index_elements=['series_table', 'series_key', 'resolution', 'bucket_start'],
+        set_={name: statement.excluded[name] for name in rows[0] if name.startswith('value_')}
+    )
+    session.execute(statement, rows)
+
+
+def update_rollups(session: OrmSession, table: SeriesTable, key: str, timestamps: np.ndarray) -> int:
+    """Recompute the rollup buckets touched by newly written entries.
+
+    The raw entries of the touched buckets are read once, so the cost only depends on the size
+    of the touched buckets and not on the length of the series. The caller commits the session.
+
+    Args:
+        session (OrmSession): The session the new entries were written with.
+        table (SeriesTable): The table the series belongs to.
+        key (str): The symbol or coin of the series.
+        timestamps (np.ndarray): The timestamps of the newly written entries.
+
+    Returns:
+        int: The number of rollup buckets written.
+    """
+    table = SeriesTable(table)
+    timestamps = to_datetime64(timestamps)
+    if table not in ROLLUP_TABLES or len(timestamps) == 0:
+        return 0
+
+    touched = {resolution: np.unique(bucket_start(timestamps, resolution)) for resolution in Resolution}
+    window_start = min(starts[0] for starts in touched.values())
+    window_end = max(bucket_end(starts[-1:], resolution)[0] for resolution, starts in touched.items())
+    raw_timestamps, raw_values = _read_raw(session, table, key, window_start.astype(datetime), window_end.astype(datetime))
+
+    written = 0
+    for resolution, starts in touched.items():
+        rollups = compute_rollups(raw_timestamps, raw_values, resolution)
+        rollups = Rollups(*(column[np.isin(rollups.timestamps, starts)] for column in rollups))
+        _write_rollups(session, table, key, resolution, rollups)
+        written += len(rollups.timestamps)
+    return written
+
+
+def rebuild_rollups(table: SeriesTable, key: str, session_factory=None) -> int:
+    """Rebuild all rollup buckets of one series from its raw entries.
+
+    Args:
+        table (SeriesTable): The table the series belongs to.
+        key (str): The symbol or coin of the series.
+        session_factory (optional): The session factory to be used. Defaults to the global Session.
+
+    Returns:
+        int: The number of rollup buckets written.
+    """
+    table = SeriesTable(table)
+    session_factory = session_factory if session_factory is not None else Session
+
+    with session_factory() as session:
+        try:
+            session.execute(
+                delete(SeriesRollup)
+                    .where(SeriesRollup.series_table == table.value)
+                    .where(SeriesRollup.series_key == key)
+            )
+            raw_timestamps, raw_values = _read_raw(session, table, key, None, None)
+            written = 0
+            for resolution in Resolution:
+                rollups = compute_rollups(raw_timestamps, raw_values, resolution)
+                _write_rollups(session, table, key, resolution, rollups)
+                written += len(rollups.timestamps)
+            session.commit()
+            logger.info("Rebuilt %d rollup buckets for %s %s", written, table.value, key)
+            return written
+        except SQLAlchemyError as e:
+            logger.error("Database error occurred while rebuilding rollups: %s", e)
+            session.rollback()
+            raise
+
+
+def backfill_rollups(session_factory=None) -> int:
+    """Roll up the rate series written before the rollups were maintained.
+
+    Runs at startup, so reads never write. Series with any rollup bucket are left untouched,
+    their buckets are kept up to date by every write.
+
+    Args:
+        session_factory (optional): The session factory to be used. Defaults to the global Session.
+
+    Returns:
+        int: The number of rollup buckets written.
+    """
+    session_factory = session_factory if session_factory is not None else Session
+    written = 0
+    for table in ROLLUP_TABLES:
+        with session_factory() as session:
+            rolled_up = set(session.execute(
+                select(SeriesRollup.series_key)
+                    .where(SeriesRollup.series_table == table.value)
+                    .distinct()
+            ).scalars())
+        for key in read_latest_timestamps(table, session_factory):
+            if key not in rolled_up:
+                written += rebuild_rollups(table, key, session_factory)
+    return written
+
+
+def read_rollup_entries(
+    table: SeriesTable,
+    key: str,
+    resolution: Resolution,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    num_values: Optional[int] = None,
+    session_factory=None
+) -> Rollups:
+    """Read the rollup buckets of one series whose start lies within [start, end).
+
+    Args:
+        table (SeriesTable): The table the series belongs to.
+        key (str): The symbol or coin of the series.
+        resolution (Resolution): The resolution of the buckets.
+        start (TimestampLike, optional): Inclusive lower bound of the bucket starts. Defaults to None.
+        end (TimestampLike, optional): Exclusive upper bound of the bucket starts. Defaults to None.
+        num_values (int, optional): Only return the most recent `num_values` buckets. Defaults to None.
+        session_factory (optional): The session factory to be used. Defaults to the read-only ReadSession.
+
+    Returns:
+        Rollups: The rollup buckets in ascending order.
+
+    Raises:
+        ValueError: If the table is not rolled up.
+    """
+    table = SeriesTable(table)
+    if table not in ROLLUP_TABLES:
+        raise ValueError(f"No rollups are maintained for table {table.value}")
+    session_factory = session_factory if session_factory is not None else ReadSession
+
+    query = (
+        select(
+            SeriesRollup.bucket_start,
+            SeriesRollup.value_sum,
+            SeriesRollup.value_compound,
+            SeriesRollup.value_min,
+            SeriesRollup.value_max,
+            SeriesRollup.value_count,
+            SeriesRollup.value_last
+        )
+            .where(SeriesRollup.series_table == table.value)
+            .where(SeriesRollup.series_key == key)
+            .where(SeriesRollup.resolution == Resolution(resolution).value)
+    )
+    if start is not None:
+        query = query.where(SeriesRollup.bucket_start >= to_naive_utc(start))
+    if end is not None:
+        query = query.where(SeriesRollup.bucket_start < to_naive_utc(end))
+    if num_values is not None:
+        query = query.order_by(SeriesRollup.bucket_start.desc()).limit(num_values)
+    else:
+        query = query.order_by(SeriesRollup.bucket_start)
+
+    try:
+        with session_factory() as session:
+            rows = session.execute(query).all()
+            logger.info("Rollup records fetched successfully for %s %s", table.value, key)
+    except SQLAlchemyError as e:
+        logger.error("Database error occurred while reading rollup data: %s", e)
+        raise
+
+    if num_values is not None:
+        rows = rows[::-1]
+    columns = list(zip(*rows)) if rows else [[]] * 7
+    return Rollups(
+        np.array(columns[0], dtype='datetime64[ms]'),
+        *(np.array(column, dtype=np.float64) for column in columns[1:5]),
+        np.array(columns[5], dtype=np.int64),
+        np.array(columns[6], dtype=np.float64)
+    )
+
+
+def count_rollup_entries(table: SeriesTable, key: str, session_factory=None) -> int:
+    """Count the rollup buckets stored for one series.
+
+    Args:
+        table (SeriesTable): The table the series belongs to.
+        key (str): The symbol or coin of the series.
+        session_factory (optional): The session factory to be used. Defaults to the read-only ReadSession.
+
+    Returns:
+        int: The number of stored rollup buckets over all resolutions.
+    """
+    session_factory = session_factory if session_factory is not None else ReadSession
+    with session_factory() as session:
+        return session.execute(
+            select(func.count())
+                .select_from(SeriesRollup)
+                .where(SeriesRollup.series_table == SeriesTable(table).value)
+                .where(SeriesRollup.series_key == key)
+        ).scalar()
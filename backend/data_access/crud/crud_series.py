@@ -0,0 +1,295 @@
+""" This module contains the fast read path for the funding rate, open interest and interest rate series.
+
+Only the timestamp and value columns are selected and the rows are fetched from the DBAPI cursor
+as they come from SQLite, skipping the ORM hydration and SQLAlchemy's conversion of every
+timestamp into a `datetime`. The stored timestamp strings are parsed by numpy in one pass.
+"""
+from datetime import datetime
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import Select, String, func, select, type_coerce
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session as OrmSession
+
+from backend.config import ReadSession
+from backend.data_access.storage.series_columns import SERIES_COLUMNS
+from backend.data_access.storage.time_series_store import SeriesTable, TimestampLike, to_datetime64, to_naive_utc
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# Spacing of the settlement grid of every table
+GRID_INTERVALS = {
+    SeriesTable.FUNDING: np.timedelta64(8, 'h'),
+    SeriesTable.OPEN_INTEREST: np.timedelta64(1, 'h'),
+    SeriesTable.INTEREST: np.timedelta64(1, 'h')
+}
+
+
+class SeriesMatrix(NamedTuple):
+    """Several series aligned on a common time grid."""
+    timestamps: np.ndarray
+    keys: List[str]
+    values: np.ndarray
+
+
+def rows_to_arrays(rows: List[tuple]) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert raw (timestamp, value) rows to a `datetime64[ms]` and a `float64` array.
+
+    Args:
+        rows (List[tuple]): The rows with the timestamps as stored by SQLite.
+
+    Returns:
+        tuple: The timestamps and values.
+    """
+    # Filling preallocated arrays skips the tuples and object arrays of an unzip
+    return (
+        np.fromiter((row[0] for row in rows), dtype='datetime64[ms]', count=len(rows)),
+        np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+    )
+
+
+def select_series(
+    table: SeriesTable,
+    key: Optional[str] = None,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    num_values: Optional[int] = None
+) -> Select:
+    """Build the query selecting the raw timestamps and values of one series within [start, end).
+
+    The query is answered from the (key, timestamp) primary key index. With `num_values` the
+    most recent entries are selected in descending order.
+
+    Args:
+        table (SeriesTable): The table the series belongs to.
+        key (str, optional): The symbol or coin of the series. Defaults to None for all series.
+        start (TimestampLike, optional): Inclusive lower bound. Defaults to None.
+        end (TimestampLike, optional): Exclusive upper bound. Defaults to None.
+        num_values (int, optional): Only select the most recent `num_values` entries. Defaults to None.
+
+    Returns:
+        Select: The query.
+    """
+    columns = SERIES_COLUMNS[SeriesTable(table)]
+    query = select(type_coerce(columns.timestamp, String), columns.value)
+    if key is not None:
+        query = query.where(columns.key == key)
+    if start is not None:
+        query = query.where(columns.timestamp >= to_naive_utc(start))
+    if end is not None:
+        query = query.where(columns.timestamp < to_naive_utc(end))
+    if num_values is not None:
+        return query.order_by(columns.timestamp.desc()).limit(num_values)
+    return query.order_by(columns.timestamp)
+
+
+def fetch_raw(session: OrmSession, query: Select) -> List[tuple]:
+    """Execute a query and fetch the rows directly from the DBAPI cursor."""
+    result = session.execute(query)
+    try:
+        return result.cursor.fetchall()
+    finally:
+        result.close()
+
+
+def read_series_arrays(
+    table: SeriesTable,
+    key: str,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    num_values: Optional[int] = None,
+    session_factory=None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Read one series within [start, end) into typed arrays.
+
+    Args:
+        table (SeriesTable): The table the series belongs to.
+        key (str): The symbol or coin of the series.
+        start (TimestampLike, optional): Inclusive lower bound. Defaults to None.
+        end (TimestampLike, optional): Exclusive upper bound. Defaults to None.
+        num_values (int, optional): Only return the most recent `num_values` entries. Defaults to None.
+        session_factory (optional): The session factory to be used. Defaults to the read-only ReadSession.
+
+    Returns:
+        tuple: The timestamps as `datetime64[ms]` and the values as `float64` in ascending order.
+    """
+    session_factory = session_factory if session_factory is not None else ReadSession
+    try:
+        with session_factory() as session:
+            rows = fetch_raw(session, select_series(table, key, start, end, num_values))
+    except SQLAlchemyError as e:
+        logger.error("Database error occurred while reading %s records: %s", SeriesTable(table).value, e)
+        raise
+
+    if num_values is not None:
+        rows.reverse()
+    return rows_to_arrays(rows)
+
+
+def read_latest_timestamps(table: SeriesTable, session_factory=None) -> Dict[str, datetime]:
+    """Read the timestamp of the most recent entry of every series of one table with a single query.
+
+    Args:
+        table (SeriesTable): The table the series belong to.
+        session_factory (optional): The session factory to be used. Defaults to the read-only ReadSession.
+
+    Returns:
+        dict: A dictionary mapping the key of every non-empty series to its most recent timestamp.
+    """
+    session_factory = session_factory if session_factory is not None else ReadSession
+    columns = SERIES_COLUMNS[SeriesTable(table)]
+    query = select(columns.key, func.max(columns.timestamp)).group_by(columns.key)
+    try:
+        with session_factory() as session:
+            return dict(session.execute(query).all())
+    except SQLAlchemyError as e:
+        logger.error("Database error occurred while reading the most recent %s timestamps: %s", SeriesTable(table).value, e)
+        raise
+
+
+def _read_many_raw(
+    table: SeriesTable,
+    keys: List[str],
+    start: Optional[TimestampLike],
+    end: Optional[TimestampLike],
+    session_factory
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Read several series with one query as flat timestamp, value and key id arrays ordered by key and time."""
+    session_factory = session_factory if session_factory is not None else ReadSession
+    columns = SERIES_COLUMNS[SeriesTable(table)]
+    query = (
+        select_series(table, None, start, end)
+            .add_columns(type_coerce(columns.key, columns.key.type.impl))
+            .where(columns.key.in_(keys))
+            .order_by(None)
+            .order_by(columns.key, columns.timestamp)
+    )
+    try:
+        with session_factory() as session:
+            rows = fetch_raw(session, query)
+    except SQLAlchemyError as e:
+        logger.error("Database error occurred while reading %s records: %s", SeriesTable(table).value, e)
+        raise
+
+    if not rows:
+        return np.array([], dtype='datetime64[ms]'), np.array([], dtype=np.float64), np.array([], dtype=np.int64)
+    timestamps, values, key_ids = zip(*rows)
+    return (
+        np.array(timestamps, dtype='datetime64[ms]'),
+        np.array(values, dtype=np.float64),
+        np.array(key_ids, dtype=np.int64)
+    )
+
+
+def read_series_arrays_many(
+    table: SeriesTable,
+    keys: Iterable[str],
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    session_factory=None
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Read several series of one table within [start, end) with a single query.
+
+    Args:
+        table (SeriesTable): The table the series belong to.
+        keys (Iterable[str]): The symbols or coins of the series.
+        start (TimestampLike, optional): Inclusive lower bound. Defaults to None.
+        end (TimestampLike, optional): Exclusive upper bound. Defaults to None.
+        session_factory (optional): The session factory to be used. Defaults to the read-only ReadSession.
+
+    Returns:
+        dict: A dictionary mapping every key to its timestamps and values in ascending order.
+    """
+    keys = list(keys)
+    registry = SERIES_COLUMNS[SeriesTable(table)].key.type.registry
+    timestamps, values, key_ids = _read_many_raw(table, keys, start, end, session_factory)
+
+    series = {key: rows_to_arrays([]) for key in keys}
+    # Rows are ordered by key, so every series is one contiguous slice
+    bounds = np.flatnonzero(np.r_[True, key_ids[1:] != key_ids[:-1], True]) if len(key_ids) else []
+    for first, last in zip(bounds[:-1], bounds[1:]):
+        series[registry.key_of(int(key_ids[first]))] = (timestamps[first:last], values[first:last])
+    return series
+
+
+def read_series_matrix(
+    table: SeriesTable,
+    keys: Iterable[str],
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    interval: Optional[np.timedelta64] = None,
+    session_factory=None
+) -> SeriesMatrix:
+    """Read several series with one query and align them on a common settlement grid.
+
+    The grid starts at `start` floored to the interval and runs up to `end`. Every entry is
+    scattered into the grid slot it falls into, slots without an entry are NaN.
+
+    Args:
+        table (SeriesTable): The table the series belong to.
+        keys (Iterable[str]): The symbols or coins of the series, one column each.
+        start (TimestampLike, optional): Inclusive lower bound. Defaults to the first entry.
+        end (TimestampLike, optional): Exclusive upper bound. Defaults to after the last entry.
+        interval (np.timedelta64, optional): The spacing of the grid. Defaults to the settlement interval of the table.
+        session_factory (optional): The session factory to be used. Defaults to the read-only ReadSession.
+
+    Returns:
+        SeriesMatrix: The grid timestamps, the keys and the (time x series) value matrix.
+    """
+    keys = list(keys)
+    interval = GRID_INTERVALS[SeriesTable(table)] if interval is None else interval
+    registry = SERIES_COLUMNS[SeriesTable(table)].key.type.registry
+    timestamps, values, key_ids = _read_many_raw(table, keys, start, end, session_factory)
+
+    grid = settlement_grid(timestamps, start, end, interval)
+    matrix = np.full((len(grid), len(keys)), np.nan)
+    if len(grid) == 0 or len(timestamps) == 0:
+        return SeriesMatrix(grid, keys, matrix)
+
+    ids = np.array([registry.id_of(key) for key in keys], dtype=np.int64)
+    order = np.argsort(ids)
+    columns = order[np.searchsorted(ids, key_ids, sorter=order)]
+    rows = ((timestamps - grid[0]) // interval).astype(np.int64)
+
+    # Entries are ordered by time within every series, so the last entry of a slot wins
+    inside = (rows >= 0) & (rows < len(grid))
+    matrix[rows[inside], columns[inside]] = values[inside]
+    return SeriesMatrix(grid, keys, matrix)
+
+
+def settlement_grid(
+    timestamps: np.ndarray,
+    start: Optional[TimestampLike],
+    end: Optional[TimestampLike],
+    interval: np.timedelta64
+) -> np.ndarray:
+    """Build the grid of settlement times covering [start, end) aligned to midnight UTC.
+
+    Args:
+        timestamps (np.ndarray): The timestamps used for missing bounds.
+        start (TimestampLike, optional): Inclusive lower bound, floored to the interval.
+        end (TimestampLike, optional): Exclusive upper bound.
+        interval (np.timedelta64): The spacing of the grid.
+
+    Returns:
+        np.ndarray: The grid timestamps as `datetime64[ms]`.
+    """
+    step = np.timedelta64(interval, 'ms').astype(np.int64)
+    if start is not None:
+        first = to_datetime64([start])[0]
+    elif len(timestamps):
+        first = timestamps.min()
+    else:
+        return np.array([], dtype='datetime64[ms]')
+    if end is not None:
+        last = to_datetime64([end])[0]
+    else:
+        last = timestamps.max() + np.timedelta64(1, 'ms') if len(timestamps) else first
+
+    first_ms = first.astype(np.int64) // step * step
+    return np.arange(first_ms, last.astype(np.int64), step).astype('datetime64[ms]')
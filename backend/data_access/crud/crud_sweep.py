@@ -0,0 +1,115 @@
+""" This module contains the CRUD functions for the results of the backtest sweeps. """
+import logging
+from typing import Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.config import ReadSession, Session
+from backend.models.models_orm import SweepResult
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SweepRow(NamedTuple):
+    """The backtest result of one instrument, stable coin and parameter set of a sweep.
+
+    Attributes:
+        symbol (str): The symbol of the perpetual.
+        stablecoin (str): The stable coin borrowed for the leveraged leg.
+        leverage (float): The target leverage.
+        rebalance_every (int): The settlements between two rebalances, 0 to never rebalance.
+        total_return (float): The return over the whole backtest.
+        apr (float): The compound annual return.
+        max_drawdown (float): The largest relative loss from a running peak.
+        settlements (int): The number of simulated settlements.
+    """
+    symbol: str
+    stablecoin: str
+    leverage: float
+    rebalance_every: int
+    total_return: float
+    apr: float
+    max_drawdown: float
+    settlements: int
+
+
+def write_sweep_results(sweep_id: str, rows: Iterable[SweepRow], session_factory=None) -> int:
+    """Insert or replace results of a sweep.
+
+    Args:
+        sweep_id (str): The id of the sweep.
+        rows (Iterable[SweepRow]): The results to be written.
+        session_factory (optional): The session factory to be used. Defaults to the global Session.
+
+    Returns:
+        int: The number of written results.
+    """
+    values = [{'sweep_id': sweep_id, **row._asdict()} for row in rows]
+    if not values:
+        return 0
+
+    session_factory = session_factory if session_factory is not None else Session
+    statement = sqlite_insert(SweepResult)
+    statement = statement.on_conflict_do_update(
+        index_elements=['sweep_id', 'symbol', 'stablecoin', 'leverage', 'rebalance_every'],
+        set_={name: statement.excluded[name] for name in ('total_return', 'apr', 'max_drawdown', 'settlements')}
+    )
+    with session_factory() as session:
+        try:
+            session.execute(statement, values)
+            session.commit()
+            return len(values)
+        except SQLAlchemyError as e:
+            logger.error("Database error occurred while writing the results of sweep %s: %s", sweep_id, e)
+            session.rollback()
+            raise
+
+
+def read_latest_sweep_id(session_factory=None) -> Optional[str]:
+    """Read the id of the most recent sweep, the ids sort by their start time.
+
+    Args:
+        session_factory (optional): The session factory to be used. Defaults to the read-only ReadSession.
+
+    Returns:
+        str: The id of the most recent sweep or None if no sweep was run.
+    """
+    session_factory = session_factory if session_factory is not None else ReadSession
+    try:
+        with session_factory() as session:
+            return session.execute(select(func.max(SweepResult.sweep_id))).scalar()
+    except SQLAlchemyError as e:
+        logger.error("Database error occurred while reading the latest sweep: %s", e)
+        raise
+
+
+def read_sweep_results(sweep_id: Optional[str] = None, session_factory=None) -> List[SweepRow]:
+    """Read the results of a sweep.
+
+    Args:
+        sweep_id (str, optional): The id of the sweep. Defaults to the most recent sweep.
+        session_factory (optional): The session factory to be used. Defaults to the read-only ReadSession.
+
+    Returns:
+        List[SweepRow]: The results ordered by symbol, stable coin, leverage and rebalancing.
+    """
+    sweep_id = sweep_id if sweep_id is not None else read_latest_sweep_id(session_factory)
+    if sweep_id is None:
+        return []
+
+    session_factory = session_factory if session_factory is not None else ReadSession
+    query = (
+        select(*(getattr(SweepResult, name) for name in SweepRow._fields))
+            .where(SweepResult.sweep_id == sweep_id)
+            .order_by(SweepResult.symbol, SweepResult.stablecoin, SweepResult.leverage, SweepResult.rebalance_every)
+    )
+    try:
+        with session_factory() as session:
+            return [SweepRow(*row) for row in session.execute(query)]
+    except SQLAlchemyError as e:
+        logger.error("Database error occurred while reading the results of sweep %s: %s", sweep_id, e)
+        raise
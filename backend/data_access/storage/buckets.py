@@ -0,0 +1,153 @@
+""" This module contains the bucketing of a series for downsampled reads.
+
+A series is reduced to one value per 8 hour, daily, weekly (starting on Monday) or monthly bucket.
+Every bucket is identified by an integer index, the epoch seconds divided by the bucket width or
+the month count since year zero, which SQL backends compute with integer arithmetic as well.
+"""
+from enum import Enum
+from typing import Tuple
+
+import numpy as np
+
+from backend.data_access.storage.time_series_store import TimestampLike, to_datetime64
+
+
+class BucketResolution(str, Enum):
+    """Enum for the widths of the buckets, from the finest to the coarsest."""
+    EIGHT_HOURS = '8h'
+    DAY = '1d'
+    WEEK = '1w'
+    MONTH = '1M'
+
+
+class Aggregation(str, Enum):
+    """Enum for the reductions of the entries within one bucket.
+
+    MEAN averages single spikes away, it suits summary statistics but not charts of the rates.
+    Charts read MIN and MAX, which keep the extremes of every bucket.
+    """
+    SUM = 'sum'
+    COMPOUND = 'compound'
+    LAST = 'last'
+    MEAN = 'mean'
+    MIN = 'min'
+    MAX = 'max'
+
+
+# Number of points a chart spanning the full page width can show
+DEFAULT_POINT_BUDGET = 1000
+
+# 1970-01-01 was a Thursday, the first Monday after the epoch starts 4 days later
+EPOCH_MONDAY_SECONDS = 4 * 86400
+
+# Width in seconds of the buckets with a fixed width
+BUCKET_SECONDS = {
+    BucketResolution.EIGHT_HOURS: 8 * 3600,
+    BucketResolution.DAY: 86400,
+    BucketResolution.WEEK: 7 * 86400
+}
+
+# Approximate width used to pick a resolution for a point budget
+_APPROXIMATE_SECONDS = {**BUCKET_SECONDS, BucketResolution.MONTH: 30 * 86400}
+
+
+def bucket_index(timestamps: np.ndarray, resolution: BucketResolution) -> np.ndarray:
+    """Return the integer index of the bucket every timestamp falls into.
+
+    Args:
+        timestamps (np.ndarray): The timestamps as `datetime64[ms]`.
+        resolution (BucketResolution): The resolution of the buckets.
+
+    Returns:
+        np.ndarray: The bucket indices.
+    """
+    resolution = BucketResolution(resolution)
+    if resolution == BucketResolution.MONTH:
+        return timestamps.astype('datetime64[M]').astype(np.int64) + 1970 * 12
+    seconds = timestamps.astype('datetime64[s]').astype(np.int64)
+    if resolution == BucketResolution.WEEK:
+        seconds = seconds - EPOCH_MONDAY_SECONDS
+    return seconds // BUCKET_SECONDS[resolution]
+
+
+def bucket_index_to_start(indices: np.ndarray, resolution: BucketResolution) -> np.ndarray:
+    """Convert bucket indices computed in SQL to the start of every bucket.
+
+    Args:
+        indices (np.ndarray): The integer bucket indices.
+        resolution (BucketResolution): The resolution of the buckets.
+
+    Returns:
+        np.ndarray: The bucket starts as `datetime64[ms]`.
+    """
+    resolution = BucketResolution(resolution)
+    indices = np.asarray(indices, dtype=np.int64)
+    if resolution == BucketResolution.MONTH:
+        return (indices - 1970 * 12).astype('datetime64[M]').astype('datetime64[ms]')
+    seconds = indices * BUCKET_SECONDS[resolution]
+    if resolution == BucketResolution.WEEK:
+        seconds = seconds + EPOCH_MONDAY_SECONDS
+    return seconds.astype('datetime64[s]').astype('datetime64[ms]')
+
+
+def resolution_for_budget(
+    start: TimestampLike,
+    end: TimestampLike,
+    max_points: int = DEFAULT_POINT_BUDGET
+) -> BucketResolution:
+    """Pick the finest resolution that keeps [start, end) within a point budget.
+
+    Args:
+        start (TimestampLike): The start of the displayed range.
+        end (TimestampLike): The end of the displayed range.
+        max_points (int, optional): The maximum number of buckets. Defaults to `DEFAULT_POINT_BUDGET`.
+
+    Returns:
+        BucketResolution: The resolution, monthly buckets if no resolution fits the budget.
+    """
+    span = (to_datetime64([end])[0] - to_datetime64([start])[0]) / np.timedelta64(1, 's')
+    for resolution in BucketResolution:
+        if span / _APPROXIMATE_SECONDS[resolution] <= max_points:
+            return resolution
+    return BucketResolution.MONTH
+
+
+def reduce_buckets(
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    resolution: BucketResolution,
+    aggregation: Aggregation
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce a sorted series to one value per bucket.
+
+    Args:
+        timestamps (np.ndarray): The timestamps in ascending order as `datetime64[ms]`.
+        values (np.ndarray): The values of the series.
+        resolution (BucketResolution): The resolution of the buckets.
+        aggregation (Aggregation): The reduction of the entries within a bucket.
+
+    Returns:
+        tuple: The bucket starts as `datetime64[ms]` and the reduced values.
+    """
+    if len(timestamps) == 0:
+        return np.array([], dtype='datetime64[ms]'), np.array([], dtype=np.float64)
+
+    values = np.asarray(values, dtype=np.float64)
+    indices = bucket_index(timestamps, resolution)
+    first = np.flatnonzero(np.r_[True, indices[1:] != indices[:-1]])
+    last = np.r_[first[1:] - 1, len(values) - 1]
+
+    aggregation = Aggregation(aggregation)
+    if aggregation == Aggregation.SUM:
+        reduced = np.add.reduceat(values, first)
+    elif aggregation == Aggregation.COMPOUND:
+        reduced = np.multiply.reduceat(1 + values, first)
+    elif aggregation == Aggregation.LAST:
+        reduced = values[last]
+    elif aggregation == Aggregation.MIN:
+        reduced = np.minimum.reduceat(values, first)
+    elif aggregation == Aggregation.MAX:
+        reduced = np.maximum.reduceat(values, first)
+    else:
+        reduced = np.add.reduceat(values, first) / (last - first + 1)
+    return bucket_index_to_start(indices[first], resolution), reduced
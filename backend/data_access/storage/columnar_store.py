@@ -0,0 +1,87 @@
+""" This module contains the columnar on-disk implementation of the time series store.
+
+Every series is stored as two column files, `timestamps.npy` and `values.npy`, in its own
+directory below the store root. Reads memory map the columns, so range reads only touch the
+pages they need.
+"""
+import os
+from pathlib import Path
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from backend.data_access.storage.memory_store import MemoryStore, merge_series
+from backend.data_access.storage.time_series_store import SeriesTable, to_datetime64
+
+
+class ColumnarStore(MemoryStore):
+    """Time series store keeping every series as memory mapped numpy column files.
+
+    Attributes:
+        root (Path): The directory holding the column files.
+    """
+
+    TIMESTAMPS_FILE = 'timestamps.npy'
+    VALUES_FILE = 'values.npy'
+
+    def __init__(self, root: Union[str, Path]) -> None:
+        super().__init__()
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _series_dir(self, table: SeriesTable, key: str) -> Path:
+        """Return the directory holding the column files of one series."""
+        return self.root / SeriesTable(table).value / key
+
+    def _get(self, table: SeriesTable, key: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the memory mapped columns of one series."""
+        cache_key = (SeriesTable(table), key)
+        if cache_key not in self._series:
+            directory = self._series_dir(table, key)
+            if not (directory / self.TIMESTAMPS_FILE).exists():
+                return super()._get(table, key)
+            self._series[cache_key] = (
+                np.load(directory / self.TIMESTAMPS_FILE, mmap_mode='r'),
+                np.load(directory / self.VALUES_FILE, mmap_mode='r')
+            )
+        return self._series[cache_key]
+
+    def _keys(self, table: SeriesTable) -> List[str]:
+        """Return the keys of all series of one table stored on disk."""
+        directory = self.root / SeriesTable(table).value
+        if not directory.exists():
+            return []
+        return sorted(path.name for path in directory.iterdir() if (path / self.TIMESTAMPS_FILE).exists())
+
+    def create_entries(
+        self,
+        table: SeriesTable,
+        key: str,
+        timestamps: np.ndarray,
+        values: np.ndarray
+    ) -> int:
+        """Merge a batch of entries into the column files of one series.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+            timestamps (np.ndarray): The timestamps of the entries.
+            values (np.ndarray): The values of the entries.
+
+        Returns:
+            int: The number of entries written.
+        """
+        new_timestamps = to_datetime64(timestamps)
+        new_values = np.asarray(values, dtype=np.float64)
+        directory = self._series_dir(table, key)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            merged_timestamps, merged_values = merge_series(*self._get(table, key), new_timestamps, new_values)
+            self._series.pop((SeriesTable(table), key), None)
+            for name, column in ((self.TIMESTAMPS_FILE, merged_timestamps), (self.VALUES_FILE, merged_values)):
+                temporary = directory / (name + '.tmp')
+                with open(temporary, 'wb') as file:
+                    np.save(file, column)
+                os.replace(temporary, directory / name)
+        return len(new_timestamps)
@@ -0,0 +1,144 @@
+""" This module contains the cumulative linear and compound returns of a rate series.
+
+The linear curve is the running sum of the rates and the compound curve the running product of
+(1 + rate). The product is accumulated as a sum of `log1p(rate)` and exponentiated at the end,
+so long histories of small rates neither lose precision nor overflow. Both curves only depend
+on their last value and the new rates, so a curve is extended by appended entries without
+touching its history, and a curve starting later is the full curve rebased to its start.
+"""
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+
+# Series table name of the persisted curves of the funding of a symbol net of the interest of a stable coin
+SPREAD_TABLE = 'funding_spread'
+
+
+class Cumulative(NamedTuple):
+    """The cumulative returns of a rate series in ascending order.
+
+    Attributes:
+        timestamps (np.ndarray): The timestamps of the entries as `datetime64[ms]`.
+        linear (np.ndarray): The running sum of the rates.
+        compound (np.ndarray): The running product of (1 + rate).
+    """
+    timestamps: np.ndarray
+    linear: np.ndarray
+    compound: np.ndarray
+
+
+def spread_key(symbol: str, stablecoin: str) -> str:
+    """Return the series key of the spread curve of a symbol and a stable coin."""
+    return f'{symbol}/{stablecoin}'
+
+
+def split_spread_key(key: str) -> Tuple[str, str]:
+    """Return the symbol and the stable coin of a spread curve key."""
+    symbol, stablecoin = key.split('/', 1)
+    return symbol, stablecoin
+
+
+def empty_cumulative() -> Cumulative:
+    """Return the cumulative returns of an empty series."""
+    return Cumulative(np.array([], dtype='datetime64[ms]'), np.array([]), np.array([]))
+
+
+def compute_cumulative(timestamps: np.ndarray, values: np.ndarray) -> Cumulative:
+    """Compute the cumulative returns of a sorted rate series.
+
+    Args:
+        timestamps (np.ndarray): The timestamps in ascending order as `datetime64[ms]`.
+        values (np.ndarray): The rates of the series.
+
+    Returns:
+        Cumulative: The cumulative returns.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    return Cumulative(
+        np.array(timestamps, dtype='datetime64[ms]'),
+        np.cumsum(values),
+        np.exp(np.cumsum(np.log1p(values)))
+    )
+
+
+def extend_cumulative(cumulative: Cumulative, timestamps: np.ndarray, values: np.ndarray) -> Cumulative:
+    """Extend cumulative returns by entries appended after their last timestamp.
+
+    Args:
+        cumulative (Cumulative): The cumulative returns to be extended.
+        timestamps (np.ndarray): The timestamps of the appended entries in ascending order.
+        values (np.ndarray): The appended rates.
+
+    Returns:
+        Cumulative: The extended cumulative returns, the cost only depends on the appended entries.
+    """
+    if len(cumulative.timestamps) == 0:
+        return compute_cumulative(timestamps, values)
+
+    tail = compute_cumulative(timestamps, values)
+    return Cumulative(
+        np.concatenate([cumulative.timestamps, tail.timestamps]),
+        np.concatenate([cumulative.linear, cumulative.linear[-1] + tail.linear]),
+        np.concatenate([cumulative.compound, cumulative.compound[-1] * tail.compound])
+    )
+
+
+def continue_cumulative(cumulative: Cumulative, tail: Cumulative) -> Cumulative:
+    """Append the points of a curve that starts at the last point of another curve.
+
+    The tail may have any base, it is rebased so its first point equals the last point of
+    `cumulative` and only the points after it are appended.
+
+    Args:
+        cumulative (Cumulative): The cumulative returns to be continued.
+        tail (Cumulative): The curve from the last timestamp of `cumulative` on.
+
+    Returns:
+        Cumulative: The continued cumulative returns.
+    """
+    if len(cumulative.timestamps) == 0:
+        return tail
+    if len(tail.timestamps) < 2:
+        return cumulative
+    return Cumulative(
+        np.concatenate([cumulative.timestamps, tail.timestamps[1:]]),
+        np.concatenate([cumulative.linear, cumulative.linear[-1] + tail.linear[1:] - tail.linear[0]]),
+        np.concatenate([cumulative.compound, cumulative.compound[-1] * tail.compound[1:] / tail.compound[0]])
+    )
+
+
+def rebase_cumulative(cumulative: Cumulative, start: np.datetime64) -> Cumulative:
+    """Return the cumulative returns of the entries from `start` on.
+
+    Args:
+        cumulative (Cumulative): The cumulative returns of the full series.
+        start (np.datetime64): The first entry accumulated.
+
+    Returns:
+        Cumulative: The rebased cumulative returns.
+    """
+    first = int(np.searchsorted(cumulative.timestamps, start, side='left'))
+    if first == 0:
+        return cumulative
+    return Cumulative(
+        cumulative.timestamps[first:],
+        cumulative.linear[first:] - cumulative.linear[first - 1],
+        cumulative.compound[first:] / cumulative.compound[first - 1]
+    )
+
+
+def cumulative_before(cumulative: Cumulative, timestamps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sample the cumulative returns of all entries strictly before every timestamp.
+
+    Args:
+        cumulative (Cumulative): The cumulative returns.
+        timestamps (np.ndarray): The sample timestamps as `datetime64[ms]`.
+
+    Returns:
+        tuple: The linear and compound returns, 0 and 1 before the first entry.
+    """
+    index = np.searchsorted(cumulative.timestamps, timestamps, side='left') - 1
+    linear = np.r_[0.0, cumulative.linear][index + 1]
+    compound = np.r_[1.0, cumulative.compound][index + 1]
+    return linear, compound
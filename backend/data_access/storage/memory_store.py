@@ -0,0 +1,299 @@
+""" This module contains the in-memory implementation of the time series store.
+
+Every series is kept as a pair of sorted numpy arrays, which makes the store a fast drop-in
+replacement for tests and benchmarks.
+"""
+from contextlib import nullcontext
+from datetime import datetime
+from threading import Lock
+from typing import ContextManager, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from backend.data_access.storage.buckets import Aggregation, BucketResolution, reduce_buckets
+from backend.data_access.storage.cumulative import Cumulative, compute_cumulative
+from backend.data_access.storage.resample import funding_interval, spread_rates
+from backend.data_access.storage.rollups import (
+    ROLLUP_TABLES,
+    Resolution,
+    Rollups,
+    bucket_start,
+    rollups_between
+)
+from backend.data_access.storage.time_series_store import SeriesTable, TimestampLike, to_datetime64
+
+
+def merge_series(
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    new_timestamps: np.ndarray,
+    new_values: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge new entries into a sorted series, new values overwrite existing ones.
+
+    Args:
+        timestamps (np.ndarray): The sorted timestamps of the series.
+        values (np.ndarray): The values of the series.
+        new_timestamps (np.ndarray): The timestamps of the new entries in any order.
+        new_values (np.ndarray): The values of the new entries.
+
+    Returns:
+        tuple: The merged timestamps and values in ascending order without duplicates.
+    """
+    merged_timestamps = np.concatenate([timestamps, new_timestamps])
+    merged_values = np.concatenate([values, new_values])
+
+    order = np.argsort(merged_timestamps, kind='stable')
+    merged_timestamps = merged_timestamps[order]
+    merged_values = merged_values[order]
+
+    # The stable sort keeps new entries behind existing ones, so keeping the last duplicate wins
+    keep = np.append(merged_timestamps[1:] != merged_timestamps[:-1], True)
+    return merged_timestamps[keep], merged_values[keep]
+
+
+def slice_series(
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    num_values: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Slice a sorted series to [start, end) and its most recent `num_values` entries.
+
+    Args:
+        timestamps (np.ndarray): The sorted timestamps of the series.
+        values (np.ndarray): The values of the series.
+        start (TimestampLike, optional): Inclusive lower bound. Defaults to None.
+        end (TimestampLike, optional): Exclusive upper bound. Defaults to None.
+        num_values (int, optional): Only return the most recent `num_values` entries. Defaults to None.
+
+    Returns:
+        tuple: Copies of the selected timestamps and values.
+    """
+    first = 0 if start is None else np.searchsorted(timestamps, to_datetime64([start])[0], side='left')
+    last = len(timestamps) if end is None else np.searchsorted(timestamps, to_datetime64([end])[0], side='left')
+    if num_values is not None:
+        first = max(first, last - num_values)
+    return np.array(timestamps[first:last]), np.array(values[first:last])
+
+
+class MemoryStore:
+    """Time series store keeping every series in numpy arrays in memory."""
+
+    def __init__(self) -> None:
+        self._series: Dict[Tuple[SeriesTable, str], Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = Lock()
+
+    def _get(self, table: SeriesTable, key: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the stored arrays of one series."""
+        empty = (np.array([], dtype='datetime64[ms]'), np.array([], dtype=np.float64))
+        return self._series.get((SeriesTable(table), key), empty)
+
+    def _keys(self, table: SeriesTable) -> List[str]:
+        """Return the keys of all stored series of one table."""
+        return [key for series_table, key in list(self._series) if series_table == SeriesTable(table)]
+
+    def create_entries(
+        self,
+        table: SeriesTable,
+        key: str,
+        timestamps: np.ndarray,
+        values: np.ndarray
+    ) -> int:
+        """Insert or overwrite a batch of entries of one series.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+            timestamps (np.ndarray): The timestamps of the entries.
+            values (np.ndarray): The values of the entries.
+
+        Returns:
+            int: The number of entries written.
+        """
+        new_timestamps = to_datetime64(timestamps)
+        new_values = np.asarray(values, dtype=np.float64)
+        with self._lock:
+            self._series[(SeriesTable(table), key)] = merge_series(*self._get(table, key), new_timestamps, new_values)
+        return len(new_timestamps)
+
+    def defer_cumulative(self, table: SeriesTable, key: str) -> ContextManager[None]:
+        """Return an empty context, the cumulative returns are computed on every read."""
+        return nullcontext()
+
+    def read_entries(
+        self,
+        table: SeriesTable,
+        key: str,
+        start: Optional[TimestampLike] = None,
+        end: Optional[TimestampLike] = None,
+        num_values: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Read the entries of one series within [start, end).
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+            start (TimestampLike, optional): Inclusive lower bound. Defaults to None.
+            end (TimestampLike, optional): Exclusive upper bound. Defaults to None.
+            num_values (int, optional): Only return the most recent `num_values` entries. Defaults to None.
+
+        Returns:
+            tuple: A tuple containing the timestamps and values in ascending order.
+        """
+        return slice_series(*self._get(table, key), start, end, num_values)
+
+    def read_most_recent_update(self, table: SeriesTable, key: str) -> Optional[datetime]:
+        """Read the timestamp of the most recent entry of one series.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+
+        Returns:
+            datetime: The most recent timestamp or None if the series is empty.
+        """
+        timestamps, _ = self._get(table, key)
+        return timestamps[-1].astype(datetime) if len(timestamps) else None
+
+    def read_most_recent_updates(self, table: SeriesTable) -> Dict[str, datetime]:
+        """Read the timestamp of the most recent entry of every series of one table.
+
+        Args:
+            table (SeriesTable): The table the series belong to.
+
+        Returns:
+            dict: A dictionary mapping the key of every non-empty series to its most recent timestamp.
+        """
+        latest = {}
+        for key in self._keys(table):
+            timestamps, _ = self._get(table, key)
+            if len(timestamps):
+                latest[key] = timestamps[-1].astype(datetime)
+        return latest
+
+    def read_entries_many(
+        self,
+        table: SeriesTable,
+        keys: Iterable[str],
+        start: Optional[TimestampLike] = None,
+        end: Optional[TimestampLike] = None
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Read the entries of several series of one table within [start, end).
+
+        Args:
+            table (SeriesTable): The table the series belong to.
+            keys (Iterable[str]): The symbols or coins of the series.
+            start (TimestampLike, optional): Inclusive lower bound. Defaults to None.
+            end (TimestampLike, optional): Exclusive upper bound. Defaults to None.
+
+        Returns:
+            dict: A dictionary mapping every key to its timestamps and values.
+        """
+        return {key: self.read_entries(table, key, start, end) for key in keys}
+
+    def read_rollups(
+        self,
+        table: SeriesTable,
+        key: str,
+        resolution: Resolution,
+        start: Optional[TimestampLike] = None,
+        end: Optional[TimestampLike] = None,
+        num_values: Optional[int] = None
+    ) -> Rollups:
+        """Compute the rollup buckets of one rate series from its stored arrays.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+            resolution (Resolution): The resolution of the buckets.
+            start (TimestampLike, optional): Inclusive lower bound of the bucket starts. Defaults to None.
+            end (TimestampLike, optional): Exclusive upper bound of the bucket starts. Defaults to None.
+            num_values (int, optional): Only return the most recent `num_values` buckets. Defaults to None.
+
+        Returns:
+            Rollups: The rollup buckets in ascending order.
+
+        Raises:
+            ValueError: If the table is not rolled up.
+        """
+        if SeriesTable(table) not in ROLLUP_TABLES:
+            raise ValueError(f"No rollups are maintained for table {SeriesTable(table).value}")
+
+        first_bucket = None if start is None else bucket_start(to_datetime64([start]), resolution)[0]
+        return rollups_between(*slice_series(*self._get(table, key), first_bucket), resolution, start, end, num_values)
+
+    def read_buckets(
+        self,
+        table: SeriesTable,
+        key: str,
+        resolution: BucketResolution,
+        aggregation: Aggregation,
+        start: Optional[TimestampLike] = None,
+        end: Optional[TimestampLike] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Read one series within [start, end) reduced to one value per bucket.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+            resolution (BucketResolution): The width of the buckets.
+            aggregation (Aggregation): The reduction of the entries within a bucket.
+            start (TimestampLike, optional): Inclusive lower bound of the entries. Defaults to None.
+            end (TimestampLike, optional): Exclusive upper bound of the entries. Defaults to None.
+
+        Returns:
+            tuple: The bucket starts and the reduced values in ascending order.
+        """
+        return reduce_buckets(*self.read_entries(table, key, start, end), resolution, aggregation)
+
+    def read_cumulative(
+        self,
+        table: SeriesTable,
+        key: str,
+        start: Optional[TimestampLike] = None
+    ) -> Cumulative:
+        """Read the cumulative linear and compound returns of one rate series from `start` on.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+            start (TimestampLike, optional): The first entry accumulated. Defaults to None.
+
+        Returns:
+            Cumulative: The cumulative returns in ascending order.
+
+        Raises:
+            ValueError: If the table does not hold rates.
+        """
+        if SeriesTable(table) not in ROLLUP_TABLES:
+            raise ValueError(f"No cumulative returns are computed for table {SeriesTable(table).value}")
+        return compute_cumulative(*self.read_entries(table, key, start))
+
+    def read_spread_cumulative(
+        self,
+        symbol: str,
+        stablecoin: str,
+        start: Optional[TimestampLike] = None
+    ) -> Cumulative:
+        """Read the cumulative returns of the funding of a symbol net of the interest of a stable coin.
+
+        Settlements after the most recent interest entry are left out, their window may still be filled.
+
+        Args:
+            symbol (str): The symbol of the funding series.
+            stablecoin (str): The stable coin of the interest series.
+            start (TimestampLike, optional): The first settlement accumulated. Defaults to None.
+
+        Returns:
+            Cumulative: The cumulative returns at the settlements in ascending order.
+        """
+        interval = funding_interval(symbol)
+        settlements, funding = self.read_entries(SeriesTable.FUNDING, symbol, start)
+        interest_timestamps, interest = self.read_entries(
+            SeriesTable.INTEREST,
+            stablecoin,
+            settlements[0] - interval if len(settlements) else None
+        )
+        return compute_cumulative(*spread_rates(settlements, funding, interest_timestamps, interest, interval))
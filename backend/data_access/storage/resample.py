@@ -0,0 +1,167 @@
+""" This module contains the resampling of hourly rates onto the settlement windows of a funding series.
+
+Every funding settlement collects the hourly entries of the window since the previous
+settlement. Windows are cut by timestamp, so a missing hour only leaves its own window short and
+a gap in the funding never shifts the windows after it. After a gap the window is capped to the
+funding interval, the entries in between belong to no settlement. Instruments settling every 1,
+2 or 4 hours work the same way as those settling every 8 hours.
+"""
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from backend.models.models_orm import INSTRUMENT_REGISTRY
+
+
+HOUR = np.timedelta64(1, 'h')
+
+
+class SettlementWindows(NamedTuple):
+    """The hourly entries summed per funding settlement window.
+
+    Attributes:
+        starts (np.ndarray): The inclusive window starts as `datetime64[ms]`.
+        ends (np.ndarray): The exclusive window ends, the settlement timestamps.
+        sums (np.ndarray): The sum of the hourly values within every window, 0 for empty windows.
+        counts (np.ndarray): The number of hourly entries within every window.
+    """
+    starts: np.ndarray
+    ends: np.ndarray
+    sums: np.ndarray
+    counts: np.ndarray
+
+    @property
+    def expected(self) -> np.ndarray:
+        """Return the number of hours every window spans."""
+        return ((self.ends - self.starts) // HOUR).astype(np.int64)
+
+    @property
+    def complete(self) -> np.ndarray:
+        """Return whether every hour of a window has an entry."""
+        return self.counts >= self.expected
+
+
+def settlement_window_starts(settlements: np.ndarray, interval: np.timedelta64) -> np.ndarray:
+    """Return the start of the window of every settlement.
+
+    A window starts at the previous settlement, but at most one interval before its own.
+
+    Args:
+        settlements (np.ndarray): The settlement timestamps in ascending order as `datetime64[ms]`.
+        interval (np.timedelta64): The funding interval of the instrument.
+
+    Returns:
+        np.ndarray: The window starts as `datetime64[ms]`.
+    """
+    settlements = np.asarray(settlements, dtype='datetime64[ms]')
+    if len(settlements) == 0:
+        return settlements
+    earliest = settlements - interval
+    return np.maximum(np.r_[earliest[:1], settlements[:-1]], earliest)
+
+
+def resample_to_settlements(
+    settlements: np.ndarray,
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    interval: Optional[np.timedelta64] = None
+) -> SettlementWindows:
+    """Sum hourly entries into the window [start, settlement) of every funding settlement.
+
+    Args:
+        settlements (np.ndarray): The settlement timestamps in ascending order as `datetime64[ms]`.
+        timestamps (np.ndarray): The hourly timestamps in ascending order as `datetime64[ms]`.
+        values (np.ndarray): The hourly values.
+        interval (np.timedelta64, optional): The funding interval of the instrument. Defaults to the
+            median spacing of the settlements, or 8 hours for a single settlement.
+
+    Returns:
+        SettlementWindows: The windows with their sums and entry counts.
+    """
+    settlements = np.asarray(settlements, dtype='datetime64[ms]')
+    timestamps = np.asarray(timestamps, dtype='datetime64[ms]')
+    values = np.asarray(values, dtype=np.float64)
+    if interval is None:
+        interval = np.median(np.diff(settlements)) if len(settlements) > 1 else np.timedelta64(8, 'h')
+    interval = np.timedelta64(interval, 'ms')
+
+    starts = settlement_window_starts(settlements, interval)
+    first = np.searchsorted(timestamps, starts, side='left')
+    last = np.searchsorted(timestamps, settlements, side='left')
+    counts = last - first
+    if len(settlements) == 0 or len(timestamps) == 0:
+        return SettlementWindows(starts, settlements, np.zeros(len(settlements)), counts)
+
+    # Windows are disjoint and ascending, so the interleaved bounds are non-decreasing. The
+    # appended zero makes an index one past the last entry valid.
+    bounds = np.empty(2 * len(settlements), dtype=np.int64)
+    bounds[0::2] = first
+    bounds[1::2] = last
+    sums = np.add.reduceat(np.r_[values, 0.0], bounds)[0::2]
+    # reduceat returns the entry at the index for empty segments
+    sums[counts == 0] = 0.0
+    return SettlementWindows(starts, settlements, sums, counts)
+
+
+def funding_interval(symbol: str) -> np.timedelta64:
+    """Return the funding interval of a registered instrument, 8 hours if it is not known."""
+    try:
+        hours = INSTRUMENT_REGISTRY.entry_of(symbol).funding_interval_hours
+    except ValueError:
+        hours = None
+    return np.timedelta64(hours or 8, 'h')
+
+
+def align_interest(
+    settlements: np.ndarray,
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    interval: Optional[np.timedelta64] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the interest accrued over the window of every settlement with interest entries.
+
+    Windows missing some hours are scaled by the mean of the hours present.
+
+    Args:
+        settlements (np.ndarray): The settlement timestamps in ascending order as `datetime64[ms]`.
+        timestamps (np.ndarray): The hourly timestamps in ascending order as `datetime64[ms]`.
+        values (np.ndarray): The hourly rates.
+        interval (np.timedelta64, optional): The funding interval of the instrument. Defaults to the
+            median spacing of the settlements.
+
+    Returns:
+        tuple: The mask of the settlements with at least one entry in their window and their interest.
+    """
+    windows = resample_to_settlements(settlements, timestamps, values, interval)
+    covered = windows.counts > 0
+    return covered, windows.sums[covered] / windows.counts[covered] * windows.expected[covered]
+
+
+def spread_rates(
+    settlements: np.ndarray,
+    funding: np.ndarray,
+    timestamps: np.ndarray,
+    interest: np.ndarray,
+    interval: Optional[np.timedelta64] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the funding of every settlement net of the interest accrued over its window.
+
+    Settlements without interest entries in their window are left out, so are settlements after
+    the most recent interest entry, their window may still be filled.
+
+    Args:
+        settlements (np.ndarray): The settlement timestamps in ascending order as `datetime64[ms]`.
+        funding (np.ndarray): The funding rates of the settlements.
+        timestamps (np.ndarray): The hourly interest timestamps in ascending order as `datetime64[ms]`.
+        interest (np.ndarray): The hourly interest rates.
+        interval (np.timedelta64, optional): The funding interval of the instrument. Defaults to the
+            median spacing of the settlements.
+
+    Returns:
+        tuple: The timestamps of the settled settlements and their net rates.
+    """
+    if len(timestamps) == 0:
+        return settlements[:0], np.asarray(funding, dtype=np.float64)[:0]
+    covered, aligned = align_interest(settlements, timestamps, interest, interval)
+    settled = (settlements <= timestamps[-1])[covered]
+    return settlements[covered][settled], (funding[covered] - aligned)[settled]
@@ -0,0 +1,127 @@
+""" This module contains the rolling statistics of a rate series over several windows at once.
+
+Every window sum is the difference of two running sums, so the mean and the standard deviation
+of all windows cost O(n) together, whatever their lengths. The running sums are taken over the
+values shifted by the first value of the series, which keeps the variance from cancelling when
+the rates are far from zero compared to their spread. `RollingAccumulator` only keeps the values
+of its longest window, so appended values extend the statistics without touching the history.
+"""
+from typing import Dict, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+
+# Lengths in days of the rolling windows shown on the charts
+ROLLING_WINDOW_DAYS = (7, 30, 90)
+
+YEAR = np.timedelta64(365, 'D')
+
+
+class RollingStats(NamedTuple):
+    """The statistics of the trailing window of every value, NaN until the window is full.
+
+    Attributes:
+        mean (np.ndarray): The mean of the window.
+        std (np.ndarray): The population standard deviation of the window.
+        apr (np.ndarray): The mean annualized without compounding.
+        sharpe (np.ndarray): The annualized ratio of the mean to the standard deviation.
+        zscore (np.ndarray): The distance of the value to the mean in standard deviations.
+    """
+    mean: np.ndarray
+    std: np.ndarray
+    apr: np.ndarray
+    sharpe: np.ndarray
+    zscore: np.ndarray
+
+
+def periods_per_year(interval: np.timedelta64) -> float:
+    """Return the number of periods of a series with entries every `interval` in a year."""
+    return YEAR / interval
+
+
+def rolling_windows(interval: np.timedelta64, days: Sequence[int] = ROLLING_WINDOW_DAYS) -> Dict[int, int]:
+    """Return the number of periods of every window length in days.
+
+    Args:
+        interval (np.timedelta64): The interval between the entries of the series.
+        days (Sequence[int], optional): The window lengths in days. Defaults to `ROLLING_WINDOW_DAYS`.
+
+    Returns:
+        Dict[int, int]: The number of periods by window length in days, at least one period each.
+    """
+    return {day: max(int(np.timedelta64(day, 'D') // interval), 1) for day in days}
+
+
+class RollingAccumulator:
+    """Rolling statistics of a series over several windows, extended by appended values.
+
+    Attributes:
+        windows (tuple): The window lengths in periods.
+        periods_per_year (float): The number of periods in a year used to annualize.
+    """
+
+    def __init__(self, windows: Sequence[int], periods_per_year: float) -> None:
+        if not windows or min(windows) < 1:
+            raise ValueError("Rolling windows need at least one period")
+        self.windows = tuple(windows)
+        self.periods_per_year = periods_per_year
+        self._shift: Optional[float] = None
+        self._tail = np.array([], dtype=np.float64)
+
+    def update(self, values: np.ndarray) -> Dict[int, RollingStats]:
+        """Append values to the series and return the statistics of the appended values.
+
+        Args:
+            values (np.ndarray): The values following the values of the previous updates.
+
+        Returns:
+            Dict[int, RollingStats]: The statistics of the appended values by window length.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if self._shift is None and len(values):
+            self._shift = float(values[0])
+        shift = self._shift if self._shift is not None else 0.0
+
+        shifted = np.concatenate([self._tail, values - shift])
+        sums = np.concatenate([[0.0], np.cumsum(shifted)])
+        squares = np.concatenate([[0.0], np.cumsum(shifted * shifted)])
+        ends = np.arange(len(self._tail), len(shifted)) + 1
+
+        stats = {}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for window in self.windows:
+                starts = ends - window
+                full = starts >= 0
+                starts = np.maximum(starts, 0)
+                mean = (sums[ends] - sums[starts]) / window
+                variance = np.maximum((squares[ends] - squares[starts]) / window - mean * mean, 0.0)
+                mean = np.where(full, mean + shift, np.nan)
+                std = np.where(full, np.sqrt(variance), np.nan)
+                stats[window] = RollingStats(
+                    mean,
+                    std,
+                    mean * self.periods_per_year,
+                    np.where(std > 0, mean / std * np.sqrt(self.periods_per_year), np.nan),
+                    np.where(std > 0, (values - mean) / std, np.nan)
+                )
+
+        self._tail = shifted[max(len(shifted) - max(self.windows) + 1, 0):]
+        return stats
+
+
+def compute_rolling_stats(
+    values: np.ndarray,
+    windows: Sequence[int],
+    periods_per_year: float
+) -> Dict[int, RollingStats]:
+    """Compute the rolling statistics of a series over several windows.
+
+    Args:
+        values (np.ndarray): The values of the series in ascending order.
+        windows (Sequence[int]): The window lengths in periods.
+        periods_per_year (float): The number of periods in a year used to annualize.
+
+    Returns:
+        Dict[int, RollingStats]: The statistics of every value by window length.
+    """
+    return RollingAccumulator(windows, periods_per_year).update(values)
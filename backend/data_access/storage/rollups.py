@@ -0,0 +1,179 @@
+""" This module contains the bucketing logic for daily, weekly and monthly rollups of a series.
+
+A rollup bucket summarises all entries of a series within one calendar day, ISO week (starting
+on Monday) or calendar month by their sum, compound product, minimum, maximum, count and last
+value. Only rate series (funding and interest) are rolled up, since compounding open interest
+values is meaningless.
+"""
+from enum import Enum
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from backend.data_access.storage.buckets import DEFAULT_POINT_BUDGET, BucketResolution, resolution_for_budget
+from backend.data_access.storage.time_series_store import SeriesTable, TimestampLike, to_datetime64
+
+
+ROLLUP_TABLES = (SeriesTable.FUNDING, SeriesTable.INTEREST)
+
+# 1970-01-01 was a Thursday, the first Monday after the epoch is day 4
+_EPOCH_MONDAY = 4
+
+
+class Resolution(str, Enum):
+    """Enum for the rollup resolutions."""
+    DAY = '1d'
+    WEEK = '1w'
+    MONTH = '1M'
+
+
+class Rollups(NamedTuple):
+    """The rollup buckets of a series in ascending order.
+
+    Attributes:
+        timestamps (np.ndarray): The start of every bucket as `datetime64[ms]`.
+        sum (np.ndarray): The sum of the values in every bucket.
+        compound (np.ndarray): The product of (1 + value) over every bucket.
+        min (np.ndarray): The smallest value in every bucket.
+        max (np.ndarray): The largest value in every bucket.
+        count (np.ndarray): The number of values in every bucket.
+        last (np.ndarray): The most recent value in every bucket.
+    """
+    timestamps: np.ndarray
+    sum: np.ndarray
+    compound: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+    count: np.ndarray
+    last: np.ndarray
+
+
+def empty_rollups() -> Rollups:
+    """Return rollups without any bucket."""
+    empty = np.array([], dtype=np.float64)
+    return Rollups(np.array([], dtype='datetime64[ms]'), empty, empty, empty, empty, np.array([], dtype=np.int64), empty)
+
+
+def bucket_start(timestamps: np.ndarray, resolution: Resolution) -> np.ndarray:
+    """Return the start of the bucket every timestamp falls into.
+
+    Args:
+        timestamps (np.ndarray): The timestamps as `datetime64[ms]`.
+        resolution (Resolution): The resolution of the buckets.
+
+    Returns:
+        np.ndarray: The bucket starts as `datetime64[ms]`.
+    """
+    resolution = Resolution(resolution)
+    if resolution == Resolution.DAY:
+        return timestamps.astype('datetime64[D]').astype('datetime64[ms]')
+    if resolution == Resolution.WEEK:
+        days = timestamps.astype('datetime64[D]').astype(np.int64)
+        return (days - (days - _EPOCH_MONDAY) % 7).astype('datetime64[D]').astype('datetime64[ms]')
+    return timestamps.astype('datetime64[M]').astype('datetime64[ms]')
+
+
+def bucket_end(starts: np.ndarray, resolution: Resolution) -> np.ndarray:
+    """Return the exclusive end of the buckets starting at `starts`.
+
+    Args:
+        starts (np.ndarray): The bucket starts as `datetime64[ms]`.
+        resolution (Resolution): The resolution of the buckets.
+
+    Returns:
+        np.ndarray: The bucket ends as `datetime64[ms]`.
+    """
+    resolution = Resolution(resolution)
+    if resolution == Resolution.DAY:
+        return starts + np.timedelta64(1, 'D')
+    if resolution == Resolution.WEEK:
+        return starts + np.timedelta64(7, 'D')
+    return (starts.astype('datetime64[M]') + 1).astype('datetime64[ms]')
+
+
+def rollup_resolution(
+    start: TimestampLike,
+    end: TimestampLike,
+    max_points: int = DEFAULT_POINT_BUDGET
+) -> Resolution:
+    """Pick the finest rollup resolution that keeps [start, end) within a point budget.
+
+    Args:
+        start (TimestampLike): The start of the displayed range.
+        end (TimestampLike): The end of the displayed range.
+        max_points (int, optional): The maximum number of buckets. Defaults to `DEFAULT_POINT_BUDGET`.
+
+    Returns:
+        Resolution: The resolution, daily buckets if 8 hour buckets would fit the budget as well.
+    """
+    resolution = resolution_for_budget(start, end, max_points)
+    return Resolution.DAY if resolution == BucketResolution.EIGHT_HOURS else Resolution(resolution.value)
+
+
+def compute_rollups(timestamps: np.ndarray, values: np.ndarray, resolution: Resolution) -> Rollups:
+    """Compute the rollup buckets of a sorted series.
+
+    Args:
+        timestamps (np.ndarray): The timestamps in ascending order as `datetime64[ms]`.
+        values (np.ndarray): The values of the series.
+        resolution (Resolution): The resolution of the buckets.
+
+    Returns:
+        Rollups: The rollup buckets.
+    """
+    if len(timestamps) == 0:
+        return empty_rollups()
+
+    values = np.asarray(values, dtype=np.float64)
+    buckets = bucket_start(timestamps, resolution)
+    first = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    last = np.r_[first[1:] - 1, len(values) - 1]
+
+    return Rollups(
+        timestamps=buckets[first],
+        sum=np.add.reduceat(values, first),
+        compound=np.multiply.reduceat(1 + values, first),
+        min=np.minimum.reduceat(values, first),
+        max=np.maximum.reduceat(values, first),
+        count=last - first + 1,
+        last=values[last]
+    )
+
+
+def tail_rollups(rollups: Rollups, num_values: int) -> Rollups:
+    """Return the most recent `num_values` buckets."""
+    return Rollups(*(column[max(len(rollups.timestamps) - num_values, 0):] for column in rollups))
+
+
+def rollups_between(
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    resolution: Resolution,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    num_values: Optional[int] = None
+) -> Rollups:
+    """Compute the rollup buckets of a sorted series starting within [start, end).
+
+    The entries have to cover the bucket of `start` from its beginning, entries before it are
+    left out with their buckets.
+
+    Args:
+        timestamps (np.ndarray): The timestamps in ascending order as `datetime64[ms]`.
+        values (np.ndarray): The values of the series.
+        resolution (Resolution): The resolution of the buckets.
+        start (TimestampLike, optional): Inclusive lower bound of the bucket starts. Defaults to None.
+        end (TimestampLike, optional): Exclusive upper bound of the bucket starts. Defaults to None.
+        num_values (int, optional): Only return the most recent `num_values` buckets. Defaults to None.
+
+    Returns:
+        Rollups: The rollup buckets in ascending order.
+    """
+    rollups = compute_rollups(timestamps, values, resolution)
+    keep = np.ones(len(rollups.timestamps), dtype=bool)
+    if start is not None:
+        keep &= rollups.timestamps >= to_datetime64([start])[0]
+    if end is not None:
+        keep &= rollups.timestamps < to_datetime64([end])[0]
+    rollups = Rollups(*(column[keep] for column in rollups))
+    return rollups if num_values is None else tail_rollups(rollups, num_values)
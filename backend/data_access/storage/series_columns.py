@@ -0,0 +1,37 @@
+""" This module maps every series table to the ORM columns holding its key, timestamp and value. """
+from typing import NamedTuple
+
+from sqlalchemy import Column, Table
+
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import FundingRate, InterestRate, OpenInterest
+
+
+class SeriesColumns(NamedTuple):
+    """The columns of a table holding one kind of time series."""
+    table: Table
+    key: Column
+    timestamp: Column
+    value: Column
+
+
+SERIES_COLUMNS = {
+    SeriesTable.FUNDING: SeriesColumns(
+        FundingRate.__table__,
+        FundingRate.__table__.c.symbol,
+        FundingRate.__table__.c.funding_rate_timestamp,
+        FundingRate.__table__.c.funding_rate
+    ),
+    SeriesTable.OPEN_INTEREST: SeriesColumns(
+        OpenInterest.__table__,
+        OpenInterest.__table__.c.symbol,
+        OpenInterest.__table__.c.open_interest_timestamp,
+        OpenInterest.__table__.c.open_interest
+    ),
+    SeriesTable.INTEREST: SeriesColumns(
+        InterestRate.__table__,
+        InterestRate.__table__.c.coin,
+        InterestRate.__table__.c.interest_rate_timestamp,
+        InterestRate.__table__.c.interest_rate
+    )
+}
@@ -0,0 +1,542 @@
+""" This module contains the SQLite implementation of the time series store. """
+from contextlib import contextmanager
+from datetime import datetime
+import logging
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.config import ReadSession, Session
+from backend.data_access.crud.crud_buckets import read_bucketed_series
+from backend.data_access.crud.crud_cache import SERIES_CACHE, SeriesCache, bump_series_version, cached_read
+from backend.data_access.crud.crud_cumulative import (
+    count_cumulative_entries,
+    read_cumulative_curve,
+    update_cumulative
+)
+from backend.data_access.crud.crud_open_interest_compacted import (
+    read_compacted_open_interest_entries,
+    read_most_recent_compacted_open_interest,
+    read_most_recent_compacted_open_interest_all
+)
+from backend.data_access.crud.crud_rollups import (
+    count_rollup_entries,
+    read_rollup_entries,
+    update_rollups
+)
+from backend.data_access.crud.crud_series import read_latest_timestamps, read_series_arrays, read_series_arrays_many
+from backend.data_access.storage.buckets import Aggregation, BucketResolution, reduce_buckets
+from backend.data_access.storage.cumulative import (
+    SPREAD_TABLE,
+    Cumulative,
+    compute_cumulative,
+    continue_cumulative,
+    spread_key
+)
+from backend.data_access.storage.memory_store import merge_series
+from backend.data_access.storage.resample import funding_interval, spread_rates
+from backend.data_access.storage.rollups import ROLLUP_TABLES, Resolution, Rollups, bucket_start, rollups_between
+from backend.data_access.storage.series_columns import SERIES_COLUMNS
+from backend.data_access.storage.time_series_store import SeriesTable, TimestampLike, to_datetime64, to_naive_utc
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _range_key(start: Optional[TimestampLike], end: Optional[TimestampLike]) -> tuple:
+    """Normalize the bounds of a read for the cache key."""
+    return tuple(None if bound is None else to_naive_utc(bound) for bound in (start, end))
+
+
+class SQLiteStore:
+    """Time series store backed by the ORM tables of the SQLite database.
+
+    Attributes:
+        session_factory: The factory creating the sessions used for writes.
+        read_session_factory: The factory creating the sessions used for reads.
+        cache (SeriesCache): The versioned cache of the reads.
+    """
+
+    def __init__(self, session_factory=None, read_session_factory=None, cache: Optional[SeriesCache] = None) -> None:
+        """Initialize the store.
+
+        Args:
+            session_factory (optional): The session factory used for writes. Defaults to the global Session.
+            read_session_factory (optional): The session factory used for reads. Defaults to `session_factory`
+                if one is given and to the read-only ReadSession otherwise.
+            cache (SeriesCache, optional): The cache of the reads. Defaults to the global `SERIES_CACHE` on the
+                application database and to a cache of its own on any other database.
+        """
+        if cache is None:
+            cache = SERIES_CACHE if session_factory is None and read_session_factory is None else SeriesCache()
+        self.cache = cache
+        if read_session_factory is None:
+            read_session_factory = session_factory if session_factory is not None else ReadSession
+        self.session_factory = session_factory if session_factory is not None else Session
+        self.read_session_factory = read_session_factory
+        self._checked_rollups = set()
+        self._checked_cumulative = set()
+        # Oldest timestamp written to every series whose curve update is deferred, None before its first write
+        self._deferred: Dict[Tuple[SeriesTable, str], Optional[np.datetime64]] = {}
+        self._deferred_lock = Lock()
+
+    def create_entries(
+        self,
+        table: SeriesTable,
+        key: str,
+        timestamps: np.ndarray,
+        values: np.ndarray
+    ) -> int:
+        """Insert or overwrite a batch of entries of one series in a single statement.
+
+        The rollup buckets touched by the batch and the cumulative curves from its first entry on
+        are updated in the same transaction, the curves only once at the end of a `defer_cumulative`
+        context.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+            timestamps (np.ndarray): The timestamps of the entries.
+            values (np.ndarray): The values of the entries.
+
+        Returns:
+            int: The number of entries written.
+        """
+        columns = SERIES_COLUMNS[SeriesTable(table)]
+        deferred = self._defer(table, key, to_datetime64(timestamps))
+        timestamps = to_datetime64(timestamps).astype(datetime)
+        values = np.asarray(values, dtype=np.float64)
+        if len(timestamps) == 0:
+            return 0
+
+        rows = [
+            {columns.key.name: key, columns.timestamp.name: ts, columns.value.name: float(value)}
+            for ts, value in zip(timestamps, values)
+        ]
+        statement = sqlite_insert(columns.table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[columns.key, columns.timestamp],
+            set_={columns.value.name: statement.excluded[columns.value.name]}
+        )
+
+        with self.session_factory() as session:
+            try:
+                extends_only = not self._changes_existing(session, columns, key, timestamps, values)
+                session.execute(statement, rows)
+                update_rollups(session, table, key, timestamps)
+                if not deferred:
+                    update_cumulative(session, table, key, timestamps)
+                bump_series_version(session, table, key, extends_only=extends_only)
+                session.commit()
+                logger.info("%d %s records written for %s", len(rows), table.value, key)
+            except SQLAlchemyError as e:
+                logger.error("Database error occurred while writing %s records: %s", table.value, e)
+                session.rollback()
+                raise
+        return len(rows)
+
+    @contextmanager
+    def defer_cumulative(self, table: SeriesTable, key: str) -> Iterator[None]:
+        """Defer the update of the persisted cumulative curves of one series to the end of a backfill.
+
+        Pages written newest first each shift the whole curve after them, so updating the curve
+        with every page costs quadratically in the length of the backfill. Within the context the
+        curve and the spreads of the series are recomputed once from the oldest entry written
+        when it exits, also if the backfill fails. Until then reads see the curve from before.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+        """
+        series = (SeriesTable(table), key)
+        with self._deferred_lock:
+            self._deferred.setdefault(series, None)
+        try:
+            yield
+        finally:
+            with self._deferred_lock:
+                first = self._deferred.pop(series, None)
+            if first is not None:
+                self._update_cumulative(table, key, first)
+
+    def _defer(self, table: SeriesTable, key: str, timestamps: np.ndarray) -> bool:
+        """Record the oldest timestamp of a batch if the curve update of its series is deferred."""
+        series = (SeriesTable(table), key)
+        with self._deferred_lock:
+            if series not in self._deferred or len(timestamps) == 0:
+                return False
+            first = timestamps.min()
+            previous = self._deferred[series]
+            self._deferred[series] = first if previous is None else min(previous, first)
+            return True
+
+    def _update_cumulative(self, table: SeriesTable, key: str, first: np.datetime64) -> None:
+        """Recompute the curves of a series and its spreads from `first` on after a deferred backfill."""
+        with self.session_factory() as session:
+            try:
+                written = update_cumulative(session, table, key, np.array([first]))
+                # The raw entries are unchanged, cached curves re-read the points added in their range
+                bump_series_version(session, table, key, extends_only=True)
+                session.commit()
+                logger.info("%d cumulative points recomputed for %s %s", written, SeriesTable(table).value, key)
+            except SQLAlchemyError as e:
+                logger.error("Database error occurred while recomputing cumulative returns: %s", e)
+                session.rollback()
+                raise
+
+    @staticmethod
+    def _changes_existing(session, columns, key: str, timestamps: np.ndarray, values: np.ndarray) -> bool:
+        """Return whether a batch overwrites stored values or fills a gap between stored entries.
+
+        Batches adding entries before the first or after the most recent one, e.g. the pages of a
+        backfill written newest first, and overlapping pages repeating the stored values leave
+        cached reads extendable.
+        """
+        first, last = session.execute(
+            select(func.min(columns.timestamp), func.max(columns.timestamp)).where(columns.key == key)
+        ).one()
+        if first is None:
+            return False
+        stored = dict(session.execute(
+            select(columns.timestamp, columns.value)
+                .where(columns.key == key)
+                .where(columns.timestamp >= min(timestamps))
+                .where(columns.timestamp <= max(timestamps))
+        ).tuples().all())
+        return any(
+            stored[ts] != value if ts in stored else first < ts < last
+            for ts, value in zip(timestamps, values.tolist())
+        )
+
+    def read_entries(
+        self,
+        table: SeriesTable,
+        key: str,
+        start: Optional[TimestampLike] = None,
+        end: Optional[TimestampLike] = None,
+        num_values: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Read the entries of one series within [start, end).
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+            start (TimestampLike, optional): Inclusive lower bound. Defaults to None.
+            end (TimestampLike, optional): Exclusive upper bound. Defaults to None.
+            num_values (int, optional): Only return the most recent `num_values` entries. Defaults to None.
+
+        Returns:
+            tuple: A tuple containing the timestamps and values in ascending order.
+        """
+        def read() -> Tuple[np.ndarray, np.ndarray]:
+            timestamps, values = read_series_arrays(table, key, start, end, num_values, self.read_session_factory)
+            if SeriesTable(table) == SeriesTable.OPEN_INTEREST:
+                timestamps, values = self._stitch_open_interest(key, timestamps, values, start, end, num_values)
+            return timestamps, values
+
+        def extend(cached: Tuple[np.ndarray, np.ndarray]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+            timestamps, values = cached
+            if len(timestamps) == 0:
+                return None
+            # The most recent `num_values` entries already cached hide any entry added in front
+            missing = None if num_values is None else max(num_values - len(timestamps), 0)
+            head_timestamps, head_values = self._read_head(table, key, timestamps[0], start, missing)
+            if len(head_timestamps) and SeriesTable(table) == SeriesTable.OPEN_INTEREST:
+                # Entries added in front are stitched with the compacted tiers by a full read
+                return None
+            new_timestamps, new_values = self._read_tail(table, key, timestamps[-1], end)
+            timestamps = np.concatenate([head_timestamps, timestamps, new_timestamps])
+            values = np.concatenate([head_values, values, new_values])
+            first = 0 if num_values is None else max(len(timestamps) - num_values, 0)
+            return timestamps[first:], values[first:]
+
+        return self._cached(table, key, ('entries', *_range_key(start, end), num_values), read, extend)
+
+    def read_most_recent_update(self, table: SeriesTable, key: str) -> Optional[datetime]:
+        """Read the timestamp of the most recent entry of one series.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+
+        Returns:
+            datetime: The most recent timestamp or None if the series is empty.
+        """
+        columns = SERIES_COLUMNS[SeriesTable(table)]
+        query = select(func.max(columns.timestamp)).where(columns.key == key)
+
+        try:
+            with self.read_session_factory() as session:
+                latest = session.execute(query).scalar()
+        except SQLAlchemyError as e:
+            logger.error("Database error occurred while reading the most recent %s timestamp: %s", table.value, e)
+            raise
+
+        if latest is None and SeriesTable(table) == SeriesTable.OPEN_INTEREST:
+            latest = read_most_recent_compacted_open_interest(key, self.read_session_factory)
+        return latest
+
+    def read_most_recent_updates(self, table: SeriesTable) -> Dict[str, datetime]:
+        """Read the timestamp of the most recent entry of every series of one table.
+
+        Runs one grouped query per table instead of one query per series.
+
+        Args:
+            table (SeriesTable): The table the series belong to.
+
+        Returns:
+            dict: A dictionary mapping the key of every non-empty series to its most recent timestamp.
+        """
+        latest = read_latest_timestamps(table, self.read_session_factory)
+
+        if SeriesTable(table) == SeriesTable.OPEN_INTEREST:
+            compacted = read_most_recent_compacted_open_interest_all(self.read_session_factory)
+            latest = {**compacted, **latest}
+        return latest
+
+    def read_entries_many(
+        self,
+        table: SeriesTable,
+        keys: Iterable[str],
+        start: Optional[TimestampLike] = None,
+        end: Optional[TimestampLike] = None
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Read the entries of several series of one table with a single query.
+
+        Args:
+            table (SeriesTable): The table the series belong to.
+            keys (Iterable[str]): The symbols or coins of the series.
+            start (TimestampLike, optional): Inclusive lower bound. Defaults to None.
+            end (TimestampLike, optional): Exclusive upper bound. Defaults to None.
+
+        Returns:
+            dict: A dictionary mapping every key to its timestamps and values.
+        """
+        series = read_series_arrays_many(table, keys, start, end, self.read_session_factory)
+
+        if SeriesTable(table) == SeriesTable.OPEN_INTEREST:
+            series = {key: self._stitch_open_interest(key, *arrays, start, end) for key, arrays in series.items()}
+        return series
+
+    def read_rollups(
+        self,
+        table: SeriesTable,
+        key: str,
+        resolution: Resolution,
+        start: Optional[TimestampLike] = None,
+        end: Optional[TimestampLike] = None,
+        num_values: Optional[int] = None
+    ) -> Rollups:
+        """Read the persisted rollup buckets of one rate series.
+
+        Series written before rollups were maintained are rolled up by `backfill_rollups` at
+        startup, until then their buckets are computed from the raw entries without writing.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+            resolution (Resolution): The resolution of the buckets.
+            start (TimestampLike, optional): Inclusive lower bound of the bucket starts. Defaults to None.
+            end (TimestampLike, optional): Exclusive upper bound of the bucket starts. Defaults to None.
+            num_values (int, optional): Only return the most recent `num_values` buckets. Defaults to None.
+
+        Returns:
+            Rollups: The rollup buckets in ascending order.
+        """
+        series = (SeriesTable(table), key)
+        if series not in self._checked_rollups:
+            if count_rollup_entries(table, key, self.read_session_factory) == 0:
+                first_bucket = None if start is None else bucket_start(to_datetime64([start]), resolution)[0]
+                return rollups_between(*self.read_entries(table, key, first_bucket), resolution, start, end, num_values)
+            self._checked_rollups.add(series)
+
+        return self._cached(
+            table,
+            key,
+            ('rollups', Resolution(resolution), *_range_key(start, end), num_values),
+            lambda: read_rollup_entries(table, key, resolution, start, end, num_values, self.read_session_factory)
+        )
+
+    def read_buckets(
+        self,
+        table: SeriesTable,
+        key: str,
+        resolution: BucketResolution,
+        aggregation: Aggregation,
+        start: Optional[TimestampLike] = None,
+        end: Optional[TimestampLike] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Read one series within [start, end) reduced to one value per bucket.
+
+        The buckets are computed in SQL. Open interest is bucketed after stitching the compacted
+        tiers, which are not stored in the hourly table.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+            resolution (BucketResolution): The width of the buckets.
+            aggregation (Aggregation): The reduction of the entries within a bucket.
+            start (TimestampLike, optional): Inclusive lower bound of the entries. Defaults to None.
+            end (TimestampLike, optional): Exclusive upper bound of the entries. Defaults to None.
+
+        Returns:
+            tuple: The bucket starts and the reduced values in ascending order.
+        """
+        def read() -> Tuple[np.ndarray, np.ndarray]:
+            if SeriesTable(table) == SeriesTable.OPEN_INTEREST:
+                return reduce_buckets(*self.read_entries(table, key, start, end), resolution, aggregation)
+            return read_bucketed_series(table, key, resolution, aggregation, start, end, self.read_session_factory)
+
+        read_key = ('buckets', BucketResolution(resolution), Aggregation(aggregation), *_range_key(start, end))
+        return self._cached(table, key, read_key, read)
+
+    def read_cumulative(
+        self,
+        table: SeriesTable,
+        key: str,
+        start: Optional[TimestampLike] = None
+    ) -> Cumulative:
+        """Read the cumulative linear and compound returns of one rate series from `start` on.
+
+        The persisted curve is rebased to `start`. Series written before the curves were persisted
+        are accumulated by `backfill_cumulative` at startup, until then their curve is computed from
+        the raw entries without writing. Cached curves are continued by the points appended since.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+            start (TimestampLike, optional): The first entry accumulated. Defaults to None.
+
+        Returns:
+            Cumulative: The cumulative returns in ascending order.
+
+        Raises:
+            ValueError: If the table does not hold rates.
+        """
+        if SeriesTable(table) not in ROLLUP_TABLES:
+            raise ValueError(f"No cumulative returns are computed for table {SeriesTable(table).value}")
+
+        if not self._has_cumulative(table, key):
+            return compute_cumulative(*self.read_entries(table, key, start))
+
+        def read() -> Cumulative:
+            return read_cumulative_curve(table, key, start, self.read_session_factory)
+
+        def extend(cached: Cumulative) -> Optional[Cumulative]:
+            # Entries added in front shift the whole rebased curve
+            if len(cached.timestamps) == 0 or len(self._read_head(table, key, cached.timestamps[0], start, 1)[0]):
+                return None
+            tail = read_cumulative_curve(table, key, cached.timestamps[-1], self.read_session_factory)
+            return continue_cumulative(cached, tail)
+
+        return self._cached(table, key, ('cumulative', *_range_key(start, None)), read, extend)
+
+    def read_spread_cumulative(
+        self,
+        symbol: str,
+        stablecoin: str,
+        start: Optional[TimestampLike] = None
+    ) -> Cumulative:
+        """Read the cumulative returns of the funding of a symbol net of the interest of a stable coin.
+
+        The curves of the registered pairs are persisted by `backfill_cumulative` at startup and
+        extended by every later write of either series. The curve of any other pair is computed
+        from the raw entries without writing.
+
+        Args:
+            symbol (str): The symbol of the funding series.
+            stablecoin (str): The stable coin of the interest series.
+            start (TimestampLike, optional): The first settlement accumulated. Defaults to None.
+
+        Returns:
+            Cumulative: The cumulative returns at the settlements in ascending order.
+        """
+        key = spread_key(symbol, stablecoin)
+        if self._has_cumulative(SPREAD_TABLE, key):
+            return read_cumulative_curve(SPREAD_TABLE, key, start, self.read_session_factory)
+
+        interval = funding_interval(symbol)
+        settlements, funding = self.read_entries(SeriesTable.FUNDING, symbol, start)
+        interest_timestamps, interest = self.read_entries(
+            SeriesTable.INTEREST,
+            stablecoin,
+            settlements[0] - interval if len(settlements) else None
+        )
+        return compute_cumulative(*spread_rates(settlements, funding, interest_timestamps, interest, interval))
+
+    def _has_cumulative(self, table: str, key: str) -> bool:
+        """Return whether the curve of a series is persisted, a persisted curve stays persisted."""
+        series = (table, key)
+        if series not in self._checked_cumulative:
+            if count_cumulative_entries(table, key, self.read_session_factory) == 0:
+                return False
+            self._checked_cumulative.add(series)
+        return True
+
+    def _read_head(
+        self,
+        table: SeriesTable,
+        key: str,
+        first: np.datetime64,
+        start: Optional[TimestampLike] = None,
+        num_values: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Read the most recent `num_values` entries of one series from `start` on and before the timestamp `first`."""
+        if num_values == 0:
+            return np.array([], dtype='datetime64[ms]'), np.array([], dtype=np.float64)
+        return read_series_arrays(table, key, start, first, num_values, self.read_session_factory)
+
+    def _read_tail(
+        self,
+        table: SeriesTable,
+        key: str,
+        last: np.datetime64,
+        end: Optional[TimestampLike] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Read the entries of one series after the timestamp `last` and before `end`."""
+        return read_series_arrays(table, key, last + np.timedelta64(1, 'ms'), end, None, self.read_session_factory)
+
+    def _cached(
+        self,
+        table: SeriesTable,
+        key: str,
+        read_key: tuple,
+        read: Callable[[], Any],
+        extend: Optional[Callable[[Any], Any]] = None
+    ) -> Any:
+        """Serve a read from the versioned cache of the store."""
+        if self.cache is None:
+            return read()
+        return cached_read(table, key, read_key, read, self.read_session_factory, self.cache, extend)
+
+    def _stitch_open_interest(
+        self,
+        key: str,
+        timestamps: np.ndarray,
+        values: np.ndarray,
+        start: Optional[TimestampLike],
+        end: Optional[TimestampLike],
+        num_values: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Prepend the compacted open interest tiers to the hourly entries."""
+        compacted_timestamps, compacted_values = read_compacted_open_interest_entries(
+            key,
+            start,
+            end,
+            num_values,
+            self.read_session_factory
+        )
+        if len(compacted_timestamps) == 0:
+            return timestamps, values
+
+        # Hourly entries take precedence over compacted buckets starting at the same time
+        timestamps, values = merge_series(compacted_timestamps, compacted_values, timestamps, values)
+        if num_values is not None:
+            first = max(len(timestamps) - num_values, 0)
+            timestamps, values = timestamps[first:], values[first:]
+        return timestamps, values
@@ -0,0 +1,282 @@
+""" This module contains the storage interface shared by all time series backends.
+
+Every backend stores one time series per (table, key) pair, where the key is the value of a
+Symbol (funding rates, open interest) or a Coin (interest rates). Timestamps are exchanged as
+naive UTC `datetime64[ms]` arrays and values as `float64` arrays, always in ascending order.
+"""
+from datetime import datetime, timezone
+from enum import Enum
+from typing import TYPE_CHECKING, ContextManager, Dict, Iterable, Optional, Protocol, Tuple, Union, runtime_checkable
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from backend.data_access.storage.buckets import Aggregation, BucketResolution
+    from backend.data_access.storage.cumulative import Cumulative
+    from backend.data_access.storage.rollups import Resolution, Rollups
+
+
+TimestampLike = Union[datetime, np.datetime64, str]
+
+
+class SeriesTable(str, Enum):
+    """Enum for the tables holding time series data."""
+    FUNDING = 'funding_rates'
+    OPEN_INTEREST = 'open_interest'
+    INTEREST = 'interest_rates'
+
+
+@runtime_checkable
+class TimeSeriesStore(Protocol):
+    """Interface of a time series storage backend."""
+
+    def create_entries(
+        self,
+        table: SeriesTable,
+        key: str,
+        timestamps: np.ndarray,
+        values: np.ndarray
+    ) -> int:
+        """Insert or overwrite a batch of entries of one series.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+            timestamps (np.ndarray): The timestamps of the entries.
+            values (np.ndarray): The values of the entries.
+
+        Returns:
+            int: The number of entries written.
+        """
+        ...
+
+    def defer_cumulative(self, table: SeriesTable, key: str) -> ContextManager[None]:
+        """Defer the update of the persisted cumulative curves of one series to the end of a backfill.
+
+        Pages written older first each shift the whole curve after them, within the context the
+        curve is recomputed once from the oldest entry written when it exits.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+
+        Returns:
+            ContextManager: The context of the backfill.
+        """
+        ...
+
+    def read_entries(
+        self,
+        table: SeriesTable,
+        key: str,
+        start: Optional[TimestampLike] = None,
+        end: Optional[TimestampLike] = None,
+        num_values: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Read the entries of one series within [start, end).
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+            start (TimestampLike, optional): Inclusive lower bound. Defaults to None.
+            end (TimestampLike, optional): Exclusive upper bound. Defaults to None.
+            num_values (int, optional): Only return the most recent `num_values` entries. Defaults to None.
+
+        Returns:
+            tuple: A tuple containing the timestamps and values in ascending order.
+        """
+        ...
+
+    def read_most_recent_update(self, table: SeriesTable, key: str) -> Optional[datetime]:
+        """Read the timestamp of the most recent entry of one series.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+
+        Returns:
+            datetime: The most recent timestamp or None if the series is empty.
+        """
+        ...
+
+    def read_most_recent_updates(self, table: SeriesTable) -> Dict[str, datetime]:
+        """Read the timestamp of the most recent entry of every series of one table.
+
+        Args:
+            table (SeriesTable): The table the series belong to.
+
+        Returns:
+            dict: A dictionary mapping the key of every non-empty series to its most recent timestamp.
+        """
+        ...
+
+    def read_entries_many(
+        self,
+        table: SeriesTable,
+        keys: Iterable[str],
+        start: Optional[TimestampLike] = None,
+        end: Optional[TimestampLike] = None
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Read the entries of several series of one table within [start, end).
+
+        Args:
+            table (SeriesTable): The table the series belong to.
+            keys (Iterable[str]): The symbols or coins of the series.
+            start (TimestampLike, optional): Inclusive lower bound. Defaults to None.
+            end (TimestampLike, optional): Exclusive upper bound. Defaults to None.
+
+        Returns:
+            dict: A dictionary mapping every key to its timestamps and values.
+        """
+        ...
+
+    def read_rollups(
+        self,
+        table: SeriesTable,
+        key: str,
+        resolution: 'Resolution',
+        start: Optional[TimestampLike] = None,
+        end: Optional[TimestampLike] = None,
+        num_values: Optional[int] = None
+    ) -> 'Rollups':
+        """Read the daily, weekly or monthly rollup buckets of one rate series.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+            resolution (Resolution): The resolution of the buckets.
+            start (TimestampLike, optional): Inclusive lower bound of the bucket starts. Defaults to None.
+            end (TimestampLike, optional): Exclusive upper bound of the bucket starts. Defaults to None.
+            num_values (int, optional): Only return the most recent `num_values` buckets. Defaults to None.
+
+        Returns:
+            Rollups: The rollup buckets in ascending order.
+        """
+        ...
+
+    def read_buckets(
+        self,
+        table: SeriesTable,
+        key: str,
+        resolution: 'BucketResolution',
+        aggregation: 'Aggregation',
+        start: Optional[TimestampLike] = None,
+        end: Optional[TimestampLike] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Read one series within [start, end) reduced to one value per bucket.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+            resolution (BucketResolution): The width of the buckets.
+            aggregation (Aggregation): The reduction of the entries within a bucket.
+            start (TimestampLike, optional): Inclusive lower bound of the entries. Defaults to None.
+            end (TimestampLike, optional): Exclusive upper bound of the entries. Defaults to None.
+
+        Returns:
+            tuple: The bucket starts and the reduced values in ascending order.
+        """
+        ...
+
+    def read_cumulative(
+        self,
+        table: SeriesTable,
+        key: str,
+        start: Optional[TimestampLike] = None
+    ) -> 'Cumulative':
+        """Read the cumulative linear and compound returns of one rate series from `start` on.
+
+        Args:
+            table (SeriesTable): The table the series belongs to.
+            key (str): The symbol or coin of the series.
+            start (TimestampLike, optional): The first entry accumulated. Defaults to None.
+
+        Returns:
+            Cumulative: The cumulative returns in ascending order.
+        """
+        ...
+
+    def read_spread_cumulative(
+        self,
+        symbol: str,
+        stablecoin: str,
+        start: Optional[TimestampLike] = None
+    ) -> 'Cumulative':
+        """Read the cumulative returns of the funding of a symbol net of the interest of a stable coin.
+
+        Args:
+            symbol (str): The symbol of the funding series.
+            stablecoin (str): The stable coin of the interest series.
+            start (TimestampLike, optional): The first settlement accumulated. Defaults to None.
+
+        Returns:
+            Cumulative: The cumulative returns at the settlements in ascending order.
+        """
+        ...
+
+
+def to_datetime64(timestamps) -> np.ndarray:
+    """Convert timestamps to a naive UTC `datetime64[ms]` array.
+
+    Integers are interpreted as milliseconds since the epoch, timezone aware datetimes are
+    converted to UTC.
+
+    Args:
+        timestamps: The timestamps to be converted.
+
+    Returns:
+        np.ndarray: The converted timestamps.
+    """
+    timestamps = np.asarray(timestamps)
+    if timestamps.dtype.kind in 'iu':
+        return timestamps.astype('int64').astype('datetime64[ms]')
+    if timestamps.dtype == object:
+        return np.array(
+            [to_naive_utc(ts) for ts in timestamps.ravel()],
+            dtype='datetime64[ms]'
+        ).reshape(timestamps.shape)
+    return timestamps.astype('datetime64[ms]')
+
+
+def to_naive_utc(timestamp: TimestampLike) -> datetime:
+    """Convert a single timestamp to a naive UTC datetime as stored in the database.
+
+    Args:
+        timestamp (TimestampLike): The timestamp to be converted.
+
+    Returns:
+        datetime: The converted timestamp.
+    """
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        return timestamp
+    return np.datetime64(timestamp, 'ms').astype(datetime)
+
+
+_store: Optional[TimeSeriesStore] = None
+
+
+def get_store() -> TimeSeriesStore:
+    """Return the store used by the ingest and data handling code.
+
+    Defaults to the SQLite store on the application database.
+
+    Returns:
+        TimeSeriesStore: The active store.
+    """
+    global _store
+    if _store is None:
+        from backend.data_access.storage.sqlite_store import SQLiteStore
+        _store = SQLiteStore()
+    return _store
+
+
+def set_store(store: TimeSeriesStore) -> None:
+    """Replace the store used by the ingest and data handling code.
+
+    Args:
+        store (TimeSeriesStore): The store to be used from now on.
+    """
+    global _store
+    _store = store
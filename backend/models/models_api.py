@@ -34,9 +34,16 @@ class FundingHistoryResponse(BaseModel):
     @property
     def cumulative_return(self) -> np.ndarray:
         """Calculate the cumulative return from the funding rates."""
-        # Calculate cumulative return
+        # Accumulate in log space, see `backend.data_access.storage.cumulative`
         _, funding_rates = self.unpacked_data
-        return np.cumprod(1 + funding_rates) - 1
+        return np.expm1(np.cumsum(np.log1p(funding_rates)))
+
+    @property
+    def series(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the timestamps as `datetime64[ms]` and the funding rates as `float64` arrays."""
+        timestamps = np.array([int(item.fundingRateTimestamp) for item in self.list], dtype=np.int64)
+        funding_rates = np.array([float(item.fundingRate) for item in self.list], dtype=np.float64)
+        return timestamps.astype('datetime64[ms]'), funding_rates
 
 
 class OpenInterestRequest(BaseModel):
@@ -58,6 +65,13 @@ class OpenInterestResponse(BaseModel):
     category: str
     list: List[OpenInterestItem]
 
+    @property
+    def series(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the timestamps as `datetime64[ms]` and the open interest as `float64` arrays."""
+        timestamps = np.array([int(item.timestamp) for item in self.list], dtype=np.int64)
+        open_interest = np.array([float(item.openInterest) for item in self.list], dtype=np.float64)
+        return timestamps.astype('datetime64[ms]'), open_interest
+
 
 class InterestRateItem(BaseModel):
     """A Pydantic model for a single interest rate item."""
@@ -80,4 +94,11 @@ class InterestRateResponse(BaseModel):
     def cumulative_return(self) -> np.ndarray:
         """Calculate the cumulative return from the interest rates."""
         _, interest_rates = self.unpacked_data
-        return np.cumprod(1 + interest_rates) - 1
\ No newline at end of file
+        return np.expm1(np.cumsum(np.log1p(interest_rates)))
+
+    @property
+    def series(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the timestamps as `datetime64[ms]` and the interest rates as `float64` arrays."""
+        timestamps = np.array([int(item.timestamp) for item in self.list], dtype=np.int64)
+        interest_rates = np.array([float(item.hourlyBorrowRate) for item in self.list], dtype=np.float64)
+        return timestamps.astype('datetime64[ms]'), interest_rates
\ No newline at end of file
@@ -1,16 +1,19 @@
 """ ORM models for the database. """
 from datetime import datetime, timezone
 from enum import Enum
+from threading import Lock
+from typing import Dict, List, NamedTuple, Optional, Type
 
-from sqlalchemy import Column, DateTime, Enum as SQLEnum, Float
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.types import TypeDecorator
 
 
 Base = declarative_base()
 
 
 class Symbol(str, Enum):
-    """Enum for the trading symbols."""
+    """Enum for the trading symbols the instrument registry is seeded with."""
     BTCUSDT = 'BTCUSDT'
     BTCUSDC = 'BTCPERP'
     BTCUSD = 'BTCUSD'
@@ -49,7 +52,7 @@ class Symbol(str, Enum):
 
 
 class Coin(str, Enum):
-    """Enum for the coins."""
+    """Enum for the coins the margin coin registry is seeded with."""
     DAI = 'DAI'
     USDT = 'USDT'
     USDC = 'USDC'
@@ -57,11 +60,136 @@ class Coin(str, Enum):
     TUSD = 'TUSD'
 
 
+class RegistryEntry(NamedTuple):
+    """An instrument or margin coin of the registry."""
+    id: int
+    key: str
+    funding_interval_hours: Optional[int] = None
+    listing_date: Optional[datetime] = None
+    active: bool = True
+
+
+class KeyRegistry:
+    """In-process cache of a registry table mapping the series keys to their integer ids.
+
+    The cache is seeded from an enum, whose members get the ids 1 to n in definition order, and
+    refreshed from the database with `backend.data_access.crud.crud_registry.load_registry`.
+
+    Attributes:
+        name (str): The name of the registered keys used in error messages.
+        seed (Type[Enum]): The enum the registry is seeded from.
+    """
+
+    def __init__(self, name: str, seed: Type[Enum], funding_interval_hours: Optional[int] = None) -> None:
+        self.name = name
+        self.seed = seed
+        self._lock = Lock()
+        self._entries: Dict[str, RegistryEntry] = {}
+        self._keys: Dict[int, str] = {}
+        for index, member in enumerate(seed, start=1):
+            self.update(RegistryEntry(index, member.value, funding_interval_hours))
+
+    def update(self, entry: RegistryEntry) -> None:
+        """Insert or replace an entry of the cache."""
+        with self._lock:
+            previous = self._entries.get(entry.key)
+            if previous is not None:
+                self._keys.pop(previous.id, None)
+            self._entries[entry.key] = entry
+            self._keys[entry.id] = entry.key
+
+    def id_of(self, key: str) -> int:
+        """Return the integer id of a key.
+
+        Raises:
+            ValueError: If the key is not registered.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            raise ValueError(f"Unknown {self.name} {key}")
+        return entry.id
+
+    def entry_of(self, key: str) -> RegistryEntry:
+        """Return the entry of a key.
+
+        Raises:
+            ValueError: If the key is not registered.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            raise ValueError(f"Unknown {self.name} {key}")
+        return entry
+
+    def key_of(self, key_id: int) -> str:
+        """Return the key of an integer id.
+
+        Raises:
+            ValueError: If the id is not registered.
+        """
+        key = self._keys.get(key_id)
+        if key is None:
+            raise ValueError(f"Unknown {self.name} id {key_id}")
+        return key
+
+    def entries(self, active_only: bool = False) -> List[RegistryEntry]:
+        """Return the cached entries ordered by id."""
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda entry: entry.id)
+        return [entry for entry in entries if entry.active or not active_only]
+
+
+INSTRUMENT_REGISTRY = KeyRegistry('instrument', Symbol, funding_interval_hours=8)
+COIN_REGISTRY = KeyRegistry('coin', Coin)
+
+
+class RegistryKey(TypeDecorator):
+    """Column type storing a symbol or coin as the integer id of its registry entry.
+
+    Symbols and coins are bound and returned as strings, so filters keep comparing against keys
+    while the database compares integers.
+    """
+    impl = Integer
+    cache_ok = True
+
+    def __init__(self, registry: KeyRegistry) -> None:
+        super().__init__()
+        self.registry = registry
+
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        if value is None or (isinstance(value, int) and not isinstance(value, bool)):
+            return value
+        return self.registry.id_of(value)
+
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        return None if value is None else self.registry.key_of(value)
+
+
+class Instrument(Base):
+    """ORM model for the registry of the traded instruments."""
+    __tablename__ = 'instruments'
+
+    id = Column(Integer, primary_key=True)
+    symbol = Column(String, unique=True, nullable=False)
+    funding_interval_hours = Column(Integer, nullable=False, default=8)
+    listing_date = Column(DateTime, nullable=True)
+    active = Column(Boolean, nullable=False, default=True)
+
+
+class MarginCoin(Base):
+    """ORM model for the registry of the margin coins."""
+    __tablename__ = 'coins'
+
+    id = Column(Integer, primary_key=True)
+    coin = Column(String, unique=True, nullable=False)
+    listing_date = Column(DateTime, nullable=True)
+    active = Column(Boolean, nullable=False, default=True)
+
+
 class FundingRate(Base):
     """ORM model for the funding rates."""
     __tablename__ = 'funding_rates'
 
-    symbol = Column(SQLEnum(Symbol), primary_key=True, nullable=False)
+    symbol = Column(RegistryKey(INSTRUMENT_REGISTRY), ForeignKey('instruments.id'), primary_key=True, nullable=False)
     funding_rate_timestamp = Column(DateTime, primary_key=True, nullable=False)
     funding_rate = Column(Float, nullable=False)
 
@@ -75,7 +203,7 @@ class OpenInterest(Base):
     """ORM model for the open interest."""
     __tablename__ = 'open_interest'
 
-    symbol = Column(SQLEnum(Symbol), primary_key=True, nullable=False)
+    symbol = Column(RegistryKey(INSTRUMENT_REGISTRY), ForeignKey('instruments.id'), primary_key=True, nullable=False)
     open_interest_timestamp = Column(DateTime, primary_key=True, nullable=False)
     open_interest = Column(Float, nullable=False)
 
@@ -89,11 +217,77 @@ class InterestRate(Base):
     """ORM model for the interest rates."""
     __tablename__ = 'interest_rates'
 
-    coin = Column(SQLEnum(Coin), primary_key=True, nullable=False)
+    coin = Column(RegistryKey(COIN_REGISTRY), ForeignKey('coins.id'), primary_key=True, nullable=False)
     interest_rate_timestamp = Column(DateTime, primary_key=True, nullable=False)
     interest_rate = Column(Float, nullable=False)
 
     def __init__(self, coin: Coin, interest_rate: str, interest_rate_timestamp: str) -> None:
         self.coin = coin 
         self.interest_rate = float(interest_rate)
-        self.interest_rate_timestamp = datetime.fromtimestamp(int(interest_rate_timestamp) / 1000, tz=timezone.utc)
\ No newline at end of file
+        self.interest_rate_timestamp = datetime.fromtimestamp(int(interest_rate_timestamp) / 1000, tz=timezone.utc)
+
+
+class SeriesRollup(Base):
+    """ORM model for the daily, weekly and monthly rollups of the rate series."""
+    __tablename__ = 'series_rollups'
+
+    series_table = Column(String, primary_key=True, nullable=False)
+    series_key = Column(String, primary_key=True, nullable=False)
+    resolution = Column(String, primary_key=True, nullable=False)
+    bucket_start = Column(DateTime, primary_key=True, nullable=False)
+    value_sum = Column(Float, nullable=False)
+    value_compound = Column(Float, nullable=False)
+    value_min = Column(Float, nullable=False)
+    value_max = Column(Float, nullable=False)
+    value_count = Column(Integer, nullable=False)
+    value_last = Column(Float, nullable=False)
+
+
+class SeriesCumulative(Base):
+    """ORM model for the persisted cumulative linear and log compound returns of the rate series and spreads."""
+    __tablename__ = 'series_cumulative'
+
+    series_table = Column(String, primary_key=True, nullable=False)
+    series_key = Column(String, primary_key=True, nullable=False)
+    timestamp = Column(DateTime, primary_key=True, nullable=False)
+    value_linear = Column(Float, nullable=False)
+    value_log = Column(Float, nullable=False)
+
+
+class SweepResult(Base):
+    """ORM model for the results of the backtest sweeps over instruments, stable coins and strategy parameters."""
+    __tablename__ = 'sweep_results'
+
+    sweep_id = Column(String, primary_key=True, nullable=False)
+    symbol = Column(String, primary_key=True, nullable=False)
+    stablecoin = Column(String, primary_key=True, nullable=False)
+    leverage = Column(Float, primary_key=True, nullable=False)
+    rebalance_every = Column(Integer, primary_key=True, nullable=False)
+    total_return = Column(Float, nullable=False)
+    apr = Column(Float, nullable=False)
+    max_drawdown = Column(Float, nullable=False)
+    settlements = Column(Integer, nullable=False)
+
+
+class SeriesVersion(Base):
+    """ORM model for the data version of every series, bumped by every write to the series."""
+    __tablename__ = 'series_versions'
+
+    series_table = Column(String, primary_key=True, nullable=False)
+    series_key = Column(String, primary_key=True, nullable=False)
+    version = Column(Integer, nullable=False, default=0)
+    rewritten_version = Column(Integer, nullable=False, default=0)
+
+
+class OpenInterestCompacted(Base):
+    """ORM model for the open interest compacted to coarser OHLC buckets."""
+    __tablename__ = 'open_interest_compacted'
+
+    symbol = Column(RegistryKey(INSTRUMENT_REGISTRY), ForeignKey('instruments.id'), primary_key=True, nullable=False)
+    tier = Column(String, primary_key=True, nullable=False)
+    bucket_start = Column(DateTime, primary_key=True, nullable=False)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    count = Column(Integer, nullable=False)
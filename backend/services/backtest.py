@@ -0,0 +1,237 @@
+""" This module contains the backtest of a leveraged long spot, short perpetual position.
+
+The spot leg of `leverage` times the equity is bought with the equity and `leverage - 1` times
+the equity borrowed in the stable coin, the perpetual short of the same notional collects the
+funding. Prices cancel between the legs, so every settlement changes the equity by the funding
+on the notional less the interest on the borrowed amount, both fixed since the last rebalance.
+Rebalancing resets the notional and the borrowed amount to the target leverage of the current
+equity and pays the fee on the traded notional of both legs.
+
+The equity within a rebalancing block is the equity at its start times one plus the running sum
+of the block's returns, and the equity at the start of every block is the running product of
+the growth of the blocks before it. Both are array operations over the whole history, and every
+array may carry leading dimensions to simulate many paths at once.
+"""
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from backend.data_access.storage.resample import align_interest, funding_interval
+from backend.data_access.storage.rolling import periods_per_year
+from backend.data_access.storage.time_series_store import SeriesTable, TimeSeriesStore, TimestampLike, get_store
+
+
+class BacktestConfig(NamedTuple):
+    """The parameters of a backtest.
+
+    Attributes:
+        leverage (float): The notional of both legs relative to the equity, at least 1.
+        entry_fee (float): The fee per notional traded on each leg when entering and rebalancing.
+        exit_fee (float): The fee per notional traded on each leg when exiting.
+        rebalance_every (int, optional): The number of settlements between two rebalances, None
+            to never rebalance.
+    """
+    leverage: float = 1.0
+    entry_fee: float = 0.0
+    exit_fee: float = 0.0
+    rebalance_every: Optional[int] = None
+
+
+class DrawdownStats(NamedTuple):
+    """The drawdowns of an equity curve.
+
+    Attributes:
+        max_drawdown (float): The largest relative loss from a running peak, 0 or negative.
+        peak (np.datetime64): The timestamp of the peak before the largest drawdown.
+        trough (np.datetime64): The timestamp of the trough of the largest drawdown.
+        longest (np.timedelta64): The longest time spent below a running peak.
+    """
+    max_drawdown: float
+    peak: Optional[np.datetime64]
+    trough: Optional[np.datetime64]
+    longest: np.timedelta64
+
+
+class BacktestResult(NamedTuple):
+    """The equity curve of a backtest and its statistics.
+
+    Attributes:
+        timestamps (np.ndarray): The settlements as `datetime64[ms]`.
+        equity (np.ndarray): The equity after every settlement relative to the initial capital,
+            the exit fee is paid at the last settlement.
+        drawdown (np.ndarray): The relative distance of the equity to its running peak.
+        total_return (float): The return over the whole backtest.
+        apr (float): The compound annual return.
+        stats (DrawdownStats): The drawdown statistics.
+    """
+    timestamps: np.ndarray
+    equity: np.ndarray
+    drawdown: np.ndarray
+    total_return: float
+    apr: float
+    stats: DrawdownStats
+
+
+def _validate(config: BacktestConfig) -> None:
+    if config.leverage < 1:
+        raise ValueError(f"Leverage must be at least 1, got {config.leverage}")
+    if config.entry_fee < 0 or config.exit_fee < 0:
+        raise ValueError("Fees must not be negative")
+    if config.rebalance_every is not None and config.rebalance_every < 1:
+        raise ValueError(f"Rebalancing needs at least one settlement, got {config.rebalance_every}")
+
+
+def simulate_equity(funding: np.ndarray, interest: np.ndarray, config: BacktestConfig) -> np.ndarray:
+    """Simulate the equity of the position over aligned settlements.
+
+    The equity starts at 1 before the entry fee, the fees of rebalancing and exiting are paid at
+    the settlement they follow. Once the equity reaches 0 the position is lost and it stays 0.
+
+    Args:
+        funding (np.ndarray): The funding rate of every settlement along the last axis.
+        interest (np.ndarray): The interest accrued per borrowed unit over every settlement window.
+        config (BacktestConfig): The parameters of the backtest.
+
+    Returns:
+        np.ndarray: The equity after every settlement, of the broadcast shape of the rates.
+
+    Raises:
+        ValueError: If the parameters are invalid.
+    """
+    _validate(config)
+    funding, interest = np.broadcast_arrays(np.asarray(funding, dtype=np.float64), np.asarray(interest, dtype=np.float64))
+    periods = funding.shape[-1]
+    if periods == 0:
+        return np.zeros(funding.shape)
+
+    leverage = config.leverage
+    every = config.rebalance_every or periods
+    returns = leverage * funding - (leverage - 1) * interest
+
+    # Running sum of the returns within every block, each block starts from its own equity
+    blocks = np.arange(periods) // every
+    running = np.cumsum(returns, axis=-1)
+    before = np.concatenate([np.zeros(running.shape[:-1] + (1,)), running[..., :-1]], axis=-1)
+    within = running - before[..., blocks * every]
+
+    # Growth of every rebalanced block net of the fee on the traded notional of both legs
+    ends = np.arange(every - 1, periods - 1, every)
+    block_returns = within[..., ends]
+    growth = 1 + block_returns - 2 * config.entry_fee * leverage * np.abs(block_returns)
+    start = (1 - 2 * config.entry_fee * leverage) * np.cumprod(
+        np.concatenate([np.ones(growth.shape[:-1] + (1,)), growth], axis=-1),
+        axis=-1
+    )
+
+    equity = start[..., blocks] * (1 + within)
+    equity[..., ends] = start[..., 1:]
+    equity[..., -1] -= 2 * config.exit_fee * leverage * start[..., -1]
+    lost = np.logical_or.accumulate(equity <= 0, axis=-1)
+    return np.where(lost, 0.0, equity)
+
+
+def equity_drawdown(equity: np.ndarray) -> np.ndarray:
+    """Return the relative distance of the equity to its running peak along the last axis."""
+    peak = np.maximum.accumulate(equity, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(peak > 0, equity / peak - 1, 0.0)
+
+
+def drawdown_stats(timestamps: np.ndarray, equity: np.ndarray) -> DrawdownStats:
+    """Compute the drawdowns of an equity curve.
+
+    Args:
+        timestamps (np.ndarray): The timestamps of the curve as `datetime64[ms]`.
+        equity (np.ndarray): The equity, positive at the start.
+
+    Returns:
+        DrawdownStats: The drawdown statistics.
+    """
+    if len(equity) == 0:
+        return DrawdownStats(0.0, None, None, np.timedelta64(0, 'ms'))
+
+    drawdown = equity_drawdown(equity)
+    trough = int(np.argmin(drawdown))
+    index = np.arange(len(equity))
+    last_peak = np.maximum.accumulate(np.where(drawdown == 0, index, 0))
+    durations = timestamps - timestamps[last_peak]
+    return DrawdownStats(
+        float(drawdown[trough]),
+        timestamps[last_peak[trough]],
+        timestamps[trough],
+        durations.max()
+    )
+
+
+def annualized_return(final: float, settlements: int, periods: float) -> float:
+    """Return the compound annual return of an equity reaching `final` after `settlements`."""
+    return float(final ** (periods / settlements) - 1) if settlements else 0.0
+
+
+def backtest(
+    timestamps: np.ndarray,
+    funding: np.ndarray,
+    interest: np.ndarray,
+    config: BacktestConfig,
+    periods: float
+) -> BacktestResult:
+    """Backtest the position over aligned settlements.
+
+    Args:
+        timestamps (np.ndarray): The settlements as `datetime64[ms]`.
+        funding (np.ndarray): The funding rate of every settlement.
+        interest (np.ndarray): The interest accrued per borrowed unit over every settlement window.
+        config (BacktestConfig): The parameters of the backtest.
+        periods (float): The number of settlements in a year.
+
+    Returns:
+        BacktestResult: The equity curve and its statistics.
+    """
+    equity = simulate_equity(funding, interest, config)
+    final = float(equity[-1]) if len(equity) else 1.0
+    return BacktestResult(
+        timestamps,
+        equity,
+        equity_drawdown(equity),
+        final - 1,
+        annualized_return(final, len(equity), periods),
+        drawdown_stats(timestamps, equity)
+    )
+
+
+def run_backtest(
+    symbol: str,
+    stablecoin: str,
+    config: BacktestConfig = BacktestConfig(),
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    store: Optional[TimeSeriesStore] = None
+) -> BacktestResult:
+    """Backtest the position on the stored funding of a symbol and interest of a stable coin.
+
+    Every settlement is paired with the interest accrued over its window, see `align_interest`.
+    Settlements without any interest are left out.
+
+    Args:
+        symbol (str): The symbol of the perpetual.
+        stablecoin (str): The stable coin borrowed for the leveraged leg.
+        config (BacktestConfig, optional): The parameters of the backtest. Defaults to 1x without fees.
+        start (TimestampLike, optional): The first settlement, inclusive. Defaults to None.
+        end (TimestampLike, optional): The last settlement, exclusive. Defaults to None.
+        store (TimeSeriesStore, optional): The store to be read. Defaults to the active store.
+
+    Returns:
+        BacktestResult: The equity curve and its statistics.
+    """
+    store = store if store is not None else get_store()
+    interval = funding_interval(symbol)
+    timestamps, funding = store.read_entries(SeriesTable.FUNDING, symbol, start, end)
+    interest_timestamps, interest_rates = store.read_entries(
+        SeriesTable.INTEREST,
+        stablecoin,
+        start=timestamps[0] - interval if len(timestamps) else start,
+        end=end
+    )
+
+    covered, interest = align_interest(timestamps, interest_timestamps, interest_rates, interval)
+    return backtest(timestamps[covered], funding[covered], interest, config, periods_per_year(interval))
@@ -0,0 +1,131 @@
+""" This module contains the block bootstrap of the compound return of a rate series.
+
+Paths are drawn by concatenating blocks of consecutive historical rates, so the autocorrelation
+of funding regimes within a block survives the resampling. The log growth of every path is the
+sum of the log growth of its complete blocks plus the part of the current block up to the step.
+With the running sum of the historical log growth, every block is a single subtraction and every
+step of every path a single lookup, without materializing the resampled rates.
+
+The steps are processed in chunks holding all paths of a few steps, each chunk is reduced to its
+percentiles before the next one is built, so the memory stays below `chunk_bytes` for any number
+of paths and steps. All random draws happen before the first chunk, so the bands do not depend
+on the chunk size.
+"""
+from typing import NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+
+# Number of simulated paths
+BOOTSTRAP_PATHS = 10_000
+
+# Consecutive settlements drawn at once, a week of 8 hour settlements
+BOOTSTRAP_BLOCK = 21
+
+# Percentiles of the compound return at every step
+BOOTSTRAP_PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+
+# Upper bound of the memory of the paths of one chunk of steps
+BOOTSTRAP_CHUNK_BYTES = 32 * 1024 * 1024
+
+
+class BootstrapBands(NamedTuple):
+    """The percentiles of the compound return of the resampled paths.
+
+    Attributes:
+        percentiles (np.ndarray): The percentiles of the bands.
+        bands (np.ndarray): The compound return factor, one row per percentile and one column per step.
+    """
+    percentiles: np.ndarray
+    bands: np.ndarray
+
+
+def block_starts(rng: np.random.Generator, length: int, block: int, paths: int, blocks: int) -> np.ndarray:
+    """Draw the first index of every block of every path, uniformly over the full blocks of the history.
+
+    Returns:
+        np.ndarray: The start indices with one row per block and one column per path.
+    """
+    return rng.integers(0, length - block + 1, size=(blocks, paths))
+
+
+def sorted_percentiles(values: np.ndarray, percentiles: np.ndarray) -> np.ndarray:
+    """Return the percentiles of every row of sorted values, interpolated linearly like `np.percentile`.
+
+    A full sort of the rows is faster than `np.percentile` partitioning them around every percentile.
+
+    Returns:
+        np.ndarray: The percentiles with one row per percentile and one column per row of values.
+    """
+    position = (values.shape[1] - 1) * percentiles / 100
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, values.shape[1] - 1)
+    fraction = (position - lower)[:, None]
+    return (1 - fraction) * values[:, lower].T + fraction * values[:, upper].T
+
+
+def bootstrap_bands(
+    returns: np.ndarray,
+    steps: Optional[int] = None,
+    paths: int = BOOTSTRAP_PATHS,
+    block: int = BOOTSTRAP_BLOCK,
+    percentiles: Sequence[float] = BOOTSTRAP_PERCENTILES,
+    seed: Union[None, int, np.random.Generator] = None,
+    chunk_bytes: int = BOOTSTRAP_CHUNK_BYTES
+) -> BootstrapBands:
+    """Compute percentile bands of the compound return from block bootstrapped paths.
+
+    The percentiles are taken of the log growth, which preserves their order, and returned as
+    compound return factors like `Cumulative.compound`.
+
+    Args:
+        returns (np.ndarray): The historical rate of every settlement, all above -1.
+        steps (int, optional): The number of settlements of every path. Defaults to the length of the history.
+        paths (int, optional): The number of paths. Defaults to `BOOTSTRAP_PATHS`.
+        block (int, optional): The consecutive settlements drawn at once, capped at the length of
+            the history. Defaults to `BOOTSTRAP_BLOCK`.
+        percentiles (Sequence[float], optional): The percentiles of the bands. Defaults to `BOOTSTRAP_PERCENTILES`.
+        seed (int or np.random.Generator, optional): The seed or the generator of the draws. Defaults to
+            None for fresh entropy.
+        chunk_bytes (int, optional): The memory of the paths of one chunk of steps. Defaults to `BOOTSTRAP_CHUNK_BYTES`.
+
+    Returns:
+        BootstrapBands: The bands, with one column per step.
+
+    Raises:
+        ValueError: If the number of paths or the block length is not positive or a percentile
+            is outside of [0, 100].
+    """
+    if paths < 1 or block < 1:
+        raise ValueError(f"Bootstrap needs at least one path and one settlement per block, got {paths} and {block}")
+
+    percentiles = np.asarray(percentiles, dtype=np.float64)
+    if np.any((percentiles < 0) | (percentiles > 100)):
+        raise ValueError(f"Percentiles must be within [0, 100], got {percentiles.tolist()}")
+
+    growth = np.log1p(np.asarray(returns, dtype=np.float64))
+    steps = len(growth) if steps is None else steps
+    if len(growth) == 0 or steps == 0:
+        return BootstrapBands(percentiles, np.ones((len(percentiles), 0)))
+
+    rng = np.random.default_rng(seed)
+    block = min(block, len(growth))
+    running = np.concatenate([[0.0], np.cumsum(growth)])
+    starts = block_starts(rng, len(growth), block, paths, -(-steps // block))
+
+    # Log growth of every path before each of its blocks, less the running sum at the block start,
+    # so a step only adds the running sum at its position within the block
+    block_growth = running[starts + block] - running[starts]
+    offset = np.cumsum(block_growth, axis=0) - block_growth - running[starts]
+    del block_growth
+
+    # The index and the float temporaries of a chunk take about three times the paths
+    chunk = max(chunk_bytes // (3 * 8 * paths), 1)
+    bands = np.empty((len(percentiles), steps))
+    for first in range(0, steps, chunk):
+        step = np.arange(first, min(first + chunk, steps))
+        index, position = np.divmod(step, block)
+        values = offset[index] + running[starts[index] + (position + 1)[:, None]]
+        values.sort(axis=1)
+        bands[:, first:first + len(step)] = sorted_percentiles(values, percentiles)
+    return BootstrapBands(percentiles, np.exp(bands))
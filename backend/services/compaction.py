@@ -0,0 +1,132 @@
+""" This module contains the retention and compaction job for the open interest table.
+
+Open interest is kept at 1h granularity for `OPEN_INTEREST_HOURLY_RETENTION_DAYS`, at 8h
+granularity for `OPEN_INTEREST_8H_RETENTION_DAYS` and at daily granularity afterwards. Every
+run compacts the expired buckets of all symbols and returns the freed pages to the file system.
+"""
+from datetime import datetime, timedelta, timezone
+import logging
+from threading import Event, Thread
+from typing import Optional
+
+from sqlalchemy import text
+
+from backend.config import engine
+from backend.data_access.crud.crud_open_interest_compacted import OpenInterestTier, compact_open_interest_entries
+from backend.data_access.crud.crud_registry import get_instruments
+from backend.settings import backend_settings
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def compact_open_interest(
+    now: Optional[datetime] = None,
+    hourly_retention_days: Optional[int] = None,
+    eight_hours_retention_days: Optional[int] = None,
+    session_factory=None
+) -> int:
+    """Compact the expired open interest of all symbols into the coarser tiers.
+
+    Args:
+        now (datetime, optional): The reference time of the retention windows. Defaults to the current time.
+        hourly_retention_days (int, optional): Days to keep hourly data. Defaults to the backend settings.
+        eight_hours_retention_days (int, optional): Days to keep 8 hour buckets. Defaults to the backend settings.
+        session_factory (optional): The session factory to be used. Defaults to the global Session.
+
+    Returns:
+        int: The number of compacted buckets.
+    """
+    now = now if now is not None else datetime.now(timezone.utc)
+    if hourly_retention_days is None:
+        hourly_retention_days = backend_settings.OPEN_INTEREST_HOURLY_RETENTION_DAYS
+    if eight_hours_retention_days is None:
+        eight_hours_retention_days = backend_settings.OPEN_INTEREST_8H_RETENTION_DAYS
+
+    hourly_cutoff = now - timedelta(days=hourly_retention_days)
+    eight_hours_cutoff = now - timedelta(days=hourly_retention_days + eight_hours_retention_days)
+
+    compacted = 0
+    # Delisted instruments keep their history, so they are compacted as well
+    for instrument in get_instruments():
+        compacted += compact_open_interest_entries(
+            instrument.key,
+            OpenInterestTier.HOURLY,
+            OpenInterestTier.EIGHT_HOURS,
+            hourly_cutoff,
+            session_factory
+        )
+        compacted += compact_open_interest_entries(
+            instrument.key,
+            OpenInterestTier.EIGHT_HOURS,
+            OpenInterestTier.DAILY,
+            eight_hours_cutoff,
+            session_factory
+        )
+    logger.info("Open interest compaction finished, %d buckets compacted", compacted)
+    return compacted
+
+
+def vacuum_database(bind=None) -> None:
+    """Return the pages freed by the compaction to the file system.
+
+    Databases created without incremental auto vacuum are converted by one full `VACUUM`,
+    afterwards every call only runs a cheap `PRAGMA incremental_vacuum`.
+
+    Args:
+        bind (optional): The engine of the database. Defaults to the application engine.
+    """
+    bind = bind if bind is not None else engine
+
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        auto_vacuum = connection.execute(text("PRAGMA auto_vacuum")).scalar()
+        # 2 is INCREMENTAL, switching the mode only takes effect with a full VACUUM
+        if auto_vacuum != 2:
+            connection.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+            connection.execute(text("VACUUM"))
+            logger.info("Database converted to incremental auto vacuum")
+        else:
+            connection.execute(text("PRAGMA incremental_vacuum"))
+            logger.info("Incremental vacuum finished")
+
+
+def run_compaction(bind=None, session_factory=None) -> int:
+    """Compact the open interest and vacuum the database once.
+
+    Args:
+        bind (optional): The engine of the database. Defaults to the application engine.
+        session_factory (optional): The session factory to be used. Defaults to the global Session.
+
+    Returns:
+        int: The number of compacted buckets.
+    """
+    compacted = compact_open_interest(session_factory=session_factory)
+    if compacted:
+        vacuum_database(bind)
+    return compacted
+
+
+def start_compaction_job(interval_seconds: Optional[int] = None) -> Event:
+    """Run the compaction periodically in a daemon thread.
+
+    Args:
+        interval_seconds (int, optional): Seconds between two runs. Defaults to the backend settings.
+
+    Returns:
+        Event: Setting the event stops the job.
+    """
+    interval_seconds = interval_seconds if interval_seconds is not None else backend_settings.COMPACTION_INTERVAL_SECONDS
+    stop = Event()
+
+    def loop() -> None:
+        while not stop.is_set():
+            try:
+                run_compaction()
+            except Exception as e:
+                logger.error("Unexpected error during open interest compaction: %s", e)
+            stop.wait(interval_seconds)
+
+    Thread(target=loop, name="open-interest-compaction", daemon=True).start()
+    logger.info("Open interest compaction job started with an interval of %d seconds", interval_seconds)
+    return stop
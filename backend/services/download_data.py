@@ -1,13 +1,11 @@
 from datetime import datetime, timezone
 import logging
 import time
+from typing import Optional
 
 from backend.data_access.api_client.bybit_client import ByBitClient
-from backend.data_access.crud.crud_funding import create_funding_entries
-from backend.data_access.crud.crud_interest import create_interest_entries
-from backend.data_access.crud.crud_open_interest import create_open_interest_entries
+from backend.data_access.storage.time_series_store import SeriesTable, TimeSeriesStore, get_store
 from backend.models.models_api import FundingRequest, OpenInterestRequest
-from backend.models.models_orm import Coin, FundingRate, InterestRate, OpenInterest, Symbol
 
 
 # Configure logging
@@ -17,10 +15,12 @@ logger = logging.getLogger(__name__)
 
 def catch_latest_funding(
     client: ByBitClient,
-    symbol: Symbol,
-    most_recent_datetime: str
+    symbol: str,
+    most_recent_datetime: str,
+    store: Optional[TimeSeriesStore] = None
 ) -> None:
-    
+    store = store if store is not None else get_store()
+
     now = int(datetime.now(timezone.utc).timestamp() * 1000)
     end_time = now
 
@@ -30,31 +30,29 @@ def catch_latest_funding(
 
         category = "linear"
 
-        while end_time > most_recent_time:
-            data = client.get_funding_history(
-                FundingRequest(
-                    category=category,
-                    symbol=symbol,
-                    endTime=now
+        # The pages overlap the stored entries, the cumulative curves are recomputed once after the last one
+        with store.defer_cumulative(SeriesTable.FUNDING, symbol):
+            while end_time > most_recent_time:
+                data = client.get_funding_history(
+                    FundingRequest(
+                        category=category,
+                        symbol=symbol,
+                        endTime=now
+                    )
                 )
-            )
 
-            for item in data.list:
-                funding_rate_record = FundingRate(
-                    symbol=symbol.value,
-                    funding_rate=item.fundingRate,
-                    funding_rate_timestamp=item.fundingRateTimestamp
-                )
-                create_funding_entries(funding_rate_record=funding_rate_record)
+                store.create_entries(SeriesTable.FUNDING, symbol, *data.series)
 
-            end_time -= min(30*60*60*1000, end_time - most_recent_time)
+                end_time -= min(30*60*60*1000, end_time - most_recent_time)
 
 
 def catch_latest_open_interest(
     client: ByBitClient,
-    symbol: Symbol,
-    most_recent_datetime: str
+    symbol: str,
+    most_recent_datetime: str,
+    store: Optional[TimeSeriesStore] = None
 ) -> None:
+    store = store if store is not None else get_store()
 
     now = int(datetime.now(timezone.utc).timestamp() * 1000)
     end_time = now
@@ -75,22 +73,18 @@ def catch_latest_open_interest(
                 )
             )
 
-            for item in data.list:
-                open_interest_record = OpenInterest(
-                    symbol=symbol.value,
-                    open_interest=item.openInterest,
-                    open_interest_timestamp=item.timestamp
-                )
-                create_open_interest_entries(open_interest_record=open_interest_record)
+            store.create_entries(SeriesTable.OPEN_INTEREST, symbol, *data.series)
 
             end_time -= min(30*60*60*1000, end_time - most_recent_time)
 
 
 def catch_latest_interest(
     client: ByBitClient,
-    coin: Coin,
-    most_recent_datetime: str
+    coin: str,
+    most_recent_datetime: str,
+    store: Optional[TimeSeriesStore] = None
 ) -> None:
+    store = store if store is not None else get_store()
 
     now = int(datetime.now(timezone.utc).timestamp() * 1000)
     end_time = now
@@ -99,55 +93,51 @@ def catch_latest_interest(
 
     if most_recent_time < now - 8*60*60*1000:
 
-        while end_time > most_recent_time:
-            data = client.get_interest_rate(coin.value, end_time=now)
+        # The pages overlap the stored entries, the cumulative curves are recomputed once after the last one
+        with store.defer_cumulative(SeriesTable.INTEREST, coin):
+            while end_time > most_recent_time:
+                data = client.get_interest_rate(coin, end_time=now)
 
-            for item in data.list:
-                interest_rate_record = InterestRate(
-                    coin=coin.value,
-                    interest_rate=item.hourlyBorrowRate,
-                    interest_rate_timestamp=item.timestamp
-                )
-                create_interest_entries(interest_rate_record=interest_rate_record)
+                store.create_entries(SeriesTable.INTEREST, coin, *data.series)
 
-            end_time -= min(30*60*60*1000, end_time - most_recent_time)
+                end_time -= min(30*60*60*1000, end_time - most_recent_time)
 
 
 def fill_funding(
     client: ByBitClient,
-    symbol: Symbol
+    symbol: str,
+    store: Optional[TimeSeriesStore] = None
 ) -> None:
+    store = store if store is not None else get_store()
     category = "linear"
 
     now = int(time.time() * 1000)
     end_time = now
 
-    while True:
+    # The pages go back in time, the cumulative curves are recomputed once after the last one
+    with store.defer_cumulative(SeriesTable.FUNDING, symbol):
+        while True:
 
-        data = client.get_funding_history(
-            FundingRequest(
-                category=category,
-                symbol=symbol,
-                endTime=end_time
-            )
-        )
-        if data.list:
-            for item in data.list:
-                funding_rate_record = FundingRate(
-                    symbol=symbol.value,
-                    funding_rate=item.fundingRate,
-                    funding_rate_timestamp=item.fundingRateTimestamp
+            data = client.get_funding_history(
+                FundingRequest(
+                    category=category,
+                    symbol=symbol,
+                    endTime=end_time
                 )
-                create_funding_entries(funding_rate_record=funding_rate_record)
-            end_time = int(data.list[-1].fundingRateTimestamp) - 1
-        else:
-            break
+            )
+            if data.list:
+                store.create_entries(SeriesTable.FUNDING, symbol, *data.series)
+                end_time = int(data.list[-1].fundingRateTimestamp) - 1
+            else:
+                break
 
 
 def fill_open_interest(
     client: ByBitClient,
-    symbol: Symbol
+    symbol: str,
+    store: Optional[TimeSeriesStore] = None
 ) -> None:
+    store = store if store is not None else get_store()
     category = "linear"
 
     now = int(time.time() * 1000)
@@ -158,19 +148,13 @@ def fill_open_interest(
         data = client.get_open_interest(
             OpenInterestRequest(
                 category=category,
-                symbol=symbol.value,
+                symbol=symbol,
                 intervalTime="1h",
                 endTime=end_time
                 )
             )
         if data.list:
-            for item in data.list:
-                open_interest_record = OpenInterest(
-                    symbol=symbol.value,
-                    open_interest=item.openInterest,
-                    open_interest_timestamp=item.timestamp
-                )
-                create_open_interest_entries(open_interest_record=open_interest_record)
+            store.create_entries(SeriesTable.OPEN_INTEREST, symbol, *data.series)
             end_time = int(data.list[-1].timestamp) - 1
         else:
             break
@@ -178,22 +162,20 @@ def fill_open_interest(
 
 def fill_interest(
     client: ByBitClient,
-    coin: Coin
+    coin: str,
+    store: Optional[TimeSeriesStore] = None
 ) -> None:
+    store = store if store is not None else get_store()
     now = int(time.time() * 1000)
     end_time = now
 
-    while True:
-        data = client.get_interest_rate(coin.value, end_time=end_time)
+    # The pages go back in time, the cumulative curves are recomputed once after the last one
+    with store.defer_cumulative(SeriesTable.INTEREST, coin):
+        while True:
+            data = client.get_interest_rate(coin, end_time=end_time)
 
-        if data.list:
-            for item in data.list:
-                interest_rate_record = InterestRate(
-                    coin=coin.value,
-                    interest_rate=item.hourlyBorrowRate,
-                    interest_rate_timestamp=item.timestamp
-                )
-                create_interest_entries(interest_rate_record=interest_rate_record)
-            end_time = int(data.list[-1].timestamp) - 1
-        else:
-            break
\ No newline at end of file
+            if data.list:
+                store.create_entries(SeriesTable.INTEREST, coin, *data.series)
+                end_time = int(data.list[-1].timestamp) - 1
+            else:
+                break
\ No newline at end of file
@@ -0,0 +1,275 @@
+""" This module contains the streaming export of the stored series for research.
+
+The rows are read from one read-only session in chunks of `EXPORT_CHUNK_SIZE` with a streaming
+cursor and written chunk by chunk, so the memory use does not depend on the exported history.
+All tables are read from the same snapshot of the database. CSV and JSON Lines are written with
+the standard library, Parquet and Arrow IPC need the optional `pyarrow` dependency.
+
+Usage:
+
+    python -m backend.services.export PATH [--format csv|jsonl|parquet|arrow]
+        [--table TABLE ...] [--key KEY ...] [--start START] [--end END]
+"""
+import argparse
+import csv
+from enum import Enum
+import json
+import logging
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Union
+
+import numpy as np
+from sqlalchemy import String, select, type_coerce
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.config import ReadSession
+from backend.data_access.crud.crud_registry import load_registry
+from backend.data_access.storage.series_columns import SERIES_COLUMNS
+from backend.data_access.storage.time_series_store import SeriesTable, TimestampLike, to_naive_utc
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+# Rows read from the cursor and written at once
+EXPORT_CHUNK_SIZE = 50_000
+
+COLUMNS = ('table', 'key', 'timestamp', 'value')
+
+
+class ExportFormat(str, Enum):
+    """Enum for the file formats of an export."""
+    CSV = 'csv'
+    JSONL = 'jsonl'
+    PARQUET = 'parquet'
+    ARROW = 'arrow'
+
+
+class SeriesChunk(NamedTuple):
+    """A chunk of exported rows of one table, ordered by key and timestamp."""
+    table: SeriesTable
+    keys: np.ndarray
+    timestamps: np.ndarray
+    values: np.ndarray
+
+
+def iter_series_chunks(
+    tables: Optional[Iterable[SeriesTable]] = None,
+    keys: Optional[Iterable[str]] = None,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    session_factory=None
+) -> Iterator[SeriesChunk]:
+    """Stream the entries of several series within [start, end) in chunks.
+
+    Args:
+        tables (Iterable[SeriesTable], optional): The tables to be exported. Defaults to all tables.
+        keys (Iterable[str], optional): The symbols and coins to be exported, keys unknown to a
+            table are ignored for it. Defaults to all series.
+        start (TimestampLike, optional): Inclusive lower bound. Defaults to None.
+        end (TimestampLike, optional): Exclusive upper bound. Defaults to None.
+        chunk_size (int, optional): The number of rows per chunk. Defaults to `EXPORT_CHUNK_SIZE`.
+        session_factory (optional): The session factory to be used. Defaults to the read-only ReadSession.
+
+    Yields:
+        SeriesChunk: The chunks ordered by table, key and timestamp.
+
+    Raises:
+        ValueError: If a key is unknown to all exported tables or a stored key id is missing from
+            the registry, which happens when the registry was not loaded from the database.
+    """
+    session_factory = session_factory if session_factory is not None else ReadSession
+    tables = list(SeriesTable) if tables is None else [SeriesTable(table) for table in tables]
+    keys = None if keys is None else set(keys)
+    if keys is not None:
+        registered = {entry.key for table in tables for entry in SERIES_COLUMNS[table].key.type.registry.entries()}
+        if keys - registered:
+            raise ValueError(f"Keys not in the registry: {', '.join(sorted(keys - registered))}")
+
+    with session_factory() as session:
+        for table in tables:
+            columns = SERIES_COLUMNS[table]
+            registry = columns.key.type.registry
+            entries = [entry for entry in registry.entries() if keys is None or entry.key in keys]
+            if not entries:
+                continue
+
+            # Registry ids are small integers, so the keys are looked up by indexing
+            key_names = np.full(max(entry.id for entry in entries) + 1, None, dtype=object)
+            for entry in entries:
+                key_names[entry.id] = entry.key
+
+            query = select(
+                type_coerce(columns.key, columns.key.type.impl),
+                type_coerce(columns.timestamp, String),
+                columns.value
+            )
+            if keys is not None:
+                query = query.where(columns.key.in_([entry.key for entry in entries]))
+            if start is not None:
+                query = query.where(columns.timestamp >= to_naive_utc(start))
+            if end is not None:
+                query = query.where(columns.timestamp < to_naive_utc(end))
+            query = query.order_by(columns.key, columns.timestamp).execution_options(yield_per=chunk_size)
+
+            try:
+                for rows in session.execute(query).partitions():
+                    key_ids, timestamps, values = zip(*rows)
+                    key_ids = np.array(key_ids, dtype=np.int64)
+                    unknown = key_ids >= len(key_names)
+                    unknown[~unknown] = np.equal(key_names[key_ids[~unknown]], None)
+                    if unknown.any():
+                        raise ValueError(
+                            f"{table.value} key ids not in the registry: {np.unique(key_ids[unknown]).tolist()}"
+                        )
+                    yield SeriesChunk(
+                        table,
+                        key_names[key_ids],
+                        np.array(timestamps, dtype='datetime64[ms]'),
+                        np.array(values, dtype=np.float64)
+                    )
+            except SQLAlchemyError as e:
+                logger.error("Database error occurred while exporting %s records: %s", table.value, e)
+                raise
+
+
+def _iso(timestamps: np.ndarray) -> np.ndarray:
+    return np.datetime_as_string(timestamps, unit='ms')
+
+
+def _write_csv(path: Path, chunks: Iterator[SeriesChunk]) -> int:
+    written = 0
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(COLUMNS)
+        for chunk in chunks:
+            writer.writerows(zip([chunk.table.value] * len(chunk.keys), chunk.keys, _iso(chunk.timestamps), chunk.values.tolist()))
+            written += len(chunk.keys)
+    return written
+
+
+def _write_jsonl(path: Path, chunks: Iterator[SeriesChunk]) -> int:
+    written = 0
+    with open(path, 'w') as file:
+        for chunk in chunks:
+            file.writelines(
+                json.dumps(dict(zip(COLUMNS, (chunk.table.value, key, ts, value)))) + '\n'
+                for key, ts, value in zip(chunk.keys, _iso(chunk.timestamps), chunk.values.tolist())
+            )
+            written += len(chunk.keys)
+    return written
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Exporting Parquet or Arrow IPC files requires the optional dependency pyarrow") from e
+    return pyarrow
+
+
+def _write_arrow(path: Path, chunks: Iterator[SeriesChunk], export_format: ExportFormat) -> int:
+    pa = _import_pyarrow()
+    schema = pa.schema([
+        ('table', pa.string()),
+        ('key', pa.string()),
+        ('timestamp', pa.timestamp('ms', tz='UTC')),
+        ('value', pa.float64())
+    ])
+
+    if export_format == ExportFormat.PARQUET:
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(path, schema)
+    else:
+        import pyarrow.ipc as ipc
+        writer = ipc.new_file(str(path), schema)
+
+    written = 0
+    try:
+        for chunk in chunks:
+            batch = pa.record_batch(
+                [
+                    pa.array([chunk.table.value] * len(chunk.keys), pa.string()),
+                    pa.array(chunk.keys.tolist(), pa.string()),
+                    pa.array(chunk.timestamps, pa.timestamp('ms')).cast(pa.timestamp('ms', tz='UTC')),
+                    pa.array(chunk.values, pa.float64())
+                ],
+                schema=schema
+            )
+            writer.write_batch(batch)
+            written += len(chunk.keys)
+    finally:
+        writer.close()
+    return written
+
+
+def export_series(
+    path: PathLike,
+    export_format: ExportFormat = ExportFormat.CSV,
+    tables: Optional[Iterable[SeriesTable]] = None,
+    keys: Optional[Iterable[str]] = None,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    session_factory=None
+) -> int:
+    """Stream the entries of several series into a file.
+
+    Every row holds the table, the key, the timestamp in UTC and the value of one entry.
+
+    Args:
+        path (PathLike): The path of the exported file.
+        export_format (ExportFormat, optional): The file format. Defaults to CSV.
+        tables (Iterable[SeriesTable], optional): The tables to be exported. Defaults to all tables.
+        keys (Iterable[str], optional): The symbols and coins to be exported. Defaults to all series.
+        start (TimestampLike, optional): Inclusive lower bound. Defaults to None.
+        end (TimestampLike, optional): Exclusive upper bound. Defaults to None.
+        chunk_size (int, optional): The number of rows per chunk. Defaults to `EXPORT_CHUNK_SIZE`.
+        session_factory (optional): The session factory to be used. Defaults to the read-only ReadSession.
+
+    Returns:
+        int: The number of exported rows.
+
+    Raises:
+        ImportError: If Parquet or Arrow IPC is requested without pyarrow installed.
+    """
+    export_format = ExportFormat(export_format)
+    path = Path(path)
+    if export_format in (ExportFormat.PARQUET, ExportFormat.ARROW):
+        _import_pyarrow()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    chunks = iter_series_chunks(tables, keys, start, end, chunk_size, session_factory)
+    if export_format == ExportFormat.CSV:
+        written = _write_csv(path, chunks)
+    elif export_format == ExportFormat.JSONL:
+        written = _write_jsonl(path, chunks)
+    else:
+        written = _write_arrow(path, chunks, export_format)
+
+    logger.info("%d rows exported to %s", written, path)
+    return written
+
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export stored series as CSV, JSON Lines, Parquet or Arrow IPC.")
+    parser.add_argument('path', help='path of the exported file')
+    parser.add_argument('--format', default=ExportFormat.CSV.value, choices=[member.value for member in ExportFormat])
+    parser.add_argument('--table', action='append', choices=[member.value for member in SeriesTable],
+                        help='table to export, may be repeated, defaults to all tables')
+    parser.add_argument('--key', action='append', help='symbol or coin to export, may be repeated, defaults to all')
+    parser.add_argument('--start', help='inclusive lower bound, e.g. 2024-01-01')
+    parser.add_argument('--end', help='exclusive upper bound, e.g. 2024-07-01')
+    parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='rows read and written at once')
+    args = parser.parse_args(arguments)
+
+    # Instruments and coins added at runtime are only known after loading the registry from the database
+    load_registry()
+    export_series(args.path, args.format, args.table, args.key, args.start, args.end, args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
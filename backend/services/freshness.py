@@ -0,0 +1,76 @@
+""" This module contains the freshness check of the stored series.
+
+The most recent timestamp of every series is read with one grouped query per table. A series
+is stale once its last entry is older than `STALE_AFTER_INTERVALS` of its update intervals,
+i.e. the sync missed at least one settlement.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional
+
+from backend.data_access.crud.crud_registry import get_coins, get_instruments
+from backend.data_access.storage.time_series_store import SeriesTable, TimeSeriesStore, get_store
+
+
+# Number of missed update intervals after which a series counts as stale
+STALE_AFTER_INTERVALS = 2
+
+# Hours between two entries of the tables without a per instrument interval
+UPDATE_INTERVAL_HOURS = {
+    SeriesTable.OPEN_INTEREST: 1,
+    SeriesTable.INTEREST: 1
+}
+
+
+class SeriesFreshness(NamedTuple):
+    """The most recent update of one series."""
+    table: SeriesTable
+    key: str
+    latest: Optional[datetime]
+    stale: bool
+
+
+def read_watermarks(store: Optional[TimeSeriesStore] = None) -> Dict[SeriesTable, Dict[str, datetime]]:
+    """Read the most recent timestamp of every series with one query per table.
+
+    Args:
+        store (TimeSeriesStore, optional): The store to be read. Defaults to the active store.
+
+    Returns:
+        dict: The most recent timestamps by table and series key, empty series are left out.
+    """
+    store = store if store is not None else get_store()
+    return {table: store.read_most_recent_updates(table) for table in SeriesTable}
+
+
+def read_freshness(
+    store: Optional[TimeSeriesStore] = None,
+    now: Optional[datetime] = None,
+    active_only: bool = True
+) -> List[SeriesFreshness]:
+    """Read the freshness of every registered series.
+
+    Args:
+        store (TimeSeriesStore, optional): The store to be read. Defaults to the active store.
+        now (datetime, optional): The reference time as naive UTC. Defaults to the current time.
+        active_only (bool, optional): Leave out delisted instruments and inactive coins. Defaults to True.
+
+    Returns:
+        list: The freshness of every series, empty series count as stale.
+    """
+    now = now if now is not None else datetime.now(timezone.utc).replace(tzinfo=None)
+    watermarks = read_watermarks(store)
+
+    series = [
+        *((SeriesTable.FUNDING, entry.key, entry.funding_interval_hours) for entry in get_instruments(active_only)),
+        *((SeriesTable.OPEN_INTEREST, entry.key, UPDATE_INTERVAL_HOURS[SeriesTable.OPEN_INTEREST])
+          for entry in get_instruments(active_only)),
+        *((SeriesTable.INTEREST, entry.key, UPDATE_INTERVAL_HOURS[SeriesTable.INTEREST])
+          for entry in get_coins(active_only))
+    ]
+
+    freshness = []
+    for table, key, interval_hours in series:
+        latest = watermarks[table].get(key)
+        stale = latest is None or now - latest > timedelta(hours=STALE_AFTER_INTERVALS * (interval_hours or 8))
+        freshness.append(SeriesFreshness(table, key, latest, stale))
+    return freshness
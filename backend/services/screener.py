@@ -0,0 +1,206 @@
+""" This module contains the funding screener ranking all instruments by their recent carry.
+
+The funding of all instruments is read with one query and laid out as a matrix with one row
+per instrument and one column per hour, settlements of instruments with longer intervals leave
+the hours between them empty. Running sums of the rates, of their squares, of the settlements
+and of the positive settlements along the hours give the statistics of every trailing window of
+every instrument from one subtraction each. The result is cached per data version, the most
+recent funding timestamps of all instruments, so the table is only computed again after a sync.
+"""
+from datetime import datetime
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from backend.data_access.crud.crud_cache import SeriesCache
+from backend.data_access.crud.crud_registry import get_instruments
+from backend.data_access.storage.resample import HOUR
+from backend.data_access.storage.rolling import YEAR
+from backend.data_access.storage.time_series_store import SeriesTable, TimeSeriesStore, get_store, to_datetime64
+
+
+# Lengths in days of the trailing windows of the screener
+SCREENER_WINDOW_DAYS = (7, 30, 90, 365)
+
+# Screeners kept per store and set of instruments, a few KiB each
+SCREENERS = SeriesCache(max_bytes=4 * 1024 * 1024)
+
+
+class Screener(NamedTuple):
+    """The funding statistics of every instrument over the trailing windows.
+
+    The matrices have one row per instrument and one column per window, windows without any
+    settlement of an instrument are NaN.
+
+    Attributes:
+        symbols (np.ndarray): The symbols of the instruments.
+        windows (np.ndarray): The window lengths in days.
+        end (np.datetime64): The most recent settlement of all instruments, the end of every window.
+        apr (np.ndarray): The mean funding rate annualized without compounding.
+        hit_rate (np.ndarray): The share of settlements with positive funding.
+        volatility (np.ndarray): The annualized standard deviation of the funding rates.
+        settlements (np.ndarray): The number of settlements.
+    """
+    symbols: np.ndarray
+    windows: np.ndarray
+    end: np.datetime64
+    apr: np.ndarray
+    hit_rate: np.ndarray
+    volatility: np.ndarray
+    settlements: np.ndarray
+
+
+def funding_matrix(
+    series: Dict[str, Tuple[np.ndarray, np.ndarray]],
+    symbols: Iterable[str],
+    end: np.datetime64,
+    hours: int
+) -> np.ndarray:
+    """Lay out the funding of several instruments on the hours before `end`.
+
+    Args:
+        series (dict): The timestamps and rates by symbol.
+        symbols (Iterable[str]): The symbols of the rows.
+        end (np.datetime64): The last hour of the matrix.
+        hours (int): The number of hours of the matrix.
+
+    Returns:
+        np.ndarray: The rates with one row per symbol and one column per hour, NaN without a settlement.
+    """
+    symbols = list(symbols)
+    start = end.astype('datetime64[h]') - np.timedelta64(hours - 1, 'h')
+    matrix = np.full((len(symbols), hours), np.nan)
+    for row, symbol in enumerate(symbols):
+        timestamps, values = series.get(symbol, (np.array([], dtype='datetime64[ms]'), np.array([])))
+        columns = (to_datetime64(timestamps).astype('datetime64[h]') - start).astype(np.int64)
+        inside = (columns >= 0) & (columns < hours)
+        matrix[row, columns[inside]] = np.asarray(values, dtype=np.float64)[inside]
+    return matrix
+
+
+def compute_screener(
+    series: Dict[str, Tuple[np.ndarray, np.ndarray]],
+    intervals: Dict[str, np.timedelta64],
+    windows: Iterable[int] = SCREENER_WINDOW_DAYS,
+    end: Optional[np.datetime64] = None
+) -> Screener:
+    """Compute the funding statistics of several instruments over trailing windows.
+
+    Args:
+        series (dict): The timestamps and rates by symbol.
+        intervals (dict): The funding interval by symbol, the symbols are the rows of the screener.
+        windows (Iterable[int], optional): The window lengths in days. Defaults to `SCREENER_WINDOW_DAYS`.
+        end (np.datetime64, optional): The end of the windows. Defaults to the most recent settlement.
+
+    Returns:
+        Screener: The statistics of every instrument and window.
+    """
+    symbols = np.array(list(intervals), dtype=str)
+    windows = np.array(sorted(windows), dtype=np.int64)
+    if end is None:
+        latest = [to_datetime64(series[symbol][0])[-1] for symbol in symbols if symbol in series and len(series[symbol][0])]
+        end = max(latest) if latest else np.datetime64('NaT', 'ms')
+    if np.isnat(end) or len(symbols) == 0:
+        empty = np.full((len(symbols), len(windows)), np.nan)
+        return Screener(symbols, windows, end, empty, empty, empty, np.zeros(empty.shape, dtype=np.int64))
+
+    hours = int(windows[-1]) * 24
+    matrix = funding_matrix(series, symbols, end, hours)
+    settled = ~np.isnan(matrix)
+    rates = np.where(settled, matrix, 0.0)
+
+    # Running sums along the hours with a leading zero column, one subtraction per window
+    def running(values: np.ndarray) -> np.ndarray:
+        return np.concatenate([np.zeros((len(symbols), 1)), np.cumsum(values, axis=1)], axis=1)
+
+    starts = hours - windows * 24
+    totals = [running(values) for values in (rates, rates * rates, settled, rates > 0)]
+    sums, squares, counts, positive = (total[:, [hours]] - total[:, starts] for total in totals)
+
+    periods = np.array([YEAR / intervals[symbol] for symbol in symbols])[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(counts > 0, sums / counts, np.nan)
+        variance = np.maximum(squares / counts - mean * mean, 0.0)
+        return Screener(
+            symbols,
+            windows,
+            end,
+            mean * periods,
+            np.where(counts > 0, positive / counts, np.nan),
+            np.sqrt(variance * periods),
+            counts.astype(np.int64)
+        )
+
+
+def _data_version(watermarks: Dict[str, datetime], symbols: Iterable[str]) -> int:
+    """Return a version of the funding of the instruments, changing with every new settlement."""
+    return hash(tuple((symbol, watermarks.get(symbol)) for symbol in symbols))
+
+
+def load_screener(
+    store: Optional[TimeSeriesStore] = None,
+    active_only: bool = True,
+    windows: Iterable[int] = SCREENER_WINDOW_DAYS
+) -> Screener:
+    """Return the screener of all registered instruments, computed once per data version.
+
+    The most recent funding timestamps of all instruments are read with one grouped query. While
+    they are unchanged the cached screener is returned without reading the funding.
+
+    Args:
+        store (TimeSeriesStore, optional): The store to be read. Defaults to the active store.
+        active_only (bool, optional): Leave out delisted instruments. Defaults to True.
+        windows (Iterable[int], optional): The window lengths in days. Defaults to `SCREENER_WINDOW_DAYS`.
+
+    Returns:
+        Screener: The statistics of every instrument and window, its arrays are read-only.
+    """
+    store = store if store is not None else get_store()
+    windows = tuple(sorted(windows))
+    intervals = {
+        entry.key: np.timedelta64(entry.funding_interval_hours or 8, 'h')
+        for entry in get_instruments(active_only)
+    }
+    watermarks = store.read_most_recent_updates(SeriesTable.FUNDING)
+    version = _data_version(watermarks, intervals)
+    key = (store, tuple(intervals), windows)
+
+    screener = SCREENERS.get(key, version)
+    if screener is None:
+        latest = [watermarks[symbol] for symbol in intervals if symbol in watermarks]
+        end = to_datetime64([max(latest)])[0] if latest else np.datetime64('NaT', 'ms')
+        series = {}
+        if latest:
+            start = end.astype('datetime64[h]') - np.timedelta64(windows[-1], 'D') + HOUR
+            series = store.read_entries_many(SeriesTable.FUNDING, intervals, start=start)
+        screener = compute_screener(series, intervals, windows, end)
+        SCREENERS.put(key, version, screener)
+    return screener
+
+
+def rank_screener(screener: Screener, window: int, by: str = 'apr', descending: bool = True) -> np.ndarray:
+    """Return the row order of the screener ranked by a statistic of one window.
+
+    Instruments without a settlement in the window are ranked last.
+
+    Args:
+        screener (Screener): The screener to be ranked.
+        window (int): The window length in days.
+        by (str, optional): The statistic, `apr`, `hit_rate` or `volatility`. Defaults to 'apr'.
+        descending (bool, optional): Rank the largest values first. Defaults to True.
+
+    Returns:
+        np.ndarray: The row indices in ranked order.
+
+    Raises:
+        ValueError: If the window or the statistic is not part of the screener.
+    """
+    if by not in ('apr', 'hit_rate', 'volatility'):
+        raise ValueError(f"Unknown screener statistic {by}")
+    column = np.flatnonzero(screener.windows == window)
+    if len(column) == 0:
+        raise ValueError(f"Unknown screener window {window}")
+
+    values = getattr(screener, by)[:, column[0]]
+    keys = -values if descending else values
+    return np.lexsort((screener.symbols, np.where(np.isnan(keys), np.inf, keys)))
@@ -0,0 +1,214 @@
+""" This module contains the export and restore of compressed database snapshots.
+
+A snapshot consists of the gzip compressed database and a JSON manifest next to it holding the
+SHA-256 checksum of the compressed file and the sync watermark, i.e. the most recent timestamp,
+of every stored series. Restoring a snapshot on a fresh container and syncing from the
+watermarks replaces the full history download.
+
+Usage:
+
+    python -m backend.services.snapshot export [--database PATH] [--snapshot PATH]
+    python -m backend.services.snapshot restore [--database PATH] [--snapshot PATH]
+"""
+import argparse
+from datetime import datetime, timezone
+import gzip
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import shutil
+import sqlite3
+import tempfile
+from typing import Optional, Union
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.config import DATABASE_PATH, SNAPSHOT_PATH
+from backend.data_access.crud.crud_registry import migrate_registry
+from backend.data_access.storage.sqlite_store import SQLiteStore
+from backend.services.freshness import read_watermarks as store_watermarks
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def manifest_path(snapshot_path: PathLike) -> Path:
+    """Return the path of the manifest belonging to a snapshot."""
+    return Path(str(snapshot_path) + '.json')
+
+
+def _sha256(path: Path) -> str:
+    """Compute the SHA-256 checksum of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_watermarks(database_path: PathLike) -> dict:
+    """Read the most recent timestamp of every series stored in a database.
+
+    Args:
+        database_path (PathLike): The path of the database.
+
+    Returns:
+        dict: The ISO formatted watermarks by table and series key, empty series are left out.
+    """
+    engine = create_engine(f'sqlite:///{database_path}')
+    try:
+        store = SQLiteStore(sessionmaker(bind=engine))
+        return {
+            table.value: {key: ts.isoformat() for key, ts in sorted(latest.items())}
+            for table, latest in store_watermarks(store).items()
+        }
+    finally:
+        engine.dispose()
+
+
+def export_snapshot(database_path: PathLike = DATABASE_PATH, snapshot_path: PathLike = SNAPSHOT_PATH) -> dict:
+    """Export a compressed and checksummed snapshot of the database.
+
+    The database is copied with the SQLite backup API, so the snapshot is consistent even while
+    the ingestion is writing.
+
+    Args:
+        database_path (PathLike, optional): The path of the database. Defaults to the application database.
+        snapshot_path (PathLike, optional): The path of the snapshot. Defaults to the configured snapshot path.
+
+    Returns:
+        dict: The manifest of the snapshot.
+
+    Raises:
+        FileNotFoundError: If the database does not exist.
+    """
+    database_path = Path(database_path)
+    snapshot_path = Path(snapshot_path)
+    if not database_path.exists():
+        raise FileNotFoundError(f"Database {database_path} does not exist")
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as directory:
+        copy_path = Path(directory) / 'snapshot.db'
+        source = sqlite3.connect(database_path)
+        target = sqlite3.connect(copy_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+
+        # Snapshots of databases written before the registry existed are shipped migrated
+        engine = create_engine(f'sqlite:///{copy_path}')
+        try:
+            migrate_registry(engine)
+        finally:
+            engine.dispose()
+
+        watermarks = read_watermarks(copy_path)
+
+        temporary = snapshot_path.with_name(snapshot_path.name + '.tmp')
+        with open(copy_path, 'rb') as raw, gzip.open(temporary, 'wb', compresslevel=6) as compressed:
+            shutil.copyfileobj(raw, compressed, CHUNK_SIZE)
+        os.replace(temporary, snapshot_path)
+
+        manifest = {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'database_size': copy_path.stat().st_size,
+            'snapshot_size': snapshot_path.stat().st_size,
+            'sha256': _sha256(snapshot_path),
+            'watermarks': watermarks
+        }
+
+    with open(manifest_path(snapshot_path), 'w') as file:
+        json.dump(manifest, file, indent=2)
+    logger.info(
+        "Snapshot exported to %s (%d of %d bytes)",
+        snapshot_path, manifest['snapshot_size'], manifest['database_size']
+    )
+    return manifest
+
+
+def restore_snapshot(snapshot_path: PathLike = SNAPSHOT_PATH, database_path: PathLike = DATABASE_PATH) -> dict:
+    """Verify and restore a snapshot into the database path.
+
+    Args:
+        snapshot_path (PathLike, optional): The path of the snapshot. Defaults to the configured snapshot path.
+        database_path (PathLike, optional): The path of the database. Defaults to the application database.
+
+    Returns:
+        dict: The manifest of the restored snapshot.
+
+    Raises:
+        FileNotFoundError: If the snapshot or its manifest does not exist.
+        ValueError: If the checksum of the snapshot does not match its manifest.
+    """
+    snapshot_path = Path(snapshot_path)
+    database_path = Path(database_path)
+
+    with open(manifest_path(snapshot_path)) as file:
+        manifest = json.load(file)
+
+    checksum = _sha256(snapshot_path)
+    if checksum != manifest['sha256']:
+        raise ValueError(f"Checksum mismatch for snapshot {snapshot_path}: expected {manifest['sha256']}, got {checksum}")
+
+    database_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = database_path.with_name(database_path.name + '.restore')
+    with gzip.open(snapshot_path, 'rb') as compressed, open(temporary, 'wb') as raw:
+        shutil.copyfileobj(compressed, raw, CHUNK_SIZE)
+    os.replace(temporary, database_path)
+
+    logger.info("Snapshot %s created at %s restored to %s", snapshot_path, manifest['created_at'], database_path)
+    return manifest
+
+
+def restore_snapshot_if_missing(
+    database_path: PathLike = DATABASE_PATH,
+    snapshot_path: PathLike = SNAPSHOT_PATH
+) -> Optional[dict]:
+    """Restore the snapshot if the database does not exist yet.
+
+    Args:
+        database_path (PathLike, optional): The path of the database. Defaults to the application database.
+        snapshot_path (PathLike, optional): The path of the snapshot. Defaults to the configured snapshot path.
+
+    Returns:
+        dict: The manifest of the restored snapshot or None if nothing was restored.
+    """
+    if Path(database_path).exists():
+        return None
+    if not Path(snapshot_path).exists():
+        logger.info("No snapshot found at %s, starting with an empty database", snapshot_path)
+        return None
+
+    try:
+        return restore_snapshot(snapshot_path, database_path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.error("Snapshot %s could not be restored, starting with an empty database: %s", snapshot_path, e)
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export or restore a compressed database snapshot.")
+    parser.add_argument('command', choices=['export', 'restore'])
+    parser.add_argument('--database', default=DATABASE_PATH, help='path of the SQLite database')
+    parser.add_argument('--snapshot', default=SNAPSHOT_PATH, help='path of the compressed snapshot')
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        export_snapshot(args.database, args.snapshot)
+    else:
+        restore_snapshot(args.snapshot, args.database)
+
+
+if __name__ == '__main__':
+    main()
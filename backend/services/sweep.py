@@ -0,0 +1,305 @@
+""" This module contains the sweep of the basis trade backtest over instruments, stable coins and parameters.
+
+The funding of every instrument is aligned with the interest of every stable coin once in the
+parent process and packed into one shared memory block. The worker processes attach to the
+block when they start, so a task only carries the offset of its pair and the parameter grid and
+never pickles the series. Every task simulates all parameter sets of one pair, the results are
+yielded as the tasks finish and written to the `sweep_results` table in batches.
+
+Usage:
+
+    python -m backend.services.sweep [--symbol SYMBOL ...] [--stablecoin COIN ...]
+        [--leverage LEVERAGE ...] [--rebalance SETTLEMENTS ...] [--entry-fee FEE] [--exit-fee FEE]
+        [--start START] [--end END] [--processes PROCESSES]
+"""
+import argparse
+from datetime import datetime, timezone
+import logging
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+import os
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from backend.data_access.crud.crud_registry import get_coins, get_instruments
+from backend.data_access.crud.crud_sweep import SweepRow, write_sweep_results
+from backend.data_access.storage.resample import align_interest, funding_interval
+from backend.data_access.storage.rolling import periods_per_year
+from backend.data_access.storage.time_series_store import SeriesTable, TimeSeriesStore, TimestampLike, get_store
+from backend.services.backtest import BacktestConfig, annualized_return, equity_drawdown, simulate_equity
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Target leverages of the default grid
+SWEEP_LEVERAGES = (1.0, 2.0, 3.0, 5.0)
+
+# Settlements between two rebalances of the default grid, 0 never rebalances
+SWEEP_REBALANCE = (0, 3, 21, 90)
+
+# Results written to the database at once
+SWEEP_BATCH_SIZE = 1_000
+
+EMPTY_SERIES = (np.array([], dtype='datetime64[ms]'), np.array([]))
+
+
+class SweepPair(NamedTuple):
+    """The location of the aligned series of an instrument and a stable coin in the shared block."""
+    symbol: str
+    stablecoin: str
+    offset: int
+    length: int
+    periods: float
+
+
+class SweepTask(NamedTuple):
+    """One pair with the parameter grid to be simulated on it."""
+    pair: SweepPair
+    configs: Tuple[BacktestConfig, ...]
+
+
+# The series of the shared block in a worker process, set by `_attach`
+_shared: Optional[SharedMemory] = None
+_series: Optional[np.ndarray] = None
+
+
+def pack_series(aligned: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[SharedMemory, np.ndarray]:
+    """Pack the aligned funding and interest of all pairs into one shared memory block.
+
+    Args:
+        aligned (list): The funding and interest of every pair.
+
+    Returns:
+        tuple: The shared block holding a (2, n) float64 array and the offset of every pair.
+    """
+    lengths = np.array([len(funding) for funding, _ in aligned], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+    total = int(lengths.sum())
+
+    shared = SharedMemory(create=True, size=max(2 * total * 8, 1))
+    series = np.ndarray((2, total), dtype=np.float64, buffer=shared.buf)
+    for (funding, interest), offset, length in zip(aligned, offsets, lengths):
+        series[0, offset:offset + length] = funding
+        series[1, offset:offset + length] = interest
+    del series
+    return shared, offsets
+
+
+def _attach(name: str, total: int) -> None:
+    """Attach a worker process to the shared block."""
+    global _shared, _series
+    _shared = SharedMemory(name=name)
+    _series = np.ndarray((2, total), dtype=np.float64, buffer=_shared.buf)
+
+
+def _detach() -> None:
+    """Drop the views of the calling process on the shared block."""
+    global _shared, _series
+    _series = None
+    if _shared is not None:
+        _shared.close()
+        _shared = None
+
+
+def _run_task(task: SweepTask) -> List[SweepRow]:
+    """Simulate all parameter sets of one pair on the attached series."""
+    pair = task.pair
+    funding = _series[0, pair.offset:pair.offset + pair.length]
+    interest = _series[1, pair.offset:pair.offset + pair.length]
+
+    rows = []
+    for config in task.configs:
+        equity = simulate_equity(funding, interest, config)
+        final = float(equity[-1])
+        rows.append(SweepRow(
+            pair.symbol,
+            pair.stablecoin,
+            float(config.leverage),
+            config.rebalance_every or 0,
+            final - 1,
+            annualized_return(final, pair.length, pair.periods),
+            float(equity_drawdown(equity).min()),
+            pair.length
+        ))
+    return rows
+
+
+def sweep_configs(
+    leverages: Iterable[float] = SWEEP_LEVERAGES,
+    rebalance: Iterable[int] = SWEEP_REBALANCE,
+    entry_fee: float = 0.0,
+    exit_fee: float = 0.0
+) -> Tuple[BacktestConfig, ...]:
+    """Return the parameter grid of a sweep.
+
+    Args:
+        leverages (Iterable[float], optional): The target leverages. Defaults to `SWEEP_LEVERAGES`.
+        rebalance (Iterable[int], optional): The settlements between two rebalances, 0 never
+            rebalances. Defaults to `SWEEP_REBALANCE`.
+        entry_fee (float, optional): The fee per notional traded on entering and rebalancing. Defaults to 0.
+        exit_fee (float, optional): The fee per notional traded on exiting. Defaults to 0.
+
+    Returns:
+        tuple: The backtest parameters of every combination.
+    """
+    return tuple(
+        BacktestConfig(float(leverage), entry_fee, exit_fee, every or None)
+        for leverage in leverages
+        for every in rebalance
+    )
+
+
+def load_aligned_pairs(
+    symbols: Iterable[str],
+    stablecoins: Iterable[str],
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    store: Optional[TimeSeriesStore] = None
+) -> Tuple[List[Tuple[str, str, float]], List[Tuple[np.ndarray, np.ndarray]]]:
+    """Read the funding of all instruments and the interest of all stable coins and align every pair.
+
+    Both tables are read with one `read_entries_many` call each. Pairs without any settlement
+    covered by interest are left out.
+
+    Args:
+        symbols (Iterable[str]): The symbols of the instruments.
+        stablecoins (Iterable[str]): The stable coins.
+        start (TimestampLike, optional): The first settlement, inclusive. Defaults to None.
+        end (TimestampLike, optional): The last settlement, exclusive. Defaults to None.
+        store (TimeSeriesStore, optional): The store to be read. Defaults to the active store.
+
+    Returns:
+        tuple: The symbol, stable coin and settlements per year of every pair and its funding and interest.
+    """
+    store = store if store is not None else get_store()
+    symbols, stablecoins = list(symbols), list(stablecoins)
+    funding = store.read_entries_many(SeriesTable.FUNDING, symbols, start, end)
+    first = [timestamps[0] - funding_interval(symbol) for symbol, (timestamps, _) in funding.items() if len(timestamps)]
+    interest = store.read_entries_many(SeriesTable.INTEREST, stablecoins, min(first) if first else start, end)
+
+    pairs, aligned = [], []
+    for symbol in symbols:
+        interval = funding_interval(symbol)
+        settlements, rates = funding.get(symbol, EMPTY_SERIES)
+        for stablecoin in stablecoins:
+            covered, interest_rates = align_interest(settlements, *interest.get(stablecoin, EMPTY_SERIES), interval)
+            if covered.any():
+                pairs.append((symbol, stablecoin, periods_per_year(interval)))
+                aligned.append((rates[covered], interest_rates))
+    return pairs, aligned
+
+
+def run_sweep(
+    symbols: Optional[Iterable[str]] = None,
+    stablecoins: Optional[Iterable[str]] = None,
+    configs: Optional[Iterable[BacktestConfig]] = None,
+    start: Optional[TimestampLike] = None,
+    end: Optional[TimestampLike] = None,
+    processes: Optional[int] = None,
+    store: Optional[TimeSeriesStore] = None
+) -> Iterator[SweepRow]:
+    """Backtest every instrument with every stable coin and parameter set across processes.
+
+    Args:
+        symbols (Iterable[str], optional): The symbols. Defaults to all active instruments.
+        stablecoins (Iterable[str], optional): The stable coins. Defaults to all active coins.
+        configs (Iterable[BacktestConfig], optional): The parameter grid. Defaults to `sweep_configs()`.
+        start (TimestampLike, optional): The first settlement, inclusive. Defaults to None.
+        end (TimestampLike, optional): The last settlement, exclusive. Defaults to None.
+        processes (int, optional): The number of worker processes. Defaults to the number of cores,
+            1 runs the sweep in the calling process.
+        store (TimeSeriesStore, optional): The store to be read. Defaults to the active store.
+
+    Yields:
+        SweepRow: The results of every pair and parameter set, in the order the pairs finish.
+    """
+    symbols = list(symbols) if symbols is not None else [entry.key for entry in get_instruments(active_only=True)]
+    stablecoins = list(stablecoins) if stablecoins is not None else [entry.key for entry in get_coins(active_only=True)]
+    configs = tuple(configs) if configs is not None else sweep_configs()
+    processes = processes if processes is not None else os.cpu_count() or 1
+
+    pairs, aligned = load_aligned_pairs(symbols, stablecoins, start, end, store)
+    if not pairs:
+        return
+
+    shared, offsets = pack_series(aligned)
+    total = int(sum(len(funding) for funding, _ in aligned))
+    tasks = [
+        SweepTask(SweepPair(symbol, stablecoin, int(offset), len(funding), periods), configs)
+        for (symbol, stablecoin, periods), (funding, _), offset in zip(pairs, aligned, offsets)
+    ]
+    del aligned
+    logger.info("Sweeping %d pairs with %d parameter sets on %d processes", len(tasks), len(configs), processes)
+
+    try:
+        if processes == 1:
+            _attach(shared.name, total)
+            for task in tasks:
+                yield from _run_task(task)
+        else:
+            with get_context().Pool(processes, initializer=_attach, initargs=(shared.name, total)) as pool:
+                for rows in pool.imap_unordered(_run_task, tasks):
+                    yield from rows
+    finally:
+        _detach()
+        shared.close()
+        shared.unlink()
+
+
+def sweep_to_table(
+    rows: Iterable[SweepRow],
+    sweep_id: Optional[str] = None,
+    batch_size: int = SWEEP_BATCH_SIZE,
+    session_factory=None
+) -> Tuple[str, int]:
+    """Write the streamed results of a sweep to the `sweep_results` table in batches.
+
+    Args:
+        rows (Iterable[SweepRow]): The results, e.g. from `run_sweep`.
+        sweep_id (str, optional): The id of the sweep. Defaults to the current UTC time.
+        batch_size (int, optional): The results written at once. Defaults to `SWEEP_BATCH_SIZE`.
+        session_factory (optional): The session factory to be used. Defaults to the global Session.
+
+    Returns:
+        tuple: The id of the sweep and the number of written results.
+    """
+    sweep_id = sweep_id if sweep_id is not None else datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+    written, batch = 0, []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            written += write_sweep_results(sweep_id, batch, session_factory)
+            batch = []
+    written += write_sweep_results(sweep_id, batch, session_factory)
+    logger.info("Sweep %s wrote %d results", sweep_id, written)
+    return sweep_id, written
+
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Backtest the basis trade over instruments, stable coins and parameters.")
+    parser.add_argument('--symbol', action='append', help='symbol to sweep, may be repeated, defaults to all active')
+    parser.add_argument('--stablecoin', action='append', help='stable coin to sweep, may be repeated, defaults to all active')
+    parser.add_argument('--leverage', type=float, action='append', help=f'target leverage, defaults to {SWEEP_LEVERAGES}')
+    parser.add_argument('--rebalance', type=int, action='append',
+                        help=f'settlements between two rebalances, 0 never, defaults to {SWEEP_REBALANCE}')
+    parser.add_argument('--entry-fee', type=float, default=0.0006, help='fee per notional traded on entering and rebalancing')
+    parser.add_argument('--exit-fee', type=float, default=0.0006, help='fee per notional traded on exiting')
+    parser.add_argument('--start', help='first settlement, e.g. 2022-01-01')
+    parser.add_argument('--end', help='exclusive last settlement, e.g. 2025-01-01')
+    parser.add_argument('--processes', type=int, help='worker processes, defaults to the number of cores')
+    args = parser.parse_args(arguments)
+
+    configs = sweep_configs(
+        args.leverage or SWEEP_LEVERAGES,
+        args.rebalance if args.rebalance is not None else SWEEP_REBALANCE,
+        args.entry_fee,
+        args.exit_fee
+    )
+    rows = run_sweep(args.symbol, args.stablecoin, configs, args.start, args.end, args.processes)
+    sweep_to_table(rows)
+
+
+if __name__ == '__main__':
+    main()
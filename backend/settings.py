@@ -13,6 +13,11 @@ class BackendSettings(BaseSettings):
     ENDPOINT_OPEN_INTEREST_BYBIT: str = '/v5/market/open-interest'
     ENDPOINT_INTNEREST_BYBIT: str = '/v5/spot-margin-trade/interest-rate-history'
 
+    # Open interest retention
+    OPEN_INTEREST_HOURLY_RETENTION_DAYS: int = 90
+    OPEN_INTEREST_8H_RETENTION_DAYS: int = 730
+    COMPACTION_INTERVAL_SECONDS: int = 6*60*60
+
     class Config:
         case_sensitive = True
         env_file = '.env'
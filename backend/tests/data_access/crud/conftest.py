@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.models.models_orm import Base, FundingRate, InterestRate, Coin, Symbol
+
+
+TIMESTAMPS = ['1704067200000', '1704096000000', '1704124800000', '1704153600000']
+
+
+# Fixture providing a session factory for an in-memory database filled through the ORM,
+# the single shared connection lets the async tests read it from the executor threads
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        'sqlite:///:memory:',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as session:
+        for index, ts in enumerate(TIMESTAMPS[::-1]):
+            session.add(FundingRate(symbol=Symbol.BTCUSDT, funding_rate=str(index), funding_rate_timestamp=ts))
+        session.add(FundingRate(symbol=Symbol.ETHUSDT, funding_rate='0.5', funding_rate_timestamp=TIMESTAMPS[0]))
+        session.add(InterestRate(coin=Coin.USDT, interest_rate='0.1', interest_rate_timestamp=TIMESTAMPS[0]))
+        session.commit()
+    yield session_factory
+    engine.dispose()
@@ -0,0 +1,55 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+
+from backend.data_access.crud.crud_async import (
+    create_entries_async,
+    read_funding_entries_async,
+    read_latest_timestamps_async,
+    read_series_arrays_async,
+    read_series_arrays_many_async,
+    read_series_matrix_async
+)
+from backend.data_access.crud.crud_series import read_series_arrays
+from backend.data_access.storage.sqlite_store import SQLiteStore
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import Symbol
+
+
+def test_async_reads_match_sync_reads(session_factory):
+    async def read_all():
+        return await asyncio.gather(
+            read_series_arrays_async('funding_rates', Symbol.BTCUSDT.value, num_values=2, session_factory=session_factory),
+            read_series_arrays_many_async('funding_rates', [Symbol.ETHUSDT.value], session_factory=session_factory),
+            read_series_matrix_async('funding_rates', [Symbol.BTCUSDT.value], session_factory=session_factory),
+            read_latest_timestamps_async('interest_rates', session_factory=session_factory)
+        )
+
+    (timestamps, values), many, matrix, latest = asyncio.run(read_all())
+
+    expected = read_series_arrays('funding_rates', Symbol.BTCUSDT.value, num_values=2, session_factory=session_factory)
+    np.testing.assert_array_equal(timestamps, expected[0])
+    np.testing.assert_array_equal(values, [1.0, 0.0])
+    np.testing.assert_array_equal(many[Symbol.ETHUSDT.value][1], [0.5])
+    np.testing.assert_array_equal(matrix.values[:, 0], [3.0, 2.0, 1.0, 0.0])
+    assert latest == {'USDT': datetime(2024, 1, 1)}
+
+
+def test_create_entries_async(session_factory):
+    store = SQLiteStore(session_factory)
+    timestamps = np.array(['2024-01-02T08', '2024-01-02T16'], dtype='datetime64[ms]')
+
+    written = asyncio.run(create_entries_async(SeriesTable.FUNDING, Symbol.BTCUSDT.value, timestamps, [0.1, 0.2], store))
+
+    assert written == 2
+    _, values = read_series_arrays('funding_rates', Symbol.BTCUSDT.value, start='2024-01-02T08', session_factory=session_factory)
+    np.testing.assert_array_equal(values, [0.1, 0.2])
+
+
+def test_read_funding_entries_async(session_factory):
+    with patch("backend.data_access.crud.crud_funding.get_store", return_value=SQLiteStore(session_factory)):
+        _, values = asyncio.run(read_funding_entries_async(Symbol.BTCUSDT, num_values=1))
+
+    np.testing.assert_array_equal(values, [0.0])
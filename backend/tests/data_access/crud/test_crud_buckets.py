@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.data_access.crud.crud_buckets import read_bucketed_series
+from backend.data_access.storage.buckets import Aggregation, BucketResolution
+from backend.data_access.storage.rollups import Resolution, compute_rollups
+from backend.models.models_orm import Base, FundingRate, Symbol
+
+
+FIRST = datetime(2024, 1, 29)
+RATES = np.linspace(-0.0002, 0.0004, 120)
+
+
+# Fixture providing a session factory for an in-memory database with 40 days of 8 hour funding rates
+@pytest.fixture
+def session_factory():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as session:
+        for index, rate in enumerate(RATES):
+            ts = int((FIRST + timedelta(hours=8 * index) - datetime(1970, 1, 1)).total_seconds() * 1000)
+            session.add(FundingRate(symbol=Symbol.BTCUSDT, funding_rate=str(rate), funding_rate_timestamp=str(ts)))
+        session.commit()
+    yield session_factory
+    engine.dispose()
+
+
+@pytest.mark.parametrize("resolution", [Resolution.DAY, Resolution.WEEK, Resolution.MONTH])
+def test_read_bucketed_series_matches_rollups(session_factory, resolution):
+    timestamps = np.array([FIRST + timedelta(hours=8 * index) for index in range(len(RATES))], dtype='datetime64[ms]')
+    rollups = compute_rollups(timestamps, RATES, resolution)
+
+    for aggregation, expected in (
+        (Aggregation.SUM, rollups.sum),
+        (Aggregation.COMPOUND, rollups.compound),
+        (Aggregation.LAST, rollups.last),
+        (Aggregation.MEAN, rollups.sum / rollups.count),
+        (Aggregation.MIN, rollups.min),
+        (Aggregation.MAX, rollups.max)
+    ):
+        starts, values = read_bucketed_series(
+            'funding_rates', Symbol.BTCUSDT.value, resolution.value, aggregation, session_factory=session_factory
+        )
+        np.testing.assert_array_equal(starts, rollups.timestamps)
+        np.testing.assert_allclose(values, expected, rtol=1e-12)
+
+
+def test_read_bucketed_series_eight_hours_and_range(session_factory):
+    starts, values = read_bucketed_series(
+        'funding_rates',
+        Symbol.BTCUSDT.value,
+        BucketResolution.EIGHT_HOURS,
+        Aggregation.LAST,
+        start='2024-02-01',
+        end='2024-02-02',
+        session_factory=session_factory
+    )
+
+    assert starts[0] == np.datetime64('2024-02-01T00:00', 'ms')
+    assert len(starts) == 3
+    np.testing.assert_allclose(values, RATES[9:12])
+
+    starts, values = read_bucketed_series(
+        'funding_rates', Symbol.ETHUSDT.value, BucketResolution.DAY, Aggregation.SUM, session_factory=session_factory
+    )
+    assert len(starts) == len(values) == 0
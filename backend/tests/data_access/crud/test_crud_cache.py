@@ -0,0 +1,148 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.data_access.crud.crud_cache import SeriesCache, read_series_version
+from backend.data_access.storage.buckets import Aggregation, BucketResolution
+from backend.data_access.storage.sqlite_store import SQLiteStore
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import Base, Symbol
+
+
+TIMESTAMPS = np.array(['2024-01-01T00', '2024-01-01T08', '2024-01-01T16'], dtype='datetime64[ms]')
+VALUES = np.array([0.0001, 0.0002, -0.0001])
+
+
+# Fixture providing a session factory for a database file shared by several stores
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "cache.db"}')
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def test_series_cache_lru_eviction_by_bytes():
+    cache = SeriesCache(max_bytes=2 * 8 * 10)
+    for name in ('a', 'b'):
+        cache.put(name, 1, np.zeros(10))
+    assert cache.get('a', 1) is not None
+
+    cache.put('c', 1, np.zeros(10))
+    assert cache.get('b', 1) is None
+    assert cache.get('a', 1) is not None
+    assert cache.get('a', 2) is None
+
+    cache.put('huge', 1, np.zeros(100))
+    assert cache.stats() == {'hits': 2, 'misses': 2, 'evictions': 1, 'extensions': 0, 'entries': 2, 'bytes': 160, 'max_bytes': 160}
+
+
+def test_series_cache_counts_extensions_across_threads():
+    cache = SeriesCache()
+
+    def count(_):
+        for _ in range(1000):
+            cache.count_extension()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(count, range(8)))
+    assert cache.stats()['extensions'] == 8000
+
+
+def test_store_reads_are_cached_until_written(session_factory):
+    store = SQLiteStore(session_factory)
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, TIMESTAMPS[:2], VALUES[:2])
+    assert read_series_version(SeriesTable.FUNDING, Symbol.BTCUSDT.value, session_factory) == (1, 0)
+
+    first = store.read_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value)
+    second = store.read_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value)
+    assert first[1] is second[1]
+    assert not second[1].flags.writeable
+    store.read_buckets(SeriesTable.FUNDING, Symbol.BTCUSDT.value, BucketResolution.DAY, Aggregation.SUM)
+    assert store.cache.stats()['hits'] == 1
+    assert store.cache.stats()['misses'] == 2
+
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, TIMESTAMPS[2:], VALUES[2:])
+    _, values = store.read_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value)
+    np.testing.assert_array_equal(values, VALUES)
+
+
+def test_writes_of_other_processes_invalidate_the_cache(session_factory):
+    reader = SQLiteStore(session_factory)
+    writer = SQLiteStore(session_factory)
+    writer.create_entries(SeriesTable.FUNDING, Symbol.ETHUSDT.value, TIMESTAMPS[:1], VALUES[:1])
+    assert len(reader.read_entries(SeriesTable.FUNDING, Symbol.ETHUSDT.value)[0]) == 1
+
+    writer.create_entries(SeriesTable.FUNDING, Symbol.ETHUSDT.value, TIMESTAMPS[1:], VALUES[1:])
+    assert len(reader.read_entries(SeriesTable.FUNDING, Symbol.ETHUSDT.value)[0]) == 3
+    assert reader.cache.stats()['hits'] == 0
+
+
+def test_appended_entries_extend_cached_reads(session_factory):
+    store = SQLiteStore(session_factory)
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, TIMESTAMPS[:2], VALUES[:2])
+    store.read_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, num_values=2)
+    store.read_cumulative(SeriesTable.FUNDING, Symbol.BTCUSDT.value)
+
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, TIMESTAMPS[2:], VALUES[2:])
+    assert read_series_version(SeriesTable.FUNDING, Symbol.BTCUSDT.value, session_factory) == (2, 0)
+
+    timestamps, values = store.read_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, num_values=2)
+    np.testing.assert_array_equal(timestamps, TIMESTAMPS[1:])
+    np.testing.assert_array_equal(values, VALUES[1:])
+    cumulative = store.read_cumulative(SeriesTable.FUNDING, Symbol.BTCUSDT.value)
+    np.testing.assert_allclose(cumulative.linear, np.cumsum(VALUES))
+    np.testing.assert_allclose(cumulative.compound, np.cumprod(1 + VALUES))
+    assert store.cache.stats()['extensions'] == 2
+
+
+def test_rewritten_entries_reload_cached_reads(session_factory):
+    store = SQLiteStore(session_factory)
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, TIMESTAMPS, VALUES)
+    store.read_cumulative(SeriesTable.FUNDING, Symbol.BTCUSDT.value)
+
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, TIMESTAMPS[:1], np.array([0.5]))
+    assert read_series_version(SeriesTable.FUNDING, Symbol.BTCUSDT.value, session_factory) == (2, 2)
+
+    cumulative = store.read_cumulative(SeriesTable.FUNDING, Symbol.BTCUSDT.value)
+    np.testing.assert_allclose(cumulative.linear, np.cumsum([0.5, *VALUES[1:]]))
+    assert store.cache.stats()['extensions'] == 0
+
+
+def test_pages_written_out_of_order_extend_cached_reads(session_factory):
+    timestamps = np.datetime64('2024-01-01T00', 'ms') + np.arange(9) * np.timedelta64(8, 'h')
+    values = np.linspace(-0.0004, 0.0004, 9)
+    store = SQLiteStore(session_factory)
+
+    # A backfill writes the newest page first, then the older ones
+    extensions = []
+    for page in (slice(6, 9), slice(3, 6), slice(0, 3)):
+        store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, timestamps[page], values[page])
+        read_timestamps, read_values = store.read_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value)
+        cumulative = store.read_cumulative(SeriesTable.FUNDING, Symbol.BTCUSDT.value)
+        extensions.append(store.cache.stats()['extensions'])
+    assert extensions == [0, 1, 2]
+    assert read_series_version(SeriesTable.FUNDING, Symbol.BTCUSDT.value, session_factory) == (3, 0)
+    np.testing.assert_array_equal(read_timestamps, timestamps)
+    np.testing.assert_array_equal(read_values, values)
+    np.testing.assert_allclose(cumulative.linear, np.cumsum(values))
+
+    # An overlapping page repeating the stored values keeps the reads extendable, a changed value does not
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, timestamps[3:6], values[3:6])
+    assert read_series_version(SeriesTable.FUNDING, Symbol.BTCUSDT.value, session_factory) == (4, 0)
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, timestamps[4:5], np.array([0.5]))
+    assert read_series_version(SeriesTable.FUNDING, Symbol.BTCUSDT.value, session_factory) == (5, 5)
+
+
+def test_filled_gaps_reload_cached_reads(session_factory):
+    store = SQLiteStore(session_factory)
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, TIMESTAMPS[::2], VALUES[::2])
+    store.read_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value)
+
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, TIMESTAMPS[1:2], VALUES[1:2])
+    assert read_series_version(SeriesTable.FUNDING, Symbol.BTCUSDT.value, session_factory) == (2, 2)
+    np.testing.assert_array_equal(store.read_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value)[1], VALUES)
+    assert store.cache.stats()['extensions'] == 0
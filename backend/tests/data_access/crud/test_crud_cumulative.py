@@ -0,0 +1,194 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, delete, event, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.data_access.crud import crud_cumulative
+from backend.data_access.crud.crud_cumulative import (
+    backfill_cumulative,
+    count_cumulative_entries,
+    read_cumulative_curve,
+    update_cumulative
+)
+from backend.data_access.storage.cumulative import SPREAD_TABLE, compute_cumulative, spread_key
+from backend.data_access.storage.memory_store import MemoryStore
+from backend.data_access.storage.sqlite_store import SQLiteStore
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import Base, Coin, SeriesCumulative, Symbol
+
+
+SETTLEMENTS = np.datetime64('2024-01-01T08', 'ms') + np.arange(12) * np.timedelta64(8, 'h')
+FUNDING = np.random.default_rng(0).normal(1e-4, 1e-4, len(SETTLEMENTS))
+HOURS = np.datetime64('2024-01-01T00', 'ms') + np.arange(12 * 8 + 1) * np.timedelta64(1, 'h')
+INTEREST = np.random.default_rng(1).normal(1e-6, 1e-7, len(HOURS))
+
+
+# Fixture providing a session factory for an empty in-memory database
+@pytest.fixture
+def session_factory():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def stored_curve(session_factory, table, key):
+    with session_factory() as session:
+        return session.execute(
+            select(SeriesCumulative.value_linear, SeriesCumulative.value_log)
+                .where(SeriesCumulative.series_table == table)
+                .where(SeriesCumulative.series_key == key)
+                .order_by(SeriesCumulative.timestamp)
+        ).all()
+
+
+def test_appended_entries_extend_the_curve(session_factory):
+    store = SQLiteStore(session_factory)
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS[:5], FUNDING[:5])
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS[5:], FUNDING[5:])
+
+    linear, log = zip(*stored_curve(session_factory, SeriesTable.FUNDING.value, Symbol.BTCUSDT.value))
+    np.testing.assert_allclose(linear, np.cumsum(FUNDING))
+    np.testing.assert_allclose(log, np.cumsum(np.log1p(FUNDING)))
+
+
+def test_rewritten_entries_recompute_the_curve(session_factory):
+    store = SQLiteStore(session_factory)
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS, FUNDING)
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS[3:4], [0.01])
+
+    rewritten = FUNDING.copy()
+    rewritten[3] = 0.01
+    linear, _ = zip(*stored_curve(session_factory, SeriesTable.FUNDING.value, Symbol.BTCUSDT.value))
+    np.testing.assert_allclose(linear, np.cumsum(rewritten))
+
+
+def test_read_cumulative_curve_rebases_to_start(session_factory):
+    SQLiteStore(session_factory).create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS, FUNDING)
+
+    cumulative = read_cumulative_curve(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS[4], session_factory)
+    expected = compute_cumulative(SETTLEMENTS[4:], FUNDING[4:])
+
+    np.testing.assert_array_equal(cumulative.timestamps, expected.timestamps)
+    np.testing.assert_allclose(cumulative.linear, expected.linear)
+    np.testing.assert_allclose(cumulative.compound, expected.compound)
+
+
+def test_spread_curve_is_extended_at_ingest(session_factory):
+    store = SQLiteStore(session_factory)
+    memory = MemoryStore()
+    for target in (store, memory):
+        target.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS[:6], FUNDING[:6])
+        target.create_entries(SeriesTable.INTEREST, Coin.DAI.value, HOURS[:40], INTEREST[:40])
+
+    # The startup backfill persists the curve, settlements after the last interest entry are pending
+    assert backfill_cumulative([(Symbol.BTCUSDT.value, Coin.DAI.value)], session_factory) == 4
+    key = spread_key(Symbol.BTCUSDT.value, Coin.DAI.value)
+    assert count_cumulative_entries(SPREAD_TABLE, key, session_factory) == 4
+    assert len(store.read_spread_cumulative(Symbol.BTCUSDT.value, Coin.DAI.value).timestamps) == 4
+
+    for target in (store, memory):
+        target.create_entries(SeriesTable.INTEREST, Coin.DAI.value, HOURS[40:], INTEREST[40:])
+        target.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS[6:], FUNDING[6:])
+    assert count_cumulative_entries(SPREAD_TABLE, key, session_factory) == len(SETTLEMENTS)
+
+    persisted = store.read_spread_cumulative(Symbol.BTCUSDT.value, Coin.DAI.value, SETTLEMENTS[2])
+    computed = memory.read_spread_cumulative(Symbol.BTCUSDT.value, Coin.DAI.value, SETTLEMENTS[2])
+    np.testing.assert_array_equal(persisted.timestamps, computed.timestamps)
+    np.testing.assert_allclose(persisted.linear, computed.linear)
+    np.testing.assert_allclose(persisted.compound, computed.compound)
+
+
+# Test that ingest only updates the persisted spreads of the written funding or interest series
+def test_ingest_updates_only_the_spreads_of_the_written_series(session_factory):
+    store = SQLiteStore(session_factory)
+    for symbol in (Symbol.BTCUSDT.value, Symbol.ETHUSDT.value):
+        store.create_entries(SeriesTable.FUNDING, symbol, SETTLEMENTS[:6], FUNDING[:6])
+    for coin in (Coin.DAI.value, Coin.USDT.value):
+        store.create_entries(SeriesTable.INTEREST, coin, HOURS, INTEREST)
+    backfill_cumulative([(Symbol.BTCUSDT.value, Coin.DAI.value), (Symbol.ETHUSDT.value, Coin.USDT.value)], session_factory)
+
+    with patch(
+        'backend.data_access.crud.crud_cumulative.update_spread_cumulative',
+        wraps=crud_cumulative.update_spread_cumulative
+    ) as update:
+        store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS[6:], FUNDING[6:])
+        assert [call.args[1:3] for call in update.call_args_list] == [(Symbol.BTCUSDT.value, Coin.DAI.value)]
+
+        update.reset_mock()
+        store.create_entries(SeriesTable.INTEREST, Coin.USDT.value, HOURS[-1:] + np.timedelta64(1, 'h'), INTEREST[-1:])
+        assert [call.args[1:3] for call in update.call_args_list] == [(Symbol.ETHUSDT.value, Coin.USDT.value)]
+
+
+# Test that reads of series without a persisted curve compute it from the raw entries without writing
+def test_read_without_curve_does_not_write(session_factory):
+    store = SQLiteStore(session_factory)
+    memory = MemoryStore()
+    for target in (store, memory):
+        target.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS, FUNDING)
+        target.create_entries(SeriesTable.INTEREST, Coin.DAI.value, HOURS, INTEREST)
+    with session_factory() as session:
+        session.execute(delete(SeriesCumulative))
+        session.commit()
+
+    funding = store.read_cumulative(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS[4])
+    spread = store.read_spread_cumulative(Symbol.BTCUSDT.value, Coin.DAI.value, SETTLEMENTS[2])
+    expected = memory.read_spread_cumulative(Symbol.BTCUSDT.value, Coin.DAI.value, SETTLEMENTS[2])
+
+    np.testing.assert_allclose(funding.linear, np.cumsum(FUNDING[4:]))
+    np.testing.assert_array_equal(spread.timestamps, expected.timestamps)
+    np.testing.assert_allclose(spread.compound, expected.compound)
+    with session_factory() as session:
+        assert session.execute(select(SeriesCumulative)).first() is None
+
+
+# Test that the startup backfill only accumulates the series and spreads without a curve
+def test_backfill_cumulative(session_factory):
+    store = SQLiteStore(session_factory)
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS, FUNDING)
+    store.create_entries(SeriesTable.INTEREST, Coin.DAI.value, HOURS, INTEREST)
+    with session_factory() as session:
+        session.execute(delete(SeriesCumulative).where(SeriesCumulative.series_key == Symbol.BTCUSDT.value))
+        session.commit()
+
+    spreads = [(Symbol.BTCUSDT.value, Coin.DAI.value)]
+    assert backfill_cumulative(spreads, session_factory) == 2 * len(SETTLEMENTS)
+    assert count_cumulative_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, session_factory) == len(SETTLEMENTS)
+    assert backfill_cumulative(spreads, session_factory) == 0
+
+
+def test_appended_entries_delete_no_curve_points(session_factory):
+    statements = []
+    event.listen(session_factory.kw['bind'], 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    store = SQLiteStore(session_factory)
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS[:5], FUNDING[:5])
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS[5:], FUNDING[5:])
+
+    assert not [statement for statement in statements if statement.startswith('DELETE FROM series_cumulative')]
+    assert count_cumulative_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, session_factory) == len(SETTLEMENTS)
+
+
+def test_deferred_backfill_recomputes_the_curve_once(session_factory):
+    store = SQLiteStore(session_factory)
+    store.create_entries(SeriesTable.INTEREST, Coin.DAI.value, HOURS, INTEREST)
+    backfill_cumulative([(Symbol.BTCUSDT.value, Coin.DAI.value)], session_factory)
+
+    with patch('backend.data_access.storage.sqlite_store.update_cumulative', wraps=update_cumulative) as update:
+        with store.defer_cumulative(SeriesTable.FUNDING, Symbol.BTCUSDT.value):
+            for first in range(len(SETTLEMENTS) - 3, -1, -3):
+                store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS[first:first + 3], FUNDING[first:first + 3])
+            assert update.call_count == 0
+    assert update.call_count == 1
+
+    linear, log = zip(*stored_curve(session_factory, SeriesTable.FUNDING.value, Symbol.BTCUSDT.value))
+    np.testing.assert_allclose(linear, np.cumsum(FUNDING))
+    np.testing.assert_allclose(log, np.cumsum(np.log1p(FUNDING)))
+    memory = MemoryStore()
+    memory.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS, FUNDING)
+    memory.create_entries(SeriesTable.INTEREST, Coin.DAI.value, HOURS, INTEREST)
+    np.testing.assert_allclose(
+        store.read_spread_cumulative(Symbol.BTCUSDT.value, Coin.DAI.value).compound,
+        memory.read_spread_cumulative(Symbol.BTCUSDT.value, Coin.DAI.value).compound
+    )
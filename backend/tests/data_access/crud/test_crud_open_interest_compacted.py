@@ -0,0 +1,137 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.data_access.crud.crud_open_interest_compacted import (
+    OHLC,
+    OpenInterestTier,
+    aggregate_ohlc,
+    compact_open_interest_entries,
+    read_compacted_open_interest_entries,
+    read_most_recent_compacted_open_interest,
+    tier_bucket_start
+)
+from backend.data_access.storage.sqlite_store import SQLiteStore
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import Base, OpenInterest, OpenInterestCompacted, Symbol
+
+
+START = np.datetime64('2024-01-01T00', 'ms')
+
+
+# Fixture providing a session factory on an in-memory database
+@pytest.fixture
+def session_factory():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def hourly_store(session_factory):
+    store = SQLiteStore(session_factory)
+    timestamps = START + np.arange(72) * np.timedelta64(1, 'h')
+    store.create_entries(SeriesTable.OPEN_INTEREST, Symbol.BTCUSDT.value, timestamps, np.arange(72, dtype=float))
+    return store
+
+
+def test_tier_bucket_start():
+    timestamps = np.array(['2024-01-01T07:30', '2024-01-01T08', '2024-01-01T23'], dtype='datetime64[ms]')
+    np.testing.assert_array_equal(
+        tier_bucket_start(timestamps, OpenInterestTier.EIGHT_HOURS),
+        np.array(['2024-01-01T00', '2024-01-01T08', '2024-01-01T16'], dtype='datetime64[ms]')
+    )
+    np.testing.assert_array_equal(
+        tier_bucket_start(timestamps, OpenInterestTier.DAILY),
+        np.array(['2024-01-01', '2024-01-01', '2024-01-01'], dtype='datetime64[ms]')
+    )
+
+
+def test_aggregate_ohlc():
+    values = np.array([3.0, 5.0, 1.0, 2.0])
+    ohlc = OHLC(START + np.arange(4) * np.timedelta64(4, 'h'), values, values, values, values, np.ones(4, dtype=np.int64))
+
+    aggregated = aggregate_ohlc(ohlc, OpenInterestTier.EIGHT_HOURS)
+
+    np.testing.assert_array_equal(aggregated.open, [3.0, 1.0])
+    np.testing.assert_array_equal(aggregated.high, [5.0, 2.0])
+    np.testing.assert_array_equal(aggregated.low, [3.0, 1.0])
+    np.testing.assert_array_equal(aggregated.close, [5.0, 2.0])
+    np.testing.assert_array_equal(aggregated.count, [2, 2])
+
+
+# Test that only complete buckets before the cutoff are compacted and removed from the hourly table
+def test_compact_open_interest_entries(session_factory, hourly_store):
+    compacted = compact_open_interest_entries(
+        Symbol.BTCUSDT,
+        OpenInterestTier.HOURLY,
+        OpenInterestTier.EIGHT_HOURS,
+        '2024-01-02T03',
+        session_factory
+    )
+    assert compacted == 24
+
+    with session_factory() as session:
+        remaining = session.execute(select(func.count()).select_from(OpenInterest)).scalar()
+    assert remaining == 48
+
+    timestamps, values = read_compacted_open_interest_entries(Symbol.BTCUSDT, session_factory=session_factory)
+    np.testing.assert_array_equal(timestamps, START + np.arange(3) * np.timedelta64(8, 'h'))
+    np.testing.assert_array_equal(values, [0.0, 8.0, 16.0])
+
+
+# Test that 8 hour buckets are compacted further into daily buckets
+def test_compact_eight_hours_into_daily(session_factory, hourly_store):
+    compact_open_interest_entries(Symbol.BTCUSDT, OpenInterestTier.HOURLY, OpenInterestTier.EIGHT_HOURS, '2024-01-03', session_factory)
+    compacted = compact_open_interest_entries(Symbol.BTCUSDT, OpenInterestTier.EIGHT_HOURS, OpenInterestTier.DAILY, '2024-01-02', session_factory)
+    assert compacted == 3
+
+    timestamps, values = read_compacted_open_interest_entries(Symbol.BTCUSDT, session_factory=session_factory)
+    np.testing.assert_array_equal(timestamps, np.array(['2024-01-01T00', '2024-01-02T00', '2024-01-02T08', '2024-01-02T16'], dtype='datetime64[ms]'))
+    assert read_most_recent_compacted_open_interest(Symbol.BTCUSDT, session_factory) == np.datetime64('2024-01-02T16', 'ms').astype(object)
+
+
+# Test that store reads stitch the compacted tiers and the hourly entries together
+def test_store_reads_stitch_tiers(session_factory, hourly_store):
+    compact_open_interest_entries(Symbol.BTCUSDT, OpenInterestTier.HOURLY, OpenInterestTier.EIGHT_HOURS, '2024-01-02', session_factory)
+
+    timestamps, values = hourly_store.read_entries(SeriesTable.OPEN_INTEREST, Symbol.BTCUSDT.value)
+    assert len(timestamps) == 3 + 48
+    assert np.all(np.diff(timestamps) > np.timedelta64(0, 'ms'))
+    np.testing.assert_array_equal(values[:4], [0.0, 8.0, 16.0, 24.0])
+
+    timestamps, values = hourly_store.read_entries(SeriesTable.OPEN_INTEREST, Symbol.BTCUSDT.value, num_values=50)
+    assert len(timestamps) == 50
+    assert values[-1] == 71.0
+
+    series = hourly_store.read_entries_many(SeriesTable.OPEN_INTEREST, [Symbol.BTCUSDT.value], end='2024-01-01T12')
+    np.testing.assert_array_equal(series[Symbol.BTCUSDT.value][1], [0.0, 8.0])
+
+
+# Test that hours ingested again after their bucket was compacted are not counted a second time
+def test_compact_skips_buckets_already_compacted(session_factory, hourly_store):
+    compact_open_interest_entries(Symbol.BTCUSDT, OpenInterestTier.HOURLY, OpenInterestTier.EIGHT_HOURS, '2024-01-01T16', session_factory)
+    hourly_store.create_entries(
+        SeriesTable.OPEN_INTEREST,
+        Symbol.BTCUSDT.value,
+        START + np.arange(8) * np.timedelta64(1, 'h'),
+        np.full(8, 100.0)
+    )
+
+    compacted = compact_open_interest_entries(Symbol.BTCUSDT, OpenInterestTier.HOURLY, OpenInterestTier.EIGHT_HOURS, '2024-01-02', session_factory)
+    assert compacted == 16
+
+    with session_factory() as session:
+        buckets = session.execute(
+            select(OpenInterestCompacted.open, OpenInterestCompacted.high, OpenInterestCompacted.close, OpenInterestCompacted.count)
+                .order_by(OpenInterestCompacted.bucket_start)
+        ).all()
+        remaining = session.execute(
+            select(func.count()).select_from(OpenInterest).where(OpenInterest.open_interest_timestamp < datetime(2024, 1, 2))
+        ).scalar()
+    assert [tuple(bucket) for bucket in buckets] == [(0.0, 7.0, 7.0, 8), (8.0, 15.0, 15.0, 8), (16.0, 23.0, 23.0, 8)]
+    assert remaining == 0
@@ -0,0 +1,111 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.data_access.crud.crud_registry import (
+    create_coin,
+    create_instrument,
+    get_coins,
+    get_instruments,
+    migrate_registry,
+    set_instrument_active
+)
+from backend.data_access.storage.sqlite_store import SQLiteStore
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import INSTRUMENT_REGISTRY, Base, Coin, Symbol
+
+
+# Fixture providing an engine for an in-memory database with a seeded registry
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    migrate_registry(engine)
+    yield engine
+    engine.dispose()
+
+
+# Fixture providing an engine for a database written before the registry existed
+@pytest.fixture
+def legacy_engine(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "legacy.db"}')
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE funding_rates (symbol VARCHAR(14) NOT NULL, funding_rate_timestamp DATETIME NOT NULL, "
+            "funding_rate FLOAT NOT NULL, PRIMARY KEY (symbol, funding_rate_timestamp))"
+        ))
+        connection.execute(text(
+            "CREATE TABLE interest_rates (coin VARCHAR(4) NOT NULL, interest_rate_timestamp DATETIME NOT NULL, "
+            "interest_rate FLOAT NOT NULL, PRIMARY KEY (coin, interest_rate_timestamp))"
+        ))
+        connection.execute(text(
+            "INSERT INTO funding_rates VALUES ('BTCUSDC', '2024-01-01 00:00:00.000000', 0.1), "
+            "('BTCUSDT', '2024-01-01 00:00:00.000000', 0.2), ('UNKNOWN', '2024-01-01 00:00:00.000000', 0.3)"
+        ))
+        connection.execute(text("INSERT INTO interest_rates VALUES ('USDT', '2024-01-01 00:00:00.000000', 0.01)"))
+    yield engine
+    engine.dispose()
+
+
+def test_seeded_registry(engine):
+    instruments = get_instruments()
+    assert [entry.key for entry in instruments[:len(Symbol)]] == [symbol.value for symbol in Symbol]
+    assert instruments[0].id == 1
+    assert instruments[0].funding_interval_hours == 8
+    assert [entry.key for entry in get_coins()[:len(Coin)]] == [coin.value for coin in Coin]
+
+
+def test_series_are_keyed_by_integer_ids(engine):
+    store = SQLiteStore(sessionmaker(bind=engine))
+    store.create_entries(SeriesTable.FUNDING, Symbol.ETHUSDT.value, np.array([1704067200000]), np.array([0.1]))
+
+    with engine.connect() as connection:
+        stored = connection.execute(text("SELECT symbol FROM funding_rates")).scalar()
+    assert stored == INSTRUMENT_REGISTRY.id_of(Symbol.ETHUSDT.value)
+
+
+def test_create_instrument_without_enum_member(engine):
+    session_factory = sessionmaker(bind=engine)
+    entry = create_instrument('NEWUSDT', funding_interval_hours=4, listing_date=datetime(2024, 6, 1), session_factory=session_factory)
+    assert entry.id > len(Symbol)
+
+    store = SQLiteStore(session_factory)
+    store.create_entries(SeriesTable.FUNDING, 'NEWUSDT', np.array([1717200000000]), np.array([0.1]))
+    timestamps, values = store.read_entries(SeriesTable.FUNDING, 'NEWUSDT')
+    np.testing.assert_array_equal(values, [0.1])
+
+    set_instrument_active('NEWUSDT', False, session_factory)
+    assert 'NEWUSDT' in [instrument.key for instrument in get_instruments()]
+    assert 'NEWUSDT' not in [instrument.key for instrument in get_instruments(active_only=True)]
+
+
+def test_create_coin(engine):
+    entry = create_coin('FDUSD', session_factory=sessionmaker(bind=engine))
+    assert entry.key in [coin.key for coin in get_coins(active_only=True)]
+
+
+def test_unknown_key_raises(engine):
+    store = SQLiteStore(sessionmaker(bind=engine))
+    with pytest.raises(Exception, match="Unknown instrument"):
+        store.read_entries(SeriesTable.FUNDING, 'NOTLISTED')
+
+
+def test_migrate_legacy_tables(legacy_engine):
+    assert migrate_registry(legacy_engine) == 2
+    assert migrate_registry(legacy_engine) == 0
+
+    columns = {column['name']: str(column['type']) for column in inspect(legacy_engine).get_columns('funding_rates')}
+    assert columns['symbol'] == 'INTEGER'
+
+    store = SQLiteStore(sessionmaker(bind=legacy_engine))
+    _, values = store.read_entries(SeriesTable.FUNDING, Symbol.BTCUSDC.value)
+    np.testing.assert_array_equal(values, [0.1])
+    _, values = store.read_entries(SeriesTable.INTEREST, Coin.USDT.value)
+    np.testing.assert_array_equal(values, [0.01])
+
+    # Rows with keys missing from the registry are dropped
+    with legacy_engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM funding_rates")).scalar() == 2
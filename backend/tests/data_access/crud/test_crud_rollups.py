@@ -0,0 +1,134 @@
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from backend.data_access.crud.crud_rollups import (
+    backfill_rollups,
+    count_rollup_entries,
+    read_rollup_entries,
+    rebuild_rollups,
+    update_rollups
+)
+from backend.data_access.storage.rollups import Resolution, compute_rollups
+from backend.data_access.storage.sqlite_store import SQLiteStore
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import Base, Coin, SeriesRollup, Symbol
+
+
+# Fixture providing a session factory on an in-memory database
+@pytest.fixture
+def session_factory():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def generate_series(num_values):
+    timestamps = np.datetime64('2024-01-01T00', 'ms') + np.arange(num_values) * np.timedelta64(8, 'h')
+    values = np.random.default_rng(0).normal(1e-4, 1e-4, num_values)
+    return timestamps, values
+
+
+# Test that writing through the store keeps the rollups equal to a full recomputation
+def test_incremental_rollups_match_full_computation(session_factory):
+    store = SQLiteStore(session_factory)
+    timestamps, values = generate_series(200)
+
+    # Write in overlapping, unordered pages as the ingest does
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, timestamps[100:][::-1], values[100:][::-1])
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, timestamps[:120][::-1], values[:120][::-1])
+
+    for resolution in Resolution:
+        expected = compute_rollups(timestamps, values, resolution)
+        rollups = read_rollup_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, resolution, session_factory=session_factory)
+        np.testing.assert_array_equal(rollups.timestamps, expected.timestamps)
+        for column, expected_column in zip(rollups[1:], expected[1:]):
+            np.testing.assert_allclose(column, expected_column)
+
+
+# Test that only the buckets touched by new entries are written
+def test_update_rollups_touches_only_new_buckets(session_factory):
+    store = SQLiteStore(session_factory)
+    timestamps, values = generate_series(90)
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, timestamps, values)
+
+    with session_factory() as session:
+        written = update_rollups(session, SeriesTable.FUNDING, Symbol.BTCUSDT.value, timestamps[-1:])
+    assert written == len(Resolution)
+
+
+# Test that open interest is not rolled up
+def test_update_rollups_ignores_open_interest(session_factory):
+    timestamps, _ = generate_series(10)
+    with session_factory() as session:
+        assert update_rollups(session, SeriesTable.OPEN_INTEREST, Symbol.BTCUSDT.value, timestamps) == 0
+    with pytest.raises(ValueError):
+        read_rollup_entries(SeriesTable.OPEN_INTEREST, Symbol.BTCUSDT.value, Resolution.DAY, session_factory=session_factory)
+
+
+# Test reading the most recent buckets and a range of buckets
+def test_read_rollup_entries_num_values_and_range(session_factory):
+    store = SQLiteStore(session_factory)
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, *generate_series(30))
+
+    rollups = read_rollup_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, Resolution.DAY, num_values=3, session_factory=session_factory)
+    np.testing.assert_array_equal(rollups.timestamps, np.array(['2024-01-08', '2024-01-09', '2024-01-10'], dtype='datetime64[ms]'))
+
+    rollups = read_rollup_entries(
+        SeriesTable.FUNDING,
+        Symbol.BTCUSDT.value,
+        Resolution.DAY,
+        start='2024-01-02',
+        end='2024-01-04',
+        session_factory=session_factory
+    )
+    np.testing.assert_array_equal(rollups.timestamps, np.array(['2024-01-02', '2024-01-03'], dtype='datetime64[ms]'))
+    np.testing.assert_array_equal(rollups.count, [3, 3])
+
+
+# Test that rollups of series written before rollups existed are rebuilt
+def test_rebuild_rollups(session_factory):
+    store = SQLiteStore(session_factory)
+    store.create_entries(SeriesTable.FUNDING, Symbol.ETHUSDT.value, *generate_series(30))
+
+    written = rebuild_rollups(SeriesTable.FUNDING, Symbol.ETHUSDT.value, session_factory)
+    assert written == count_rollup_entries(SeriesTable.FUNDING, Symbol.ETHUSDT.value, session_factory)
+    assert written == 10 + 2 + 1
+
+
+def drop_rollups(session_factory, key):
+    """Delete the rollups of a series, like a series written before rollups were maintained."""
+    with session_factory() as session:
+        session.execute(delete(SeriesRollup).where(SeriesRollup.series_key == key))
+        session.commit()
+
+
+# Test that the startup backfill only rolls up the series without any rollups
+def test_backfill_rollups(session_factory):
+    store = SQLiteStore(session_factory)
+    store.create_entries(SeriesTable.FUNDING, Symbol.ETHUSDT.value, *generate_series(30))
+    store.create_entries(SeriesTable.INTEREST, Coin.DAI.value, *generate_series(30))
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, *generate_series(30))
+    drop_rollups(session_factory, Symbol.ETHUSDT.value)
+    drop_rollups(session_factory, Coin.DAI.value)
+
+    assert backfill_rollups(session_factory) == 2 * (10 + 2 + 1)
+    assert count_rollup_entries(SeriesTable.INTEREST, Coin.DAI.value, session_factory) == 10 + 2 + 1
+    assert backfill_rollups(session_factory) == 0
+
+
+# Test that reading a series without rollups computes them from the raw entries without writing
+def test_read_rollups_without_rollups_does_not_write(session_factory):
+    store = SQLiteStore(session_factory)
+    timestamps, values = generate_series(30)
+    store.create_entries(SeriesTable.FUNDING, Symbol.ETHUSDT.value, timestamps, values)
+    drop_rollups(session_factory, Symbol.ETHUSDT.value)
+
+    rollups = store.read_rollups(SeriesTable.FUNDING, Symbol.ETHUSDT.value, Resolution.DAY, start='2024-01-03T12', num_values=3)
+    expected = compute_rollups(timestamps, values, Resolution.DAY)
+
+    np.testing.assert_array_equal(rollups.timestamps, expected.timestamps[-3:])
+    np.testing.assert_allclose(rollups.sum, expected.sum[-3:])
+    assert count_rollup_entries(SeriesTable.FUNDING, Symbol.ETHUSDT.value, session_factory) == 0
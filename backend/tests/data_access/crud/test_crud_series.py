@@ -0,0 +1,109 @@
+from datetime import datetime, timezone
+
+import numpy as np
+
+from backend.data_access.crud.crud_series import (
+    read_latest_timestamps,
+    read_series_arrays,
+    read_series_arrays_many,
+    read_series_matrix,
+    rows_to_arrays
+)
+from backend.models.models_orm import Coin, Symbol
+
+
+def test_read_series_arrays(session_factory):
+    timestamps, values = read_series_arrays('funding_rates', Symbol.BTCUSDT.value, session_factory=session_factory)
+
+    assert timestamps.dtype == np.dtype('datetime64[ms]')
+    assert values.dtype == np.float64
+    assert timestamps[0] == np.datetime64('2024-01-01T00:00', 'ms')
+    assert np.all(np.diff(timestamps) == np.timedelta64(8, 'h'))
+    np.testing.assert_array_equal(values, [3.0, 2.0, 1.0, 0.0])
+
+
+def test_read_series_arrays_num_values_and_range(session_factory):
+    timestamps, values = read_series_arrays('funding_rates', Symbol.BTCUSDT.value, num_values=2, session_factory=session_factory)
+    np.testing.assert_array_equal(values, [1.0, 0.0])
+
+    timestamps, values = read_series_arrays(
+        'funding_rates',
+        Symbol.BTCUSDT.value,
+        start=datetime(2024, 1, 1, 8, tzinfo=timezone.utc),
+        end='2024-01-02T00',
+        session_factory=session_factory
+    )
+    np.testing.assert_array_equal(values, [2.0, 1.0])
+
+
+def test_read_series_arrays_empty(session_factory):
+    timestamps, values = read_series_arrays('interest_rates', Coin.DAI.value, session_factory=session_factory)
+    assert timestamps.dtype == np.dtype('datetime64[ms]')
+    assert len(timestamps) == len(values) == 0
+
+
+def test_read_latest_timestamps(session_factory):
+    latest = read_latest_timestamps('funding_rates', session_factory=session_factory)
+
+    assert latest == {
+        Symbol.BTCUSDT.value: datetime(2024, 1, 2),
+        Symbol.ETHUSDT.value: datetime(2024, 1, 1)
+    }
+    assert read_latest_timestamps('open_interest', session_factory=session_factory) == {}
+
+
+def test_read_series_arrays_many(session_factory):
+    series = read_series_arrays_many(
+        'funding_rates',
+        [Symbol.ETHUSDT.value, Symbol.BTCUSDT.value, Symbol.SOLUSDT.value],
+        session_factory=session_factory
+    )
+
+    np.testing.assert_array_equal(series[Symbol.BTCUSDT.value][1], [3.0, 2.0, 1.0, 0.0])
+    np.testing.assert_array_equal(series[Symbol.ETHUSDT.value][1], [0.5])
+    assert len(series[Symbol.SOLUSDT.value][0]) == 0
+
+
+def test_read_series_matrix(session_factory):
+    matrix = read_series_matrix(
+        'funding_rates',
+        [Symbol.ETHUSDT.value, Symbol.BTCUSDT.value, Symbol.SOLUSDT.value],
+        start='2023-12-31T20',
+        end='2024-01-02T08',
+        session_factory=session_factory
+    )
+
+    assert matrix.keys == [Symbol.ETHUSDT.value, Symbol.BTCUSDT.value, Symbol.SOLUSDT.value]
+    assert matrix.values.shape == (5, 3)
+    assert matrix.timestamps[0] == np.datetime64('2023-12-31T16:00', 'ms')
+    np.testing.assert_array_equal(matrix.values[:, 0], [np.nan, 0.5, np.nan, np.nan, np.nan])
+    np.testing.assert_array_equal(matrix.values[:, 1], [np.nan, 3.0, 2.0, 1.0, 0.0])
+    assert np.isnan(matrix.values[:, 2]).all()
+
+
+def test_read_series_matrix_without_range(session_factory):
+    matrix = read_series_matrix(
+        'funding_rates',
+        [Symbol.BTCUSDT.value, Symbol.ETHUSDT.value],
+        interval=np.timedelta64(4, 'h'),
+        session_factory=session_factory
+    )
+
+    assert len(matrix.timestamps) == 7
+    assert matrix.timestamps[-1] == np.datetime64('2024-01-02T00:00', 'ms')
+    np.testing.assert_array_equal(matrix.values[::2, 0], [3.0, 2.0, 1.0, 0.0])
+    assert np.isnan(matrix.values[1::2]).all()
+
+    empty = read_series_matrix('interest_rates', [Coin.DAI.value], session_factory=session_factory)
+    assert empty.values.shape == (0, 1)
+
+
+def test_rows_to_arrays():
+    timestamps, values = rows_to_arrays([('2024-01-01 00:00:00.000000', 1.5), ('2024-01-01 08:00:00.000000', 2)])
+
+    np.testing.assert_array_equal(timestamps, np.array(['2024-01-01T00', '2024-01-01T08'], dtype='datetime64[ms]'))
+    np.testing.assert_array_equal(values, [1.5, 2.0])
+    assert values.dtype == np.float64
+
+    timestamps, values = rows_to_arrays([])
+    assert timestamps.dtype == np.dtype('datetime64[ms]') and len(values) == 0
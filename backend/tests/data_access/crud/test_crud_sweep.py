@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.data_access.crud.crud_sweep import SweepRow, read_latest_sweep_id, read_sweep_results, write_sweep_results
+from backend.models.models_orm import Base
+
+
+ROWS = [
+    SweepRow('ETHUSDT', 'USDC', 2.0, 0, 0.1, 0.05, -0.02, 100),
+    SweepRow('BTCUSDT', 'USDC', 3.0, 21, 0.2, 0.1, -0.04, 100),
+    SweepRow('BTCUSDT', 'USDC', 1.0, 0, 0.05, 0.02, -0.01, 100)
+]
+
+
+# Fixture providing a session factory for an empty in-memory database
+@pytest.fixture
+def session_factory():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def test_write_and_read_sweep_results(session_factory):
+    assert write_sweep_results('20240101T000000', ROWS, session_factory) == 3
+
+    assert read_sweep_results('20240101T000000', session_factory) == [ROWS[2], ROWS[1], ROWS[0]]
+
+
+def test_write_sweep_results_replaces_rows(session_factory):
+    write_sweep_results('20240101T000000', ROWS, session_factory)
+    write_sweep_results('20240101T000000', [ROWS[0]._replace(apr=0.5)], session_factory)
+
+    rows = read_sweep_results('20240101T000000', session_factory)
+    assert len(rows) == 3
+    assert rows[-1].apr == 0.5
+
+
+def test_read_sweep_results_defaults_to_latest_sweep(session_factory):
+    write_sweep_results('20240101T000000', ROWS, session_factory)
+    write_sweep_results('20240201T000000', ROWS[:1], session_factory)
+
+    assert read_latest_sweep_id(session_factory) == '20240201T000000'
+    assert read_sweep_results(session_factory=session_factory) == ROWS[:1]
+
+
+def test_read_sweep_results_without_sweep(session_factory):
+    assert write_sweep_results('20240101T000000', [], session_factory) == 0
+    assert read_latest_sweep_id(session_factory) is None
+    assert read_sweep_results(session_factory=session_factory) == []
@@ -0,0 +1,51 @@
+import numpy as np
+
+from backend.data_access.storage.buckets import (
+    Aggregation,
+    BucketResolution,
+    bucket_index,
+    bucket_index_to_start,
+    reduce_buckets,
+    resolution_for_budget
+)
+from backend.data_access.storage.rollups import Resolution, bucket_start
+
+
+TIMESTAMPS = np.array(['2024-01-03T05', '2024-01-31T16', '2024-02-01T00', '2024-03-17T23'], dtype='datetime64[ms]')
+
+
+def test_bucket_index_round_trip_matches_rollup_buckets():
+    for resolution in (Resolution.DAY, Resolution.WEEK, Resolution.MONTH):
+        starts = bucket_index_to_start(bucket_index(TIMESTAMPS, resolution.value), resolution.value)
+        np.testing.assert_array_equal(starts, bucket_start(TIMESTAMPS, resolution))
+
+    starts = bucket_index_to_start(bucket_index(TIMESTAMPS, BucketResolution.EIGHT_HOURS), BucketResolution.EIGHT_HOURS)
+    np.testing.assert_array_equal(starts[:2], np.array(['2024-01-03T00', '2024-01-31T16'], dtype='datetime64[ms]'))
+
+
+def test_reduce_buckets():
+    values = np.array([0.1, 0.2, 0.3, 0.4])
+
+    starts, sums = reduce_buckets(TIMESTAMPS, values, BucketResolution.MONTH, Aggregation.SUM)
+    np.testing.assert_array_equal(starts, np.array(['2024-01', '2024-02', '2024-03'], dtype='datetime64[M]').astype('datetime64[ms]'))
+    np.testing.assert_allclose(sums, [0.3, 0.3, 0.4])
+
+    _, compound = reduce_buckets(TIMESTAMPS, values, BucketResolution.MONTH, Aggregation.COMPOUND)
+    np.testing.assert_allclose(compound, [1.1 * 1.2, 1.3, 1.4])
+    _, last = reduce_buckets(TIMESTAMPS, values, BucketResolution.MONTH, Aggregation.LAST)
+    np.testing.assert_allclose(last, [0.2, 0.3, 0.4])
+    _, mean = reduce_buckets(TIMESTAMPS, values, BucketResolution.MONTH, Aggregation.MEAN)
+    np.testing.assert_allclose(mean, [0.15, 0.3, 0.4])
+    _, lows = reduce_buckets(TIMESTAMPS, values, BucketResolution.MONTH, Aggregation.MIN)
+    np.testing.assert_allclose(lows, [0.1, 0.3, 0.4])
+    _, highs = reduce_buckets(TIMESTAMPS, values, BucketResolution.MONTH, Aggregation.MAX)
+    np.testing.assert_allclose(highs, [0.2, 0.3, 0.4])
+
+    starts, reduced = reduce_buckets(TIMESTAMPS[:0], values[:0], BucketResolution.DAY, Aggregation.SUM)
+    assert len(starts) == len(reduced) == 0
+
+
+def test_resolution_for_budget():
+    assert resolution_for_budget('2024-01-01', '2024-03-01') == BucketResolution.EIGHT_HOURS
+    assert resolution_for_budget('2020-01-01', '2024-01-01') == BucketResolution.WEEK
+    assert resolution_for_budget('2020-01-01', '2024-01-01', max_points=10) == BucketResolution.MONTH
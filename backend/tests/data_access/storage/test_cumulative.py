@@ -0,0 +1,52 @@
+import numpy as np
+
+from backend.data_access.storage.cumulative import (
+    compute_cumulative,
+    continue_cumulative,
+    cumulative_before,
+    rebase_cumulative
+)
+
+
+TIMESTAMPS = np.datetime64('2024-01-01T00', 'ms') + np.arange(6) * np.timedelta64(8, 'h')
+VALUES = np.array([0.001, -0.002, 0.003, 0.0005, 0.001, -0.001])
+
+
+def test_compute_cumulative_in_log_space():
+    rates = np.full(200_000, 1e-4)
+
+    cumulative = compute_cumulative(np.arange(len(rates)).astype('datetime64[ms]'), rates)
+
+    np.testing.assert_allclose(cumulative.compound[-1], np.exp(len(rates) * np.log1p(1e-4)), rtol=1e-12)
+    np.testing.assert_allclose(cumulative.compound[:100], np.cumprod(1 + rates[:100]))
+
+
+def test_rebase_cumulative_equals_curve_from_start():
+    rebased = rebase_cumulative(compute_cumulative(TIMESTAMPS, VALUES), TIMESTAMPS[2])
+    expected = compute_cumulative(TIMESTAMPS[2:], VALUES[2:])
+
+    np.testing.assert_array_equal(rebased.timestamps, expected.timestamps)
+    np.testing.assert_allclose(rebased.linear, expected.linear)
+    np.testing.assert_allclose(rebased.compound, expected.compound)
+
+
+def test_continue_cumulative_with_differently_based_tail():
+    head = compute_cumulative(TIMESTAMPS[:3], VALUES[:3])
+    # The tail starts at the last point of the head, accumulated from there
+    tail = compute_cumulative(TIMESTAMPS[2:], VALUES[2:])
+
+    continued = continue_cumulative(head, tail)
+    expected = compute_cumulative(TIMESTAMPS, VALUES)
+
+    np.testing.assert_array_equal(continued.timestamps, expected.timestamps)
+    np.testing.assert_allclose(continued.linear, expected.linear)
+    np.testing.assert_allclose(continued.compound, expected.compound)
+
+
+def test_cumulative_before():
+    cumulative = compute_cumulative(TIMESTAMPS, VALUES)
+
+    linear, compound = cumulative_before(cumulative, np.array([TIMESTAMPS[0], TIMESTAMPS[2], TIMESTAMPS[-1] + 1]))
+
+    np.testing.assert_allclose(linear, [0.0, VALUES[:2].sum(), VALUES.sum()])
+    np.testing.assert_allclose(compound, [1.0, np.prod(1 + VALUES[:2]), np.prod(1 + VALUES)])
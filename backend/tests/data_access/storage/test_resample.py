@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from backend.data_access.storage.resample import funding_interval, resample_to_settlements, settlement_window_starts
+from backend.models.models_orm import Symbol
+
+
+HOUR = np.timedelta64(1, 'h')
+START = np.datetime64('2024-01-01T00', 'ms')
+
+
+def reference_resample(settlements, timestamps, values, interval):
+    """Sum the hourly entries of every window with a plain loop over the entries."""
+    sums, counts = [], []
+    previous = None
+    for settlement in settlements:
+        start = settlement - interval if previous is None else max(previous, settlement - interval)
+        inside = [value for timestamp, value in zip(timestamps, values) if start <= timestamp < settlement]
+        sums.append(sum(inside))
+        counts.append(len(inside))
+        previous = settlement
+    return np.array(sums, dtype=np.float64), np.array(counts, dtype=np.int64)
+
+
+def random_series(rng, interval_hours):
+    """Draw hourly entries and settlements with missing hours and gaps in the funding."""
+    hours = int(rng.integers(0, 400))
+    timestamps = START + np.flatnonzero(rng.random(hours) > 0.2) * HOUR
+    values = rng.normal(1e-5, 1e-5, len(timestamps))
+
+    settlements = START + np.arange(-2, hours // interval_hours + 3) * interval_hours * HOUR
+    settlements = settlements[rng.random(len(settlements)) > 0.3]
+    return settlements, timestamps, values
+
+
+@pytest.mark.parametrize('interval_hours', [1, 4, 8])
+@pytest.mark.parametrize('seed', range(25))
+def test_resample_to_settlements_matches_reference(seed, interval_hours):
+    rng = np.random.default_rng(seed)
+    settlements, timestamps, values = random_series(rng, interval_hours)
+    interval = interval_hours * HOUR
+
+    windows = resample_to_settlements(settlements, timestamps, values, interval)
+    sums, counts = reference_resample(settlements, timestamps, values, interval)
+
+    np.testing.assert_allclose(windows.sums, sums, rtol=1e-12, atol=1e-18)
+    np.testing.assert_array_equal(windows.counts, counts)
+    # Every entry belongs to at most one window and no window spans more than the interval
+    assert windows.counts.sum() <= len(timestamps)
+    assert np.all(windows.expected <= interval_hours)
+
+
+def test_resample_to_settlements_regular():
+    timestamps = START + np.arange(24) * HOUR
+    settlements = START + np.arange(1, 4) * 8 * HOUR
+
+    windows = resample_to_settlements(settlements, timestamps, np.arange(24.0))
+
+    np.testing.assert_array_equal(windows.sums, [28.0, 92.0, 156.0])
+    np.testing.assert_array_equal(windows.counts, [8, 8, 8])
+    assert windows.complete.all()
+
+
+def test_resample_to_settlements_gaps_do_not_shift_windows():
+    timestamps = START + np.delete(np.arange(48), [3, 4]) * HOUR
+    # The settlement at 32h is missing, the window of the one at 40h only reaches back 8 hours
+    settlements = START + np.array([8, 16, 24, 40, 48]) * HOUR
+
+    windows = resample_to_settlements(settlements, timestamps, np.ones(len(timestamps)), 8 * HOUR)
+
+    np.testing.assert_array_equal(windows.counts, [6, 8, 8, 8, 8])
+    np.testing.assert_array_equal(windows.complete, [False, True, True, True, True])
+    np.testing.assert_array_equal(windows.starts[3], START + 32 * HOUR)
+
+
+def test_resample_to_settlements_empty():
+    windows = resample_to_settlements(START + np.arange(1, 3) * 8 * HOUR, np.array([], dtype='datetime64[ms]'), [])
+    np.testing.assert_array_equal(windows.sums, [0.0, 0.0])
+    np.testing.assert_array_equal(windows.counts, [0, 0])
+
+    windows = resample_to_settlements(np.array([], dtype='datetime64[ms]'), START + np.arange(3) * HOUR, np.ones(3))
+    assert len(windows.sums) == 0
+
+
+def test_settlement_window_starts_capped_after_gap():
+    settlements = START + np.array([4, 8, 20]) * HOUR
+
+    starts = settlement_window_starts(settlements, 4 * HOUR)
+
+    np.testing.assert_array_equal(starts, START + np.array([0, 4, 16]) * HOUR)
+
+
+def test_funding_interval_defaults_to_eight_hours():
+    assert funding_interval(Symbol.BTCUSDT.value) == np.timedelta64(8, 'h')
+    assert funding_interval('UNLISTEDUSDT') == np.timedelta64(8, 'h')
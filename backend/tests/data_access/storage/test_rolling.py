@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from backend.data_access.storage.rolling import (
+    RollingAccumulator,
+    compute_rolling_stats,
+    periods_per_year,
+    rolling_windows
+)
+
+
+VALUES = np.random.default_rng(7).normal(1e-4, 5e-5, 200)
+
+
+def reference_stats(values, window):
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    mean = np.r_[np.full(window - 1, np.nan), windows.mean(axis=1)]
+    std = np.r_[np.full(window - 1, np.nan), windows.std(axis=1)]
+    return mean, std
+
+
+def test_rolling_windows_and_periods_per_year():
+    assert rolling_windows(np.timedelta64(8, 'h')) == {7: 21, 30: 90, 90: 270}
+    assert rolling_windows(np.timedelta64(1, 'h'), days=[1]) == {1: 24}
+    assert periods_per_year(np.timedelta64(8, 'h')) == 3 * 365
+
+
+@pytest.mark.parametrize("window", [1, 5, 21, 200])
+def test_compute_rolling_stats_matches_reference(window):
+    stats = compute_rolling_stats(VALUES, [window], 1095)[window]
+    mean, std = reference_stats(VALUES, window)
+
+    np.testing.assert_allclose(stats.mean, mean, rtol=1e-9)
+    np.testing.assert_allclose(stats.std, std, rtol=1e-6, atol=1e-10)
+    np.testing.assert_allclose(stats.apr, mean * 1095, rtol=1e-9)
+    if window > 1:
+        np.testing.assert_allclose(stats.sharpe, mean / std * np.sqrt(1095), rtol=1e-6)
+        np.testing.assert_allclose(stats.zscore, (VALUES - mean) / std, rtol=1e-6, atol=1e-9)
+
+
+def test_compute_rolling_stats_of_large_constant_offset():
+    # The shift keeps the variance of rates far from zero from cancelling
+    stats = compute_rolling_stats(1e6 + VALUES, [21], 1095)[21]
+    _, std = reference_stats(VALUES, 21)
+
+    np.testing.assert_allclose(stats.std, std, rtol=1e-3)
+
+
+def test_rolling_accumulator_extends_statistics():
+    accumulator = RollingAccumulator([3, 21, 50], 1095)
+    parts = [accumulator.update(chunk) for chunk in np.split(VALUES, [2, 10, 11, 120])]
+    expected = compute_rolling_stats(VALUES, [3, 21, 50], 1095)
+
+    for window in (3, 21, 50):
+        for field in ('mean', 'std', 'zscore'):
+            np.testing.assert_allclose(
+                np.concatenate([getattr(part[window], field) for part in parts]),
+                getattr(expected[window], field),
+                rtol=1e-9
+            )
+
+
+def test_rolling_stats_of_constant_series():
+    stats = compute_rolling_stats(np.full(10, 0.001), [3], 1095)[3]
+
+    np.testing.assert_allclose(stats.std[2:], 0)
+    assert np.isnan(stats.sharpe).all()
+    assert np.isnan(stats.zscore).all()
+
+
+def test_rolling_accumulator_rejects_empty_windows():
+    with pytest.raises(ValueError):
+        RollingAccumulator([], 1095)
+    with pytest.raises(ValueError):
+        RollingAccumulator([0], 1095)
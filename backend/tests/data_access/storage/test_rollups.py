@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from backend.data_access.storage.rollups import Resolution, bucket_end, bucket_start, compute_rollups, rollup_resolution
+
+
+TIMESTAMPS = np.array(
+    ['2024-01-31T00', '2024-01-31T08', '2024-01-31T16', '2024-02-01T00', '2024-02-05T08'],
+    dtype='datetime64[ms]'
+)
+VALUES = np.array([0.01, 0.02, -0.01, 0.03, 0.04])
+
+
+@pytest.mark.parametrize("resolution, expected", [
+    (Resolution.DAY, ['2024-01-31', '2024-01-31', '2024-01-31', '2024-02-01', '2024-02-05']),
+    (Resolution.WEEK, ['2024-01-29', '2024-01-29', '2024-01-29', '2024-01-29', '2024-02-05']),
+    (Resolution.MONTH, ['2024-01-01', '2024-01-01', '2024-01-01', '2024-02-01', '2024-02-01'])
+])
+def test_bucket_start(resolution, expected):
+    np.testing.assert_array_equal(bucket_start(TIMESTAMPS, resolution), np.array(expected, dtype='datetime64[ms]'))
+
+
+def test_bucket_end():
+    starts = np.array(['2024-01-01'], dtype='datetime64[ms]')
+    assert bucket_end(starts, Resolution.DAY)[0] == np.datetime64('2024-01-02', 'ms')
+    assert bucket_end(starts, Resolution.WEEK)[0] == np.datetime64('2024-01-08', 'ms')
+    assert bucket_end(starts, Resolution.MONTH)[0] == np.datetime64('2024-02-01', 'ms')
+
+
+def test_compute_rollups_daily():
+    rollups = compute_rollups(TIMESTAMPS, VALUES, Resolution.DAY)
+
+    np.testing.assert_array_equal(rollups.timestamps, np.array(['2024-01-31', '2024-02-01', '2024-02-05'], dtype='datetime64[ms]'))
+    np.testing.assert_allclose(rollups.sum, [0.02, 0.03, 0.04])
+    np.testing.assert_allclose(rollups.compound, [1.01 * 1.02 * 0.99, 1.03, 1.04])
+    np.testing.assert_allclose(rollups.min, [-0.01, 0.03, 0.04])
+    np.testing.assert_allclose(rollups.max, [0.02, 0.03, 0.04])
+    np.testing.assert_array_equal(rollups.count, [3, 1, 1])
+    np.testing.assert_allclose(rollups.last, [-0.01, 0.03, 0.04])
+
+
+def test_compute_rollups_preserves_totals():
+    for resolution in Resolution:
+        rollups = compute_rollups(TIMESTAMPS, VALUES, resolution)
+        assert rollups.count.sum() == len(VALUES)
+        np.testing.assert_allclose(rollups.sum.sum(), VALUES.sum())
+        np.testing.assert_allclose(np.prod(rollups.compound), np.prod(1 + VALUES))
+
+
+def test_compute_rollups_empty():
+    rollups = compute_rollups(np.array([], dtype='datetime64[ms]'), np.array([]), Resolution.MONTH)
+    assert len(rollups.timestamps) == 0
+    assert len(rollups.count) == 0
+
+
+@pytest.mark.parametrize("days, expected", [(30, Resolution.DAY), (500, Resolution.DAY), (5 * 365, Resolution.WEEK), (50 * 365, Resolution.MONTH)])
+def test_rollup_resolution(days, expected):
+    end = np.datetime64('2024-12-01T00', 'ms')
+    assert rollup_resolution(end - np.timedelta64(days, 'D'), end, 500) == expected
@@ -0,0 +1,185 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.data_access.storage.buckets import Aggregation, BucketResolution
+from backend.data_access.storage.columnar_store import ColumnarStore
+from backend.data_access.storage.memory_store import MemoryStore, merge_series
+from backend.data_access.storage.rollups import Resolution
+from backend.data_access.storage.sqlite_store import SQLiteStore
+from backend.data_access.storage.time_series_store import SeriesTable, TimeSeriesStore, to_datetime64
+from backend.models.models_orm import Base, Coin, Symbol
+
+
+TIMESTAMPS = np.array(['2024-01-01T00', '2024-01-01T08', '2024-01-01T16', '2024-01-02T00'], dtype='datetime64[ms]')
+VALUES = np.array([0.0001, 0.0002, -0.0001, 0.0003])
+
+
+# Fixture running every test against each backend
+@pytest.fixture(params=["sqlite", "memory", "columnar"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        yield SQLiteStore(sessionmaker(bind=engine))
+        engine.dispose()
+    elif request.param == "memory":
+        yield MemoryStore()
+    else:
+        yield ColumnarStore(tmp_path / "columns")
+
+
+def test_store_implements_protocol(store):
+    assert isinstance(store, TimeSeriesStore)
+
+
+def test_create_and_read_entries(store):
+    # Entries arrive newest first from the exchange and are returned in ascending order
+    written = store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, TIMESTAMPS[::-1], VALUES[::-1])
+    timestamps, values = store.read_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value)
+
+    assert written == 4
+    assert timestamps.dtype == np.dtype('datetime64[ms]')
+    assert values.dtype == np.float64
+    np.testing.assert_array_equal(timestamps, TIMESTAMPS)
+    np.testing.assert_array_equal(values, VALUES)
+
+
+def test_create_entries_overwrites_duplicates(store):
+    store.create_entries(SeriesTable.INTEREST, Coin.USDT.value, TIMESTAMPS, VALUES)
+    store.create_entries(SeriesTable.INTEREST, Coin.USDT.value, TIMESTAMPS[:1], np.array([0.5]))
+    timestamps, values = store.read_entries(SeriesTable.INTEREST, Coin.USDT.value)
+
+    assert len(timestamps) == 4
+    assert values[0] == 0.5
+
+
+def test_read_entries_range_and_num_values(store):
+    store.create_entries(SeriesTable.OPEN_INTEREST, Symbol.ETHUSDT.value, TIMESTAMPS, VALUES)
+
+    timestamps, values = store.read_entries(
+        SeriesTable.OPEN_INTEREST,
+        Symbol.ETHUSDT.value,
+        start=datetime(2024, 1, 1, 8),
+        end=np.datetime64('2024-01-02T00')
+    )
+    np.testing.assert_array_equal(timestamps, TIMESTAMPS[1:3])
+    np.testing.assert_array_equal(values, VALUES[1:3])
+
+    timestamps, values = store.read_entries(SeriesTable.OPEN_INTEREST, Symbol.ETHUSDT.value, num_values=2)
+    np.testing.assert_array_equal(timestamps, TIMESTAMPS[2:])
+    np.testing.assert_array_equal(values, VALUES[2:])
+
+
+def test_read_entries_empty_series(store):
+    timestamps, values = store.read_entries(SeriesTable.FUNDING, Symbol.SOLUSDT.value)
+    assert len(timestamps) == 0
+    assert len(values) == 0
+
+
+def test_read_most_recent_update(store):
+    assert store.read_most_recent_update(SeriesTable.FUNDING, Symbol.BTCUSDC.value) is None
+
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDC.value, TIMESTAMPS, VALUES)
+    assert store.read_most_recent_update(SeriesTable.FUNDING, Symbol.BTCUSDC.value) == datetime(2024, 1, 2)
+
+
+def test_read_most_recent_updates(store):
+    assert store.read_most_recent_updates(SeriesTable.FUNDING) == {}
+
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDC.value, TIMESTAMPS, VALUES)
+    store.create_entries(SeriesTable.FUNDING, Symbol.ETHUSDT.value, TIMESTAMPS[:2], VALUES[:2])
+    store.create_entries(SeriesTable.INTEREST, Coin.USDT.value, TIMESTAMPS[:1], VALUES[:1])
+
+    assert store.read_most_recent_updates(SeriesTable.FUNDING) == {
+        Symbol.BTCUSDC.value: datetime(2024, 1, 2),
+        Symbol.ETHUSDT.value: datetime(2024, 1, 1, 8)
+    }
+    assert store.read_most_recent_updates(SeriesTable.INTEREST) == {Coin.USDT.value: datetime(2024, 1, 1)}
+
+
+def test_read_entries_many(store):
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, TIMESTAMPS, VALUES)
+    store.create_entries(SeriesTable.FUNDING, Symbol.ETHUSDT.value, TIMESTAMPS[:2], 2 * VALUES[:2])
+
+    series = store.read_entries_many(
+        SeriesTable.FUNDING,
+        [Symbol.BTCUSDT.value, Symbol.ETHUSDT.value, Symbol.SOLUSDT.value],
+        start=TIMESTAMPS[1]
+    )
+
+    assert set(series) == {Symbol.BTCUSDT.value, Symbol.ETHUSDT.value, Symbol.SOLUSDT.value}
+    np.testing.assert_array_equal(series[Symbol.BTCUSDT.value][1], VALUES[1:])
+    np.testing.assert_array_equal(series[Symbol.ETHUSDT.value][0], TIMESTAMPS[1:2])
+    assert len(series[Symbol.SOLUSDT.value][0]) == 0
+
+
+def test_merge_series_keeps_latest_value():
+    timestamps, values = merge_series(TIMESTAMPS[:2], VALUES[:2], TIMESTAMPS[1:3][::-1], np.array([9.0, 8.0]))
+    np.testing.assert_array_equal(timestamps, TIMESTAMPS[:3])
+    np.testing.assert_array_equal(values, [VALUES[0], 8.0, 9.0])
+
+
+def test_to_datetime64_from_milliseconds():
+    timestamps = to_datetime64(np.array([1700000000000]))
+    assert timestamps[0] == np.datetime64('2023-11-14T22:13:20', 'ms')
+
+
+def test_read_rollups(store):
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, TIMESTAMPS, VALUES)
+
+    rollups = store.read_rollups(SeriesTable.FUNDING, Symbol.BTCUSDT.value, Resolution.DAY)
+    np.testing.assert_array_equal(rollups.timestamps, np.array(['2024-01-01', '2024-01-02'], dtype='datetime64[ms]'))
+    np.testing.assert_allclose(rollups.sum, [VALUES[:3].sum(), VALUES[3]])
+    np.testing.assert_array_equal(rollups.count, [3, 1])
+
+    rollups = store.read_rollups(SeriesTable.FUNDING, Symbol.BTCUSDT.value, Resolution.DAY, start='2024-01-01T12')
+    np.testing.assert_array_equal(rollups.timestamps, np.array(['2024-01-02'], dtype='datetime64[ms]'))
+
+    rollups = store.read_rollups(SeriesTable.FUNDING, Symbol.BTCUSDT.value, Resolution.MONTH, num_values=1)
+    np.testing.assert_allclose(rollups.compound, [np.prod(1 + VALUES)])
+
+
+def test_read_buckets(store):
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, TIMESTAMPS, VALUES)
+
+    starts, sums = store.read_buckets(SeriesTable.FUNDING, Symbol.BTCUSDT.value, BucketResolution.DAY, Aggregation.SUM)
+    np.testing.assert_array_equal(starts, np.array(['2024-01-01', '2024-01-02'], dtype='datetime64[ms]'))
+    np.testing.assert_allclose(sums, [0.0002, 0.0003])
+
+    starts, last = store.read_buckets(
+        SeriesTable.FUNDING, Symbol.BTCUSDT.value, BucketResolution.WEEK, Aggregation.LAST, start='2024-01-01T08'
+    )
+    np.testing.assert_array_equal(starts, np.array(['2024-01-01'], dtype='datetime64[ms]'))
+    np.testing.assert_allclose(last, [0.0003])
+
+    _, lows = store.read_buckets(SeriesTable.FUNDING, Symbol.BTCUSDT.value, BucketResolution.DAY, Aggregation.MIN)
+    np.testing.assert_allclose(lows, [-0.0001, 0.0003])
+    _, highs = store.read_buckets(SeriesTable.FUNDING, Symbol.BTCUSDT.value, BucketResolution.DAY, Aggregation.MAX)
+    np.testing.assert_allclose(highs, [0.0002, 0.0003])
+
+
+def test_read_cumulative(store):
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, TIMESTAMPS, VALUES)
+
+    cumulative = store.read_cumulative(SeriesTable.FUNDING, Symbol.BTCUSDT.value, start=TIMESTAMPS[1])
+    np.testing.assert_array_equal(cumulative.timestamps, TIMESTAMPS[1:])
+    np.testing.assert_allclose(cumulative.linear, np.cumsum(VALUES[1:]))
+    np.testing.assert_allclose(cumulative.compound, np.cumprod(1 + VALUES[1:]))
+
+    with pytest.raises(ValueError):
+        store.read_cumulative(SeriesTable.OPEN_INTEREST, Symbol.BTCUSDT.value)
+
+
+def test_read_spread_cumulative(store):
+    settlements = to_datetime64(TIMESTAMPS)
+    hours = np.arange(settlements[0] - np.timedelta64(8, 'h'), settlements[-1] + np.timedelta64(1, 'h'), np.timedelta64(1, 'h'))
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, settlements, VALUES)
+    store.create_entries(SeriesTable.INTEREST, Coin.DAI.value, hours, np.full(len(hours), 1e-6))
+
+    cumulative = store.read_spread_cumulative(Symbol.BTCUSDT.value, Coin.DAI.value)
+    np.testing.assert_array_equal(cumulative.timestamps, settlements)
+    assert cumulative.linear[-1] == pytest.approx(np.sum(VALUES) - 1e-6 * (len(hours) - 1))
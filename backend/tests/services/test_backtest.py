@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from backend.data_access.storage.memory_store import MemoryStore
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import Coin, Symbol
+from backend.services.backtest import (
+    BacktestConfig,
+    backtest,
+    drawdown_stats,
+    run_backtest,
+    simulate_equity
+)
+
+
+RNG = np.random.default_rng(11)
+FUNDING = RNG.normal(1e-4, 2e-4, 500)
+INTEREST = RNG.normal(8e-5, 1e-5, 500)
+TIMESTAMPS = np.datetime64('2024-01-01T00', 'ms') + np.arange(500) * np.timedelta64(8, 'h')
+
+
+def simulate_with_loop(funding, interest, config):
+    """Step through the settlements one by one, rebalancing and paying the fees as they occur."""
+    leverage = config.leverage
+    equity = 1 - 2 * config.entry_fee * leverage
+    notional, borrowed = leverage * equity, (leverage - 1) * equity
+    curve = []
+    for index, (rate, cost) in enumerate(zip(funding, interest)):
+        equity += notional * rate - borrowed * cost
+        last = index == len(funding) - 1
+        if last:
+            equity -= 2 * config.exit_fee * notional
+        elif config.rebalance_every and (index + 1) % config.rebalance_every == 0:
+            equity -= 2 * config.entry_fee * abs(leverage * equity - notional)
+            notional, borrowed = leverage * equity, (leverage - 1) * equity
+        curve.append(equity)
+    return np.array(curve)
+
+
+@pytest.mark.parametrize("config", [
+    BacktestConfig(),
+    BacktestConfig(leverage=3, entry_fee=0.0006, exit_fee=0.0006),
+    BacktestConfig(leverage=2.5, entry_fee=0.0005, exit_fee=0.001, rebalance_every=21),
+    BacktestConfig(leverage=4, entry_fee=0.0002, rebalance_every=1),
+    BacktestConfig(leverage=2, rebalance_every=500)
+])
+def test_simulate_equity_matches_loop(config):
+    np.testing.assert_allclose(simulate_equity(FUNDING, INTEREST, config), simulate_with_loop(FUNDING, INTEREST, config))
+
+
+def test_simulate_equity_of_several_paths():
+    config = BacktestConfig(leverage=3, entry_fee=0.0006, rebalance_every=30)
+    paths = np.stack([FUNDING, FUNDING[::-1], 2 * FUNDING])
+
+    equity = simulate_equity(paths, INTEREST, config)
+
+    assert equity.shape == (3, 500)
+    for path, curve in zip(paths, equity):
+        np.testing.assert_allclose(curve, simulate_equity(path, INTEREST, config))
+
+
+def test_simulate_equity_stays_lost():
+    funding = np.array([0.001, -0.6, 0.5, 0.5])
+
+    equity = simulate_equity(funding, np.zeros(4), BacktestConfig(leverage=2))
+
+    np.testing.assert_allclose(equity, [1.002, 0.0, 0.0, 0.0])
+
+
+def test_simulate_equity_rejects_invalid_config():
+    for config in [BacktestConfig(leverage=0.5), BacktestConfig(entry_fee=-0.1), BacktestConfig(rebalance_every=0)]:
+        with pytest.raises(ValueError):
+            simulate_equity(FUNDING, INTEREST, config)
+
+
+def test_drawdown_stats():
+    timestamps = TIMESTAMPS[:6]
+    stats = drawdown_stats(timestamps, np.array([1.0, 1.2, 0.9, 1.1, 1.3, 1.0]))
+
+    assert stats.max_drawdown == pytest.approx(-0.25)
+    assert stats.peak == timestamps[1]
+    assert stats.trough == timestamps[2]
+    assert stats.longest == np.timedelta64(16, 'h')
+
+
+def test_backtest_statistics():
+    result = backtest(TIMESTAMPS, FUNDING, INTEREST, BacktestConfig(leverage=2), 3 * 365)
+
+    assert result.total_return == pytest.approx(result.equity[-1] - 1)
+    assert result.apr == pytest.approx(result.equity[-1] ** (3 * 365 / 500) - 1)
+    assert result.drawdown.min() == pytest.approx(result.stats.max_drawdown)
+    assert (result.drawdown <= 0).all()
+
+
+def test_run_backtest_reads_aligned_series():
+    store = MemoryStore()
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, TIMESTAMPS, FUNDING)
+    hours = np.arange(TIMESTAMPS[0] - np.timedelta64(8, 'h'), TIMESTAMPS[-1], np.timedelta64(1, 'h'))
+    store.create_entries(SeriesTable.INTEREST, Coin.DAI.value, hours, np.full(len(hours), 1e-5))
+
+    config = BacktestConfig(leverage=3, entry_fee=0.0006, exit_fee=0.0006, rebalance_every=21)
+    result = run_backtest(Symbol.BTCUSDT.value, Coin.DAI.value, config, store=store)
+
+    # Every settlement window holds 8 hours of interest
+    np.testing.assert_array_equal(result.timestamps, TIMESTAMPS)
+    np.testing.assert_allclose(result.equity, simulate_with_loop(FUNDING, np.full(500, 8e-5), config))
+
+
+def test_run_backtest_of_empty_series():
+    result = run_backtest(Symbol.BTCUSDT.value, Coin.DAI.value, store=MemoryStore())
+
+    assert len(result.equity) == 0
+    assert result.total_return == 0
+    assert result.stats.max_drawdown == 0
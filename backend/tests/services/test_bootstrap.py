@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from backend.services.bootstrap import bootstrap_bands, sorted_percentiles
+
+
+RETURNS = np.random.default_rng(3).normal(1e-4, 2e-4, 300)
+
+
+def bootstrap_with_paths(returns, steps, paths, block, percentiles, seed):
+    """Materialize every resampled path and take the percentiles of its compound return."""
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(0, len(returns) - block + 1, size=(-(-steps // block), paths))
+    index = (starts[:, None, :] + np.arange(block)[None, :, None]).reshape(-1, paths)[:steps]
+    growth = np.cumsum(np.log1p(returns[index]), axis=0)
+    return np.exp(np.percentile(growth, percentiles, axis=1))
+
+
+@pytest.mark.parametrize("steps, block", [(300, 21), (250, 7), (500, 21), (50, 1)])
+def test_bootstrap_bands_match_materialized_paths(steps, block):
+    result = bootstrap_bands(RETURNS, steps, paths=200, block=block, percentiles=(5, 50, 95), seed=1)
+
+    assert result.bands.shape == (3, steps)
+    np.testing.assert_allclose(result.bands, bootstrap_with_paths(RETURNS, steps, 200, block, (5, 50, 95), 1))
+
+
+def test_bootstrap_bands_do_not_depend_on_the_chunk_size():
+    whole = bootstrap_bands(RETURNS, paths=500, seed=7)
+    chunked = bootstrap_bands(RETURNS, paths=500, seed=7, chunk_bytes=1)
+
+    np.testing.assert_array_equal(whole.bands, chunked.bands)
+
+
+def test_bootstrap_bands_are_seedable():
+    first = bootstrap_bands(RETURNS, paths=100, seed=2)
+
+    np.testing.assert_array_equal(first.bands, bootstrap_bands(RETURNS, paths=100, seed=np.random.default_rng(2)).bands)
+    assert not np.array_equal(first.bands, bootstrap_bands(RETURNS, paths=100, seed=3).bands)
+
+
+def test_bootstrap_bands_of_a_constant_rate():
+    result = bootstrap_bands(np.full(30, 0.001), 60, paths=50, block=100, seed=0)
+
+    # The block is capped at the history, every path compounds the same rate
+    for band in result.bands:
+        np.testing.assert_allclose(band, 1.001 ** np.arange(1, 61))
+
+
+def test_bootstrap_bands_without_history():
+    result = bootstrap_bands(np.array([]), paths=10)
+
+    assert result.bands.shape == (5, 0)
+
+
+@pytest.mark.parametrize("arguments", [{"paths": 0}, {"block": 0}, {"percentiles": (50, 101)}])
+def test_bootstrap_bands_rejects_invalid_arguments(arguments):
+    with pytest.raises(ValueError):
+        bootstrap_bands(RETURNS, **arguments)
+
+
+def test_sorted_percentiles():
+    values = np.sort(np.random.default_rng(0).normal(size=(4, 101)), axis=1)
+    percentiles = np.array([0.0, 2.5, 50.0, 99.9, 100.0])
+
+    np.testing.assert_allclose(sorted_percentiles(values, percentiles), np.percentile(values, percentiles, axis=1))
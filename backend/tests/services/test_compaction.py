@@ -0,0 +1,48 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.data_access.storage.sqlite_store import SQLiteStore
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import Base, Symbol
+from backend.services.compaction import compact_open_interest, vacuum_database
+
+
+# Fixture providing an engine on a database file
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_compact_open_interest(engine):
+    session_factory = sessionmaker(bind=engine)
+    store = SQLiteStore(session_factory)
+    timestamps = np.datetime64('2024-01-01T00', 'ms') + np.arange(24 * 30) * np.timedelta64(1, 'h')
+    store.create_entries(SeriesTable.OPEN_INTEREST, Symbol.ETHUSDT.value, timestamps, np.ones(len(timestamps)))
+
+    compacted = compact_open_interest(
+        now=datetime(2024, 1, 31),
+        hourly_retention_days=10,
+        eight_hours_retention_days=10,
+        session_factory=session_factory
+    )
+
+    # 20 days of hourly data are compacted into 8h buckets, the oldest 10 days again into daily buckets
+    assert compacted == 20 * 24 + 10 * 3
+    timestamps, _ = store.read_entries(SeriesTable.OPEN_INTEREST, Symbol.ETHUSDT.value)
+    assert len(timestamps) == 10 + 10 * 3 + 10 * 24
+
+
+def test_vacuum_database_switches_to_incremental(engine):
+    vacuum_database(engine)
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA auto_vacuum")).scalar() == 2
+
+    # A second run only performs the incremental vacuum
+    vacuum_database(engine)
@@ -0,0 +1,114 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.data_access.storage.sqlite_store import SQLiteStore
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import Base, Coin, Symbol
+from backend.services.export import ExportFormat, export_series, iter_series_chunks
+
+
+TIMESTAMPS = np.datetime64('2024-01-01T00', 'ms') + np.arange(10) * np.timedelta64(8, 'h')
+
+
+# Fixture providing a session factory for a database file with two funding and one interest series
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    store = SQLiteStore(session_factory)
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, TIMESTAMPS, np.arange(10) / 100)
+    store.create_entries(SeriesTable.FUNDING, Symbol.ETHUSDT.value, TIMESTAMPS[:4], np.full(4, 0.5))
+    store.create_entries(SeriesTable.INTEREST, Coin.USDT.value, TIMESTAMPS[:2], np.full(2, 0.1))
+    yield session_factory
+    engine.dispose()
+
+
+def test_iter_series_chunks(session_factory):
+    chunks = list(iter_series_chunks([SeriesTable.FUNDING], chunk_size=3, session_factory=session_factory))
+
+    assert [len(chunk.keys) for chunk in chunks] == [3, 3, 3, 3, 2]
+    keys = np.concatenate([chunk.keys for chunk in chunks])
+    timestamps = np.concatenate([chunk.timestamps for chunk in chunks])
+    assert keys.tolist() == [Symbol.BTCUSDT.value] * 10 + [Symbol.ETHUSDT.value] * 4
+    np.testing.assert_array_equal(timestamps[:10], TIMESTAMPS)
+
+
+def test_iter_series_chunks_filters(session_factory):
+    chunks = list(iter_series_chunks(
+        keys=[Symbol.ETHUSDT.value, Coin.USDT.value],
+        start=TIMESTAMPS[1],
+        end=TIMESTAMPS[3],
+        session_factory=session_factory
+    ))
+
+    assert [(chunk.table, chunk.keys.tolist()) for chunk in chunks] == [
+        (SeriesTable.FUNDING, [Symbol.ETHUSDT.value] * 2),
+        (SeriesTable.INTEREST, [Coin.USDT.value])
+    ]
+
+
+# Test that unknown keys and stored key ids missing from the registry raise instead of exporting empty keys
+def test_iter_series_chunks_unknown_keys(session_factory):
+    with pytest.raises(ValueError, match="UNKNOWN"):
+        list(iter_series_chunks(keys=['UNKNOWN'], session_factory=session_factory))
+
+    with session_factory() as session:
+        session.execute(text("UPDATE funding_rates SET symbol = 999 WHERE symbol = (SELECT MAX(symbol) FROM funding_rates)"))
+        session.commit()
+    with pytest.raises(ValueError, match=r"\[999\]"):
+        list(iter_series_chunks([SeriesTable.FUNDING], session_factory=session_factory))
+
+
+def test_export_series_csv(session_factory, tmp_path):
+    path = tmp_path / 'export.csv'
+
+    written = export_series(path, ExportFormat.CSV, chunk_size=4, session_factory=session_factory)
+
+    with open(path, newline='') as file:
+        rows = list(csv.DictReader(file))
+    assert written == len(rows) == 16
+    assert rows[0] == {
+        'table': SeriesTable.FUNDING.value,
+        'key': Symbol.BTCUSDT.value,
+        'timestamp': '2024-01-01T00:00:00.000',
+        'value': '0.0'
+    }
+    assert rows[-1]['table'] == SeriesTable.INTEREST.value
+
+
+def test_export_series_jsonl(session_factory, tmp_path):
+    path = tmp_path / 'export.jsonl'
+
+    written = export_series(path, 'jsonl', tables=[SeriesTable.INTEREST], session_factory=session_factory)
+
+    with open(path) as file:
+        rows = [json.loads(line) for line in file]
+    assert written == 2
+    assert rows[1] == {
+        'table': SeriesTable.INTEREST.value,
+        'key': Coin.USDT.value,
+        'timestamp': '2024-01-01T08:00:00.000',
+        'value': 0.1
+    }
+
+
+@pytest.mark.parametrize('export_format', [ExportFormat.PARQUET, ExportFormat.ARROW])
+def test_export_series_arrow(session_factory, tmp_path, export_format):
+    pa = pytest.importorskip('pyarrow')
+    path = tmp_path / f'export.{export_format.value}'
+
+    written = export_series(path, export_format, chunk_size=5, session_factory=session_factory)
+
+    if export_format == ExportFormat.PARQUET:
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+    else:
+        table = pa.ipc.open_file(str(path)).read_all()
+    assert written == table.num_rows == 16
+    assert table.column('key').to_pylist()[:10] == [Symbol.BTCUSDT.value] * 10
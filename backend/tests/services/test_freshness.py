@@ -0,0 +1,51 @@
+from datetime import datetime
+
+import numpy as np
+
+from backend.data_access.storage.memory_store import MemoryStore
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import Coin, Symbol
+from backend.services.freshness import read_freshness, read_watermarks
+from frontend.src.components.freshness_badge import freshness_badge_content
+
+
+NOW = datetime(2024, 1, 2, 12)
+
+
+def test_read_watermarks():
+    store = MemoryStore()
+    store.create_entries(SeriesTable.INTEREST, Coin.USDC.value, np.array(['2024-01-02T11'], dtype='datetime64[ms]'), [0.1])
+
+    watermarks = read_watermarks(store)
+
+    assert set(watermarks) == set(SeriesTable)
+    assert watermarks[SeriesTable.INTEREST] == {Coin.USDC.value: datetime(2024, 1, 2, 11)}
+    assert watermarks[SeriesTable.FUNDING] == {}
+
+
+def test_read_freshness():
+    store = MemoryStore()
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, np.array(['2024-01-02T08'], dtype='datetime64[ms]'), [0.1])
+    store.create_entries(SeriesTable.FUNDING, Symbol.ETHUSDT.value, np.array(['2024-01-01T16'], dtype='datetime64[ms]'), [0.1])
+    store.create_entries(SeriesTable.INTEREST, Coin.USDT.value, np.array(['2024-01-02T11'], dtype='datetime64[ms]'), [0.1])
+
+    freshness = {(series.table, series.key): series for series in read_freshness(store, NOW)}
+
+    assert not freshness[(SeriesTable.FUNDING, Symbol.BTCUSDT.value)].stale
+    assert freshness[(SeriesTable.FUNDING, Symbol.ETHUSDT.value)].stale
+    assert not freshness[(SeriesTable.INTEREST, Coin.USDT.value)].stale
+    assert freshness[(SeriesTable.OPEN_INTEREST, Symbol.BTCUSDT.value)].latest is None
+    assert freshness[(SeriesTable.OPEN_INTEREST, Symbol.BTCUSDT.value)].stale
+
+
+def test_freshness_badge_content():
+    store = MemoryStore()
+    assert freshness_badge_content(read_freshness(store, NOW), NOW) == ("No data", "red")
+
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, np.array(['2024-01-02T08'], dtype='datetime64[ms]'), [0.1])
+    freshness = [series for series in read_freshness(store, NOW) if series.latest is not None]
+    assert freshness_badge_content(freshness, NOW) == ("Up to date, oldest 4 h ago", "green")
+
+    text, color = freshness_badge_content(read_freshness(store, NOW), NOW)
+    assert color == "yellow"
+    assert text.endswith("stale, oldest 4 h ago")
@@ -0,0 +1,106 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from backend.data_access.storage.memory_store import MemoryStore
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import Symbol
+from backend.services.screener import SCREENERS, compute_screener, load_screener, rank_screener
+
+
+END = np.datetime64('2024-06-01T00', 'ms')
+EIGHT_HOURS = np.timedelta64(8, 'h')
+
+
+def settlements(days: int, interval: np.timedelta64 = EIGHT_HOURS) -> np.ndarray:
+    return END - np.arange(days * np.timedelta64(1, 'D') // interval)[::-1] * interval
+
+
+def reference(timestamps, values, days, interval):
+    inside = timestamps > END - np.timedelta64(days, 'D')
+    rates = values[inside]
+    periods = np.timedelta64(365, 'D') / interval
+    return rates.mean() * periods, (rates > 0).mean(), rates.std() * np.sqrt(periods)
+
+
+# Fixture clearing the cached screeners around every test
+@pytest.fixture(autouse=True)
+def screeners():
+    SCREENERS.clear()
+    yield SCREENERS
+    SCREENERS.clear()
+
+
+def test_compute_screener_matches_reference():
+    rng = np.random.default_rng(3)
+    hourly = settlements(400, np.timedelta64(1, 'h'))
+    series = {
+        'A': (settlements(400), rng.normal(1e-4, 1e-4, 1200)),
+        'B': (hourly, rng.normal(-2e-5, 1e-5, len(hourly)))
+    }
+    intervals = {'A': EIGHT_HOURS, 'B': np.timedelta64(1, 'h')}
+
+    screener = compute_screener(series, intervals)
+
+    assert screener.end == END
+    assert screener.windows.tolist() == [7, 30, 90, 365]
+    for row, symbol in enumerate(screener.symbols):
+        for column, days in enumerate(screener.windows):
+            apr, hit_rate, volatility = reference(*series[symbol], days, intervals[symbol])
+            assert screener.apr[row, column] == pytest.approx(apr)
+            assert screener.hit_rate[row, column] == pytest.approx(hit_rate)
+            assert screener.volatility[row, column] == pytest.approx(volatility, rel=1e-6)
+    assert screener.settlements[:, 0].tolist() == [21, 168]
+
+
+def test_compute_screener_without_recent_settlements():
+    series = {'A': (settlements(10), np.full(30, 1e-4)), 'B': (settlements(100)[:30], np.full(30, 1e-4))}
+
+    screener = compute_screener(series, {'A': EIGHT_HOURS, 'B': EIGHT_HOURS, 'C': EIGHT_HOURS})
+
+    assert screener.apr[0, 0] == pytest.approx(1e-4 * 3 * 365)
+    assert np.isnan(screener.apr[1, :3]).all()
+    assert screener.apr[1, 3] == pytest.approx(1e-4 * 3 * 365)
+    assert np.isnan(screener.apr[2]).all()
+    assert screener.settlements[2].tolist() == [0, 0, 0, 0]
+
+
+def test_compute_screener_of_empty_series():
+    screener = compute_screener({}, {'A': EIGHT_HOURS})
+
+    assert np.isnat(screener.end)
+    assert np.isnan(screener.apr).all()
+
+
+def test_rank_screener():
+    series = {symbol: (settlements(10), np.full(30, rate)) for symbol, rate in [('A', 1e-4), ('B', 3e-4), ('C', -1e-4)]}
+    screener = compute_screener(series, {symbol: EIGHT_HOURS for symbol in ['A', 'B', 'C', 'D']})
+
+    assert screener.symbols[rank_screener(screener, 7)].tolist() == ['B', 'A', 'C', 'D']
+    assert screener.symbols[rank_screener(screener, 7, descending=False)].tolist() == ['C', 'A', 'B', 'D']
+    with pytest.raises(ValueError):
+        rank_screener(screener, 14)
+    with pytest.raises(ValueError):
+        rank_screener(screener, 7, by='sharpe')
+
+
+def test_load_screener_is_cached_per_data_version():
+    store = MemoryStore()
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, settlements(30), np.full(90, 1e-4))
+
+    with patch.object(store, 'read_entries_many', wraps=store.read_entries_many) as read_entries_many:
+        screener = load_screener(store)
+        assert load_screener(store) is screener
+        assert read_entries_many.call_count == 1
+
+        # A new settlement changes the data version
+        store.create_entries(SeriesTable.FUNDING, Symbol.ETHUSDT.value, [END + EIGHT_HOURS], [2e-4])
+        updated = load_screener(store)
+        assert read_entries_many.call_count == 2
+
+    row = {symbol: index for index, symbol in enumerate(updated.symbols)}
+    assert updated.end == END + EIGHT_HOURS
+    assert updated.apr[row[Symbol.BTCUSDT.value], 0] == pytest.approx(1e-4 * 3 * 365)
+    assert updated.settlements[row[Symbol.ETHUSDT.value], 0] == 1
+    assert len(updated.symbols) == len(Symbol)
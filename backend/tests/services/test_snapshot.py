@@ -0,0 +1,81 @@
+import json
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.data_access.storage.sqlite_store import SQLiteStore
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import Base, Coin, Symbol
+from backend.services.snapshot import (
+    export_snapshot,
+    manifest_path,
+    restore_snapshot,
+    restore_snapshot_if_missing
+)
+
+
+TIMESTAMPS = np.datetime64('2024-01-01T00', 'ms') + np.arange(100) * np.timedelta64(8, 'h')
+
+
+# Fixture providing a filled database file
+@pytest.fixture
+def database_path(tmp_path):
+    path = tmp_path / 'funding_history.db'
+    engine = create_engine(f'sqlite:///{path}')
+    Base.metadata.create_all(engine)
+    store = SQLiteStore(sessionmaker(bind=engine))
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, TIMESTAMPS, np.full(100, 1e-4))
+    store.create_entries(SeriesTable.INTEREST, Coin.USDT.value, TIMESTAMPS[:10], np.full(10, 1e-6))
+    engine.dispose()
+    return path
+
+
+def test_export_snapshot(database_path, tmp_path):
+    snapshot_path = tmp_path / 'snapshots' / 'funding_history.db.gz'
+    manifest = export_snapshot(database_path, snapshot_path)
+
+    assert snapshot_path.exists()
+    assert manifest['snapshot_size'] < manifest['database_size']
+    assert manifest['watermarks'][SeriesTable.FUNDING.value] == {Symbol.BTCUSDT.value: '2024-02-03T00:00:00'}
+    assert manifest['watermarks'][SeriesTable.INTEREST.value] == {Coin.USDT.value: '2024-01-04T00:00:00'}
+    assert manifest['watermarks'][SeriesTable.OPEN_INTEREST.value] == {}
+    with open(manifest_path(snapshot_path)) as file:
+        assert json.load(file) == manifest
+
+
+def test_restore_snapshot(database_path, tmp_path):
+    snapshot_path = tmp_path / 'funding_history.db.gz'
+    export_snapshot(database_path, snapshot_path)
+
+    restored_path = tmp_path / 'restored' / 'funding_history.db'
+    restore_snapshot(snapshot_path, restored_path)
+
+    engine = create_engine(f'sqlite:///{restored_path}')
+    timestamps, _ = SQLiteStore(sessionmaker(bind=engine)).read_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value)
+    engine.dispose()
+    np.testing.assert_array_equal(timestamps, TIMESTAMPS)
+
+
+def test_restore_snapshot_checksum_mismatch(database_path, tmp_path):
+    snapshot_path = tmp_path / 'funding_history.db.gz'
+    export_snapshot(database_path, snapshot_path)
+    with open(snapshot_path, 'ab') as file:
+        file.write(b'corrupted')
+
+    with pytest.raises(ValueError):
+        restore_snapshot(snapshot_path, tmp_path / 'restored.db')
+    assert restore_snapshot_if_missing(tmp_path / 'restored.db', snapshot_path) is None
+    assert not (tmp_path / 'restored.db').exists()
+
+
+def test_restore_snapshot_if_missing(database_path, tmp_path):
+    snapshot_path = tmp_path / 'funding_history.db.gz'
+    export_snapshot(database_path, snapshot_path)
+
+    # An existing database is never overwritten
+    assert restore_snapshot_if_missing(database_path, snapshot_path) is None
+    assert restore_snapshot_if_missing(tmp_path / 'new.db', tmp_path / 'missing.db.gz') is None
+    assert restore_snapshot_if_missing(tmp_path / 'new.db', snapshot_path) is not None
+    assert (tmp_path / 'new.db').exists()
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.data_access.crud.crud_sweep import read_sweep_results
+from backend.data_access.storage.memory_store import MemoryStore
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import Base, Coin, Symbol
+from backend.services.backtest import BacktestConfig, run_backtest
+from backend.services.sweep import load_aligned_pairs, run_sweep, sweep_configs, sweep_to_table
+
+
+RNG = np.random.default_rng(5)
+SETTLEMENTS = np.datetime64('2024-01-01T08', 'ms') + np.arange(90) * np.timedelta64(8, 'h')
+HOURS = np.datetime64('2024-01-01T00', 'ms') + np.arange(90 * 8 + 1) * np.timedelta64(1, 'h')
+SYMBOLS = [Symbol.BTCUSDT.value, Symbol.ETHUSDT.value]
+COINS = [Coin.USDC.value, Coin.USDT.value]
+CONFIGS = sweep_configs([1.0, 3.0], [0, 7], entry_fee=0.0005, exit_fee=0.0005)
+
+
+# Fixture providing a store with the funding of two instruments and the interest of two stable coins,
+# the interest of USDT only starts halfway through the funding
+@pytest.fixture
+def store():
+    store = MemoryStore()
+    for symbol in SYMBOLS:
+        store.create_entries(SeriesTable.FUNDING, symbol, SETTLEMENTS, RNG.normal(1e-4, 2e-4, len(SETTLEMENTS)))
+    store.create_entries(SeriesTable.INTEREST, Coin.USDC.value, HOURS, RNG.normal(1e-5, 1e-6, len(HOURS)))
+    store.create_entries(SeriesTable.INTEREST, Coin.USDT.value, HOURS[360:], RNG.normal(1e-5, 1e-6, len(HOURS) - 360))
+    return store
+
+
+# Fixture providing a session factory for an empty in-memory database
+@pytest.fixture
+def session_factory():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def test_sweep_configs():
+    configs = sweep_configs([1, 2], [0, 21])
+
+    assert configs == (
+        BacktestConfig(1.0, 0.0, 0.0, None),
+        BacktestConfig(1.0, 0.0, 0.0, 21),
+        BacktestConfig(2.0, 0.0, 0.0, None),
+        BacktestConfig(2.0, 0.0, 0.0, 21)
+    )
+
+
+def test_load_aligned_pairs_skips_pairs_without_interest(store):
+    pairs, aligned = load_aligned_pairs(SYMBOLS + [Symbol.SOLUSDT.value], COINS, store=store)
+
+    assert [pair[:2] for pair in pairs] == [(symbol, coin) for symbol in SYMBOLS for coin in COINS]
+    assert [len(funding) for funding, _ in aligned] == [90, 45, 90, 45]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_run_sweep_matches_run_backtest(store, processes):
+    rows = list(run_sweep(SYMBOLS, COINS, CONFIGS, processes=processes, store=store))
+
+    assert len(rows) == len(SYMBOLS) * len(COINS) * len(CONFIGS)
+    for row in rows:
+        config = BacktestConfig(row.leverage, 0.0005, 0.0005, row.rebalance_every or None)
+        result = run_backtest(row.symbol, row.stablecoin, config, store=store)
+        assert row.settlements == len(result.equity)
+        assert row.total_return == pytest.approx(result.total_return)
+        assert row.apr == pytest.approx(result.apr)
+        assert row.max_drawdown == pytest.approx(result.stats.max_drawdown)
+
+
+def test_run_sweep_without_data():
+    assert list(run_sweep(SYMBOLS, COINS, CONFIGS, processes=1, store=MemoryStore())) == []
+
+
+def test_sweep_to_table_writes_in_batches(store, session_factory):
+    rows = run_sweep(SYMBOLS, COINS, CONFIGS, processes=1, store=store)
+
+    sweep_id, written = sweep_to_table(rows, 'test', batch_size=3, session_factory=session_factory)
+
+    assert (sweep_id, written) == ('test', 16)
+    assert len(read_sweep_results('test', session_factory)) == 16
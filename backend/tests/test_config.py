@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from backend.config import create_reader_engine, create_writer_engine
+
+
+# Fixture providing a writer and a reader engine on the same database file
+@pytest.fixture
+def engines(tmp_path):
+    path = tmp_path / 'funding_history.db'
+    writer = create_writer_engine(f'sqlite:///{path}')
+    with writer.begin() as connection:
+        connection.execute(text("CREATE TABLE entries (value INTEGER)"))
+        connection.execute(text("INSERT INTO entries VALUES (1)"))
+    reader = create_reader_engine(str(path), pool_size=2)
+    yield writer, reader
+    reader.dispose()
+    writer.dispose()
+
+
+def test_writer_uses_wal_and_single_connection(engines):
+    writer, _ = engines
+    with writer.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == 'wal'
+    assert writer.pool.size() == 1
+
+
+def test_reader_cannot_write(engines):
+    _, reader = engines
+    with reader.connect() as connection:
+        assert connection.execute(text("PRAGMA query_only")).scalar() == 1
+        with pytest.raises(OperationalError):
+            connection.execute(text("INSERT INTO entries VALUES (2)"))
+
+
+def test_reader_sees_consistent_snapshot(engines):
+    writer, reader = engines
+    ReadSession = sessionmaker(bind=reader)
+
+    with ReadSession() as session:
+        assert session.execute(text("SELECT COUNT(*) FROM entries")).scalar() == 1
+
+        # A write committed while the read transaction is open is not visible to it
+        with writer.begin() as connection:
+            connection.execute(text("INSERT INTO entries VALUES (2)"))
+        assert session.execute(text("SELECT COUNT(*) FROM entries")).scalar() == 1
+
+    with ReadSession() as session:
+        assert session.execute(text("SELECT COUNT(*) FROM entries")).scalar() == 2
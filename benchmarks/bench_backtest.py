@@ -0,0 +1,62 @@
+""" Benchmark comparing a settlement by settlement loop with the vectorized backtest.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python benchmarks/bench_backtest.py
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backend.services.backtest import BacktestConfig, simulate_equity
+
+
+def timed(label: str, function, repeat: int = 5) -> float:
+    """Run a function `repeat` times and print the best wall clock time."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    print(f"  {label:<36} {1000 * best:10.2f} ms")
+    return best
+
+
+def simulate_with_loop(funding: np.ndarray, interest: np.ndarray, config: BacktestConfig) -> list:
+    """Step through the settlements one by one, as the notebooks did."""
+    leverage = config.leverage
+    equity = 1 - 2 * config.entry_fee * leverage
+    notional, borrowed = leverage * equity, (leverage - 1) * equity
+    curve = []
+    for index, (rate, cost) in enumerate(zip(funding, interest)):
+        equity += notional * rate - borrowed * cost
+        if index == len(funding) - 1:
+            equity -= 2 * config.exit_fee * notional
+        elif config.rebalance_every and (index + 1) % config.rebalance_every == 0:
+            equity -= 2 * config.entry_fee * abs(leverage * equity - notional)
+            notional, borrowed = leverage * equity, (leverage - 1) * equity
+        curve.append(max(equity, 0.0))
+    return curve
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--years', type=int, nargs='+', default=[3, 10], help='years of 8 hour settlements')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    config = BacktestConfig(leverage=3, entry_fee=0.0006, exit_fee=0.0006, rebalance_every=21)
+    for years in args.years:
+        points = years * 3 * 365
+        funding = rng.normal(1e-4, 1e-4, points)
+        interest = rng.normal(8e-5, 1e-5, points)
+
+        print(f"{years} years, {points} settlements")
+        loop = timed("settlement loop", lambda: simulate_with_loop(funding, interest, config))
+        vectorized = timed("vectorized simulation", lambda: simulate_equity(funding, interest, config))
+        print(f"  speedup {loop / vectorized:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
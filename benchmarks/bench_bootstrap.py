@@ -0,0 +1,51 @@
+""" Benchmark of the block bootstrap bands against materializing every resampled path.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python benchmarks/bench_bootstrap.py
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backend.services.bootstrap import BOOTSTRAP_BLOCK, BOOTSTRAP_PERCENTILES, bootstrap_bands
+
+
+def timed(label: str, function, repeat: int = 3) -> float:
+    """Run a function `repeat` times and print the best wall clock time."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    print(f"  {label:<36} {1000 * best:10.2f} ms")
+    return best
+
+
+def bootstrap_with_paths(returns: np.ndarray, steps: int, paths: int, seed: int) -> np.ndarray:
+    """Gather the resampled rates of every path, compound them and take the percentiles."""
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(0, len(returns) - BOOTSTRAP_BLOCK + 1, size=(-(-steps // BOOTSTRAP_BLOCK), paths))
+    index = (starts[:, None, :] + np.arange(BOOTSTRAP_BLOCK)[None, :, None]).reshape(-1, paths)[:steps]
+    growth = np.cumsum(np.log1p(returns[index]), axis=0)
+    return np.exp(np.percentile(growth, BOOTSTRAP_PERCENTILES, axis=1))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--years', type=int, default=3, help='years of 8 hour settlements')
+    parser.add_argument('--paths', type=int, nargs='+', default=[1_000, 10_000], help='number of paths')
+    args = parser.parse_args()
+
+    steps = args.years * 3 * 365
+    returns = np.random.default_rng(0).normal(1e-4, 2e-4, steps)
+    for paths in args.paths:
+        print(f"{paths} paths, {steps} settlements")
+        materialized = timed("materialized paths", lambda: bootstrap_with_paths(returns, steps, paths, 0))
+        bands = timed("running sum bands", lambda: bootstrap_bands(returns, paths=paths, seed=0))
+        print(f"  speedup {materialized / bands:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+""" Benchmark comparing the per-point dict loop of the chart loaders with the columnar payload builder.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python benchmarks/bench_chart_payload.py
+"""
+import argparse
+import time
+
+import numpy as np
+
+from frontend.src.data_handling.chart_payload import ChartSeries, build_chart_payload
+
+
+def timed(label: str, function, repeat: int = 5) -> float:
+    """Run a function `repeat` times and print the best wall clock time."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    print(f"  {label:<36} {1000 * best:10.2f} ms")
+    return best
+
+
+def build_with_loop(timestamps: np.ndarray, funding: np.ndarray, interest: np.ndarray) -> list:
+    """Build the records the way the loaders did before, one `strftime` and dict per point."""
+    data = []
+    for ts, value, rate in zip(timestamps.astype(object), funding, interest):
+        data.append(
+            {
+                "date": ts.strftime('%b %y'),
+                "Funding BTCUSDT": round(value, 5),
+                "Interest DAI": round(rate, 5)
+            }
+        )
+    return data
+
+
+def build_with_payload(timestamps: np.ndarray, funding: np.ndarray, interest: np.ndarray) -> list:
+    data, _ = build_chart_payload(
+        timestamps,
+        [ChartSeries("Funding BTCUSDT", funding, "blue.6"), ChartSeries("Interest DAI", interest, "orange.6")]
+    )
+    return data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--points', type=int, nargs='+', default=[5_000, 50_000], help='numbers of points per chart')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for points in args.points:
+        timestamps = np.datetime64('2024-12-01T00', 'ms') - np.arange(points)[::-1] * np.timedelta64(8, 'h')
+        funding, interest = 100 * rng.normal(1e-4, 1e-4, (2, points))
+
+        print(f"{points} points, 2 series")
+        loop = timed("dict loop with strftime and round", lambda: build_with_loop(timestamps, funding, interest))
+        payload = timed("columnar payload builder", lambda: build_with_payload(timestamps, funding, interest))
+        print(f"  speedup {loop / payload:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+""" Benchmark comparing an ORM read hydrating model objects with the column-direct read path.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python benchmarks/bench_reads.py
+"""
+import argparse
+from pathlib import Path
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import create_engine, desc
+from sqlalchemy.orm import sessionmaker
+
+from backend.data_access.crud.crud_series import read_series_arrays, read_series_arrays_many
+from backend.data_access.storage.sqlite_store import SQLiteStore
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import Base, FundingRate, Symbol
+
+
+def timed(label: str, function, repeat: int = 5) -> float:
+    """Run a function `repeat` times and print the best wall clock time."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    print(f"  {label:<36} {1000 * best:10.2f} ms")
+    return best
+
+
+def orm_read(session_factory, symbol: str):
+    """Read one funding series by hydrating ORM objects, like the CRUD layer did before the store."""
+    with session_factory() as session:
+        entries = (
+            session.query(FundingRate)
+                .filter_by(symbol=symbol)
+                .order_by(desc(FundingRate.funding_rate_timestamp))
+                .all()
+        )
+    timestamps = np.array([entry.funding_rate_timestamp for entry in entries])[::-1]
+    return timestamps, np.array([entry.funding_rate for entry in entries])[::-1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--symbols', type=int, default=5, help='number of series to write')
+    parser.add_argument('--values', type=int, default=20000, help='number of entries per series')
+    args = parser.parse_args()
+
+    symbols = [symbol.value for symbol in list(Symbol)[:args.symbols]]
+    end = np.datetime64('2024-12-01T00', 'ms')
+    timestamps = end - np.arange(args.values)[::-1] * np.timedelta64(8, 'h')
+    values = np.random.default_rng(0).normal(1e-4, 1e-4, args.values)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'bench.db'}")
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+        store = SQLiteStore(session_factory)
+        for symbol in symbols:
+            store.create_entries(SeriesTable.FUNDING, symbol, timestamps, values)
+
+        print(f"{args.values} entries per series")
+        orm = timed("ORM read, one series", lambda: orm_read(session_factory, symbols[0]))
+        orm_all = timed("ORM read, all series", lambda: [orm_read(session_factory, symbol) for symbol in symbols])
+
+        fast = timed("column-direct read, one series", lambda: read_series_arrays(
+            SeriesTable.FUNDING, symbols[0], session_factory=session_factory
+        ))
+        fast_all = timed("column-direct read, all series", lambda: read_series_arrays_many(
+            SeriesTable.FUNDING, symbols, session_factory=session_factory
+        ))
+        print(f"  speedup {orm / fast:.1f}x for one series, {orm_all / fast_all:.1f}x for all series")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+""" Benchmark running the same workload against every time series store backend.
+
+Run from the repository root with:
+
+    PYTHONPATH=. python benchmarks/bench_storage.py
+"""
+import argparse
+from pathlib import Path
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.data_access.storage.columnar_store import ColumnarStore
+from backend.data_access.storage.memory_store import MemoryStore
+from backend.data_access.storage.sqlite_store import SQLiteStore
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import Base, Symbol
+
+
+def generate_series(num_values: int, seed: int):
+    """Generate a synthetic 8 hour funding rate series."""
+    rng = np.random.default_rng(seed)
+    end = np.datetime64('2024-12-01T00', 'ms')
+    timestamps = end - np.arange(num_values)[::-1] * np.timedelta64(8, 'h')
+    return timestamps, rng.normal(1e-4, 1e-4, num_values)
+
+
+def timed(label: str, function, repeat: int = 5):
+    """Run a function `repeat` times and print the best wall clock time."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    print(f"  {label:<28} {1000 * best:10.2f} ms")
+
+
+def run_suite(name: str, store, symbols, num_values: int) -> None:
+    """Run the benchmark workload against one store."""
+    print(name)
+    series = {symbol: generate_series(num_values, seed) for seed, symbol in enumerate(symbols)}
+    window_start = series[symbols[0]][0][-3*365]
+
+    timed("bulk write", lambda: [store.create_entries(SeriesTable.FUNDING, s, *series[s]) for s in symbols], repeat=1)
+    timed("full read", lambda: store.read_entries(SeriesTable.FUNDING, symbols[0]))
+    timed("latest 5y read", lambda: store.read_entries(SeriesTable.FUNDING, symbols[0], num_values=5*3*365))
+    timed("1y range read", lambda: store.read_entries(SeriesTable.FUNDING, symbols[0], start=window_start))
+    timed("latest timestamp", lambda: store.read_most_recent_update(SeriesTable.FUNDING, symbols[0]))
+    timed("multi-series read", lambda: store.read_entries_many(SeriesTable.FUNDING, symbols))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--symbols', type=int, default=10, help='number of series to write')
+    parser.add_argument('--values', type=int, default=20000, help='number of entries per series')
+    args = parser.parse_args()
+
+    symbols = [symbol.value for symbol in list(Symbol)[:args.symbols]]
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'bench.db'}")
+        Base.metadata.create_all(engine)
+
+        run_suite("SQLiteStore", SQLiteStore(sessionmaker(bind=engine)), symbols, args.values)
+        run_suite("MemoryStore", MemoryStore(), symbols, args.values)
+        run_suite("ColumnarStore", ColumnarStore(Path(directory) / 'columns'), symbols, args.values)
+
+
+if __name__ == '__main__':
+    main()
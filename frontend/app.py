@@ -2,12 +2,18 @@
 from dash import callback, Dash, _dash_renderer, Input, Output, State 
 from dash_iconify import DashIconify
 import dash_mantine_components as dmc
-from sqlalchemy import create_engine
+from flask import jsonify
 
+from backend.config import engine
 from backend.data_access.api_client.bybit_client import ByBitClient
-from backend.data_access.crud.crud_funding import read_most_recent_update_funding
-from backend.data_access.crud.crud_interest import read_most_recent_update_interest
-from backend.data_access.crud.crud_open_interest import read_most_recent_update_open_interest
+from backend.data_access.crud.crud_cache import SERIES_CACHE
+from backend.data_access.crud.crud_cumulative import backfill_cumulative
+from backend.data_access.crud.crud_rollups import backfill_rollups
+from backend.data_access.crud.crud_registry import get_coins, get_instruments, migrate_registry
+from backend.data_access.storage.time_series_store import SeriesTable, get_store
+from backend.services.compaction import start_compaction_job
+from backend.services.freshness import read_watermarks
+from backend.services.snapshot import restore_snapshot_if_missing
 from backend.services.download_data import (
     catch_latest_funding,
     catch_latest_open_interest,
@@ -16,23 +22,38 @@ from backend.services.download_data import (
     fill_interest,
     fill_open_interest
 )
-from backend.models.models_orm import Base, Coin, Symbol
+from backend.models.models_orm import Base
 from frontend.settings import frontend_settings
 # This is not explicitly used but needs to be imported to make the callabacks knwon to the app
 import frontend.src.callbacks.load_carousel_callback
+import frontend.src.callbacks.freshness_callback
+import frontend.src.callbacks.screener_callback
+import frontend.src.callbacks.sweep_callback
 from frontend.src.components.components_id_tree import ComponentsIdTree
-from frontend.src.layouts.page_layout import app_layout
+from frontend.src.components.freshness_badge import generate_freshness_badge
+from frontend.src.layouts.page_layout import generate_page_layout
 
 
-engine = create_engine('sqlite:///funding_history.db')
+# Restore the prebuilt snapshot on a fresh container, the sync below then only fetches the delta
+restore_snapshot_if_missing()
+
 Base.metadata.create_all(engine)
+migrate_registry(engine)
+# Series written before the rollups and curves were maintained are accumulated once here, reads never write
+backfill_rollups()
+backfill_cumulative((instrument.key, coin.key) for instrument in get_instruments() for coin in get_coins())
 
 
 client = ByBitClient()
+store = get_store()
+# One grouped query per table instead of one query per series
+watermarks = read_watermarks(store)
 
-for symbol in Symbol:
+# Delisted instruments are skipped, their history stays available
+for instrument in get_instruments(active_only=True):
 
-    most_recent_funding = read_most_recent_update_funding(symbol)
+    symbol = instrument.key
+    most_recent_funding = watermarks[SeriesTable.FUNDING].get(symbol)
 
     if most_recent_funding is not None:
         catch_latest_funding(
@@ -46,7 +67,7 @@ for symbol in Symbol:
             symbol
         )
     
-    most_recent_oi = read_most_recent_update_open_interest(symbol)
+    most_recent_oi = watermarks[SeriesTable.OPEN_INTEREST].get(symbol)
 
     if most_recent_oi is not None:
         catch_latest_open_interest(
@@ -60,9 +81,10 @@ for symbol in Symbol:
             symbol
         )
 
-for coin in Coin:
+for margin_coin in get_coins(active_only=True):
 
-    most_recent_datetime = read_most_recent_update_interest(coin)
+    coin = margin_coin.key
+    most_recent_datetime = watermarks[SeriesTable.INTEREST].get(coin)
     
     if most_recent_datetime is not None:
         catch_latest_interest(
@@ -76,6 +98,8 @@ for coin in Coin:
             coin
         )
 
+start_compaction_job()
+
 
 _dash_renderer._set_react_version("18.2.0")
 app = Dash(__name__, external_stylesheets=[dmc.styles.CAROUSEL])
@@ -107,6 +131,7 @@ app.layout = dmc.MantineProvider(
                             p="md",
                             pr="lg",
                             children=[
+                                generate_freshness_badge(),
                                 theme_toggle
                             ]
                         )
@@ -114,7 +139,7 @@ app.layout = dmc.MantineProvider(
                 ),
                 dmc.AppShellMain(
                     children=[
-                        app_layout
+                        generate_page_layout()
                     ]
                 ),
                 dmc.AppShellFooter(
@@ -139,6 +164,12 @@ app.layout = dmc.MantineProvider(
 )
 
 
+@app.server.route("/stats/cache")
+def cache_stats():
+    """Export the hit and miss counters of the series read cache."""
+    return jsonify(SERIES_CACHE.stats())
+
+
 @callback(
     Output(ComponentsIdTree.App.MANTINE_PROVIDER, "forceColorScheme"),
     Input(ComponentsIdTree.AppShellHeader.COLOR_THEME_TOGGLE, "n_clicks"),
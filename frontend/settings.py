@@ -6,6 +6,9 @@ class FrontendSettings(BaseSettings):
     PORT: int = 8049
     HOST: str = "0.0.0.0"
 
+    # Maximum number of points per line chart
+    CHART_POINT_BUDGET: int = 500
+
     class Config:
         case_sensitive = True
 
@@ -0,0 +1,18 @@
+""" Callback refreshing the freshness badge in the header. """
+from typing import Tuple
+
+from dash import callback, Input, Output
+
+from backend.services.freshness import read_freshness
+from frontend.src.components.components_id_tree import ComponentsIdTree
+from frontend.src.components.freshness_badge import freshness_badge_content
+
+
+@callback(
+    Output(ComponentsIdTree.AppShellHeader.FRESHNESS_BADGE, "children"),
+    Output(ComponentsIdTree.AppShellHeader.FRESHNESS_BADGE, "color"),
+    Input(ComponentsIdTree.AppShellHeader.FRESHNESS_INTERVAL, "n_intervals")
+)
+def update_freshness_badge(_) -> Tuple[str, str]:
+    """Update the freshness badge with the most recent timestamps of all series."""
+    return freshness_badge_content(read_freshness())
@@ -1,5 +1,6 @@
 """ Callbacks for loading the content of the carousel in the basis trade and leveraged basis trade tabs. """
-from typing import List, Tuple
+from functools import partial
+from typing import List, Optional, Sequence, Tuple
 
 from dash import callback, dcc, Input, MATCH, no_update, Output, State
 import dash_mantine_components as dmc
@@ -154,12 +155,14 @@ def handle_tab_switch_basis_trade(
     Output(ComponentsIdTree.Tabs.TabCarousel.CAROUSEL_BASIS_TRADE_LEVERAGED, 'children', allow_duplicate=True),
     Input(ComponentsIdTree.Tabs.TabSettings.SELECT_COIN_BASIS_TRADE_LEVERAGED, 'value'),
     Input(ComponentsIdTree.Tabs.TabSettings.SELECT_STABLECOIN_BASIS_TRADE_LEVERAGED, 'value'),
+    Input(ComponentsIdTree.Tabs.TabSettings.SELECT_ROLLING_STATS_BASIS_TRADE_LEVERAGED, 'value'),
     State(ComponentsIdTree.Tabs.TabStores.STORE_BASIS_TRADE_LEVERAGED, 'data'),
     prevent_initial_call=True
 )
 def handle_tab_switch_basis_trade_leveraged(
     coin: Symbol,
     stable: Coin,
+    rolling_series: Optional[Sequence[str]],
     data: dict,
 ) -> List[dmc.CarouselSlide]:
     """ 
@@ -168,6 +171,7 @@ def handle_tab_switch_basis_trade_leveraged(
     Args:
         coin (Symbol): The symbol of the coin selected in the dropdown component.
         stable (Coin): The stable coin selected in the dropdown component.
+        rolling_series (Sequence[str], optional): The rolling statistics selected for the net income chart.
         data (dict): The current state data stored in `tab-2-store`. It includes information 
                     like which slide is currently active.
 
@@ -179,7 +183,7 @@ def handle_tab_switch_basis_trade_leveraged(
     loaders = [
         load_data_cumulative_funding_leveraged,
         load_data_funding_rates_leveraged,
-        load_data_net_income_leveraged
+        partial(load_data_net_income_leveraged, rolling_series=rolling_series or ())
     ]
 
     carousel[data["active_carousel"]] = dmc.CarouselSlide(
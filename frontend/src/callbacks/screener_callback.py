@@ -0,0 +1,23 @@
+""" Callback ranking the instruments in the screener table. """
+from dash import callback, Input, Output
+
+from frontend.src.components.components_id_tree import ComponentsIdTree
+from frontend.src.data_handling.data_handling_screener import load_data_screener
+
+
+@callback(
+    Output(ComponentsIdTree.Tabs.TabScreener.TABLE, "data"),
+    Input(ComponentsIdTree.Tabs.TabScreener.SELECT_WINDOW, "value"),
+    Input(ComponentsIdTree.Tabs.TabScreener.SELECT_RANK_BY, "value")
+)
+def update_screener_table(window: str, by: str) -> dict:
+    """Update the screener table with the instruments ranked by a statistic of the selected window.
+
+    Args:
+        window (str): The window in days selected in the Select component.
+        by (str): The statistic selected in the Select component.
+
+    Returns:
+        dict: The head and the body of the table.
+    """
+    return load_data_screener(int(window), by)
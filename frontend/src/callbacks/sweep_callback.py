@@ -0,0 +1,22 @@
+""" Callback drawing the heatmap of the best sweep configurations. """
+from dash import callback, Input, Output
+import plotly.graph_objects as go
+
+from frontend.src.components.components_id_tree import ComponentsIdTree
+from frontend.src.data_handling.data_handling_sweep import load_data_sweep_heatmap
+
+
+@callback(
+    Output(ComponentsIdTree.Tabs.TabSweep.HEATMAP, "figure"),
+    Input(ComponentsIdTree.Tabs.TabSweep.SELECT_BEST_BY, "value")
+)
+def update_sweep_heatmap(by: str) -> go.Figure:
+    """Update the heatmap with the best configuration of every pair by the selected score.
+
+    Args:
+        by (str): The score selected in the Select component.
+
+    Returns:
+        go.Figure: The heatmap of the most recent sweep.
+    """
+    return load_data_sweep_heatmap(by)
@@ -9,6 +9,8 @@ class ComponentsIdTree():
     
     class AppShellHeader(str, Enum):
         COLOR_THEME_TOGGLE = "color-theme-toggle"
+        FRESHNESS_BADGE = "freshness-badge"
+        FRESHNESS_INTERVAL = "freshness-interval"
     
     class Tabs():
 
@@ -27,6 +29,8 @@ class ComponentsIdTree():
         class TabPanels(str, Enum):
             PANEL_BASIS_TRADE = "Basis Trade"
             PANEL_BASIS_TRADE_LEVERAGED = "Basis Trade Leveraged"
+            PANEL_SCREENER = "Screener"
+            PANEL_SWEEP = "Sweep"
         
         class TabCarousel(dict, Enum):
             CAROUSEL_BASIS_TRADE = {
@@ -56,4 +60,17 @@ class ComponentsIdTree():
                 "leaf": "basis-trade",
                 "type": "leveraged",
                 "field": "stablecoin"
-            }
\ No newline at end of file
+            }
+            SELECT_ROLLING_STATS_BASIS_TRADE_LEVERAGED = {
+                "leaf": "select-rolling-stats",
+                "type": "leveraged"
+            }
+
+        class TabScreener(str, Enum):
+            SELECT_WINDOW = "screener-select-window"
+            SELECT_RANK_BY = "screener-select-rank-by"
+            TABLE = "screener-table"
+
+        class TabSweep(str, Enum):
+            SELECT_BEST_BY = "sweep-select-best-by"
+            HEATMAP = "sweep-heatmap"
@@ -0,0 +1,69 @@
+""" This module contains the badge in the header showing how fresh the stored data is. """
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from dash import dcc, html
+import dash_mantine_components as dmc
+
+from backend.services.freshness import SeriesFreshness
+from frontend.src.components.components_id_tree import ComponentsIdTree
+
+
+# Milliseconds between two refreshes of the badge
+FRESHNESS_REFRESH_MS = 60_000
+
+
+def _format_age(age_seconds: float) -> str:
+    minutes = int(age_seconds // 60)
+    if minutes < 60:
+        return f"{minutes} min"
+    if minutes < 48 * 60:
+        return f"{minutes // 60} h"
+    return f"{minutes // (24 * 60)} d"
+
+
+def freshness_badge_content(
+    freshness: List[SeriesFreshness],
+    now: Optional[datetime] = None
+) -> Tuple[str, str]:
+    """Generate the text and color of the freshness badge.
+
+    Args:
+        freshness (List[SeriesFreshness]): The freshness of every series.
+        now (datetime, optional): The reference time as naive UTC. Defaults to the current time.
+
+    Returns:
+        tuple: The text and the color of the badge.
+    """
+    now = now if now is not None else datetime.now(timezone.utc).replace(tzinfo=None)
+    latest = [series.latest for series in freshness if series.latest is not None]
+    if not latest:
+        return "No data", "red"
+
+    stale = sum(series.stale for series in freshness)
+    age = _format_age((now - min(latest)).total_seconds())
+    if stale:
+        return f"{stale} of {len(freshness)} series stale, oldest {age} ago", "yellow"
+    return f"Up to date, oldest {age} ago", "green"
+
+
+def generate_freshness_badge() -> html.Div:
+    """Generate the freshness badge and the interval refreshing it.
+
+    Returns:
+        html.Div: The badge and its interval.
+    """
+    return html.Div(
+        children=[
+            dmc.Badge(
+                id=ComponentsIdTree.AppShellHeader.FRESHNESS_BADGE,
+                variant="light",
+                color="gray",
+                children="Checking data"
+            ),
+            dcc.Interval(
+                id=ComponentsIdTree.AppShellHeader.FRESHNESS_INTERVAL,
+                interval=FRESHNESS_REFRESH_MS
+            )
+        ]
+    )
@@ -0,0 +1,76 @@
+""" This module contains the options of the selects, the symbols and coins are read from the registry. """
+from typing import Dict, List
+
+from backend.data_access.crud.crud_registry import get_coins, get_instruments
+from backend.data_access.storage.rolling import ROLLING_WINDOW_DAYS
+from backend.models.models_orm import RegistryEntry
+from backend.services.screener import SCREENER_WINDOW_DAYS
+from frontend.src.data_handling.data_handling_basis_trade_leveraged import ROLLING_LABELS
+from frontend.src.data_handling.data_handling_screener import SCREENER_RANK_BY
+from frontend.src.data_handling.data_handling_sweep import SWEEP_BEST_BY
+
+
+def _option(entry: RegistryEntry) -> Dict[str, str]:
+    return {
+        "value": entry.key,
+        "label": entry.key,
+        "description": entry.key if entry.active else f"{entry.key} (delisted)"
+    }
+
+
+def instrument_options() -> List[Dict[str, str]]:
+    """Generate the options of a symbol select from the cached instrument registry.
+
+    Returns:
+        List[Dict[str, str]]: The options of all instruments, delisted ones keep their history.
+    """
+    return [_option(entry) for entry in get_instruments()]
+
+
+def coin_options() -> List[Dict[str, str]]:
+    """Generate the options of a stablecoin select from the cached coin registry.
+
+    Returns:
+        List[Dict[str, str]]: The options of all margin coins.
+    """
+    return [_option(entry) for entry in get_coins()]
+
+
+def rolling_options() -> List[Dict[str, str]]:
+    """Generate the options of the rolling statistics select of the net income slide.
+
+    Returns:
+        List[Dict[str, str]]: The options of every statistic over every window, like `apr-30`.
+    """
+    return [
+        {"value": f"{statistic}-{days}", "label": f"{label} {days}d"}
+        for statistic, label in ROLLING_LABELS.items()
+        for days in ROLLING_WINDOW_DAYS
+    ]
+
+
+def screener_window_options() -> List[Dict[str, str]]:
+    """Generate the options of the window select of the screener.
+
+    Returns:
+        List[Dict[str, str]]: The options of every screener window in days.
+    """
+    return [{"value": str(days), "label": f"{days} days"} for days in SCREENER_WINDOW_DAYS]
+
+
+def screener_rank_options() -> List[Dict[str, str]]:
+    """Generate the options of the rank by select of the screener.
+
+    Returns:
+        List[Dict[str, str]]: The options of every statistic the screener can be ranked by.
+    """
+    return [{"value": value, "label": label} for value, label in SCREENER_RANK_BY.items()]
+
+
+def sweep_best_options() -> List[Dict[str, str]]:
+    """Generate the options of the best by select of the sweep heatmap.
+
+    Returns:
+        List[Dict[str, str]]: The options of every score the best configuration can be chosen by.
+    """
+    return [{"value": value, "label": label} for value, label in SWEEP_BEST_BY.items()]
@@ -3,26 +3,26 @@ import dash_mantine_components as dmc
 
 from backend.models.models_orm import Symbol
 from frontend.src.components.components_id_tree import ComponentsIdTree
+from frontend.src.components.select_options import instrument_options
 
 
-fieldset_basis_trade = dmc.Fieldset(
-    legend="Chart Settings",
-    mt='xl',
-    children=[
-        dmc.Select(
-            id=ComponentsIdTree.Tabs.TabSettings.SELECT_COIN_BASIS_TRADE,
-            label="Select Coin",
-            placeholder="Select Coin",
-            value=Symbol.BTCUSDT,
-            allowDeselect=False,
-            data=[
-                {
-                    "value": symbol,
-                    "label": symbol.value,
-                    "description": symbol.value
-                }
-                for symbol in Symbol
-            ]
-        )
-    ]
-)
\ No newline at end of file
+def generate_fieldset_basis_trade() -> dmc.Fieldset:
+    """Generate the settings of the basis trade tab with the currently registered symbols.
+
+    Returns:
+        dmc.Fieldset: The fieldset of the basis trade tab.
+    """
+    return dmc.Fieldset(
+        legend="Chart Settings",
+        mt='xl',
+        children=[
+            dmc.Select(
+                id=ComponentsIdTree.Tabs.TabSettings.SELECT_COIN_BASIS_TRADE,
+                label="Select Coin",
+                placeholder="Select Coin",
+                value=Symbol.BTCUSDT.value,
+                allowDeselect=False,
+                data=instrument_options()
+            )
+        ]
+    )
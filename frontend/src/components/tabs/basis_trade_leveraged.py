@@ -3,45 +3,47 @@ import dash_mantine_components as dmc
 
 from backend.models.models_orm import Coin, Symbol
 from frontend.src.components.components_id_tree import ComponentsIdTree
+from frontend.src.components.select_options import coin_options, instrument_options, rolling_options
 
 
-fieldset_basis_trade_leveraged = dmc.Fieldset(
-    legend="Chart Settings Basis Trade Leveraged",
-    mt='xl',
-    children=[
-        dmc.Stack(
-            children=[
-                dmc.Select(
-                    id=ComponentsIdTree.Tabs.TabSettings.SELECT_COIN_BASIS_TRADE_LEVERAGED,
-                    label="Select Coin",
-                    placeholder="Select Coin",
-                    value=Symbol.BTCUSDT,
-                    allowDeselect=False,
-                    data=[
-                        {
-                            "value": symbol,
-                            "label": symbol.value,
-                            "description": symbol.value
-                        }
-                        for symbol in Symbol
-                    ]
-                ),
-                dmc.Select(
-                    id=ComponentsIdTree.Tabs.TabSettings.SELECT_STABLECOIN_BASIS_TRADE_LEVERAGED,
-                    label="Select Stablecoin",
-                    placeholder="Select Stablecoin",
-                    value=Coin.DAI,
-                    allowDeselect=False,
-                    data=[
-                        {
-                            "value": coin,
-                            "label": coin.value,
-                            "description": coin.value
-                        }
-                        for coin in Coin
-                    ]
-                )
-            ]
-        )
-    ]
-)
\ No newline at end of file
+def generate_fieldset_basis_trade_leveraged() -> dmc.Fieldset:
+    """Generate the settings of the leveraged basis trade tab with the currently registered symbols and coins.
+
+    Returns:
+        dmc.Fieldset: The fieldset of the leveraged basis trade tab.
+    """
+    return dmc.Fieldset(
+        legend="Chart Settings Basis Trade Leveraged",
+        mt='xl',
+        children=[
+            dmc.Stack(
+                children=[
+                    dmc.Select(
+                        id=ComponentsIdTree.Tabs.TabSettings.SELECT_COIN_BASIS_TRADE_LEVERAGED,
+                        label="Select Coin",
+                        placeholder="Select Coin",
+                        value=Symbol.BTCUSDT.value,
+                        allowDeselect=False,
+                        data=instrument_options()
+                    ),
+                    dmc.Select(
+                        id=ComponentsIdTree.Tabs.TabSettings.SELECT_STABLECOIN_BASIS_TRADE_LEVERAGED,
+                        label="Select Stablecoin",
+                        placeholder="Select Stablecoin",
+                        value=Coin.DAI.value,
+                        allowDeselect=False,
+                        data=coin_options()
+                    ),
+                    dmc.MultiSelect(
+                        id=ComponentsIdTree.Tabs.TabSettings.SELECT_ROLLING_STATS_BASIS_TRADE_LEVERAGED,
+                        label="Rolling Statistics",
+                        description="Shown on the net income chart",
+                        placeholder="Select Statistics",
+                        value=[],
+                        clearable=True,
+                        data=rolling_options()
+                    )
+                ]
+            )
+        ]
+    )
@@ -0,0 +1,74 @@
+""" This module contains the components for the Screener tab. """
+import dash_mantine_components as dmc
+
+from frontend.src.components.components_id_tree import ComponentsIdTree
+from frontend.src.components.select_options import screener_rank_options, screener_window_options
+
+
+def generate_fieldset_screener() -> dmc.Fieldset:
+    """Generate the settings of the screener tab.
+
+    Returns:
+        dmc.Fieldset: The fieldset of the screener tab.
+    """
+    return dmc.Fieldset(
+        legend="Screener Settings",
+        mt='xl',
+        children=[
+            dmc.Stack(
+                children=[
+                    dmc.Select(
+                        id=ComponentsIdTree.Tabs.TabScreener.SELECT_WINDOW,
+                        label="Select Window",
+                        value="30",
+                        allowDeselect=False,
+                        data=screener_window_options()
+                    ),
+                    dmc.Select(
+                        id=ComponentsIdTree.Tabs.TabScreener.SELECT_RANK_BY,
+                        label="Rank By",
+                        value="apr",
+                        allowDeselect=False,
+                        data=screener_rank_options()
+                    )
+                ]
+            )
+        ]
+    )
+
+
+def generate_panel_screener() -> dmc.TabsPanel:
+    """Generate the panel of the screener tab with its settings and the ranked table.
+
+    Returns:
+        dmc.TabsPanel: The panel of the screener tab.
+    """
+    return dmc.TabsPanel(
+        id=ComponentsIdTree.Tabs.TabPanels.PANEL_SCREENER,
+        value=ComponentsIdTree.Tabs.TabPanels.PANEL_SCREENER,
+        children=dmc.Grid(
+            children=[
+                dmc.GridCol(
+                    span=2.5,
+                    children=[generate_fieldset_screener()]
+                ),
+                dmc.GridCol(
+                    span=9.5,
+                    children=[
+                        dmc.ScrollArea(
+                            h="calc(80vh - 150px)",
+                            mt='xl',
+                            children=[
+                                dmc.Table(
+                                    id=ComponentsIdTree.Tabs.TabScreener.TABLE,
+                                    striped=True,
+                                    highlightOnHover=True,
+                                    stickyHeader=True
+                                )
+                            ]
+                        )
+                    ]
+                )
+            ]
+        )
+    )
@@ -0,0 +1,66 @@
+""" This module contains the components for the Sweep tab. """
+from dash import dcc
+import dash_mantine_components as dmc
+
+from frontend.src.components.components_id_tree import ComponentsIdTree
+from frontend.src.components.select_options import sweep_best_options
+
+
+def generate_fieldset_sweep() -> dmc.Fieldset:
+    """Generate the settings of the sweep tab.
+
+    Returns:
+        dmc.Fieldset: The fieldset of the sweep tab.
+    """
+    return dmc.Fieldset(
+        legend="Sweep Settings",
+        mt='xl',
+        children=[
+            dmc.Stack(
+                children=[
+                    dmc.Select(
+                        id=ComponentsIdTree.Tabs.TabSweep.SELECT_BEST_BY,
+                        label="Best By",
+                        value="apr",
+                        allowDeselect=False,
+                        data=sweep_best_options()
+                    ),
+                    dmc.Text(
+                        "Results of the most recent run of python -m backend.services.sweep",
+                        size="sm",
+                        c="dimmed"
+                    )
+                ]
+            )
+        ]
+    )
+
+
+def generate_panel_sweep() -> dmc.TabsPanel:
+    """Generate the panel of the sweep tab with its settings and the heatmap.
+
+    Returns:
+        dmc.TabsPanel: The panel of the sweep tab.
+    """
+    return dmc.TabsPanel(
+        id=ComponentsIdTree.Tabs.TabPanels.PANEL_SWEEP,
+        value=ComponentsIdTree.Tabs.TabPanels.PANEL_SWEEP,
+        children=dmc.Grid(
+            children=[
+                dmc.GridCol(
+                    span=2.5,
+                    children=[generate_fieldset_sweep()]
+                ),
+                dmc.GridCol(
+                    span=9.5,
+                    children=[
+                        dcc.Graph(
+                            id=ComponentsIdTree.Tabs.TabSweep.HEATMAP,
+                            config={"displayModeBar": False},
+                            style={"marginTop": "10px"}
+                        )
+                    ]
+                )
+            ]
+        )
+    )
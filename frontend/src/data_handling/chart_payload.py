@@ -0,0 +1,79 @@
+""" This module contains the builder of the data and series payload of the line charts.
+
+The loaders pass whole arrays instead of building one dict per point in a loop. The values are
+rounded with one numpy call per series and the date labels are derived from the month index of
+the timestamps, so only the distinct months are ever formatted. Long series are reduced to the
+point budget of the chart with `lttb_indices` before the records are built.
+"""
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from frontend.src.data_handling.downsample import lttb_indices
+
+
+MONTH_ABBREVIATIONS = np.array(['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])
+
+
+class ChartSeries(NamedTuple):
+    """One line of a chart.
+
+    Attributes:
+        name (str): The name of the series, also its key in the data records.
+        values (np.ndarray): The values, one per timestamp.
+        color (str): The Mantine color of the line.
+        decimals (int): The number of decimals the values are rounded to.
+    """
+    name: str
+    values: np.ndarray
+    color: str
+    decimals: int = 5
+
+
+def month_labels(timestamps: np.ndarray) -> np.ndarray:
+    """Format timestamps as month labels like `Jan 24`, equal to `strftime('%b %y')`.
+
+    Args:
+        timestamps (np.ndarray): The timestamps as `datetime64`.
+
+    Returns:
+        np.ndarray: The labels as strings.
+    """
+    months, inverse = np.unique(np.asarray(timestamps).astype('datetime64[M]').astype(np.int64), return_inverse=True)
+    if len(months) == 0:
+        return np.array([], dtype=str)
+    years = np.char.zfill(((1970 + months // 12) % 100).astype(str), 2)
+    labels = np.char.add(np.char.add(MONTH_ABBREVIATIONS[months % 12], ' '), years)
+    return labels[inverse.reshape(-1)]
+
+
+def build_chart_payload(
+    timestamps: np.ndarray,
+    series: List[ChartSeries],
+    max_points: Optional[int] = None
+) -> Tuple[List[dict], List[dict]]:
+    """Build the records and the series definitions of a `dmc.LineChart`.
+
+    Args:
+        timestamps (np.ndarray): The timestamps of the points as `datetime64`.
+        series (List[ChartSeries]): The lines of the chart, all as long as the timestamps.
+        max_points (int, optional): The point budget of the chart, all series are downsampled
+            together to the same timestamps. Defaults to None for all points.
+
+    Returns:
+        tuple: The records with a `date` label and one rounded value per series, and the series definitions.
+    """
+    timestamps = np.asarray(timestamps)
+    values = [np.asarray(line.values, dtype=np.float64) for line in series]
+    if max_points is not None and values:
+        kept = lttb_indices(timestamps, np.column_stack(values), max_points)
+        timestamps, values = timestamps[kept], [column[kept] for column in values]
+
+    names = ['date', *(line.name for line in series)]
+    columns = [
+        month_labels(timestamps).tolist(),
+        *(np.round(column, line.decimals).tolist() for column, line in zip(values, series))
+    ]
+    data = [dict(zip(names, row)) for row in zip(*columns)]
+    definitions = [{"name": line.name, "color": line.color} for line in series]
+    return data, definitions
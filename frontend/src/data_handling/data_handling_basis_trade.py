@@ -1,63 +1,82 @@
 """ This module contains functions that generate graphs for the funding rates and stable coin interest. """
 import numpy as np
 
-from backend.data_access.crud.crud_funding import read_funding_entries
+from backend.data_access.storage.buckets import Aggregation, resolution_for_budget
+from backend.data_access.storage.rollups import bucket_end, rollup_resolution
+from backend.data_access.storage.time_series_store import SeriesTable, get_store
 from backend.models.models_orm import Symbol
+from frontend.settings import frontend_settings
+from frontend.src.data_handling.chart_payload import ChartSeries, build_chart_payload
 
 
-def load_data_cumulative_funding(symbol: Symbol = Symbol.BTCUSDT.value):
+def load_data_cumulative_funding(symbol: str = Symbol.BTCUSDT.value):
     """ This function loads the data for the cumulative funding rate graph.
 
     Args:
-        symbol (Symbol, optional): The symbol for which the cumulative return should be calculated.
+        symbol (str, optional): The symbol for which the cumulative return should be calculated.
             Defaults to Symbol.BTCUSDT.value.
     
     Returns:
         dict: A dictionary containing the timestamps and funding rates for the given coin.
     """
-    timestamps_coin, funding_rates_coin = read_funding_entries(Symbol(symbol), num_values=5*3*365)
-    linear_return_coin = 100 * np.cumsum(np.array(funding_rates_coin))
-    cumulative_return_btc = 100 * (np.cumprod(1 + np.array(funding_rates_coin)) - 1)
+    store = get_store()
+    latest = store.read_most_recent_update(SeriesTable.FUNDING, symbol)
+    if latest is None:
+        timestamps, linear, compound = np.array([], dtype='datetime64[ms]'), np.array([]), np.array([])
+    else:
+        # Five years of persisted rollups, a few hundred buckets accumulated to the end of every bucket
+        latest = np.datetime64(latest, 'ms')
+        start = latest - np.timedelta64(5*365, 'D')
+        resolution = rollup_resolution(start, latest, frontend_settings.CHART_POINT_BUDGET)
+        rollups = store.read_rollups(SeriesTable.FUNDING, symbol, resolution, start=start)
+        timestamps = np.minimum(bucket_end(rollups.timestamps, resolution), latest)
+        linear, compound = np.cumsum(rollups.sum), np.cumprod(rollups.compound)
+    linear_return_coin = 100 * linear
+    cumulative_return_btc = 100 * (compound - 1)
 
     title = f"{symbol} Funding Rate Cumulative"
-    data = []
-    for ts, compound, linear in zip(timestamps_coin, cumulative_return_btc, linear_return_coin):
-        data.append(
-            {
-                'date': ts.strftime('%b %y'),
-                f'Compound Funding {symbol}': round(compound, 2),
-                f'Cummulative Funding {symbol}': round(linear, 2)
-            }
-        )
-    
-    series = [
-        {"name": f"Compound Funding {symbol}", "color": "indigo.6"},
-        {"name": f"Cummulative Funding {symbol}", "color": "blue.6"}
-    ]
+    data, series = build_chart_payload(
+        timestamps,
+        [
+            ChartSeries(f"Compound Funding {symbol}", cumulative_return_btc, "indigo.6", 2),
+            ChartSeries(f"Cummulative Funding {symbol}", linear_return_coin, "blue.6", 2)
+        ],
+        max_points=frontend_settings.CHART_POINT_BUDGET
+    )
     
     return title, data, series
 
 
-def load_data_funding_rates(symbol: Symbol = Symbol.BTCUSDT.value):
+def load_data_funding_rates(symbol: str = Symbol.BTCUSDT.value):
     """ This function loads the data for the funding rate graph.
 
     Args:
-        symbol (Symbol, optional): The symbol for which the funding rates should be calculated.
+        symbol (str, optional): The symbol for which the funding rates should be calculated.
             Defaults to Symbol.BTCUSDT.value.
     
     Returns:
         dict: A dictionary containing the timestamps and funding rates for the given coin.
     """
-    timestamps_btc, funding_rates_btc = read_funding_entries(Symbol(symbol), num_values=5*3*365)
+    store = get_store()
+    latest = store.read_most_recent_update(SeriesTable.FUNDING, symbol)
+    if latest is None:
+        timestamps, highs, lows = np.array([], dtype='datetime64[ms]'), np.array([]), np.array([])
+    else:
+        # Five years bucketed in SQL, the highest and lowest settlement of every bucket keep single spikes visible
+        latest = np.datetime64(latest, 'ms')
+        start = latest - np.timedelta64(5*365, 'D')
+        resolution = resolution_for_budget(start, latest, frontend_settings.CHART_POINT_BUDGET)
+        timestamps, highs = store.read_buckets(SeriesTable.FUNDING, symbol, resolution, Aggregation.MAX, start=start)
+        _, lows = store.read_buckets(SeriesTable.FUNDING, symbol, resolution, Aggregation.MIN, start=start)
 
     title = f"{symbol} Funding Rate"
-    
-    data = []
-    for ts, value in zip(timestamps_btc, funding_rates_btc):
-        data.append({'date': ts.strftime('%b %y'), f'Funding {symbol}': round(100*value, 5)})
-    
-    series = [
-        {"name": f"Funding {symbol}", "color": "blue.6"},
-    ]
+    data, series = build_chart_payload(
+        timestamps,
+        [
+            ChartSeries(f"Max Funding {symbol}", 100*highs, "blue.6"),
+            ChartSeries(f"Min Funding {symbol}", 100*lows, "cyan.6")
+        ],
+        max_points=frontend_settings.CHART_POINT_BUDGET
+    )
 
     return title, data, series
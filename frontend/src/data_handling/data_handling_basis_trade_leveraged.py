@@ -1,165 +1,489 @@
 """ This module contains functions that generate graphs for the funding rates and stable coin interest. """
+from threading import Lock
+import time
+from typing import Callable, Dict, NamedTuple, Optional, Sequence
+
 import numpy as np
 
-from backend.data_access.crud.crud_funding import read_funding_entries
-from backend.data_access.crud.crud_interest import read_interest_entries
+from backend.data_access.crud.crud_cache import SeriesCache
+from backend.data_access.storage.cumulative import cumulative_before
+from backend.data_access.storage.resample import align_interest, funding_interval
+from backend.data_access.storage.rolling import (
+    ROLLING_WINDOW_DAYS,
+    RollingAccumulator,
+    RollingStats,
+    periods_per_year,
+    rolling_windows
+)
+from backend.data_access.storage.time_series_store import SeriesTable, TimeSeriesStore, get_store
 from backend.models.models_orm import Coin, Symbol
+from backend.services.bootstrap import BootstrapBands, bootstrap_bands
+from frontend.settings import frontend_settings
+from frontend.src.data_handling.chart_payload import ChartSeries, build_chart_payload
+
+
+# Number of most recent funding settlements shown on the leveraged slides
+LEVERAGED_FUNDING_VALUES = 3*365
+
+# Number of settlements averaged by the moving average of the net income slide
+MOVING_AVERAGE_PERIODS = 30
+
+# Labels of the rolling statistics and colors of their optional series in the order they are selected
+ROLLING_LABELS = {"mean": "Mean", "std": "Std", "apr": "APR", "sharpe": "Sharpe", "zscore": "Z-Score"}
+ROLLING_COLORS = ["violet.6", "cyan.6", "yellow.6", "grape.6", "teal.6", "indigo.6", "lime.6", "pink.6"]
+
+# Length in days of the blocks of the bootstrap bands of the cumulative slide and the seed of their draws,
+# fixed so the bands only change with the data
+BOOTSTRAP_BLOCK_DAYS = 7
+BOOTSTRAP_SEED = 0
+
+# Colors of the bootstrap bands by their distance from the median
+BOOTSTRAP_COLORS = {0.0: "green.9", 25.0: "green.4", 45.0: "green.2"}
+
+# Aligned frames kept for switching between the slides, a few KiB each
+ALIGNED_FRAMES = SeriesCache(max_bytes=16 * 1024 * 1024)
+
+
+class AlignedFrame(NamedTuple):
+    """The funding of a symbol and the interest of a stable coin summed over the same settlement windows."""
+    timestamps: np.ndarray
+    funding: np.ndarray
+    interest: np.ndarray
+
+
+class RollingState(NamedTuple):
+    """The accumulator of the rolling statistics of a pair and the net income it was fed last."""
+    accumulator: RollingAccumulator
+    timestamps: np.ndarray
+    values: np.ndarray
+    stats: Dict[int, RollingStats]
+
+
+# Rolling statistics of every pair, extended by the settlements of every newer aligned frame
+ROLLING_STATES: Dict[tuple, RollingState] = {}
+_ROLLING_LOCK = Lock()
+
+
+class CumulativeFrame(NamedTuple):
+    """The compound returns of the funding, the interest and their spread at the same settlements."""
+    timestamps: np.ndarray
+    funding: np.ndarray
+    interest: np.ndarray
+    spread: np.ndarray
+
+
+def interest_window_start(timestamps_coin: np.ndarray, interval: np.timedelta64 = np.timedelta64(8, 'h')):
+    """Return the first hourly interest timestamp needed to align the interest with the funding.
+
+    The first funding settlement collects the interest of the interval before it.
+
+    Args:
+        timestamps_coin (np.ndarray): The funding timestamps as `datetime64[ms]`.
+        interval (np.timedelta64, optional): The funding interval of the symbol. Defaults to 8 hours.
+
+    Returns:
+        np.datetime64: The start of the interest window or None to read the whole history.
+    """
+    return timestamps_coin[0] - interval if len(timestamps_coin) else None
+
+
+def build_aligned_frame(
+    symbol: str,
+    stablecoin: str,
+    num_values: Optional[int] = LEVERAGED_FUNDING_VALUES,
+    store: Optional[TimeSeriesStore] = None
+) -> AlignedFrame:
+    """Read the funding of a symbol and the interest of a stable coin and align them by settlement.
+
+    Every funding settlement is paired with the hourly interest since the previous settlement,
+    see `align_interest`. Settlements without any interest are left out.
+
+    Args:
+        symbol (str): The symbol of the funding series.
+        stablecoin (str): The stable coin of the interest series.
+        num_values (int, optional): The number of most recent funding entries. Defaults to `LEVERAGED_FUNDING_VALUES`.
+        store (TimeSeriesStore, optional): The store to be read. Defaults to the active store.
+
+    Returns:
+        AlignedFrame: The funding timestamps, the funding rates and the interest rates of the same windows.
+    """
+    store = store if store is not None else get_store()
+    interval = funding_interval(symbol)
+    timestamps_coin, funding_rates_coin = store.read_entries(SeriesTable.FUNDING, symbol, num_values=num_values)
+    timestamps_stable, interest_rates_stable = store.read_entries(
+        SeriesTable.INTEREST,
+        stablecoin,
+        start=interest_window_start(timestamps_coin, interval)
+    )
+
+    covered, interest = align_interest(timestamps_coin, timestamps_stable, interest_rates_stable, interval)
+    return AlignedFrame(timestamps_coin[covered], funding_rates_coin[covered], interest)
+
+
+def load_aligned_frame(
+    symbol: str,
+    stablecoin: str,
+    num_values: Optional[int] = LEVERAGED_FUNDING_VALUES,
+    store: Optional[TimeSeriesStore] = None
+) -> AlignedFrame:
+    """Return the aligned frame of a symbol and a stable coin, built at most once per hour.
+
+    New funding and interest entries only settle on full hours, so a frame built within the
+    current hour is served to all leveraged slides without reading the store again.
+
+    Args:
+        symbol (str): The symbol of the funding series.
+        stablecoin (str): The stable coin of the interest series.
+        num_values (int, optional): The number of most recent funding entries. Defaults to `LEVERAGED_FUNDING_VALUES`.
+        store (TimeSeriesStore, optional): The store to be read. Defaults to the active store.
+
+    Returns:
+        AlignedFrame: The aligned frame, its arrays are read-only.
+    """
+    store = store if store is not None else get_store()
+    return _memoized(
+        (store, 'aligned', symbol, stablecoin, num_values),
+        lambda: build_aligned_frame(symbol, stablecoin, num_values, store)
+    )
+
+
+def build_cumulative_frame(
+    symbol: str,
+    stablecoin: str,
+    num_values: Optional[int] = LEVERAGED_FUNDING_VALUES,
+    store: Optional[TimeSeriesStore] = None
+) -> CumulativeFrame:
+    """Read the persisted compound returns of the funding, the interest and their spread.
+
+    The curves are rebased to the first settlement of the aligned frame. The interest is
+    sampled before every settlement, so it covers the same windows as the spread.
+
+    Args:
+        symbol (str): The symbol of the funding series.
+        stablecoin (str): The stable coin of the interest series.
+        num_values (int, optional): The number of most recent funding entries. Defaults to `LEVERAGED_FUNDING_VALUES`.
+        store (TimeSeriesStore, optional): The store to be read. Defaults to the active store.
+
+    Returns:
+        CumulativeFrame: The compound returns at the settlements of the spread.
+    """
+    store = store if store is not None else get_store()
+    frame = load_aligned_frame(symbol, stablecoin, num_values, store)
+    if len(frame.timestamps) == 0:
+        empty = np.array([])
+        return CumulativeFrame(frame.timestamps, empty, empty, empty)
+
+    start = frame.timestamps[0]
+    spread = store.read_spread_cumulative(symbol, stablecoin, start)
+    funding = store.read_cumulative(SeriesTable.FUNDING, symbol, start)
+    interest = store.read_cumulative(SeriesTable.INTEREST, stablecoin, start - funding_interval(symbol))
+
+    _, funding_compound = cumulative_before(funding, spread.timestamps + np.timedelta64(1, 'ms'))
+    _, interest_compound = cumulative_before(interest, spread.timestamps)
+    return CumulativeFrame(spread.timestamps, funding_compound, interest_compound, spread.compound)
+
+
+def load_cumulative_frame(
+    symbol: str,
+    stablecoin: str,
+    num_values: Optional[int] = LEVERAGED_FUNDING_VALUES,
+    store: Optional[TimeSeriesStore] = None
+) -> CumulativeFrame:
+    """Return the cumulative frame of a symbol and a stable coin, built at most once per hour.
+
+    Args:
+        symbol (str): The symbol of the funding series.
+        stablecoin (str): The stable coin of the interest series.
+        num_values (int, optional): The number of most recent funding entries. Defaults to `LEVERAGED_FUNDING_VALUES`.
+        store (TimeSeriesStore, optional): The store to be read. Defaults to the active store.
+
+    Returns:
+        CumulativeFrame: The cumulative frame, its arrays are read-only.
+    """
+    store = store if store is not None else get_store()
+    return _memoized(
+        (store, 'cumulative', symbol, stablecoin, num_values),
+        lambda: build_cumulative_frame(symbol, stablecoin, num_values, store)
+    )
+
+
+def build_rolling_stats(
+    symbol: str,
+    stablecoin: str,
+    num_values: Optional[int] = LEVERAGED_FUNDING_VALUES,
+    store: Optional[TimeSeriesStore] = None
+) -> Dict[int, RollingStats]:
+    """Compute the rolling statistics of the net income in percent from the aligned frame.
+
+    The accumulator of the pair is only fed the settlements newer than its previous update and
+    is rebuilt if earlier settlements of the frame changed. The statistics of the first values
+    of a frame may therefore cover settlements that have slid out of it.
+
+    Args:
+        symbol (str): The symbol of the funding series.
+        stablecoin (str): The stable coin of the interest series.
+        num_values (int, optional): The number of most recent funding entries. Defaults to `LEVERAGED_FUNDING_VALUES`.
+        store (TimeSeriesStore, optional): The store to be read. Defaults to the active store.
+
+    Returns:
+        Dict[int, RollingStats]: The statistics by window length in periods, covering the
+            `rolling_windows` of the symbol and `MOVING_AVERAGE_PERIODS`.
+    """
+    store = store if store is not None else get_store()
+    interval = funding_interval(symbol)
+    frame = load_aligned_frame(symbol, stablecoin, num_values, store)
+    values = 100*(frame.funding - frame.interest)
+    key = (store, symbol, stablecoin, num_values)
+
+    with _ROLLING_LOCK:
+        state = ROLLING_STATES.get(key)
+        appended = _appended_from(state, frame.timestamps, values)
+        if appended is None:
+            windows = {MOVING_AVERAGE_PERIODS, *rolling_windows(interval).values()}
+            accumulator = RollingAccumulator(sorted(windows), periods_per_year(interval))
+            stats = accumulator.update(values)
+        else:
+            accumulator = state.accumulator
+            added = accumulator.update(values[appended:])
+            stats = {
+                window: RollingStats(*(
+                    np.concatenate([previous, new])[len(previous) + len(new) - len(values):]
+                    for previous, new in zip(state.stats[window], added[window])
+                ))
+                for window in accumulator.windows
+            }
+        ROLLING_STATES[key] = RollingState(accumulator, frame.timestamps, values, stats)
+    return stats
+
+
+def _appended_from(state: Optional[RollingState], timestamps: np.ndarray, values: np.ndarray) -> Optional[int]:
+    """Return the index of the first value appended since the state was fed, None if the state does not extend."""
+    if state is None or len(state.timestamps) == 0:
+        return None
+    first = int(np.searchsorted(timestamps, state.timestamps[-1], side='right'))
+    if first == 0:
+        return None
+    if not np.array_equal(timestamps[:first], state.timestamps[-first:]) or not np.array_equal(values[:first], state.values[-first:]):
+        return None
+    return first
+
+
+def load_rolling_stats(
+    symbol: str,
+    stablecoin: str,
+    num_values: Optional[int] = LEVERAGED_FUNDING_VALUES,
+    store: Optional[TimeSeriesStore] = None
+) -> Dict[int, RollingStats]:
+    """Return the rolling statistics of the net income, computed at most once per hour.
+
+    Args:
+        symbol (str): The symbol of the funding series.
+        stablecoin (str): The stable coin of the interest series.
+        num_values (int, optional): The number of most recent funding entries. Defaults to `LEVERAGED_FUNDING_VALUES`.
+        store (TimeSeriesStore, optional): The store to be read. Defaults to the active store.
+
+    Returns:
+        Dict[int, RollingStats]: The statistics by window length in periods.
+    """
+    store = store if store is not None else get_store()
+    return _memoized(
+        (store, 'rolling', symbol, stablecoin, num_values),
+        lambda: build_rolling_stats(symbol, stablecoin, num_values, store)
+    )
+
+
+def build_bootstrap_bands(
+    symbol: str,
+    stablecoin: str,
+    num_values: Optional[int] = LEVERAGED_FUNDING_VALUES,
+    store: Optional[TimeSeriesStore] = None
+) -> BootstrapBands:
+    """Compute the bootstrap bands of the compound spread from the aligned frame.
+
+    The paths resample weeks of the spread of funding and interest of the aligned frame and
+    have one step per settlement of the cumulative frame.
+
+    Args:
+        symbol (str): The symbol of the funding series.
+        stablecoin (str): The stable coin of the interest series.
+        num_values (int, optional): The number of most recent funding entries. Defaults to `LEVERAGED_FUNDING_VALUES`.
+        store (TimeSeriesStore, optional): The store to be read. Defaults to the active store.
+
+    Returns:
+        BootstrapBands: The percentiles of the compound spread at every settlement of the cumulative frame.
+    """
+    frame = load_aligned_frame(symbol, stablecoin, num_values, store)
+    steps = len(load_cumulative_frame(symbol, stablecoin, num_values, store).timestamps)
+    block = rolling_windows(funding_interval(symbol), (BOOTSTRAP_BLOCK_DAYS,))[BOOTSTRAP_BLOCK_DAYS]
+    return bootstrap_bands(frame.funding - frame.interest, steps, block=block, seed=BOOTSTRAP_SEED)
+
+
+def load_bootstrap_bands(
+    symbol: str,
+    stablecoin: str,
+    num_values: Optional[int] = LEVERAGED_FUNDING_VALUES,
+    store: Optional[TimeSeriesStore] = None
+) -> BootstrapBands:
+    """Return the bootstrap bands of the compound spread, computed at most once per hour.
+
+    Args:
+        symbol (str): The symbol of the funding series.
+        stablecoin (str): The stable coin of the interest series.
+        num_values (int, optional): The number of most recent funding entries. Defaults to `LEVERAGED_FUNDING_VALUES`.
+        store (TimeSeriesStore, optional): The store to be read. Defaults to the active store.
+
+    Returns:
+        BootstrapBands: The bootstrap bands, its arrays are read-only.
+    """
+    store = store if store is not None else get_store()
+    return _memoized(
+        (store, 'bootstrap', symbol, stablecoin, num_values),
+        lambda: build_bootstrap_bands(symbol, stablecoin, num_values, store)
+    )
+
+
+def bootstrap_color(percentile: float) -> str:
+    """Return the color of a bootstrap band, lighter the further it is from the median."""
+    distance = abs(percentile - 50.0)
+    return BOOTSTRAP_COLORS[max(bound for bound in BOOTSTRAP_COLORS if bound <= distance)]
+
+
+def parse_rolling_series(value: str):
+    """Split the value of a rolling series option like `apr-30` into the statistic and the window in days.
+
+    Raises:
+        ValueError: If the statistic or the window is unknown.
+    """
+    statistic, _, days = value.partition('-')
+    if statistic not in ROLLING_LABELS or not days.isdigit() or int(days) not in ROLLING_WINDOW_DAYS:
+        raise ValueError(f"Unknown rolling series {value}")
+    return statistic, int(days)
+
+
+def _memoized(key: tuple, build: Callable[[], tuple]) -> tuple:
+    """Serve a frame built within the current hour from `ALIGNED_FRAMES`."""
+    hour = int(time.time() // 3600)
+    frame = ALIGNED_FRAMES.get(key, hour)
+    if frame is None:
+        frame = build()
+        ALIGNED_FRAMES.put(key, hour, frame)
+    return frame
 
 
 def load_data_cumulative_funding_leveraged(
-    symbol: Symbol = Symbol.BTCUSDT.value,
-    stablecoin: Coin = Coin.DAI.value
+    symbol: str = Symbol.BTCUSDT.value,
+    stablecoin: str = Coin.DAI.value
 ):
     """ This function loads the data for the cumulative funding rate graph.
 
+    The compound difference is shown with the percentiles of its block bootstrapped paths, see
+    `load_bootstrap_bands`.
+
     Args:
-        symbol (Symbol, optional): The symbol for which the cumulative return should be calculated.
+        symbol (str, optional): The symbol for which the cumulative return should be calculated.
             Defaults to Symbol.BTCUSDT.value.
-        stablecoin (Coin, optional): The stable coin for which the interest rates should be calculated.
+        stablecoin (str, optional): The stable coin for which the interest rates should be calculated.
     
     Returns:
         dict: A dictionary containing the timestamps and funding rates for the given coin.
     """
-    timestamps_coin, funding_rates_coin = read_funding_entries(Symbol(symbol), num_values=3*365)
-    timestamps_stable, interest_rates_stable = read_interest_entries(Coin(stablecoin))
-    first_entry = max(min(timestamps_coin), min(timestamps_stable))
-
-    interest_rates_stable = interest_rates_stable[len(interest_rates_stable) % 8:].reshape(-1, 8).sum(axis=1)
-    timestamps_stable = timestamps_stable[len(timestamps_stable) % 8::8]
+    frame = load_cumulative_frame(symbol, stablecoin)
+    bootstrap = load_bootstrap_bands(symbol, stablecoin)
 
-    timestamps_stable = [timestamp for timestamp in timestamps_stable if timestamp >= first_entry]
-    timestamps_coin = [timestamp for timestamp in timestamps_coin if timestamp >= first_entry][-len(timestamps_stable):]
-
-    funding_rates_coin = funding_rates_coin[-len(timestamps_coin):]
-    interest_rates_stable = interest_rates_stable[-len(timestamps_stable):]
-    
-    compound_funding_coin = 100*(np.cumprod(1 + np.array(funding_rates_coin)) - 1)
-    compound_interest_stable = 100*(np.cumprod(1 + np.array(interest_rates_stable)) - 1)
-    compound_difference = 100*(np.cumprod(1 + np.array(funding_rates_coin) - np.array(interest_rates_stable)) - 1)
+    compound_funding_coin = 100*(frame.funding - 1)
+    compound_interest_stable = 100*(frame.interest - 1)
+    compound_difference = 100*(frame.spread - 1)
 
     title = f"{symbol} Funding Rate Cumulative"
-
-    data = []
-    for ts, compound, linear, difference in zip(timestamps_coin, compound_funding_coin, compound_interest_stable, compound_difference):
-        data.append(
-            {
-                "date": ts.strftime("%b %y"),
-                f"Compound Funding {symbol}": round(compound, 2),
-                f"Compound Interest {stablecoin}": round(linear, 2),
-                "Compound Difference": round(difference, 2)
-            }
-        )
-    
-    series = [
-        {"name": f"Compound Funding {symbol}", "color": "blue.6"},
-        {"name": f"Compound Interest {stablecoin}", "color": "orange.6"},
-        {"name": "Compound Difference", "color": "green.6"}
-    ]
+    data, series = build_chart_payload(
+        frame.timestamps,
+        [
+            ChartSeries(f"Compound Funding {symbol}", compound_funding_coin, "blue.6", 2),
+            ChartSeries(f"Compound Interest {stablecoin}", compound_interest_stable, "orange.6", 2),
+            ChartSeries("Compound Difference", compound_difference, "green.6", 2),
+            *(
+                ChartSeries(f"Bootstrap P{percentile:g}", 100*(band - 1), bootstrap_color(percentile), 2)
+                for percentile, band in zip(bootstrap.percentiles, bootstrap.bands)
+            )
+        ],
+        max_points=frontend_settings.CHART_POINT_BUDGET
+    )
     
     return title, data, series
 
 
 def load_data_funding_rates_leveraged(
-    symbol: Symbol = Symbol.BTCUSDT.value,
-    stablecoin: Coin = Coin.DAI.value
+    symbol: str = Symbol.BTCUSDT.value,
+    stablecoin: str = Coin.DAI.value
 ):
     """ This function loads the data for the funding rate graph.
 
     Args:
-        symbol (Symbol, optional): The symbol for which the funding rates should be calculated.
+        symbol (str, optional): The symbol for which the funding rates should be calculated.
             Defaults to Symbol.BTCUSDT.value.
-        stablecoin (Coin, optional): The stable coin for which the interest rates should be calculated.
+        stablecoin (str, optional): The stable coin for which the interest rates should be calculated.
     
     Returns:
         dict: A dictionary containing the timestamps and funding rates for the given coin.
     """
-    timestamps_coin, funding_rates_coin = read_funding_entries(Symbol(symbol), num_values=None)
-    timestamps_stable, interest_rates_stable = read_interest_entries(Coin(stablecoin))
-    first_entry = max(min(timestamps_coin), min(timestamps_stable))
-
-    interest_rates_stable = interest_rates_stable[len(interest_rates_stable) % 8:].reshape(-1, 8).sum(axis=1)
-    timestamps_stable = timestamps_stable[len(timestamps_stable) % 8::8]
-
-    timestamps_stable = [timestamp for timestamp in timestamps_stable if timestamp >= first_entry]
-    timestamps_coin = [timestamp for timestamp in timestamps_coin if timestamp >= first_entry][-len(timestamps_stable):]
-
-    funding_rates_coin = 100*(funding_rates_coin[-len(timestamps_coin):])
-    interest_rates_stable = 100*(interest_rates_stable[-len(timestamps_stable):])
+    frame = load_aligned_frame(symbol, stablecoin)
 
     title = f"{symbol} Funding Rate vs. Interest"
-
-    data = []
-    for ts, funding, interest in zip(
-        timestamps_coin,
-        funding_rates_coin,
-        interest_rates_stable
-    ):
-        data.append(
-            {
-                "date": ts.strftime('%b %y'),
-                f"Funding {symbol}": round(funding, 5),
-                f"Interest {stablecoin}": round(interest, 5)
-            }
-        )
-    
-    series = [
-        {"name": f"Funding {symbol}", "color": "blue.6"},
-        {"name": f"Interest {stablecoin}", "color": "orange.6"}
-    ]
+    data, series = build_chart_payload(
+        frame.timestamps,
+        [
+            ChartSeries(f"Funding {symbol}", 100*frame.funding, "blue.6"),
+            ChartSeries(f"Interest {stablecoin}", 100*frame.interest, "orange.6")
+        ],
+        max_points=frontend_settings.CHART_POINT_BUDGET
+    )
 
     return title, data, series
 
 
 def load_data_net_income_leveraged(
-    symbol: Symbol = Symbol.BTCUSDT.value,
-    stablecoin: Coin = Coin.DAI.value
+    symbol: str = Symbol.BTCUSDT.value,
+    stablecoin: str = Coin.DAI.value,
+    rolling_series: Sequence[str] = ()
 ):
     """ This function loads the data for the net income graph.
 
     Args:
-        symbol (Symbol, optional): The symbol for which the net income should be calculated.
+        symbol (str, optional): The symbol for which the net income should be calculated.
             Defaults to Symbol.BTCUSDT.value
-        stablecoin (Coin, optional): The stable coin for which the interest rates should be calculated.
+        stablecoin (str, optional): The stable coin for which the interest rates should be calculated.
+        rolling_series (Sequence[str], optional): The rolling statistics shown in addition, like
+            `apr-30` for the 30 day APR, see `parse_rolling_series`. Defaults to none.
     
     Returns:
         dict: A dictionary containing the timestamps and net income for the given coin.
     """
-    timestamps_coin, funding_rates_coin = read_funding_entries(Symbol(symbol), num_values=None)
-    timestamps_stable, interest_rates_stable = read_interest_entries(Coin(stablecoin))
-    first_entry = max(min(timestamps_coin), min(timestamps_stable))
+    frame = load_aligned_frame(symbol, stablecoin)
+    stats = load_rolling_stats(symbol, stablecoin)
+    windows = rolling_windows(funding_interval(symbol))
 
-    interest_rates_stable = interest_rates_stable[len(interest_rates_stable) % 8:].reshape(-1, 8).sum(axis=1)
-    timestamps_stable = timestamps_stable[len(timestamps_stable) % 8::8]
-
-    timestamps_stable = [timestamp for timestamp in timestamps_stable if timestamp >= first_entry]
-    timestamps_coin = [timestamp for timestamp in timestamps_coin if timestamp >= first_entry][-len(timestamps_stable):]
-
-    funding_rates_coin = 100*(funding_rates_coin[-len(timestamps_coin):])
-    interest_rates_stable = 100*(interest_rates_stable[-len(timestamps_stable):])
-
-    net_income = np.array(funding_rates_coin) - np.array(interest_rates_stable)
-    window_size = 30
-    moving_average_30d = np.convolve(net_income, np.ones(window_size) / window_size, mode='valid')
+    net_income = 100*(frame.funding - frame.interest)
+    moving_average = stats[MOVING_AVERAGE_PERIODS].mean
+    optional = []
+    window_start = MOVING_AVERAGE_PERIODS - 1
+    for index, value in enumerate(rolling_series):
+        statistic, days = parse_rolling_series(value)
+        optional.append(ChartSeries(
+            f"{ROLLING_LABELS[statistic]} {days}d",
+            getattr(stats[windows[days]], statistic),
+            ROLLING_COLORS[index % len(ROLLING_COLORS)]
+        ))
+        window_start = max(window_start, windows[days] - 1)
 
     title = f"{symbol} Net Income"
+    data, series = build_chart_payload(
+        frame.timestamps[window_start:],
+        [
+            ChartSeries("Difference", net_income[window_start:], "green.6"),
+            ChartSeries("Moving Average 30d", moving_average[window_start:], "red.6"),
+            *(line._replace(values=line.values[window_start:]) for line in optional)
+        ],
+        max_points=frontend_settings.CHART_POINT_BUDGET
+    )
 
-    data = []
-    for ts, income, ma30 in zip(
-        timestamps_coin[-len(moving_average_30d):],
-        net_income[-len(moving_average_30d):],
-        moving_average_30d
-    ):
-        data.append(
-            {
-                "date": ts.strftime("%b %y"),
-                "Difference": round(income, 5),
-                "Moving Average 30d": round(ma30, 5)
-            }
-        )
-    
-    series = [
-        {"name": "Difference", "color": "green.6"},
-        {"name": "Moving Average 30d", "color": "red.6"}
-    ]
-
-    return title, data, series
\ No newline at end of file
+    return title, data, series
@@ -0,0 +1,54 @@
+""" This module contains the function that generates the table of the funding screener. """
+from typing import Dict, List
+
+import numpy as np
+
+from backend.services.screener import load_screener, rank_screener
+
+
+# Statistics the screener can be ranked by and their column headers
+SCREENER_RANK_BY = {"apr": "APR", "hit_rate": "Hit Rate", "volatility": "Volatility"}
+
+
+def _percent(values: np.ndarray, decimals: int = 2) -> List[str]:
+    """Format fractions as percentages, missing values as a dash."""
+    text = np.char.add(np.round(100*values, decimals).astype(str), ' %')
+    return np.where(np.isnan(values), '-', text).tolist()
+
+
+def load_data_screener(window: int = 30, by: str = "apr") -> Dict[str, list]:
+    """ This function loads the data for the screener table.
+
+    Every instrument is listed with its funding APR over all windows and its hit rate and
+    volatility over the selected window, ranked by the selected statistic of that window.
+
+    Args:
+        window (int, optional): The window in days the instruments are ranked by. Defaults to 30.
+        by (str, optional): The statistic the instruments are ranked by, see `SCREENER_RANK_BY`.
+            Defaults to "apr".
+
+    Returns:
+        dict: The head and the body of a `dmc.Table`.
+    """
+    screener = load_screener()
+    order = rank_screener(screener, window, by, descending=by != "volatility")
+    column = int(np.flatnonzero(screener.windows == window)[0])
+
+    columns = [
+        screener.symbols[order].tolist(),
+        *(_percent(screener.apr[order, index]) for index in range(len(screener.windows))),
+        _percent(screener.hit_rate[order, column], 1),
+        _percent(screener.volatility[order, column]),
+        screener.settlements[order, column].tolist()
+    ]
+    head = [
+        "Rank",
+        "Symbol",
+        *(f"APR {days}d" for days in screener.windows),
+        f"Hit Rate {window}d",
+        f"Volatility {window}d",
+        f"Settlements {window}d"
+    ]
+    body = [[rank, *row] for rank, row in enumerate(zip(*columns), start=1)]
+    return {"head": head, "body": body}
+
@@ -0,0 +1,75 @@
+""" This module contains the function that generates the heatmap of the best sweep configurations. """
+from typing import Optional
+
+import numpy as np
+import plotly.graph_objects as go
+
+from backend.data_access.crud.crud_sweep import read_sweep_results
+
+
+# Scores the best configuration of every pair can be chosen by and their labels
+SWEEP_BEST_BY = {"apr": "APR", "calmar": "APR / Max Drawdown"}
+
+# Smallest drawdown the APR is divided by, so configurations without losses keep a finite score
+MIN_DRAWDOWN = 1e-4
+
+
+def load_data_sweep_heatmap(by: str = "apr", sweep_id: Optional[str] = None) -> go.Figure:
+    """ This function loads the heatmap of the best configuration of every instrument and stable coin.
+
+    Every cell shows the score of the best leverage and rebalancing of a pair in the sweep, the
+    hover text names the configuration.
+
+    Args:
+        by (str, optional): The score the best configuration is chosen by, see `SWEEP_BEST_BY`.
+            Defaults to "apr".
+        sweep_id (str, optional): The id of the sweep. Defaults to the most recent sweep.
+
+    Returns:
+        go.Figure: The heatmap, empty if no sweep was run.
+
+    Raises:
+        ValueError: If the score is unknown.
+    """
+    if by not in SWEEP_BEST_BY:
+        raise ValueError(f"Unknown sweep score {by}")
+
+    rows = read_sweep_results(sweep_id)
+    figure = go.Figure(layout={"title": {"text": f"Best Configuration by {SWEEP_BEST_BY[by]}"}})
+    if not rows:
+        figure.update_layout(title={"text": "No sweep results, run python -m backend.services.sweep"})
+        return figure
+
+    symbols, symbol_index = np.unique([row.symbol for row in rows], return_inverse=True)
+    coins, coin_index = np.unique([row.stablecoin for row in rows], return_inverse=True)
+    apr = np.array([row.apr for row in rows])
+    drawdown = np.array([row.max_drawdown for row in rows])
+    score = apr if by == "apr" else apr / np.maximum(-drawdown, MIN_DRAWDOWN)
+
+    # Order by cell and score, the last row of every cell is its best configuration
+    cells = symbol_index * len(coins) + coin_index
+    order = np.lexsort((score, cells))
+    last = np.r_[cells[order][1:] != cells[order][:-1], True]
+    best = order[last]
+
+    values = np.full((len(symbols), len(coins)), np.nan)
+    labels = np.full((len(symbols), len(coins)), "", dtype=object)
+    values[symbol_index[best], coin_index[best]] = 100*apr[best] if by == "apr" else score[best]
+    labels[symbol_index[best], coin_index[best]] = [
+        f"{rows[index].leverage:g}x, rebalance {rows[index].rebalance_every or 'never'}, "
+        f"APR {100*rows[index].apr:.2f} %, max drawdown {100*rows[index].max_drawdown:.2f} %"
+        for index in best
+    ]
+
+    figure.add_trace(go.Heatmap(
+        z=values,
+        x=coins.tolist(),
+        y=symbols.tolist(),
+        text=labels,
+        hovertemplate="%{y} / %{x}<br>%{text}<extra></extra>",
+        colorscale="RdYlGn",
+        zmid=0,
+        colorbar={"title": {"text": "APR %" if by == "apr" else SWEEP_BEST_BY[by]}}
+    ))
+    figure.update_layout(height=max(400, 22 * len(symbols)), yaxis={"autorange": "reversed"})
+    return figure
@@ -0,0 +1,63 @@
+""" This module contains the Largest-Triangle-Three-Buckets downsampling of the chart series.
+
+The points between the first and the last are split into equally sized buckets and from every
+bucket the point spanning the largest triangle with the point kept from the previous bucket and
+the mean of the next bucket is kept. Spikes span large triangles, so they survive the reduction
+while flat stretches collapse to a few points. Several series sharing one time axis are reduced
+together by summing their triangle areas, every series scaled to its own value range. The
+largest and the smallest value of every series are kept in addition to the points of the
+buckets, which leave room for them in the point budget, so the extremes of the chart are exact
+even where a neighbouring point spans a larger triangle or several extremes share a bucket.
+"""
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """Select the indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    Args:
+        x (np.ndarray): The ascending positions of the points, e.g. timestamps as `datetime64`.
+        y (np.ndarray): The values, one row per point and one column per series, or a 1d array.
+        max_points (int): The maximum number of points kept, at least 3. With many series and a
+            small budget the extremes may exceed it, the buckets keep at least 3 points.
+
+    Returns:
+        np.ndarray: The ascending indices of the kept points, all indices if there are at most `max_points`.
+    """
+    length = len(x)
+    if length <= max_points or max_points < 3:
+        return np.arange(length)
+
+    x = np.asarray(x)
+    x = (x - x[0]).astype(np.float64) if np.issubdtype(x.dtype, np.datetime64) else x.astype(np.float64)
+    y = np.asarray(y, dtype=np.float64).reshape(length, -1)
+    spread = np.nanmax(y, axis=0) - np.nanmin(y, axis=0)
+    y = np.nan_to_num((y - np.nanmin(y, axis=0)) / np.where(spread > 0, spread, 1.0))
+    # The largest and the smallest value of every series are kept on top of the bucket points
+    max_points = max(max_points - 2 * y.shape[1], 3)
+
+    # Bucket i holds the points [bounds[i], bounds[i + 1]), the first and last point are always kept
+    bounds = (np.arange(max_points - 1) * (length - 2) / (max_points - 2)).astype(np.int64) + 1
+    bounds[-1] = length - 1
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = length - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        first, last = bounds[bucket], bounds[bucket + 1]
+        if bucket + 2 < len(bounds):
+            next_x = x[last:bounds[bucket + 2]].mean()
+            next_y = y[last:bounds[bucket + 2]].mean(axis=0)
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        areas = np.abs(
+            (x[previous] - next_x) * (y[first:last] - y[previous])
+            - (x[previous] - x[first:last, None]) * (next_y - y[previous])
+        ).sum(axis=1)
+        previous = first + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+
+    extremes = np.concatenate([np.argmax(y, axis=0), np.argmin(y, axis=0)])
+    return np.union1d(selected, extremes)
@@ -6,8 +6,10 @@ from dash import dcc
 import dash_mantine_components as dmc
 
 from frontend.src.components.components_id_tree import ComponentsIdTree
-from frontend.src.components.tabs.basis_trade import fieldset_basis_trade
-from frontend.src.components.tabs.basis_trade_leveraged import fieldset_basis_trade_leveraged
+from frontend.src.components.tabs.basis_trade import generate_fieldset_basis_trade
+from frontend.src.components.tabs.basis_trade_leveraged import generate_fieldset_basis_trade_leveraged
+from frontend.src.components.tabs.screener import generate_panel_screener
+from frontend.src.components.tabs.sweep import generate_panel_sweep
 from frontend.src.components.tabs.tab_layout import generate_tab
 
 
@@ -70,35 +72,45 @@ def generate_panels(
     ]
 
 
-page_layout = dmc.Box(
-    children=[
-        dmc.Tabs(
-            value=ComponentsIdTree.Tabs.TabPanels.PANEL_BASIS_TRADE,
-            children=[
-                dmc.TabsList(
-                    children=[
-                        *generate_stores(ComponentsIdTree.Tabs.TabStores),
-                        *generate_tabs(ComponentsIdTree.Tabs.TabPanels)
-                    ]
-                ),
-                *generate_panels(
-                    ComponentsIdTree.Tabs.TabPanels,
-                    ComponentsIdTree.Tabs.TabCarousel,
-                    [fieldset_basis_trade, fieldset_basis_trade_leveraged]
-                )
-            ]
-        )
-    ],
-    style={"maxWidth": "1600px", "margin": "auto"}
-)
-
-
-app_layout = dmc.Box(
-    children=[
-        dmc.Box(
-            children=[
-                page_layout
-            ]
-        )
-    ]
-)
\ No newline at end of file
+def generate_page_layout() -> dmc.Box:
+    """Generate the layout of the page.
+
+    The layout is generated after the registry is loaded, so the selects list the instruments and
+    coins currently in the registry.
+
+    Returns:
+        dmc.Box: The layout of the page.
+    """
+    page_layout = dmc.Box(
+        children=[
+            dmc.Tabs(
+                value=ComponentsIdTree.Tabs.TabPanels.PANEL_BASIS_TRADE,
+                children=[
+                    dmc.TabsList(
+                        children=[
+                            *generate_stores(ComponentsIdTree.Tabs.TabStores),
+                            *generate_tabs(ComponentsIdTree.Tabs.TabPanels)
+                        ]
+                    ),
+                    *generate_panels(
+                        ComponentsIdTree.Tabs.TabPanels,
+                        ComponentsIdTree.Tabs.TabCarousel,
+                        [generate_fieldset_basis_trade(), generate_fieldset_basis_trade_leveraged()]
+                    ),
+                    generate_panel_screener(),
+                    generate_panel_sweep()
+                ]
+            )
+        ],
+        style={"maxWidth": "1600px", "margin": "auto"}
+    )
+
+    return dmc.Box(
+        children=[
+            dmc.Box(
+                children=[
+                    page_layout
+                ]
+            )
+        ]
+    )
@@ -0,0 +1,12 @@
+from unittest.mock import patch
+
+from frontend.src.callbacks.screener_callback import update_screener_table
+
+
+def test_update_screener_table():
+    with patch('frontend.src.callbacks.screener_callback.load_data_screener') as mock_load:
+        mock_load.return_value = {"head": [], "body": []}
+
+        assert update_screener_table("90", "volatility") == {"head": [], "body": []}
+
+    mock_load.assert_called_once_with(90, "volatility")
@@ -0,0 +1,13 @@
+from unittest.mock import patch
+
+import plotly.graph_objects as go
+
+from frontend.src.callbacks.sweep_callback import update_sweep_heatmap
+
+
+def test_update_sweep_heatmap():
+    figure = go.Figure()
+    with patch('frontend.src.callbacks.sweep_callback.load_data_sweep_heatmap', return_value=figure) as mock_load:
+        assert update_sweep_heatmap("calmar") is figure
+
+    mock_load.assert_called_once_with("calmar")
@@ -0,0 +1,34 @@
+import numpy as np
+
+from frontend.src.data_handling.chart_payload import ChartSeries, build_chart_payload, month_labels
+
+
+def test_month_labels_match_strftime():
+    timestamps = np.datetime64('1999-11-30T23', 'ms') + np.arange(0, 400 * 24, 7) * np.timedelta64(1, 'h')
+
+    expected = [timestamp.strftime('%b %y') for timestamp in timestamps.astype(object)]
+
+    assert month_labels(timestamps).tolist() == expected
+
+
+def test_month_labels_empty():
+    assert month_labels(np.array([], dtype='datetime64[ms]')).tolist() == []
+
+
+def test_build_chart_payload():
+    timestamps = np.array(['2024-01-31T16', '2024-02-01T00'], dtype='datetime64[ms]')
+
+    data, series = build_chart_payload(
+        timestamps,
+        [
+            ChartSeries('Funding BTCUSDT', np.array([0.0123456, -0.5]), 'blue.6'),
+            ChartSeries('Compound', np.array([1.005, 2.0]), 'green.6', 2)
+        ]
+    )
+
+    assert data == [
+        {'date': 'Jan 24', 'Funding BTCUSDT': 0.01235, 'Compound': 1.0},
+        {'date': 'Feb 24', 'Funding BTCUSDT': -0.5, 'Compound': 2.0}
+    ]
+    assert all(type(value) is float for value in data[0].values() if not isinstance(value, str))
+    assert series == [{'name': 'Funding BTCUSDT', 'color': 'blue.6'}, {'name': 'Compound', 'color': 'green.6'}]
@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from backend.data_access.storage.memory_store import MemoryStore
+from backend.data_access.storage.rollups import Resolution, bucket_start
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import Symbol
+from frontend.settings import frontend_settings
+from frontend.src.data_handling.data_handling_basis_trade import load_data_cumulative_funding, load_data_funding_rates
+
+
+SETTLEMENTS = np.datetime64('2024-01-01T00', 'ms') + np.arange(5 * 365 * 3) * np.timedelta64(8, 'h')
+
+
+@pytest.mark.parametrize("spike", [100, 2000, 5000])
+def test_load_data_funding_rates_keeps_spikes(spike):
+    rates = np.random.default_rng(spike).normal(1e-4, 5e-5, len(SETTLEMENTS))
+    rates[spike] = 0.02
+    store = MemoryStore()
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS, rates)
+
+    with patch('frontend.src.data_handling.data_handling_basis_trade.get_store', return_value=store):
+        _, data, _ = load_data_funding_rates()
+
+    # Five years of settlements are read as about 260 weekly buckets, the 2 % settlement is not averaged away
+    assert 255 <= len(data) <= 262 <= frontend_settings.CHART_POINT_BUDGET
+    assert max(point[f"Max Funding {Symbol.BTCUSDT.value}"] for point in data) == pytest.approx(2.0)
+    assert all(point[f"Min Funding {Symbol.BTCUSDT.value}"] <= point[f"Max Funding {Symbol.BTCUSDT.value}"] for point in data)
+
+
+def test_load_data_funding_rates_without_entries():
+    with patch('frontend.src.data_handling.data_handling_basis_trade.get_store', return_value=MemoryStore()):
+        title, data, series = load_data_funding_rates()
+
+    assert title == f"{Symbol.BTCUSDT.value} Funding Rate"
+    assert data == []
+    assert series == [
+        {"name": f"Max Funding {Symbol.BTCUSDT.value}", "color": "blue.6"},
+        {"name": f"Min Funding {Symbol.BTCUSDT.value}", "color": "cyan.6"}
+    ]
+
+
+def test_load_data_cumulative_funding_reads_weekly_rollups():
+    rates = np.random.default_rng(0).normal(1e-4, 5e-5, len(SETTLEMENTS))
+    store = MemoryStore()
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, SETTLEMENTS, rates)
+
+    with patch('frontend.src.data_handling.data_handling_basis_trade.get_store', return_value=store):
+        _, data, _ = load_data_cumulative_funding()
+
+    # Five years of settlements are read as about 260 weekly buckets, accumulated from the first full week
+    assert 255 <= len(data) <= 262
+    start = SETTLEMENTS[-1] - np.timedelta64(5 * 365, 'D')
+    first_week = bucket_start(np.array([start]), Resolution.WEEK)[0]
+    first_week += np.timedelta64(7, 'D') if first_week < start else np.timedelta64(0, 'D')
+    accumulated = rates[SETTLEMENTS >= first_week]
+    assert data[-1][f"Compound Funding {Symbol.BTCUSDT.value}"] == pytest.approx(100 * (np.prod(1 + accumulated) - 1), abs=0.01)
+    assert data[-1][f"Cummulative Funding {Symbol.BTCUSDT.value}"] == pytest.approx(100 * np.sum(accumulated), abs=0.01)
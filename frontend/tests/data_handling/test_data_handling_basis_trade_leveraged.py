@@ -0,0 +1,149 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from backend.data_access.storage.memory_store import MemoryStore
+from backend.data_access.storage.rolling import RollingAccumulator, compute_rolling_stats
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import Coin, Symbol
+from frontend.src.data_handling.data_handling_basis_trade_leveraged import (
+    ALIGNED_FRAMES,
+    ROLLING_STATES,
+    build_aligned_frame,
+    build_rolling_stats,
+    load_bootstrap_bands,
+    load_aligned_frame,
+    load_data_cumulative_funding_leveraged,
+    load_data_funding_rates_leveraged,
+    load_data_net_income_leveraged
+)
+
+
+END = np.datetime64('2024-03-01T00', 'ms')
+
+
+# Fixture providing a store with 60 funding settlements and 24 days of hourly interest
+@pytest.fixture
+def store():
+    store = MemoryStore()
+    store.create_entries(
+        SeriesTable.FUNDING,
+        Symbol.BTCUSDT.value,
+        END - np.arange(60)[::-1] * np.timedelta64(8, 'h'),
+        np.full(60, 0.001)
+    )
+    store.create_entries(
+        SeriesTable.INTEREST,
+        Coin.DAI.value,
+        END - np.arange(24 * 24)[::-1] * np.timedelta64(1, 'h'),
+        np.full(24 * 24, 0.0001)
+    )
+    ALIGNED_FRAMES.clear()
+    ROLLING_STATES.clear()
+    yield store
+    ALIGNED_FRAMES.clear()
+    ROLLING_STATES.clear()
+
+
+def test_build_aligned_frame(store):
+    frame = build_aligned_frame(Symbol.BTCUSDT.value, Coin.DAI.value, store=store)
+
+    # Every settlement collects the 8 hours before it, the interest reaches back far enough for all of them
+    assert len(frame.timestamps) == len(frame.funding) == len(frame.interest) == 60
+    assert frame.timestamps[-1] == END
+    np.testing.assert_allclose(frame.interest, 0.0008)
+
+
+def test_build_aligned_frame_scales_partial_windows(store):
+    # Leave two of the eight hours of the last window
+    timestamps, values = store.read_entries(SeriesTable.INTEREST, Coin.DAI.value)
+    store = MemoryStore()
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, np.array([END - np.timedelta64(8, 'h'), END]), [0.001, 0.001])
+    store.create_entries(SeriesTable.INTEREST, Coin.DAI.value, timestamps[:-7], values[:-7])
+
+    frame = build_aligned_frame(Symbol.BTCUSDT.value, Coin.DAI.value, store=store)
+
+    np.testing.assert_allclose(frame.interest, [0.0008, 0.0008])
+
+
+def test_build_aligned_frame_without_interest():
+    frame = build_aligned_frame(Symbol.BTCUSDT.value, Coin.DAI.value, store=MemoryStore())
+
+    assert len(frame.timestamps) == 0
+
+
+def test_load_aligned_frame_is_shared_by_all_slides(store):
+    with patch('frontend.src.data_handling.data_handling_basis_trade_leveraged.get_store', return_value=store), \
+            patch('frontend.src.data_handling.data_handling_basis_trade_leveraged.build_aligned_frame',
+                  wraps=build_aligned_frame) as build:
+        _, cumulative, _ = load_data_cumulative_funding_leveraged()
+        _, funding, _ = load_data_funding_rates_leveraged()
+        _, net_income, _ = load_data_net_income_leveraged()
+
+    # The funding and interest series are aligned once for the three slides
+    assert build.call_count == 1
+    assert len(cumulative) == len(funding) == 60
+    assert len(net_income) == 60 - 30 + 1
+    assert funding[-1]['Interest DAI'] == pytest.approx(0.08)
+
+
+def test_load_aligned_frame_expires_with_the_hour(store):
+    with patch('frontend.src.data_handling.data_handling_basis_trade_leveraged.time.time', return_value=3600 * 10.5):
+        frame = load_aligned_frame(Symbol.BTCUSDT.value, Coin.DAI.value, store=store)
+        assert load_aligned_frame(Symbol.BTCUSDT.value, Coin.DAI.value, store=store) is frame
+
+    with patch('frontend.src.data_handling.data_handling_basis_trade_leveraged.time.time', return_value=3600 * 11):
+        assert load_aligned_frame(Symbol.BTCUSDT.value, Coin.DAI.value, store=store) is not frame
+
+
+def test_load_data_net_income_leveraged_with_rolling_series(store):
+    with patch('frontend.src.data_handling.data_handling_basis_trade_leveraged.get_store', return_value=store):
+        _, data, series = load_data_net_income_leveraged(rolling_series=['apr-7', 'std-7'])
+
+    # The 7 day window spans 21 settlements, the series start once the moving average is full
+    assert [line['name'] for line in series] == ["Difference", "Moving Average 30d", "APR 7d", "Std 7d"]
+    assert len(data) == 60 - 30 + 1
+    assert data[-1]['APR 7d'] == pytest.approx(100 * (0.001 - 0.0008) * 3 * 365)
+    assert data[-1]['Std 7d'] == pytest.approx(0)
+
+
+# Test that the rolling statistics are only fed the settlements newer than the previous frame
+def test_build_rolling_stats_feeds_only_new_settlements(store):
+    build_rolling_stats(Symbol.BTCUSDT.value, Coin.DAI.value, store=store)
+    store.create_entries(SeriesTable.FUNDING, Symbol.BTCUSDT.value, END + np.arange(1, 4) * np.timedelta64(8, 'h'), [0.002, -0.001, 0.003])
+    store.create_entries(SeriesTable.INTEREST, Coin.DAI.value, END + np.arange(1, 25) * np.timedelta64(1, 'h'), np.full(24, 0.0002))
+    ALIGNED_FRAMES.clear()
+
+    with patch.object(RollingAccumulator, 'update', autospec=True, side_effect=RollingAccumulator.update) as update:
+        stats = build_rolling_stats(Symbol.BTCUSDT.value, Coin.DAI.value, store=store)
+    assert [len(call.args[1]) for call in update.call_args_list] == [3]
+
+    frame = load_aligned_frame(Symbol.BTCUSDT.value, Coin.DAI.value, store=store)
+    expected = compute_rolling_stats(100*(frame.funding - frame.interest), sorted(stats), 3 * 365)
+    for window, rolling in stats.items():
+        np.testing.assert_allclose(rolling.mean, expected[window].mean)
+        np.testing.assert_allclose(rolling.zscore, expected[window].zscore)
+
+
+def test_load_data_net_income_leveraged_rejects_unknown_rolling_series(store):
+    with patch('frontend.src.data_handling.data_handling_basis_trade_leveraged.get_store', return_value=store), \
+            pytest.raises(ValueError):
+        load_data_net_income_leveraged(rolling_series=['apr-14'])
+
+
+def test_load_data_cumulative_funding_leveraged_with_bootstrap_bands(store):
+    with patch('frontend.src.data_handling.data_handling_basis_trade_leveraged.get_store', return_value=store):
+        _, data, series = load_data_cumulative_funding_leveraged()
+
+    # A constant spread compounds the same on every resampled path
+    assert [line['name'] for line in series][3:] == [f"Bootstrap P{p}" for p in (5, 25, 50, 75, 95)]
+    assert data[-1]['Bootstrap P5'] == data[-1]['Bootstrap P95'] == data[-1]['Compound Difference']
+
+
+def test_load_bootstrap_bands_is_seeded(store):
+    bands = load_bootstrap_bands(Symbol.BTCUSDT.value, Coin.DAI.value, store=store)
+    ALIGNED_FRAMES.clear()
+
+    np.testing.assert_array_equal(bands.bands, load_bootstrap_bands(Symbol.BTCUSDT.value, Coin.DAI.value, store=store).bands)
+    assert bands.bands.shape == (5, 60)
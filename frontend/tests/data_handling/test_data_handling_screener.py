@@ -0,0 +1,46 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from backend.data_access.storage.memory_store import MemoryStore
+from backend.data_access.storage.time_series_store import SeriesTable
+from backend.models.models_orm import Symbol
+from backend.services.screener import SCREENERS
+from frontend.src.data_handling.data_handling_screener import load_data_screener
+
+
+END = np.datetime64('2024-06-01T00', 'ms')
+
+
+# Fixture providing a store with 30 days of funding of three symbols
+@pytest.fixture
+def store():
+    store = MemoryStore()
+    timestamps = END - np.arange(90)[::-1] * np.timedelta64(8, 'h')
+    for symbol, rate in [(Symbol.BTCUSDT, 1e-4), (Symbol.ETHUSDT, 3e-4), (Symbol.SOLUSDT, -1e-4)]:
+        store.create_entries(SeriesTable.FUNDING, symbol.value, timestamps, np.full(90, rate))
+    SCREENERS.clear()
+    with patch('backend.services.screener.get_store', return_value=store):
+        yield store
+    SCREENERS.clear()
+
+
+def test_load_data_screener(store):
+    table = load_data_screener(30, "apr")
+
+    assert table["head"] == [
+        "Rank", "Symbol", "APR 7d", "APR 30d", "APR 90d", "APR 365d", "Hit Rate 30d", "Volatility 30d", "Settlements 30d"
+    ]
+    assert len(table["body"]) == len(Symbol)
+    assert table["body"][0] == [1, Symbol.ETHUSDT.value, "32.85 %", "32.85 %", "32.85 %", "32.85 %", "100.0 %", "0.0 %", 90]
+    assert table["body"][1][1] == Symbol.BTCUSDT.value
+    assert table["body"][2][1] == Symbol.SOLUSDT.value
+    assert table["body"][-1][2:] == ["-", "-", "-", "-", "-", "-", 0]
+
+
+def test_load_data_screener_ranked_by_hit_rate(store):
+    table = load_data_screener(7, "hit_rate")
+
+    assert [row[1] for row in table["body"][:3]] == sorted([Symbol.BTCUSDT.value, Symbol.ETHUSDT.value]) + [Symbol.SOLUSDT.value]
+    assert table["body"][2][6] == "0.0 %"
@@ -0,0 +1,48 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from backend.data_access.crud.crud_sweep import SweepRow
+from frontend.src.data_handling.data_handling_sweep import load_data_sweep_heatmap
+
+
+ROWS = [
+    SweepRow('BTCUSDT', 'USDC', 1.0, 0, 0.1, 0.05, -0.01, 100),
+    SweepRow('BTCUSDT', 'USDC', 3.0, 21, 0.3, 0.15, -0.1, 100),
+    SweepRow('ETHUSDT', 'USDC', 2.0, 0, -0.1, -0.05, -0.2, 100)
+]
+
+
+def test_load_data_sweep_heatmap_by_apr():
+    with patch('frontend.src.data_handling.data_handling_sweep.read_sweep_results', return_value=ROWS):
+        figure = load_data_sweep_heatmap("apr")
+
+    heatmap = figure.data[0]
+    assert list(heatmap.y) == ['BTCUSDT', 'ETHUSDT']
+    assert list(heatmap.x) == ['USDC']
+    np.testing.assert_allclose(np.array(heatmap.z, dtype=float), [[15.0], [-5.0]])
+    assert heatmap.text[0][0].startswith("3x, rebalance 21")
+
+
+def test_load_data_sweep_heatmap_by_calmar():
+    with patch('frontend.src.data_handling.data_handling_sweep.read_sweep_results', return_value=ROWS):
+        figure = load_data_sweep_heatmap("calmar")
+
+    # 0.05 / 0.01 beats 0.15 / 0.1, the drawdown decides
+    heatmap = figure.data[0]
+    np.testing.assert_allclose(np.array(heatmap.z, dtype=float), [[5.0], [-0.25]])
+    assert heatmap.text[0][0].startswith("1x, rebalance never")
+
+
+def test_load_data_sweep_heatmap_without_results():
+    with patch('frontend.src.data_handling.data_handling_sweep.read_sweep_results', return_value=[]):
+        figure = load_data_sweep_heatmap()
+
+    assert len(figure.data) == 0
+    assert "No sweep results" in figure.layout.title.text
+
+
+def test_load_data_sweep_heatmap_rejects_unknown_score():
+    with pytest.raises(ValueError):
+        load_data_sweep_heatmap("sharpe")
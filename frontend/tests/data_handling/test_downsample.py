@@ -0,0 +1,74 @@
+import numpy as np
+
+from frontend.src.data_handling.chart_payload import ChartSeries, build_chart_payload
+from frontend.src.data_handling.downsample import lttb_indices
+
+
+TIMESTAMPS = np.datetime64('2020-01-01T00', 'ms') + np.arange(5500) * np.timedelta64(8, 'h')
+
+
+def test_lttb_indices_keeps_budget_and_endpoints():
+    values = np.random.default_rng(0).normal(1e-4, 1e-4, len(TIMESTAMPS))
+
+    kept = lttb_indices(TIMESTAMPS, values, 500)
+
+    assert 498 <= len(kept) <= 500
+    assert kept[0] == 0 and kept[-1] == len(TIMESTAMPS) - 1
+    assert np.all(np.diff(kept) > 0)
+
+
+def test_lttb_indices_keeps_spikes():
+    values = np.random.default_rng(1).normal(1e-4, 1e-5, len(TIMESTAMPS))
+    values[1234] = 0.01
+    values[4321] = -0.005
+
+    kept = lttb_indices(TIMESTAMPS, values, 100)
+
+    assert 1234 in kept and 4321 in kept
+
+
+def test_lttb_indices_considers_all_series():
+    flat = np.zeros(len(TIMESTAMPS))
+    spiky = np.zeros(len(TIMESTAMPS))
+    spiky[2000] = 1.0
+
+    kept = lttb_indices(TIMESTAMPS, np.column_stack([flat, spiky]), 50)
+
+    assert 2000 in kept
+
+
+def test_lttb_indices_short_series():
+    np.testing.assert_array_equal(lttb_indices(TIMESTAMPS[:10], np.ones(10), 500), np.arange(10))
+
+
+def test_build_chart_payload_downsamples():
+    funding = np.random.default_rng(2).normal(1e-2, 1e-2, len(TIMESTAMPS))
+    funding[3000] = 1.0
+
+    data, _ = build_chart_payload(TIMESTAMPS, [ChartSeries('Funding', funding, 'blue.6')], max_points=500)
+
+    assert 498 <= len(data) <= 500
+    assert max(record['Funding'] for record in data) == 1.0
+
+
+def test_lttb_indices_keeps_the_extremes_of_every_series():
+    walks = np.cumsum(np.random.default_rng(3).normal(0, 1, (len(TIMESTAMPS), 2)), axis=0)
+
+    kept = lttb_indices(TIMESTAMPS, walks, 50)
+
+    assert len(kept) <= 50 and np.all(np.diff(kept) > 0)
+    for walk in walks.T:
+        assert np.argmax(walk) in kept and np.argmin(walk) in kept
+
+
+# Test that the peaks of two series falling into the same bucket are both kept
+def test_lttb_indices_keeps_extremes_sharing_a_bucket():
+    first = np.zeros(len(TIMESTAMPS))
+    second = np.zeros(len(TIMESTAMPS))
+    first[1000] = 1.0
+    second[1001] = 1.0
+
+    kept = lttb_indices(TIMESTAMPS, np.column_stack([first, second]), 50)
+
+    assert len(kept) <= 50 and np.all(np.diff(kept) > 0)
+    assert 1000 in kept and 1001 in kept